@@ -0,0 +1,436 @@
+import csv
+import math
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from constants import *
+from utils import *
+
+META_COLUMNS = [
+    "export_index",
+    "video_frame_index",
+    "image_name",
+    "label_name",
+    "bbox_ok",
+    "bbox_source",
+    "tracker_ok",
+    "yolo_enabled",
+    "yolo_candidate_conf",
+    "yolo_candidate_ok",
+    "yolo_rejected_far",
+    "yolo_jump_ratio",
+]
+REVIEW_COLUMNS = [
+    "start_export_index",
+    "end_export_index",
+    "start_video_frame",
+    "end_video_frame",
+    "frames",
+    "reason",
+]
+
+
+@dataclass
+class FrameLabel:
+    frame_index: int
+    box_xywh: tuple[int, int, int, int] | None
+    bbox_source: str
+    tracker_ok: bool
+    yolo_candidate_xywh: tuple[int, int, int, int] | None
+    yolo_conf: float
+    yolo_ok: bool
+    yolo_rejected_far: bool
+    yolo_jump_ratio: float
+
+
+def consecutive_jump_ratios(boxes_xywh: np.ndarray, valid: np.ndarray, frame_w: int, frame_h: int) -> np.ndarray:
+    """
+    Center jump ratio of each candidate against the previous row's candidate.
+
+    Row 0 and rows where either candidate is missing are NaN.
+    """
+    ratios = np.full(len(boxes_xywh), np.nan, dtype=np.float64)
+    if len(boxes_xywh) < 2:
+        return ratios
+    centers = boxes_xywh[:, :2] + boxes_xywh[:, 2:4] / 2.0
+    dist = np.hypot(*(centers[1:] - centers[:-1]).T)
+    diag = math.hypot(float(frame_w), float(frame_h))
+    pair_valid = valid[1:] & valid[:-1]
+    ratios[1:] = np.where(pair_valid, dist / diag if diag > 0 else 0.0, np.nan)
+    return ratios
+
+
+class BatchAutoLabeler:
+    """
+    Headless YOLO + tracker labeler that processes frames in batches.
+
+    Acceptance matches track_label_video.py: a YOLO candidate is accepted unless
+    its center jumps more than max_jump_ratio from the last accepted box. While
+    YOLO keeps being accepted, the last accepted box is the previous frame's
+    candidate, so those ratios come from one vectorized pass; only frames after a
+    rejection or a miss fall back to a scalar check. The tracker is created lazily
+    and only runs on frames YOLO could not label.
+    """
+
+    def __init__(
+        self,
+        yolo_model,
+        frame_w: int,
+        frame_h: int,
+        conf_threshold: float,
+        max_jump_ratio: float,
+        tracker_type: str,
+    ):
+        self.yolo_model = yolo_model
+        self.frame_w = frame_w
+        self.frame_h = frame_h
+        self.conf_threshold = float(conf_threshold)
+        self.max_jump_ratio = float(max_jump_ratio)
+        self.tracker_type = tracker_type
+
+        self.last_accepted_box: tuple[int, int, int, int] | None = None
+        self.prev_frame = None
+        self.prev_source = "none"
+        self.prev_candidate: tuple[int, int, int, int] | None = None
+        self.tracker = None
+
+    def _detect_batch(self, frames: list) -> list[tuple[int, int, int, int, float] | None]:
+        results = self.yolo_model.predict(frames, conf=self.conf_threshold, verbose=False)
+        return [best_detection_from_result(result, self.frame_w, self.frame_h) for result in results]
+
+    def _bridge_with_tracker(self, frame) -> tuple[int, int, int, int] | None:
+        if self.tracker is None:
+            if self.last_accepted_box is None or self.prev_frame is None:
+                return None
+            self.tracker = make_tracker(self.tracker_type)
+            self.tracker.init(self.prev_frame, tuple(map(int, self.last_accepted_box)))
+        ok, box = self.tracker.update(frame)
+        if not ok:
+            return None
+        return clamp_bbox(*box, self.frame_w, self.frame_h)
+
+    def label_batch(self, frame_indices: list[int], frames: list) -> list[FrameLabel]:
+        detections = self._detect_batch(frames)
+
+        # Prepend the previous batch's last candidate so ratios chain across batches.
+        chained = [self.prev_candidate] + [d[:4] if d is not None else None for d in detections]
+        valid = np.array([c is not None for c in chained], dtype=bool)
+        boxes = np.array([c if c is not None else (0, 0, 0, 0) for c in chained], dtype=np.float64)
+        ratios = consecutive_jump_ratios(boxes, valid, self.frame_w, self.frame_h)[1:]
+
+        labels: list[FrameLabel] = []
+        for i, (frame_index, frame, det) in enumerate(zip(frame_indices, frames, detections)):
+            candidate = det[:4] if det is not None else None
+            conf = det[4] if det is not None else 0.0
+            yolo_ok = candidate is not None
+            rejected = False
+            jump_ratio = 0.0
+
+            if candidate is not None and self.last_accepted_box is not None:
+                if self.prev_source == "yolo" and not np.isnan(ratios[i]):
+                    jump_ratio = float(ratios[i])
+                else:
+                    jump_ratio = bbox_center_jump_ratio(
+                        prev_box=self.last_accepted_box,
+                        next_box=candidate,
+                        frame_w=self.frame_w,
+                        frame_h=self.frame_h,
+                    )
+                if jump_ratio > self.max_jump_ratio:
+                    yolo_ok = False
+                    rejected = True
+
+            chosen = None
+            source = "none"
+            tracker_ok = False
+            if yolo_ok:
+                chosen = candidate
+                source = "yolo"
+                # Re-seeded from this frame the next time YOLO needs bridging.
+                self.tracker = None
+            else:
+                chosen = self._bridge_with_tracker(frame)
+                tracker_ok = chosen is not None
+                if chosen is not None:
+                    source = "tracker"
+
+            if chosen is not None:
+                self.last_accepted_box = chosen
+            self.prev_frame = frame
+            self.prev_source = source
+            self.prev_candidate = candidate
+
+            labels.append(
+                FrameLabel(
+                    frame_index=frame_index,
+                    box_xywh=chosen,
+                    bbox_source=source,
+                    tracker_ok=tracker_ok,
+                    yolo_candidate_xywh=candidate,
+                    yolo_conf=conf,
+                    yolo_ok=yolo_ok,
+                    yolo_rejected_far=rejected,
+                    yolo_jump_ratio=jump_ratio,
+                )
+            )
+        return labels
+
+
+def start_decoder(cap, frame_queue: queue.Queue, stop_event: threading.Event, start_index: int) -> threading.Thread:
+    """Decode frames on a background thread; puts (frame_index, frame) and a final None."""
+
+    def run() -> None:
+        frame_index = start_index
+        try:
+            while not stop_event.is_set():
+                ok, frame = cap.read()
+                if not ok:
+                    break
+                frame_index += 1
+                frame_queue.put((frame_index, frame))
+        finally:
+            frame_queue.put(None)
+
+    thread = threading.Thread(target=run, daemon=True, name="auto-label-decode")
+    thread.start()
+    return thread
+
+
+def write_exported_frame(image_path: Path, frame: np.ndarray, label_path: Path, label_text: str) -> None:
+    if not cv2.imwrite(str(image_path), frame, [int(cv2.IMWRITE_JPEG_QUALITY), 90]):
+        raise RuntimeError(f"Could not write image: {image_path}")
+    label_path.write_text(label_text)
+
+
+class BoundedWriter:
+    """
+    Writer thread pool with at most max_pending submitted tasks in flight.
+
+    submit() blocks on the oldest task once the limit is reached, so decoded frames
+    are not buffered for the whole run, and re-raises a failed write right away.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.max_pending = max(1, int(max_pending))
+        self._pool = ThreadPoolExecutor(max_workers=max(1, int(workers)), thread_name_prefix="auto-label-write")
+        self._pending: deque[Future] = deque()
+
+    def raise_failures(self) -> None:
+        while self._pending and self._pending[0].done():
+            self._pending.popleft().result()
+        for future in self._pending:
+            if future.done() and future.exception() is not None:
+                future.result()
+
+    def submit(self, fn, *args) -> None:
+        self.raise_failures()
+        while len(self._pending) >= self.max_pending:
+            self._pending.popleft().result()
+        self._pending.append(self._pool.submit(fn, *args))
+
+    def close(self) -> None:
+        try:
+            while self._pending:
+                self._pending.popleft().result()
+        finally:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+def build_review_segments(rows: list[tuple[int, int, str, float]], min_conf: float) -> list[list]:
+    """Group consecutive exports labeled by the tracker, unlabeled, or with low YOLO confidence."""
+    segments: list[list] = []
+    current: list | None = None
+    for export_index, video_frame_index, source, conf in rows:
+        if source == "yolo" and conf >= min_conf:
+            reason = None
+        elif source == "yolo":
+            reason = "low_conf"
+        else:
+            reason = source
+        if reason is None:
+            current = None
+            continue
+        if current is not None and current[5] == reason and current[1] == export_index - 1:
+            current[1] = export_index
+            current[3] = video_frame_index
+            current[4] += 1
+            continue
+        current = [export_index, export_index, video_frame_index, video_frame_index, 1, reason]
+        segments.append(current)
+    return segments
+
+
+def run_auto_label(
+    video_path: Path | None = None,
+    labels_root: Path | None = None,
+    class_name: str | None = None,
+    yolo_model=None,
+    batch_size: int | None = None,
+) -> Path:
+    video_path = Path(video_path or VIDEO_PATH)
+    labels_root = Path(labels_root or OUT_DIR)
+    class_name = class_name or LABEL_CLASS_NAME
+    batch_size = max(1, int(batch_size or LABEL_AUTO_BATCH_SIZE))
+
+    if yolo_model is None:
+        catalog = open_session_catalog(str(labels_root))
+        try:
+            yolo_weights = find_labeling_yolo_weights(
+                class_name=class_name,
+                models_root=LABEL_YOLO_BEST_MODELS_DIR,
+                catalog=catalog,
+            )
+        finally:
+            if catalog is not None:
+                catalog.close()
+        if yolo_weights is None:
+            raise RuntimeError(
+                "Auto-label mode needs YOLO weights.\n"
+                f"No class-matched best.pt found under {resolve_repo_path(LABEL_YOLO_BEST_MODELS_DIR)}."
+            )
+        yolo_model = load_labeling_yolo_model(yolo_weights)
+        print(f"yolo weights: {yolo_weights}")
+
+    cap = cv2.VideoCapture(str(video_path), cv2.CAP_FFMPEG)
+    if not cap.isOpened():
+        raise RuntimeError(f"Could not open {video_path}")
+    src_fps = cap.get(cv2.CAP_PROP_FPS)
+    if not src_fps or src_fps <= 0:
+        src_fps = FPS_HINT
+    export_step = max(1, int(round(src_fps / EXPORT_FPS)))
+
+    session_dir = create_unique_label_session_dir(labels_root, class_name)
+    images_dir = session_dir / "images"
+    labels_dir = session_dir / "labels"
+    images_dir.mkdir(exist_ok=True)
+    labels_dir.mkdir(exist_ok=True)
+
+    frame_queue: queue.Queue = queue.Queue(maxsize=max(2, LABEL_AUTO_DECODE_QUEUE_SIZE))
+    stop_event = threading.Event()
+    decoder = start_decoder(cap, frame_queue, stop_event, start_index=-1)
+
+    labeler: BatchAutoLabeler | None = None
+    frame_writer = BoundedWriter(LABEL_AUTO_WRITER_THREADS, LABEL_AUTO_MAX_PENDING_WRITES)
+    review_rows: list[tuple[int, int, str, float]] = []
+    export_index = 0
+    skipped_black = 0
+    source_counts = {"yolo": 0, "tracker": 0, "none": 0}
+    t0 = time.perf_counter()
+    frames_seen = 0
+
+    meta_path = session_dir / "meta.csv"
+    with open(meta_path, "w", newline="") as meta_f:
+        meta = csv.writer(meta_f)
+        meta.writerow(META_COLUMNS)
+
+        def flush_batch(indices: list[int], frames: list) -> None:
+            nonlocal export_index
+            for label, frame in zip(labeler.label_batch(indices, frames), frames):
+                source_counts[label.bbox_source] += 1
+                # Keep the GUI tool's export numbering: frame 0 is the first decoded frame.
+                if label.frame_index % export_step != 0:
+                    continue
+                img_name = f"frame_{export_index:06d}.jpg"
+                lbl_name = f"frame_{export_index:06d}.txt"
+                label_text = ""
+                if label.box_xywh is not None:
+                    x, y, w, h = label.box_xywh
+                    label_text = yolo_line(CLASS_ID, x, y, w, h, labeler.frame_w, labeler.frame_h) + "\n"
+                frame_writer.submit(write_exported_frame, images_dir / img_name, frame, labels_dir / lbl_name, label_text)
+                has_candidate = label.yolo_candidate_xywh is not None
+                meta.writerow(
+                    [
+                        export_index,
+                        label.frame_index,
+                        img_name,
+                        lbl_name,
+                        int(label.box_xywh is not None),
+                        label.bbox_source,
+                        int(label.tracker_ok),
+                        1,
+                        f"{label.yolo_conf:.4f}" if has_candidate else "",
+                        int(label.yolo_ok),
+                        int(label.yolo_rejected_far),
+                        f"{label.yolo_jump_ratio:.4f}" if has_candidate else "",
+                    ]
+                )
+                review_rows.append((export_index, label.frame_index, label.bbox_source, label.yolo_conf))
+                export_index += 1
+            meta_f.flush()
+
+        batch_indices: list[int] = []
+        batch_frames: list = []
+        try:
+            while True:
+                item = frame_queue.get()
+                if item is None:
+                    break
+                frame_index, frame = item
+                frames_seen += 1
+                if labeler is None:
+                    if frame_index < STARTUP_PROBE_FRAMES and is_near_black(frame):
+                        skipped_black += 1
+                        continue
+                    h, w = frame.shape[:2]
+                    labeler = BatchAutoLabeler(
+                        yolo_model=yolo_model,
+                        frame_w=w,
+                        frame_h=h,
+                        conf_threshold=LABEL_YOLO_CONF_THRESHOLD,
+                        max_jump_ratio=LABEL_YOLO_MAX_CENTER_JUMP_RATIO,
+                        tracker_type=TRACKER_TYPE,
+                    )
+                batch_indices.append(frame_index)
+                batch_frames.append(frame)
+                if len(batch_frames) >= batch_size:
+                    flush_batch(batch_indices, batch_frames)
+                    batch_indices, batch_frames = [], []
+            if batch_frames and labeler is not None:
+                flush_batch(batch_indices, batch_frames)
+        finally:
+            stop_event.set()
+            # Unblock the decoder if it is waiting on a full queue.
+            while decoder.is_alive():
+                try:
+                    frame_queue.get(timeout=0.05)
+                except queue.Empty:
+                    pass
+            cap.release()
+            frame_writer.close()
+
+    segments = build_review_segments(review_rows, LABEL_AUTO_REVIEW_MIN_CONF)
+    review_path = session_dir / "review_segments.csv"
+    with open(review_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(REVIEW_COLUMNS)
+        writer.writerows(segments)
+
+    elapsed = time.perf_counter() - t0
+    review_frames = sum(s[4] for s in segments)
+    print(f"Auto-labeled {frames_seen} frames in {elapsed:.1f}s ({frames_seen / max(elapsed, 1e-9):.1f} fps)")
+    if skipped_black:
+        print(f"Skipped {skipped_black} near-black startup frame(s)")
+    print(
+        f"- sources: yolo={source_counts['yolo']}, tracker={source_counts['tracker']}, "
+        f"none={source_counts['none']}"
+    )
+    print(f"- exported samples: {export_index}")
+    print(f"- review: {len(segments)} segment(s), {review_frames} frame(s) -> {review_path}")
+    print(f"Saved to {session_dir}")
+    return session_dir
+
+
+def main() -> None:
+    run_auto_label()
+
+
+if __name__ == "__main__":
+    main()
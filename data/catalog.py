@@ -0,0 +1,778 @@
+import argparse
+import csv
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+# Stdlib-only on purpose: models/ imports this module as `data.catalog`, where
+# `constants`/`utils` would resolve to the models/ copies.
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+SCHEMA_VERSION = 2
+IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+VIDEO_EXTS = {".avi", ".mp4", ".mkv", ".mov"}
+# Never descend into these while looking for sessions.
+_LEAF_DIR_NAMES = {"images", "labels", "weights", "__pycache__"}
+_MAX_SCAN_DEPTH = 6
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS catalog_info (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS scan_dirs (
+    path TEXT PRIMARY KEY,
+    mtime_ns INTEGER NOT NULL,
+    subdirs TEXT NOT NULL,
+    files TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    class_name TEXT,
+    bucket TEXT,
+    images_mtime_ns INTEGER,
+    labels_mtime_ns INTEGER,
+    meta_mtime_ns INTEGER,
+    video_path TEXT,
+    frame_count INTEGER NOT NULL DEFAULT 0,
+    indexed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS frames (
+    id INTEGER PRIMARY KEY,
+    session_id INTEGER NOT NULL REFERENCES sessions(id) ON DELETE CASCADE,
+    image_name TEXT NOT NULL,
+    label_name TEXT,
+    has_label INTEGER NOT NULL DEFAULT 0,
+    export_index INTEGER,
+    video_frame_index INTEGER,
+    bbox_ok INTEGER,
+    bbox_source TEXT,
+    tracker_ok INTEGER,
+    yolo_enabled INTEGER,
+    yolo_conf REAL,
+    yolo_candidate_ok INTEGER,
+    yolo_rejected_far INTEGER,
+    yolo_jump_ratio REAL,
+    label_mtime_ns INTEGER,
+    label_size INTEGER,
+    UNIQUE(session_id, image_name)
+);
+CREATE TABLE IF NOT EXISTS labels (
+    frame_id INTEGER NOT NULL REFERENCES frames(id) ON DELETE CASCADE,
+    line_index INTEGER NOT NULL,
+    class_id INTEGER,
+    cx REAL, cy REAL, w REAL, h REAL,
+    PRIMARY KEY (frame_id, line_index)
+);
+CREATE TABLE IF NOT EXISTS model_runs (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    name TEXT NOT NULL,
+    source TEXT NOT NULL,
+    best_path TEXT,
+    last_path TEXT,
+    weights_mtime_ns INTEGER NOT NULL DEFAULT 0,
+    run_mtime_ns INTEGER NOT NULL DEFAULT 0,
+    indexed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_sessions_class ON sessions(class_name, bucket);
+CREATE INDEX IF NOT EXISTS idx_frames_session ON frames(session_id);
+CREATE INDEX IF NOT EXISTS idx_frames_source_conf ON frames(bbox_source, yolo_conf);
+CREATE INDEX IF NOT EXISTS idx_labels_class ON labels(class_id);
+"""
+# Columns added after schema version 1; ALTERed into older catalogs on open.
+_ADDED_COLUMNS = {
+    "frames": (("label_mtime_ns", "INTEGER"), ("label_size", "INTEGER")),
+    "model_runs": (("run_mtime_ns", "INTEGER NOT NULL DEFAULT 0"),),
+}
+
+
+@dataclass(frozen=True)
+class SessionRecord:
+    path: Path
+    kind: str
+    name: str
+    class_name: str | None
+    bucket: str | None
+    frame_count: int
+    video_path: Path | None
+
+
+@dataclass(frozen=True)
+class FrameRecord:
+    session_path: Path
+    class_name: str | None
+    bucket: str | None
+    image_path: Path
+    label_path: Path | None
+    export_index: int | None
+    video_frame_index: int | None
+    bbox_source: str | None
+    yolo_conf: float | None
+
+
+@dataclass(frozen=True)
+class ModelRunRecord:
+    path: Path
+    name: str
+    source: str
+    best_path: Path | None
+    last_path: Path | None
+    weights_mtime_ns: int
+    run_mtime_ns: int
+
+
+@dataclass
+class RefreshStats:
+    dirs_listed: int = 0
+    sessions_indexed: int = 0
+    sessions_unchanged: int = 0
+    sessions_removed: int = 0
+    model_runs_indexed: int = 0
+    labels_reread: int = 0
+
+
+def resolve_repo_path(path_like: str | Path) -> Path:
+    path = Path(path_like)
+    return path if path.is_absolute() else (REPO_ROOT / path)
+
+
+def _mtime_ns(path: Path) -> int | None:
+    try:
+        return path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def _file_signature(path: Path) -> tuple[int, int] | tuple[None, None]:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None, None
+    return int(st.st_mtime_ns), int(st.st_size)
+
+
+def _parse_int(value: str | None) -> int | None:
+    if value is None or str(value).strip() == "":
+        return None
+    try:
+        return int(float(value))
+    except ValueError:
+        return None
+
+
+def _parse_float(value: str | None) -> float | None:
+    if value is None or str(value).strip() == "":
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+def _parse_bool(value: str | None) -> int | None:
+    if value is None or str(value).strip() == "":
+        return None
+    return 1 if str(value).strip().lower() in {"1", "true", "yes"} else 0
+
+
+def _parse_label_lines(text: str) -> list[tuple[int | None, float | None, float | None, float | None, float | None]]:
+    rows = []
+    for line in text.splitlines():
+        parts = line.split()
+        if not parts:
+            continue
+        class_id = _parse_int(parts[0])
+        coords = [_parse_float(p) for p in parts[1:5]] + [None] * (4 - len(parts[1:5]))
+        rows.append((class_id, *coords))
+    return rows
+
+
+class SessionCatalog:
+    """
+    SQLite index of raw sessions, labeled sessions (frames, labels, meta.csv
+    fields) and model runs.
+
+    refresh() is incremental: directory listings are cached by mtime, and a
+    session is only re-read when its images/, labels/ or meta.csv mtime
+    changed. Editing a label file in place does not bump its directory mtime,
+    so label rows are also keyed on each label file's mtime/size and re-read
+    when those change.
+    """
+
+    def __init__(self, db_path: str | Path):
+        self.db_path = resolve_repo_path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.execute("PRAGMA journal_mode = WAL")
+        self.conn.executescript(_SCHEMA)
+        for table, columns in _ADDED_COLUMNS.items():
+            existing = {row[1] for row in self.conn.execute(f"PRAGMA table_info({table})")}
+            for name, decl in columns:
+                if name not in existing:
+                    self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {decl}")
+        self.conn.execute(
+            "INSERT OR REPLACE INTO catalog_info(key, value) VALUES ('schema_version', ?)",
+            (str(SCHEMA_VERSION),),
+        )
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "SessionCatalog":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.close()
+
+    # -----------------------
+    # Incremental directory walk
+    # -----------------------
+    def _list_dir(self, directory: Path, stats: RefreshStats) -> tuple[list[str], list[str]]:
+        mtime = _mtime_ns(directory)
+        if mtime is None:
+            self.conn.execute("DELETE FROM scan_dirs WHERE path = ?", (str(directory),))
+            return [], []
+        row = self.conn.execute(
+            "SELECT mtime_ns, subdirs, files FROM scan_dirs WHERE path = ?",
+            (str(directory),),
+        ).fetchone()
+        if row is not None and row[0] == mtime:
+            subdirs = row[1].split("\n") if row[1] else []
+            files = row[2].split("\n") if row[2] else []
+            return subdirs, files
+
+        subdirs, files = [], []
+        with os.scandir(directory) as it:
+            for entry in it:
+                if entry.is_dir():
+                    subdirs.append(entry.name)
+                elif entry.is_file():
+                    files.append(entry.name)
+        subdirs.sort()
+        files.sort()
+        stats.dirs_listed += 1
+        self.conn.execute(
+            "INSERT OR REPLACE INTO scan_dirs(path, mtime_ns, subdirs, files) VALUES (?, ?, ?, ?)",
+            (str(directory), mtime, "\n".join(subdirs), "\n".join(files)),
+        )
+        return subdirs, files
+
+    def _find_session_dirs(self, root: Path, stats: RefreshStats) -> list[Path]:
+        found: list[Path] = []
+        stack = [(root, 0)]
+        while stack:
+            directory, depth = stack.pop()
+            subdirs, _ = self._list_dir(directory, stats)
+            if "images" in subdirs:
+                found.append(directory)
+            if depth >= _MAX_SCAN_DEPTH:
+                continue
+            for name in subdirs:
+                if name not in _LEAF_DIR_NAMES:
+                    stack.append((directory / name, depth + 1))
+        return sorted(found)
+
+    # -----------------------
+    # Session indexing
+    # -----------------------
+    def _upsert_session(self, values: dict) -> int:
+        self.conn.execute(
+            """
+            INSERT INTO sessions(path, kind, name, class_name, bucket, images_mtime_ns,
+                                 labels_mtime_ns, meta_mtime_ns, video_path, frame_count, indexed_at)
+            VALUES (:path, :kind, :name, :class_name, :bucket, :images_mtime_ns,
+                    :labels_mtime_ns, :meta_mtime_ns, :video_path, :frame_count, :indexed_at)
+            ON CONFLICT(path) DO UPDATE SET
+                kind=excluded.kind, name=excluded.name, class_name=excluded.class_name,
+                bucket=excluded.bucket, images_mtime_ns=excluded.images_mtime_ns,
+                labels_mtime_ns=excluded.labels_mtime_ns, meta_mtime_ns=excluded.meta_mtime_ns,
+                video_path=excluded.video_path, frame_count=excluded.frame_count,
+                indexed_at=excluded.indexed_at
+            """,
+            values,
+        )
+        return self.conn.execute("SELECT id FROM sessions WHERE path = ?", (values["path"],)).fetchone()[0]
+
+    def _index_label_session(
+        self,
+        session_dir: Path,
+        class_name: str | None,
+        bucket: str | None,
+        stats: RefreshStats,
+        deep: bool,
+    ) -> None:
+        images_dir = session_dir / "images"
+        labels_dir = session_dir / "labels"
+        meta_path = session_dir / "meta.csv"
+        mtimes = (_mtime_ns(images_dir), _mtime_ns(labels_dir), _mtime_ns(meta_path))
+
+        row = self.conn.execute(
+            "SELECT images_mtime_ns, labels_mtime_ns, meta_mtime_ns FROM sessions WHERE path = ?",
+            (str(session_dir),),
+        ).fetchone()
+        if row is not None and tuple(row) == mtimes and not deep:
+            self._refresh_changed_labels(session_dir, stats)
+            stats.sessions_unchanged += 1
+            return
+
+        _, image_files = self._list_dir(images_dir, stats)
+        image_names = [n for n in image_files if Path(n).suffix.lower() in IMAGE_EXTS]
+        label_files = set(self._list_dir(labels_dir, stats)[1]) if mtimes[1] is not None else set()
+
+        meta_by_image: dict[str, dict] = {}
+        if mtimes[2] is not None:
+            with meta_path.open("r", newline="") as f:
+                for meta_row in csv.DictReader(f):
+                    image_name = str(meta_row.get("image_name", "")).strip()
+                    if image_name:
+                        meta_by_image[image_name] = meta_row
+
+        session_id = self._upsert_session(
+            {
+                "path": str(session_dir),
+                "kind": "label",
+                "name": session_dir.name,
+                "class_name": class_name,
+                "bucket": bucket,
+                "images_mtime_ns": mtimes[0],
+                "labels_mtime_ns": mtimes[1],
+                "meta_mtime_ns": mtimes[2],
+                "video_path": None,
+                "frame_count": len(image_names),
+                "indexed_at": time.time(),
+            }
+        )
+        self.conn.execute("DELETE FROM frames WHERE session_id = ?", (session_id,))
+
+        for image_name in image_names:
+            label_name = f"{Path(image_name).stem}.txt"
+            has_label = label_name in label_files
+            meta = meta_by_image.get(image_name, {})
+            cursor = self.conn.execute(
+                """
+                INSERT INTO frames(session_id, image_name, label_name, has_label, export_index,
+                                   video_frame_index, bbox_ok, bbox_source, tracker_ok, yolo_enabled,
+                                   yolo_conf, yolo_candidate_ok, yolo_rejected_far, yolo_jump_ratio,
+                                   label_mtime_ns, label_size)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (
+                    session_id,
+                    image_name,
+                    label_name if has_label else None,
+                    int(has_label),
+                    _parse_int(meta.get("export_index")),
+                    _parse_int(meta.get("video_frame_index")),
+                    _parse_bool(meta.get("bbox_ok")),
+                    (meta.get("bbox_source") or None),
+                    _parse_bool(meta.get("tracker_ok")),
+                    _parse_bool(meta.get("yolo_enabled")),
+                    _parse_float(meta.get("yolo_candidate_conf")),
+                    _parse_bool(meta.get("yolo_candidate_ok")),
+                    _parse_bool(meta.get("yolo_rejected_far")),
+                    _parse_float(meta.get("yolo_jump_ratio")),
+                    *(_file_signature(labels_dir / label_name) if has_label else (None, None)),
+                ),
+            )
+            if has_label:
+                self._insert_label_rows(cursor.lastrowid, labels_dir / label_name)
+        stats.sessions_indexed += 1
+
+    def _insert_label_rows(self, frame_id: int, label_path: Path) -> None:
+        label_rows = _parse_label_lines(label_path.read_text())
+        self.conn.executemany(
+            "INSERT INTO labels(frame_id, line_index, class_id, cx, cy, w, h) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(frame_id, i, *values) for i, values in enumerate(label_rows)],
+        )
+
+    def _refresh_changed_labels(self, session_dir: Path, stats: RefreshStats) -> None:
+        """Re-read label files edited in place (same directory mtime, new file mtime/size)."""
+        labels_dir = session_dir / "labels"
+        rows = self.conn.execute(
+            """
+            SELECT f.id, f.label_name, f.label_mtime_ns, f.label_size
+            FROM frames f JOIN sessions s ON s.id = f.session_id
+            WHERE s.path = ? AND f.has_label = 1
+            """,
+            (str(session_dir),),
+        ).fetchall()
+        for frame_id, label_name, mtime_ns, size in rows:
+            label_path = labels_dir / label_name
+            signature = _file_signature(label_path)
+            if signature == (mtime_ns, size):
+                continue
+            self.conn.execute("DELETE FROM labels WHERE frame_id = ?", (frame_id,))
+            if signature[0] is not None:
+                self._insert_label_rows(frame_id, label_path)
+            self.conn.execute(
+                "UPDATE frames SET label_mtime_ns = ?, label_size = ? WHERE id = ?",
+                (*signature, frame_id),
+            )
+            stats.labels_reread += 1
+
+    def _index_raw_session(self, session_dir: Path, files: list[str], stats: RefreshStats) -> None:
+        videos = [n for n in files if Path(n).suffix.lower() in VIDEO_EXTS]
+        images_dir = session_dir / "images"
+        images_mtime = _mtime_ns(images_dir)
+        video_mtime = _mtime_ns(session_dir / videos[0]) if videos else None
+
+        row = self.conn.execute(
+            "SELECT images_mtime_ns, meta_mtime_ns FROM sessions WHERE path = ?",
+            (str(session_dir),),
+        ).fetchone()
+        if row is not None and tuple(row) == (images_mtime, video_mtime):
+            stats.sessions_unchanged += 1
+            return
+
+        frame_count = 0
+        if images_mtime is not None:
+            frame_count = sum(
+                1 for n in self._list_dir(images_dir, stats)[1] if Path(n).suffix.lower() in IMAGE_EXTS
+            )
+        self._upsert_session(
+            {
+                "path": str(session_dir),
+                "kind": "raw",
+                "name": session_dir.name,
+                "class_name": None,
+                "bucket": None,
+                "images_mtime_ns": images_mtime,
+                "labels_mtime_ns": None,
+                # Raw sessions have no meta.csv; track the video mtime in its slot.
+                "meta_mtime_ns": video_mtime,
+                "video_path": str(session_dir / videos[0]) if videos else None,
+                "frame_count": frame_count,
+                "indexed_at": time.time(),
+            }
+        )
+        stats.sessions_indexed += 1
+
+    def _drop_missing_sessions(self, root: Path, kind: str, keep: set[str], stats: RefreshStats) -> None:
+        prefix = str(root).rstrip(os.sep) + os.sep
+        rows = self.conn.execute(
+            "SELECT id, path FROM sessions WHERE kind = ? AND substr(path, 1, ?) = ?",
+            (kind, len(prefix), prefix),
+        ).fetchall()
+        for session_id, path in rows:
+            if path not in keep:
+                self.conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+                stats.sessions_removed += 1
+
+    def refresh_labels(
+        self,
+        labels_root: str | Path,
+        deep: bool = False,
+        stats: RefreshStats | None = None,
+    ) -> RefreshStats:
+        """Index labeled sessions under labels/<class>/<bucket...>/<session>/."""
+        stats = stats or RefreshStats()
+        root = resolve_repo_path(labels_root).resolve()
+        if not root.is_dir():
+            return stats
+
+        found: set[str] = set()
+        for session_dir in self._find_session_dirs(root, stats):
+            rel_parts = session_dir.relative_to(root).parts
+            if len(rel_parts) < 3:
+                # labels/<class>/<name>_dataset|_yolo are build outputs, not sessions.
+                continue
+            class_name = rel_parts[0]
+            bucket = "/".join(rel_parts[1:-1])
+            self._index_label_session(session_dir, class_name, bucket, stats, deep)
+            found.add(str(session_dir))
+        self._drop_missing_sessions(root, "label", found, stats)
+        self.conn.commit()
+        return stats
+
+    def refresh_raw(self, raw_root: str | Path, stats: RefreshStats | None = None) -> RefreshStats:
+        """Index raw capture sessions (one folder per session with a video or images/)."""
+        stats = stats or RefreshStats()
+        root = resolve_repo_path(raw_root).resolve()
+        if not root.is_dir():
+            return stats
+
+        found: set[str] = set()
+        subdirs, _ = self._list_dir(root, stats)
+        for name in subdirs:
+            session_dir = root / name
+            child_dirs, files = self._list_dir(session_dir, stats)
+            has_video = any(Path(n).suffix.lower() in VIDEO_EXTS for n in files)
+            if not has_video and "images" not in child_dirs:
+                continue
+            self._index_raw_session(session_dir, files, stats)
+            found.add(str(session_dir))
+        self._drop_missing_sessions(root, "raw", found, stats)
+        self.conn.commit()
+        return stats
+
+    def refresh_model_runs(
+        self,
+        models_root: str | Path,
+        source: str,
+        stats: RefreshStats | None = None,
+    ) -> RefreshStats:
+        """
+        Index model run folders under models_root.
+
+        A run is any folder holding best.pt/last.pt directly or in weights/. A direct
+        child of models_root with a weights/ folder is a run even before any weights
+        are saved (e.g. an interrupted training run), with best_path/last_path None.
+        """
+        stats = stats or RefreshStats()
+        root = resolve_repo_path(models_root).resolve()
+        if not root.is_dir():
+            return stats
+
+        found: set[str] = set()
+        stack = [(root, 0)]
+        while stack:
+            directory, depth = stack.pop()
+            subdirs, files = self._list_dir(directory, stats)
+            weights_dir = directory / "weights"
+            weight_files = set(files)
+            base = directory
+            if "weights" in subdirs:
+                weight_files = set(self._list_dir(weights_dir, stats)[1])
+                base = weights_dir
+            best = base / "best.pt" if "best.pt" in weight_files else None
+            last = base / "last.pt" if "last.pt" in weight_files else None
+            has_weights = best is not None or last is not None
+            if directory != root and (has_weights or (depth == 1 and "weights" in subdirs)):
+                weights_mtime = max((_mtime_ns(p) or 0 for p in (best, last) if p is not None), default=0)
+                self.conn.execute(
+                    """
+                    INSERT INTO model_runs(path, name, source, best_path, last_path, weights_mtime_ns,
+                                           run_mtime_ns, indexed_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(path) DO UPDATE SET
+                        name=excluded.name, source=excluded.source, best_path=excluded.best_path,
+                        last_path=excluded.last_path, weights_mtime_ns=excluded.weights_mtime_ns,
+                        run_mtime_ns=excluded.run_mtime_ns, indexed_at=excluded.indexed_at
+                    """,
+                    (
+                        str(directory),
+                        directory.name,
+                        source,
+                        str(best) if best else None,
+                        str(last) if last else None,
+                        weights_mtime,
+                        _mtime_ns(directory) or 0,
+                        time.time(),
+                    ),
+                )
+                found.add(str(directory))
+                stats.model_runs_indexed += 1
+                continue
+            if depth < _MAX_SCAN_DEPTH:
+                for name in subdirs:
+                    if name not in _LEAF_DIR_NAMES:
+                        stack.append((directory / name, depth + 1))
+
+        prefix = str(root).rstrip(os.sep) + os.sep
+        for run_id, path in self.conn.execute(
+            "SELECT id, path FROM model_runs WHERE source = ? AND substr(path, 1, ?) = ?",
+            (source, len(prefix), prefix),
+        ).fetchall():
+            if path not in found:
+                self.conn.execute("DELETE FROM model_runs WHERE id = ?", (run_id,))
+        self.conn.commit()
+        return stats
+
+    # -----------------------
+    # Queries
+    # -----------------------
+    def sessions(
+        self,
+        kind: str | None = None,
+        class_name: str | None = None,
+        bucket: str | None = None,
+        under: str | Path | None = None,
+    ) -> list[SessionRecord]:
+        clauses, params = [], []
+        if kind is not None:
+            clauses.append("kind = ?")
+            params.append(kind)
+        if class_name is not None:
+            clauses.append("class_name = ?")
+            params.append(class_name)
+        if bucket is not None:
+            clauses.append("(bucket = ? OR bucket LIKE ?)")
+            params.extend([bucket, f"{bucket}/%"])
+        if under is not None:
+            prefix = str(resolve_repo_path(under).resolve()).rstrip(os.sep) + os.sep
+            clauses.append("substr(path, 1, ?) = ?")
+            params.extend([len(prefix), prefix])
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.conn.execute(
+            f"SELECT path, kind, name, class_name, bucket, frame_count, video_path FROM sessions {where} ORDER BY path",
+            params,
+        ).fetchall()
+        return [
+            SessionRecord(
+                path=Path(r[0]),
+                kind=r[1],
+                name=r[2],
+                class_name=r[3],
+                bucket=r[4],
+                frame_count=int(r[5]),
+                video_path=Path(r[6]) if r[6] else None,
+            )
+            for r in rows
+        ]
+
+    def frames(
+        self,
+        class_name: str | None = None,
+        bucket: str | None = None,
+        session: str | Path | None = None,
+        bbox_source: str | None = None,
+        min_conf: float | None = None,
+        label_class_id: int | None = None,
+        has_label: bool | None = None,
+    ) -> list[FrameRecord]:
+        """
+        Query labeled frames, e.g. frames(class_name="black_drone", bbox_source="yolo", min_conf=0.6).
+        """
+        clauses, params = ["s.kind = 'label'"], []
+        if class_name is not None:
+            clauses.append("s.class_name = ?")
+            params.append(class_name)
+        if bucket is not None:
+            clauses.append("(s.bucket = ? OR s.bucket LIKE ?)")
+            params.extend([bucket, f"{bucket}/%"])
+        if session is not None:
+            clauses.append("s.path = ?")
+            params.append(str(resolve_repo_path(session).resolve()))
+        if bbox_source is not None:
+            clauses.append("f.bbox_source = ?")
+            params.append(bbox_source)
+        if min_conf is not None:
+            clauses.append("f.yolo_conf >= ?")
+            params.append(float(min_conf))
+        if has_label is not None:
+            clauses.append("f.has_label = ?")
+            params.append(int(has_label))
+        if label_class_id is not None:
+            clauses.append("EXISTS (SELECT 1 FROM labels l WHERE l.frame_id = f.id AND l.class_id = ?)")
+            params.append(int(label_class_id))
+
+        rows = self.conn.execute(
+            f"""
+            SELECT s.path, s.class_name, s.bucket, f.image_name, f.label_name, f.export_index,
+                   f.video_frame_index, f.bbox_source, f.yolo_conf
+            FROM frames f JOIN sessions s ON s.id = f.session_id
+            WHERE {' AND '.join(clauses)}
+            ORDER BY s.path, f.image_name
+            """,
+            params,
+        ).fetchall()
+        return [
+            FrameRecord(
+                session_path=Path(r[0]),
+                class_name=r[1],
+                bucket=r[2],
+                image_path=Path(r[0]) / "images" / r[3],
+                label_path=(Path(r[0]) / "labels" / r[4]) if r[4] else None,
+                export_index=r[5],
+                video_frame_index=r[6],
+                bbox_source=r[7],
+                yolo_conf=r[8],
+            )
+            for r in rows
+        ]
+
+    def session_image_paths(self, session_dir: str | Path) -> list[Path]:
+        session_path = str(resolve_repo_path(session_dir).resolve())
+        rows = self.conn.execute(
+            """
+            SELECT f.image_name FROM frames f JOIN sessions s ON s.id = f.session_id
+            WHERE s.path = ? ORDER BY f.image_name
+            """,
+            (session_path,),
+        ).fetchall()
+        return [Path(session_path) / "images" / r[0] for r in rows]
+
+    def model_runs(self, source: str | None = None, name_contains: str | None = None) -> list[ModelRunRecord]:
+        """Model runs, newest weights first."""
+        clauses, params = [], []
+        if source is not None:
+            clauses.append("source = ?")
+            params.append(source)
+        if name_contains is not None:
+            clauses.append("lower(name) LIKE ?")
+            params.append(f"%{name_contains.lower()}%")
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self.conn.execute(
+            f"SELECT path, name, source, best_path, last_path, weights_mtime_ns, run_mtime_ns FROM model_runs {where} "
+            "ORDER BY weights_mtime_ns DESC",
+            params,
+        ).fetchall()
+        return [
+            ModelRunRecord(
+                path=Path(r[0]),
+                name=r[1],
+                source=r[2],
+                best_path=Path(r[3]) if r[3] else None,
+                last_path=Path(r[4]) if r[4] else None,
+                weights_mtime_ns=int(r[5]),
+                run_mtime_ns=int(r[6]),
+            )
+            for r in rows
+        ]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Refresh and query the session/model catalog.")
+    parser.add_argument("--db", type=str, default="data/labels/.catalog.sqlite", help="Catalog database path.")
+    parser.add_argument("--labels-root", type=str, default="data/labels")
+    parser.add_argument("--raw-root", type=str, default="data/raw_data")
+    parser.add_argument("--runs-root", type=str, default="runs/models")
+    parser.add_argument("--best-models-root", type=str, default="yolo_best_models")
+    parser.add_argument("--deep", action="store_true", help="Re-read every labeled session.")
+    parser.add_argument("--class-name", type=str, default=None, help="Frame query: class folder.")
+    parser.add_argument("--bbox-source", type=str, default=None, help="Frame query: e.g. yolo or tracker.")
+    parser.add_argument("--min-conf", type=float, default=None, help="Frame query: minimum YOLO confidence.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    start = time.perf_counter()
+    with SessionCatalog(args.db) as catalog:
+        stats = catalog.refresh_labels(args.labels_root, deep=args.deep)
+        catalog.refresh_raw(args.raw_root, stats=stats)
+        catalog.refresh_model_runs(args.runs_root, source="runs", stats=stats)
+        catalog.refresh_model_runs(args.best_models_root, source="best_models", stats=stats)
+        elapsed_ms = (time.perf_counter() - start) * 1000.0
+
+        print(f"Catalog: {catalog.db_path}")
+        print(
+            f"- refresh: {elapsed_ms:.0f} ms, dirs listed={stats.dirs_listed}, "
+            f"sessions indexed={stats.sessions_indexed}, unchanged={stats.sessions_unchanged}, "
+            f"removed={stats.sessions_removed}, label files re-read={stats.labels_reread}"
+        )
+        print(f"- raw sessions: {len(catalog.sessions(kind='raw'))}")
+        print(f"- labeled sessions: {len(catalog.sessions(kind='label'))}")
+        print(f"- model runs: {len(catalog.model_runs())}")
+
+        if args.class_name or args.bbox_source or args.min_conf is not None:
+            frames = catalog.frames(
+                class_name=args.class_name,
+                bbox_source=args.bbox_source,
+                min_conf=args.min_conf,
+            )
+            print(f"- matching frames: {len(frames)}")
+            for frame in frames[:20]:
+                conf = "n/a" if frame.yolo_conf is None else f"{frame.yolo_conf:.2f}"
+                print(f"  {frame.image_path} (source={frame.bbox_source}, conf={conf})")
+            if len(frames) > 20:
+                print(f"  ... {len(frames) - 20} more")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable
+
+SNAPSHOT_VERSION = 1
+
+_INDEX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    chunk_size INTEGER NOT NULL,
+    chunks TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS uploaded_chunks (
+    backend TEXT NOT NULL,
+    hash TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    uploaded_at REAL NOT NULL,
+    PRIMARY KEY (backend, hash)
+);
+"""
+
+
+@dataclass
+class BackupStats:
+    files: int = 0
+    files_hashed: int = 0
+    chunks: int = 0
+    chunks_uploaded: int = 0
+    bytes_total: int = 0
+    bytes_uploaded: int = 0
+
+
+def hash_chunk(payload: bytes) -> str:
+    return hashlib.sha256(payload).hexdigest()
+
+
+def iter_file_chunks(path: Path, chunk_size: int):
+    with path.open("rb") as f:
+        while True:
+            block = f.read(chunk_size)
+            if not block:
+                break
+            yield block
+
+
+class LocalDirectoryBackend:
+    """Chunk store in a plain directory: chunks/<aa>/<hash>, snapshots/<name>.json."""
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.key = f"local:{self.root.resolve()}"
+
+    def _chunk_path(self, chunk_hash: str) -> Path:
+        return self.root / "chunks" / chunk_hash[:2] / chunk_hash
+
+    def has_chunk(self, chunk_hash: str) -> bool:
+        return self._chunk_path(chunk_hash).exists()
+
+    def put_chunk(self, chunk_hash: str, payload: bytes) -> None:
+        path = self._chunk_path(chunk_hash)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, path)
+
+    def get_chunk(self, chunk_hash: str) -> bytes:
+        return self._chunk_path(chunk_hash).read_bytes()
+
+    def put_snapshot(self, name: str, payload: bytes) -> None:
+        path = self.root / "snapshots" / f"{name}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_bytes(payload)
+        os.replace(tmp_path, path)
+
+    def get_snapshot(self, name: str) -> bytes:
+        return (self.root / "snapshots" / f"{name}.json").read_bytes()
+
+    def list_snapshots(self) -> list[str]:
+        snapshots_dir = self.root / "snapshots"
+        if not snapshots_dir.exists():
+            return []
+        return sorted(p.stem for p in snapshots_dir.glob("*.json"))
+
+
+class DriveBackend:
+    """
+    Chunk store in a Google Drive folder (chunks/ and snapshots/ subfolders).
+
+    Every chunk goes through a resumable upload; transient errors retry the
+    current request instead of restarting the file.
+    """
+
+    FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+
+    def __init__(
+        self,
+        service,
+        folder_id: str,
+        chunks_folder_name: str = "chunks",
+        snapshots_folder_name: str = "snapshots",
+        supports_all_drives: bool = True,
+        upload_retries: int = 5,
+    ):
+        self.service = service
+        self.folder_id = folder_id
+        self.supports_all_drives = supports_all_drives
+        self.upload_retries = max(1, int(upload_retries))
+        self.key = f"drive:{folder_id}"
+        self.chunks_folder_id = self._ensure_folder(chunks_folder_name, folder_id)
+        self.snapshots_folder_id = self._ensure_folder(snapshots_folder_name, folder_id)
+
+    def _list_kwargs(self) -> dict:
+        if not self.supports_all_drives:
+            return {}
+        return {"supportsAllDrives": True, "includeItemsFromAllDrives": True}
+
+    def _find_file_id(self, name: str, parent_id: str) -> str | None:
+        query = f"name = '{name}' and '{parent_id}' in parents and trashed = false"
+        found = self.service.files().list(q=query, fields="files(id)", pageSize=1, **self._list_kwargs()).execute()
+        files = found.get("files", [])
+        return files[0]["id"] if files else None
+
+    def _ensure_folder(self, name: str, parent_id: str) -> str:
+        existing = self._find_file_id(name, parent_id)
+        if existing is not None:
+            return existing
+        body = {"name": name, "parents": [parent_id], "mimeType": self.FOLDER_MIME_TYPE}
+        created = (
+            self.service.files()
+            .create(body=body, fields="id", supportsAllDrives=self.supports_all_drives)
+            .execute()
+        )
+        return created["id"]
+
+    def _upload_bytes(self, name: str, parent_id: str, payload: bytes, mime_type: str) -> None:
+        from googleapiclient.errors import HttpError
+        from googleapiclient.http import MediaIoBaseUpload
+
+        media = MediaIoBaseUpload(io.BytesIO(payload), mimetype=mime_type, resumable=True)
+        request = self.service.files().create(
+            body={"name": name, "parents": [parent_id]},
+            media_body=media,
+            fields="id",
+            supportsAllDrives=self.supports_all_drives,
+        )
+        response = None
+        failures = 0
+        while response is None:
+            try:
+                _, response = request.next_chunk()
+                failures = 0
+            except (HttpError, OSError) as exc:
+                status = getattr(getattr(exc, "resp", None), "status", None)
+                failures += 1
+                if failures >= self.upload_retries or (status is not None and int(status) < 500):
+                    raise
+                # Resumable session survives; the next call resumes from the last acknowledged byte.
+                time.sleep(min(30.0, 2.0 ** failures))
+
+    def has_chunk(self, chunk_hash: str) -> bool:
+        return self._find_file_id(chunk_hash, self.chunks_folder_id) is not None
+
+    def put_chunk(self, chunk_hash: str, payload: bytes) -> None:
+        self._upload_bytes(chunk_hash, self.chunks_folder_id, payload, "application/octet-stream")
+
+    def get_chunk(self, chunk_hash: str) -> bytes:
+        file_id = self._find_file_id(chunk_hash, self.chunks_folder_id)
+        if file_id is None:
+            raise RuntimeError(f"Chunk not found on Drive: {chunk_hash}")
+        return self.service.files().get_media(fileId=file_id, supportsAllDrives=self.supports_all_drives).execute()
+
+    def put_snapshot(self, name: str, payload: bytes) -> None:
+        self._upload_bytes(f"{name}.json", self.snapshots_folder_id, payload, "application/json")
+
+    def get_snapshot(self, name: str) -> bytes:
+        file_id = self._find_file_id(f"{name}.json", self.snapshots_folder_id)
+        if file_id is None:
+            raise RuntimeError(f"Snapshot not found on Drive: {name}")
+        return self.service.files().get_media(fileId=file_id, supportsAllDrives=self.supports_all_drives).execute()
+
+    def list_snapshots(self) -> list[str]:
+        names: list[str] = []
+        page_token = None
+        query = f"'{self.snapshots_folder_id}' in parents and trashed = false"
+        while True:
+            found = (
+                self.service.files()
+                .list(q=query, fields="nextPageToken, files(name)", pageToken=page_token, **self._list_kwargs())
+                .execute()
+            )
+            names.extend(f["name"][: -len(".json")] for f in found.get("files", []) if f["name"].endswith(".json"))
+            page_token = found.get("nextPageToken")
+            if not page_token:
+                return sorted(names)
+
+
+class ChunkedBackup:
+    """
+    Content-addressed, incremental backup of one or more directory trees.
+
+    Files are split into fixed-size chunks named by their SHA-256. A local
+    SQLite index remembers each file's chunk list (keyed by size + mtime, so
+    unchanged files are never re-read) and which chunks each backend already
+    holds. Each chunk is marked uploaded as soon as it lands, so an interrupted
+    run resumes where it stopped. The snapshot manifest is written last; a
+    snapshot only exists once all of its chunks do.
+    """
+
+    def __init__(self, index_path: Path, backend, chunk_size: int = 8 * 1024 * 1024):
+        self.index_path = Path(index_path)
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        self.backend = backend
+        self.chunk_size = int(chunk_size)
+        self.conn = sqlite3.connect(str(self.index_path))
+        self.conn.executescript(_INDEX_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "ChunkedBackup":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _file_chunks(self, path: Path, stats: BackupStats) -> list[str]:
+        st = path.stat()
+        key = str(path.resolve())
+        row = self.conn.execute(
+            "SELECT size, mtime_ns, chunk_size, chunks FROM files WHERE path = ?",
+            (key,),
+        ).fetchone()
+        if row is not None and row[0] == st.st_size and row[1] == st.st_mtime_ns and row[2] == self.chunk_size:
+            return json.loads(row[3])
+
+        chunks = [hash_chunk(block) for block in iter_file_chunks(path, self.chunk_size)]
+        self.conn.execute(
+            "INSERT OR REPLACE INTO files (path, size, mtime_ns, chunk_size, chunks) VALUES (?, ?, ?, ?, ?)",
+            (key, st.st_size, st.st_mtime_ns, self.chunk_size, json.dumps(chunks)),
+        )
+        stats.files_hashed += 1
+        return chunks
+
+    def _is_uploaded(self, chunk_hash: str) -> bool:
+        row = self.conn.execute(
+            "SELECT 1 FROM uploaded_chunks WHERE backend = ? AND hash = ?",
+            (self.backend.key, chunk_hash),
+        ).fetchone()
+        return row is not None
+
+    def _upload_file_chunks(self, path: Path, chunks: list[str], stats: BackupStats) -> None:
+        missing = [h for h in chunks if not self._is_uploaded(h)]
+        if not missing:
+            return
+        wanted = set(missing)
+        for block in iter_file_chunks(path, self.chunk_size):
+            chunk_hash = hash_chunk(block)
+            if chunk_hash not in wanted:
+                continue
+            wanted.discard(chunk_hash)
+            if not self.backend.has_chunk(chunk_hash):
+                self.backend.put_chunk(chunk_hash, block)
+                stats.chunks_uploaded += 1
+                stats.bytes_uploaded += len(block)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO uploaded_chunks (backend, hash, size, uploaded_at) VALUES (?, ?, ?, ?)",
+                (self.backend.key, chunk_hash, len(block), time.time()),
+            )
+            self.conn.commit()
+        if wanted:
+            raise RuntimeError(f"{path} changed while it was being backed up; rerun the backup.")
+
+    def backup(
+        self,
+        roots: dict[str, Path],
+        snapshot_name: str,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> BackupStats:
+        """Back up each root (name -> directory) and publish a snapshot manifest."""
+        stats = BackupStats()
+        jobs: list[tuple[str, Path, Path]] = []
+        for root_name, root_dir in roots.items():
+            root_dir = Path(root_dir)
+            if not root_dir.is_dir():
+                raise RuntimeError(f"Missing source directory: {root_dir}")
+            for path in sorted(p for p in root_dir.rglob("*") if p.is_file() and not p.is_symlink()):
+                jobs.append((root_name, root_dir, path))
+
+        manifest_files: list[dict] = []
+        for done, (root_name, root_dir, path) in enumerate(jobs, start=1):
+            chunks = self._file_chunks(path, stats)
+            self.conn.commit()
+            self._upload_file_chunks(path, chunks, stats)
+            st = path.stat()
+            manifest_files.append(
+                {
+                    "root": root_name,
+                    "path": path.relative_to(root_dir).as_posix(),
+                    "size": st.st_size,
+                    "mtime_ns": st.st_mtime_ns,
+                    "chunks": chunks,
+                }
+            )
+            stats.files += 1
+            stats.chunks += len(chunks)
+            stats.bytes_total += st.st_size
+            if progress is not None:
+                progress(done, len(jobs))
+
+        manifest = {
+            "version": SNAPSHOT_VERSION,
+            "name": snapshot_name,
+            "created_at": time.time(),
+            "chunk_size": self.chunk_size,
+            "roots": sorted(roots),
+            "files": manifest_files,
+        }
+        self.backend.put_snapshot(snapshot_name, json.dumps(manifest, indent=1).encode("utf-8"))
+        return stats
+
+
+def restore_snapshot(backend, snapshot_name: str, output_dir: Path) -> int:
+    """Rebuild a snapshot under output_dir/<root>/...; returns the number of files written."""
+    manifest = json.loads(backend.get_snapshot(snapshot_name))
+    if manifest.get("version") != SNAPSHOT_VERSION:
+        raise RuntimeError(f"Unsupported snapshot version in {snapshot_name}: {manifest.get('version')}")
+    output_dir = Path(output_dir)
+    for entry in manifest["files"]:
+        dst = output_dir / entry["root"] / entry["path"]
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        with dst.open("wb") as f:
+            for chunk_hash in entry["chunks"]:
+                payload = backend.get_chunk(chunk_hash)
+                if hash_chunk(payload) != chunk_hash:
+                    raise RuntimeError(f"Corrupt chunk {chunk_hash} in {entry['root']}/{entry['path']}")
+                f.write(payload)
+        os.utime(dst, ns=(entry["mtime_ns"], entry["mtime_ns"]))
+    return len(manifest["files"])
+
+
+def format_backup_stats(stats: BackupStats) -> str:
+    return (
+        f"files={stats.files} (rehashed {stats.files_hashed}), chunks={stats.chunks}, "
+        f"uploaded {stats.chunks_uploaded} chunk(s) / {stats.bytes_uploaded / 1e6:.1f} MB "
+        f"of {stats.bytes_total / 1e6:.1f} MB"
+    )
@@ -24,10 +24,37 @@ OUT_DIR = "data/labels"
 LABEL_CLASS_NAME = "brushless_drone"
 CLASS_ID = 1
 
+# SQLite catalog of sessions/frames/labels/model runs, stored at <OUT_DIR>/<CATALOG_FILE_NAME>.
+# Dataset tools query it instead of walking the tree; it refreshes incrementally from mtimes.
+CATALOG_ENABLED = True
+CATALOG_FILE_NAME = ".catalog.sqlite"
+
 # Source folder under labels/<class_name>/.
 # Examples: "all_data", "all_data/train_val", "all_data/test"
 LABEL_ALL_DATA_DIR = "all_data/train_val"
 
+# create_dataset.py: how session images/labels are placed into <class>_dataset/.
+# "auto" tries reflink -> hardlink -> copy; see YOLO_LINK_MODE for the full list.
+DATASET_LINK_MODE = "auto"
+# With --overwrite, update a previously built dataset in place instead of recreating it.
+DATASET_INCREMENTAL_OUTPUT = True
+DATASET_MATERIALIZE_MANIFEST_NAME = ".materialize_manifest.json"
+# Default --workers for create_dataset.py (parallel link/copy threads).
+DATASET_MATERIALIZE_WORKERS = 8
+
+# Near-duplicate frame filtering in create_dataset.py (--dedup overrides DEDUP_MODE).
+# - "off": keep every frame
+# - "drop": keep only frames that differ from the last kept frame of the session
+# - "thin": like drop, but keep one of every DEDUP_THIN_KEEP_EVERY near-duplicates
+DEDUP_MODE = "off"
+# dHash (64-bit) distance at or below which frames are near-duplicates.
+DEDUP_MAX_HAMMING = 4
+# Bbox center/size quantization cells per axis; a box moving to another cell is never a duplicate.
+DEDUP_BBOX_GRID = 16
+DEDUP_THIN_KEEP_EVERY = 5
+# Per-session hash cache file, written next to images/ and labels/.
+DEDUP_CACHE_NAME = "frame_hashes.csv"
+
 # Export target FPS for sampled frames from the source video.
 EXPORT_FPS = 30.0
 
@@ -48,6 +75,16 @@ LABEL_YOLO_CONF_THRESHOLD = 0.25
 # Value is normalized by frame diagonal length.
 LABEL_YOLO_MAX_CENTER_JUMP_RATIO = 0.30
 
+# Headless auto-label mode (track_label_video.py --auto, or data/auto_label_video.py):
+# YOLO runs in batches on a decoded-frame queue; the tracker only bridges frames YOLO misses.
+LABEL_AUTO_BATCH_SIZE = 16
+LABEL_AUTO_DECODE_QUEUE_SIZE = 64
+LABEL_AUTO_WRITER_THREADS = 2
+# Exported frames queued for writing at most; labeling waits for the writers beyond this.
+LABEL_AUTO_MAX_PENDING_WRITES = 32
+# Exported YOLO labels below this confidence are listed in review_segments.csv with tracker/none frames.
+LABEL_AUTO_REVIEW_MIN_CONF = 0.50
+
 
 
 
@@ -71,6 +108,14 @@ BACKUP_DATE_FORMAT = "%d%m%Y"
 BACKUP_RAW_SUFFIX = "raw_data"
 BACKUP_LABELS_SUFFIX = "labels"
 BACKUP_ARCHIVE_FORMAT = "zip"
+# Zip archives are streamed to Drive while they are compressed (no temp file).
+# Stream block = resumable upload chunk; must be a whole number of MB (Drive wants 256 KiB multiples).
+BACKUP_STREAM_CHUNK_MB = 8
+BACKUP_STREAM_QUEUE_CHUNKS = 4
+BACKUP_STREAM_REPORT_INTERVAL_S = 10.0
+BACKUP_ZIP_COMPRESSLEVEL = 6
+# Already-compressed members are stored as-is instead of deflated again.
+BACKUP_ZIP_STORED_EXTENSIONS = (".jpg", ".jpeg", ".png", ".avi", ".mp4", ".mkv", ".npz", ".zip")
 
 # Environment configuration for private Drive target.
 ENV_FILE_PATH = ".env"
@@ -88,8 +133,18 @@ GDRIVE_FOLDER_ID_PATH_REGEX = r"/folders/([A-Za-z0-9_-]+)"
 GDRIVE_FOLDER_ID_RAW_REGEX = r"[A-Za-z0-9_-]{10,}"
 GDRIVE_FOLDER_QUERY_KEYS = ("id", "folder")
 
-# Temporary directory prefix when building transient archives.
-BACKUP_TEMP_DIR_PREFIX = "dataset_backup_"
+# Backup mode: "zip" uploads two full archives, "chunked" uploads only new content-addressed chunks
+# (files split into BACKUP_CHUNK_SIZE_MB pieces) plus one snapshot manifest per run.
+BACKUP_MODE = "zip"
+# "drive" or "local"; the local backend writes the same chunk store into BACKUP_LOCAL_DIR.
+BACKUP_BACKEND = "drive"
+BACKUP_LOCAL_DIR = "data/backup_store"
+BACKUP_CHUNK_SIZE_MB = 8
+# Local index of file chunk lists and chunks already uploaded per backend (enables resume).
+BACKUP_INDEX_PATH = "data/.backup_index.sqlite"
+GDRIVE_CHUNKS_FOLDER_NAME = "chunks"
+GDRIVE_SNAPSHOTS_FOLDER_NAME = "snapshots"
+GDRIVE_UPLOAD_RETRIES = 5
 
 
 
@@ -133,5 +188,21 @@ YOLO_FALLBACK_TO_FRAME_SPLIT_IF_FEW_SESSIONS = True
 YOLO_SINGLE_CLASS_MODE = True
 YOLO_TARGET_CLASS_ID = 0
 
+# How output images are materialized from the source dataset:
+# - "auto": reflink (CoW clone) -> hardlink -> copy, first one the filesystem supports
+# - "reflink" / "hardlink" / "symlink" / "copy": force one mode
+# Hardlinks/symlinks share bytes with the source, so edit images in the source dataset only.
+YOLO_LINK_MODE = "auto"
+# Reuse an existing output and only touch samples whose split/source/label changed.
+# Set False to always wipe and rebuild the output from scratch.
+YOLO_INCREMENTAL_OUTPUT = True
+# File (inside the output dataset) that records what was materialized and from where.
+YOLO_MATERIALIZE_MANIFEST_NAME = ".materialize_manifest.json"
+# Parallel copy/link/label-rewrite threads. I/O bound, so more threads than cores helps
+# on network storage; 1 runs everything sequentially.
+YOLO_MATERIALIZE_WORKERS = 8
+# Print materialization progress every N percent.
+YOLO_PROGRESS_STEP_PCT = 10
+
 
 #######################################################################################################
@@ -3,7 +3,31 @@ import csv
 import shutil
 from pathlib import Path
 
-from constants import LABEL_ALL_DATA_DIR, LABEL_CLASS_NAME, OUT_DIR
+from catalog import SessionCatalog
+from constants import (
+    CATALOG_ENABLED,
+    CATALOG_FILE_NAME,
+    DATASET_INCREMENTAL_OUTPUT,
+    DATASET_LINK_MODE,
+    DATASET_MATERIALIZE_MANIFEST_NAME,
+    DATASET_MATERIALIZE_WORKERS,
+    DEDUP_BBOX_GRID,
+    DEDUP_CACHE_NAME,
+    DEDUP_MAX_HAMMING,
+    DEDUP_MODE,
+    DEDUP_THIN_KEEP_EVERY,
+    LABEL_ALL_DATA_DIR,
+    LABEL_CLASS_NAME,
+    OUT_DIR,
+)
+from dedup import DEDUP_MODES, DedupConfig, SessionDedupResult, dedup_session, format_dedup_report
+from materialize import (
+    LINK_MODES,
+    DatasetMaterializer,
+    MaterializeEntry,
+    format_materialize_stats,
+    make_progress_printer,
+)
 from utils import sanitize_class_folder_name
 
 
@@ -53,7 +77,41 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--overwrite",
         action="store_true",
-        help="Replace dataset folder if it already exists.",
+        help=(
+            "Update the dataset folder if it already exists. Previously materialized datasets "
+            "are updated incrementally; anything else is recreated."
+        ),
+    )
+    parser.add_argument(
+        "--full-rebuild",
+        action="store_true",
+        help="With --overwrite, wipe the dataset folder instead of updating it incrementally.",
+    )
+    parser.add_argument(
+        "--link-mode",
+        type=str,
+        choices=LINK_MODES,
+        default=DATASET_LINK_MODE,
+        help="How images/labels are placed in the dataset (default from constants.py).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DATASET_MATERIALIZE_WORKERS,
+        help="Parallel link/copy threads (1 = sequential).",
+    )
+    parser.add_argument(
+        "--dedup",
+        type=str,
+        choices=DEDUP_MODES,
+        default=DEDUP_MODE,
+        help="Near-duplicate frame filtering per session (default from constants.py).",
+    )
+    parser.add_argument(
+        "--dedup-max-hamming",
+        type=int,
+        default=DEDUP_MAX_HAMMING,
+        help="Perceptual-hash bit distance treated as a near-duplicate.",
     )
     return parser.parse_args()
 
@@ -62,7 +120,16 @@ def is_session_dir(session_dir: Path) -> bool:
     return (session_dir / "images").is_dir() and (session_dir / "labels").is_dir()
 
 
-def discover_all_sessions(all_data_dir: Path) -> list[Path]:
+def discover_all_sessions(all_data_dir: Path, catalog: SessionCatalog | None = None) -> list[Path]:
+    if catalog is not None:
+        root = all_data_dir.resolve()
+        sessions = [
+            record.path
+            for record in catalog.sessions(kind="label", under=root)
+            if record.path.parent == root and is_session_dir(record.path)
+        ]
+        return sorted(sessions, key=lambda d: d.name)
+
     sessions = [
         d
         for d in all_data_dir.iterdir()
@@ -97,23 +164,29 @@ def resolve_selected_sessions(all_data_dir: Path, requested: list[str]) -> list[
     return selected
 
 
-def prepare_output_dirs(dataset_dir: Path, overwrite: bool) -> tuple[Path, Path]:
+def prepare_output_dirs(dataset_dir: Path, overwrite: bool, keep_existing: bool = False) -> tuple[Path, Path]:
     if dataset_dir.exists():
         if not overwrite:
             raise RuntimeError(
                 f"Dataset directory already exists: {dataset_dir}. "
                 "Use --overwrite to recreate it."
             )
-        shutil.rmtree(dataset_dir)
+        if not keep_existing:
+            shutil.rmtree(dataset_dir)
 
     images_out = dataset_dir / "images"
     labels_out = dataset_dir / "labels"
-    images_out.mkdir(parents=True, exist_ok=False)
-    labels_out.mkdir(parents=True, exist_ok=False)
+    images_out.mkdir(parents=True, exist_ok=True)
+    labels_out.mkdir(parents=True, exist_ok=True)
     return images_out, labels_out
 
 
-def collect_image_paths(images_dir: Path) -> list[Path]:
+def collect_image_paths(images_dir: Path, catalog: SessionCatalog | None = None) -> list[Path]:
+    if catalog is not None:
+        indexed = [p for p in catalog.session_image_paths(images_dir.parent) if p.suffix == ".jpg"]
+        if indexed:
+            return indexed
+    # Sessions outside the catalog (e.g. --sessions with a full path) are listed directly.
     return sorted(images_dir.glob("*.jpg"))
 
 
@@ -122,15 +195,24 @@ def combine_sessions(
     images_out: Path,
     labels_out: Path,
     manifest_path: Path,
+    materializer: DatasetMaterializer | None = None,
+    workers: int = 1,
+    catalog: SessionCatalog | None = None,
+    dedup_config: DedupConfig | None = None,
 ) -> tuple[int, int]:
     """
-    Copy all session image/label pairs into contiguous dataset filenames.
+    Materialize all session image/label pairs into contiguous dataset filenames.
 
     Returns:
         total_copied, missing_label_count
     """
     total_copied = 0
     missing_label_count = 0
+    entries: list[MaterializeEntry] = []
+    dataset_dir = manifest_path.parent
+    if materializer is None:
+        materializer = DatasetMaterializer(dataset_dir, link_mode="copy")
+    dedup_results: dict[str, SessionDedupResult] = {}
 
     with open(manifest_path, "w", newline="") as mf:
         writer = csv.writer(mf)
@@ -152,18 +234,34 @@ def combine_sessions(
                 print(f"Warning: skipping malformed session {session_dir}")
                 continue
 
-            for image_path in collect_image_paths(images_dir):
+            image_paths = collect_image_paths(images_dir, catalog=catalog)
+            if dedup_config is not None and dedup_config.mode != "off":
+                dedup_result = dedup_session(session_dir, image_paths, dedup_config)
+                dedup_results[session_dir.name] = dedup_result
+                image_paths = dedup_result.kept
+
+            for image_path in image_paths:
                 source_label = labels_dir / f"{image_path.stem}.txt"
 
                 out_stem = f"frame_{total_copied:06d}"
                 out_image = images_out / f"{out_stem}.jpg"
                 out_label = labels_out / f"{out_stem}.txt"
 
-                shutil.copy2(image_path, out_image)
+                entries.append(
+                    MaterializeEntry(dst_rel=str(out_image.relative_to(dataset_dir)), src=image_path)
+                )
                 if source_label.exists():
-                    shutil.copy2(source_label, out_label)
+                    entries.append(
+                        MaterializeEntry(dst_rel=str(out_label.relative_to(dataset_dir)), src=source_label)
+                    )
                 else:
-                    out_label.write_text("")
+                    entries.append(
+                        MaterializeEntry(
+                            dst_rel=str(out_label.relative_to(dataset_dir)),
+                            transform=lambda _raw: b"",
+                            transform_key="empty",
+                        )
+                    )
                     missing_label_count += 1
 
                 writer.writerow(
@@ -178,6 +276,12 @@ def combine_sessions(
                 )
                 total_copied += 1
 
+    if dedup_results:
+        for line in format_dedup_report(dedup_results):
+            print(line)
+
+    stats = materializer.sync(entries, workers=workers, progress=make_progress_printer("materialize"))
+    print(f"Materialized files: {format_materialize_stats(stats)}")
     return total_copied, missing_label_count
 
 
@@ -195,10 +299,19 @@ def main():
     if not all_data_dir.exists():
         raise RuntimeError(f"Missing source directory: {all_data_dir}")
 
+    catalog = None
+    if CATALOG_ENABLED:
+        catalog = SessionCatalog(labels_root.resolve() / CATALOG_FILE_NAME)
+        refresh = catalog.refresh_labels(labels_root.resolve())
+        print(
+            f"Catalog refreshed: {refresh.sessions_indexed} session(s) indexed, "
+            f"{refresh.sessions_unchanged} unchanged"
+        )
+
     if args.sessions:
         sessions = resolve_selected_sessions(all_data_dir, args.sessions)
     else:
-        sessions = discover_all_sessions(all_data_dir)
+        sessions = discover_all_sessions(all_data_dir, catalog=catalog)
 
     if not sessions:
         raise RuntimeError(
@@ -208,7 +321,17 @@ def main():
 
     dataset_name = args.output_name.strip() if args.output_name.strip() else f"{class_name}_dataset"
     dataset_dir = class_dir / dataset_name
-    images_out, labels_out = prepare_output_dirs(dataset_dir, overwrite=args.overwrite)
+    materializer = DatasetMaterializer(
+        dataset_dir,
+        link_mode=args.link_mode,
+        manifest_name=DATASET_MATERIALIZE_MANIFEST_NAME,
+    )
+    incremental = DATASET_INCREMENTAL_OUTPUT and not args.full_rebuild and materializer.has_manifest()
+    images_out, labels_out = prepare_output_dirs(
+        dataset_dir,
+        overwrite=args.overwrite,
+        keep_existing=incremental,
+    )
     manifest_path = dataset_dir / "manifest.csv"
 
     print(f"Class: {class_name}")
@@ -217,13 +340,27 @@ def main():
     for s in sessions:
         print(f"- {s}")
     print(f"Output dataset: {dataset_dir}")
+    print(f"Build mode: {'incremental' if incremental else 'full'} (link mode: {args.link_mode})")
+    print(f"Dedup: {args.dedup}")
 
     total_copied, missing_label_count = combine_sessions(
         sessions=sessions,
         images_out=images_out,
         labels_out=labels_out,
         manifest_path=manifest_path,
+        materializer=materializer,
+        workers=args.workers,
+        catalog=catalog,
+        dedup_config=DedupConfig(
+            mode=args.dedup,
+            max_hamming=args.dedup_max_hamming,
+            bbox_grid=DEDUP_BBOX_GRID,
+            thin_keep_every=DEDUP_THIN_KEEP_EVERY,
+            cache_name=DEDUP_CACHE_NAME,
+        ),
     )
+    if catalog is not None:
+        catalog.close()
 
     print("Done")
     print(f"Total samples copied: {total_copied}")
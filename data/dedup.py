@@ -0,0 +1,190 @@
+import csv
+from dataclasses import dataclass
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+DEDUP_MODES = ("off", "drop", "thin")
+HASH_CACHE_COLUMNS = ["image_name", "size", "mtime_ns", "dhash"]
+
+
+@dataclass(frozen=True)
+class DedupConfig:
+    """
+    - mode: "off", "drop" (keep only distinct frames) or "thin" (keep every Nth near-duplicate)
+    - max_hamming: dHash bit distance at or below which two frames count as near-duplicates
+    - bbox_grid: bbox center/size quantization cells per axis; a cell change is never a duplicate
+    - thin_keep_every: in "thin" mode, keep one of every N consecutive near-duplicates
+    """
+
+    mode: str = "drop"
+    max_hamming: int = 4
+    bbox_grid: int = 16
+    thin_keep_every: int = 5
+    cache_name: str = "frame_hashes.csv"
+
+
+@dataclass
+class SessionDedupResult:
+    kept: list[Path]
+    dropped: list[Path]
+    hashes_computed: int = 0
+
+    @property
+    def total(self) -> int:
+        return len(self.kept) + len(self.dropped)
+
+
+def compute_dhash(gray: np.ndarray, hash_size: int = 8) -> int:
+    """64-bit difference hash of a grayscale image (hash_size x hash_size bits)."""
+    small = cv2.resize(gray, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+
+def hash_image_file(image_path: Path) -> int | None:
+    # Reduced decode: the JPEG decoder skips most of the work at 1/8 scale.
+    gray = cv2.imread(str(image_path), cv2.IMREAD_REDUCED_GRAYSCALE_8)
+    if gray is None:
+        gray = cv2.imread(str(image_path), cv2.IMREAD_GRAYSCALE)
+    if gray is None:
+        return None
+    return compute_dhash(gray)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+def bbox_signature(label_path: Path, grid: int) -> tuple[int, ...] | None:
+    """Quantized (cx, cy, w, h) of every box in a YOLO label file; None when unlabeled."""
+    if not label_path.exists():
+        return None
+    cells: list[int] = []
+    for line in label_path.read_text().splitlines():
+        parts = line.split()
+        if len(parts) < 5:
+            continue
+        try:
+            coords = [float(v) for v in parts[1:5]]
+        except ValueError:
+            continue
+        cells.extend(min(grid - 1, max(0, int(v * grid))) for v in coords)
+    return tuple(cells) if cells else None
+
+
+def load_hash_cache(cache_path: Path) -> dict[str, tuple[int, int, int]]:
+    cache: dict[str, tuple[int, int, int]] = {}
+    if not cache_path.exists():
+        return cache
+    with cache_path.open("r", newline="") as f:
+        for row in csv.DictReader(f):
+            try:
+                cache[row["image_name"]] = (int(row["size"]), int(row["mtime_ns"]), int(row["dhash"], 16))
+            except (KeyError, ValueError):
+                continue
+    return cache
+
+
+def save_hash_cache(cache_path: Path, cache: dict[str, tuple[int, int, int]]) -> None:
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    with tmp_path.open("w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(HASH_CACHE_COLUMNS)
+        for image_name in sorted(cache):
+            size, mtime_ns, dhash = cache[image_name]
+            writer.writerow([image_name, size, mtime_ns, f"{dhash:016x}"])
+    tmp_path.replace(cache_path)
+
+
+def session_hashes(session_dir: Path, image_paths: list[Path], cache_name: str) -> tuple[dict[str, int], int]:
+    """Return image_name -> dHash for the session, reusing <session>/<cache_name> when fresh."""
+    cache_path = session_dir / cache_name
+    cache = load_hash_cache(cache_path)
+    hashes: dict[str, int] = {}
+    computed = 0
+    for image_path in image_paths:
+        st = image_path.stat()
+        cached = cache.get(image_path.name)
+        if cached is not None and cached[0] == st.st_size and cached[1] == st.st_mtime_ns:
+            hashes[image_path.name] = cached[2]
+            continue
+        dhash = hash_image_file(image_path)
+        if dhash is None:
+            continue
+        cache[image_path.name] = (st.st_size, st.st_mtime_ns, dhash)
+        hashes[image_path.name] = dhash
+        computed += 1
+
+    live_names = {p.name for p in image_paths}
+    stale = [name for name in cache if name not in live_names]
+    for name in stale:
+        del cache[name]
+    if computed or stale or not cache_path.exists():
+        save_hash_cache(cache_path, cache)
+    return hashes, computed
+
+
+def dedup_session(session_dir: Path, image_paths: list[Path], config: DedupConfig) -> SessionDedupResult:
+    """
+    Walk a session's frames in order and drop (or thin) frames that look like the
+    last kept frame: dHash within max_hamming and the same quantized bbox layout.
+    """
+    if config.mode == "off" or not image_paths:
+        return SessionDedupResult(kept=list(image_paths), dropped=[])
+    if config.mode not in DEDUP_MODES:
+        raise RuntimeError(f"Invalid dedup mode: {config.mode}. Use one of: {', '.join(DEDUP_MODES)}")
+
+    hashes, computed = session_hashes(session_dir, image_paths, config.cache_name)
+    labels_dir = session_dir / "labels"
+
+    kept: list[Path] = []
+    dropped: list[Path] = []
+    ref_hash: int | None = None
+    ref_sig: tuple[int, ...] | None = None
+    duplicate_run = 0
+
+    for image_path in image_paths:
+        dhash = hashes.get(image_path.name)
+        sig = bbox_signature(labels_dir / f"{image_path.stem}.txt", config.bbox_grid)
+        is_duplicate = (
+            dhash is not None
+            and ref_hash is not None
+            and sig == ref_sig
+            and hamming_distance(dhash, ref_hash) <= config.max_hamming
+        )
+
+        if is_duplicate:
+            duplicate_run += 1
+            if config.mode == "thin" and duplicate_run % max(1, config.thin_keep_every) == 0:
+                kept.append(image_path)
+            else:
+                dropped.append(image_path)
+            continue
+
+        kept.append(image_path)
+        ref_hash = dhash
+        ref_sig = sig
+        duplicate_run = 0
+
+    return SessionDedupResult(kept=kept, dropped=dropped, hashes_computed=computed)
+
+
+def format_dedup_report(results: dict[str, SessionDedupResult]) -> list[str]:
+    lines: list[str] = []
+    total = sum(r.total for r in results.values())
+    dropped = sum(len(r.dropped) for r in results.values())
+    dropped_bytes = sum(p.stat().st_size for r in results.values() for p in r.dropped if p.exists())
+    for session_name, result in results.items():
+        pct = 100.0 * len(result.dropped) / result.total if result.total else 0.0
+        lines.append(
+            f"- {session_name}: kept {len(result.kept)}/{result.total} "
+            f"(dropped {len(result.dropped)}, {pct:.1f}%, hashed {result.hashes_computed} new)"
+        )
+    pct = 100.0 * dropped / total if total else 0.0
+    lines.append(
+        f"Dedup total: {total} -> {total - dropped} frames "
+        f"(-{dropped}, {pct:.1f}% smaller, {dropped_bytes / 1e6:.1f} MB of images skipped)"
+    )
+    return lines
@@ -0,0 +1,346 @@
+import errno
+import hashlib
+import json
+import os
+import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable
+
+
+MANIFEST_VERSION = 1
+LINK_MODES = ("auto", "reflink", "hardlink", "symlink", "copy")
+# Order tried by "auto": cheapest first, full copy only when nothing else works.
+AUTO_LINK_ORDER = ("reflink", "hardlink", "copy")
+
+# Linux FICLONE ioctl (_IOW(0x94, 9, int)); works on btrfs/xfs/bcachefs.
+_FICLONE = 0x40049409
+_HASH_BLOCK_BYTES = 1024 * 1024
+# Errors meaning "this filesystem/mode cannot do it at all": auto mode stops trying the mode.
+# Anything else (ENOENT, EACCES, EEXIST races, ...) only affects the one file.
+_MODE_UNSUPPORTED_ERRNOS = frozenset({errno.EXDEV, errno.EPERM, errno.ENOTSUP, errno.EOPNOTSUPP, errno.EMLINK})
+
+
+@dataclass(frozen=True)
+class MaterializeEntry:
+    """
+    One file in the materialized output tree.
+
+    - src: source file to link/copy (or to read when transform is set)
+    - transform: optional bytes->bytes rewrite; the result is written, never linked
+    - transform_key: identifies the transform so a config change forces a rewrite
+    """
+
+    dst_rel: str
+    src: Path | None = None
+    transform: Callable[[bytes], bytes] | None = None
+    transform_key: str = ""
+
+
+@dataclass
+class MaterializeStats:
+    linked: int = 0
+    copied: int = 0
+    written: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    missing_sources: int = 0
+    by_mode: dict[str, int] = field(default_factory=dict)
+
+    @property
+    def touched(self) -> int:
+        return self.linked + self.copied + self.written + self.removed
+
+
+def hash_bytes(payload: bytes) -> str:
+    return hashlib.sha1(payload).hexdigest()
+
+
+def hash_file(path: Path) -> str:
+    digest = hashlib.sha1()
+    with path.open("rb") as f:
+        while True:
+            block = f.read(_HASH_BLOCK_BYTES)
+            if not block:
+                break
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _stat_signature(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return int(st.st_size), int(st.st_mtime_ns)
+
+
+def reflink_file(src: Path, dst: Path) -> None:
+    if not sys.platform.startswith("linux"):
+        raise OSError(errno.EOPNOTSUPP, "reflink is only implemented for Linux")
+    import fcntl
+
+    with src.open("rb") as fsrc, dst.open("wb") as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+        except OSError as exc:
+            fdst.close()
+            dst.unlink(missing_ok=True)
+            if exc.errno in (errno.ENOTTY, errno.EINVAL):
+                # Filesystems without FICLONE report it as an unknown/invalid ioctl.
+                raise OSError(errno.EOPNOTSUPP, f"reflink not supported: {exc.strerror}") from exc
+            raise
+    shutil.copystat(src, dst)
+
+
+def _place_file(src: Path, dst: Path, mode: str) -> None:
+    if mode == "reflink":
+        reflink_file(src, dst)
+    elif mode == "hardlink":
+        os.link(src, dst)
+    elif mode == "symlink":
+        os.symlink(src.resolve(), dst)
+    elif mode == "copy":
+        shutil.copy2(src, dst)
+    else:
+        raise RuntimeError(f"Unsupported link mode: {mode}. Use one of: {', '.join(LINK_MODES)}")
+
+
+def _remove_path(path: Path) -> None:
+    if path.is_symlink() or path.exists():
+        path.unlink()
+
+
+class DatasetMaterializer:
+    """
+    Incrementally materialize a dataset tree from source files.
+
+    The output root keeps a JSON manifest describing every file it owns
+    (source path, source stat, content hash, link mode). Image hashes are
+    filled in lazily the first time a source is seen to change. A rebuild only
+    touches entries whose destination, source or transform changed, and
+    removes files that dropped out of the dataset. Unchanged files are
+    detected from the source stat alone, so the steady-state cost is one
+    stat() per sample.
+    """
+
+    def __init__(
+        self,
+        output_root: Path,
+        link_mode: str = "auto",
+        manifest_name: str = ".materialize_manifest.json",
+    ):
+        mode = link_mode.strip().lower()
+        if mode not in LINK_MODES:
+            raise RuntimeError(f"Invalid link mode: {link_mode}. Use one of: {', '.join(LINK_MODES)}")
+        self.output_root = Path(output_root)
+        self.link_mode = mode
+        self.manifest_path = self.output_root / manifest_name
+        self._unsupported_modes: set[str] = set()
+
+    def has_manifest(self) -> bool:
+        return self.manifest_path.exists()
+
+    def load_manifest(self) -> dict[str, dict]:
+        if not self.manifest_path.exists():
+            return {}
+        try:
+            payload = json.loads(self.manifest_path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return {}
+        if payload.get("version") != MANIFEST_VERSION:
+            return {}
+        entries = payload.get("entries", {})
+        return entries if isinstance(entries, dict) else {}
+
+    def save_manifest(self, entries: dict[str, dict]) -> None:
+        self.output_root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_name(self.manifest_path.name + ".tmp")
+        tmp_path.write_text(
+            json.dumps(
+                {"version": MANIFEST_VERSION, "link_mode": self.link_mode, "entries": entries},
+                indent=1,
+                sort_keys=True,
+            )
+        )
+        os.replace(tmp_path, self.manifest_path)
+
+    def _link_with_fallback(self, src: Path, dst: Path) -> str:
+        candidates = AUTO_LINK_ORDER if self.link_mode == "auto" else (self.link_mode,)
+        last_error: OSError | None = None
+        for mode in candidates:
+            if mode in self._unsupported_modes:
+                continue
+            try:
+                _place_file(src, dst, mode)
+                return mode
+            except OSError as exc:
+                last_error = exc
+                _remove_path(dst)
+                if self.link_mode != "auto":
+                    raise
+                if exc.errno in _MODE_UNSUPPORTED_ERRNOS:
+                    # Filesystem does not support this mode (or crosses devices); stop retrying it.
+                    self._unsupported_modes.add(mode)
+                # Otherwise a per-file problem: fall back for this file only.
+                continue
+        raise RuntimeError(f"Could not materialize {src} -> {dst}: {last_error}")
+
+    def _sync_entry(self, entry: MaterializeEntry, previous: dict | None) -> tuple[dict | None, str, str]:
+        """Bring one destination file up to date; returns (manifest record, outcome, mode)."""
+        dst = self.output_root / entry.dst_rel
+        src = Path(entry.src) if entry.src is not None else None
+        src_sig = _stat_signature(src) if src is not None else None
+
+        if src is not None and src_sig is None and entry.transform is None:
+            return None, "missing", ""
+
+        src_key = str(src.resolve()) if src is not None else ""
+        dst_present = dst.is_symlink() or dst.exists()
+
+        if (
+            previous is not None
+            and dst_present
+            and previous.get("src") == src_key
+            and previous.get("transform_key", "") == entry.transform_key
+            and src_sig is not None
+            and previous.get("size") == src_sig[0]
+            and previous.get("mtime_ns") == src_sig[1]
+        ):
+            return previous, "unchanged", previous.get("mode", "")
+
+        dst.parent.mkdir(parents=True, exist_ok=True)
+
+        if entry.transform is not None:
+            raw = src.read_bytes() if src_sig is not None else b""
+            payload = entry.transform(raw)
+            content_hash = hash_bytes(payload)
+            mode = "write"
+            if dst_present and previous is not None and previous.get("sha1") == content_hash and not dst.is_symlink():
+                outcome = "unchanged"
+            else:
+                _remove_path(dst)
+                dst.write_bytes(payload)
+                outcome = "written"
+        else:
+            # Hash only when there is a previous record to compare against, so a first
+            # build of a large dataset does not read every image.
+            same_source = dst_present and previous is not None and previous.get("src") == src_key
+            content_hash = hash_file(src) if same_source else None
+            if same_source and content_hash == previous.get("sha1"):
+                # Source was touched but its bytes did not change.
+                outcome = "unchanged"
+                mode = previous.get("mode", self.link_mode)
+            else:
+                _remove_path(dst)
+                mode = self._link_with_fallback(src, dst)
+                outcome = "copied" if mode == "copy" else "linked"
+
+        record = {
+            "src": src_key,
+            "size": src_sig[0] if src_sig is not None else None,
+            "mtime_ns": src_sig[1] if src_sig is not None else None,
+            "sha1": content_hash,
+            "mode": mode,
+            "transform_key": entry.transform_key,
+        }
+        return record, outcome, mode
+
+    @staticmethod
+    def _count_outcome(stats: MaterializeStats, outcome: str, mode: str) -> None:
+        if outcome == "missing":
+            stats.missing_sources += 1
+        elif outcome == "unchanged":
+            stats.unchanged += 1
+        elif outcome == "written":
+            stats.written += 1
+        else:
+            if outcome == "copied":
+                stats.copied += 1
+            else:
+                stats.linked += 1
+            stats.by_mode[mode] = stats.by_mode.get(mode, 0) + 1
+
+    def sync(
+        self,
+        entries: list[MaterializeEntry],
+        workers: int = 1,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> MaterializeStats:
+        """
+        Materialize entries, optionally on a thread pool.
+
+        Each entry owns a distinct destination file, so entries are independent and
+        the result does not depend on the worker count. progress(done, total) is
+        called from the calling thread.
+        """
+        previous_entries = self.load_manifest()
+        stats = MaterializeStats()
+        next_entries: dict[str, dict] = {}
+
+        seen: set[str] = set()
+        for entry in entries:
+            if entry.dst_rel in seen:
+                raise RuntimeError(f"Duplicate materialized path: {entry.dst_rel}")
+            seen.add(entry.dst_rel)
+
+        total = len(entries)
+        if workers <= 1 or total <= 1:
+            results = (self._sync_entry(entry, previous_entries.get(entry.dst_rel)) for entry in entries)
+            for done, (entry, (record, outcome, mode)) in enumerate(zip(entries, results), start=1):
+                if record is not None:
+                    next_entries[entry.dst_rel] = record
+                self._count_outcome(stats, outcome, mode)
+                if progress is not None:
+                    progress(done, total)
+        else:
+            # Create parent dirs up front so workers never race on mkdir of the same folder.
+            for parent in sorted({(self.output_root / e.dst_rel).parent for e in entries}):
+                parent.mkdir(parents=True, exist_ok=True)
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="materialize") as pool:
+                results = pool.map(
+                    lambda entry: self._sync_entry(entry, previous_entries.get(entry.dst_rel)),
+                    entries,
+                )
+                for done, (entry, (record, outcome, mode)) in enumerate(zip(entries, results), start=1):
+                    if record is not None:
+                        next_entries[entry.dst_rel] = record
+                    self._count_outcome(stats, outcome, mode)
+                    if progress is not None:
+                        progress(done, total)
+
+        for stale_rel in sorted(set(previous_entries) - set(next_entries)):
+            stale_path = self.output_root / stale_rel
+            if stale_path.is_symlink() or stale_path.exists():
+                stale_path.unlink()
+                stats.removed += 1
+
+        self.save_manifest(next_entries)
+        return stats
+
+
+def make_progress_printer(label: str, step_pct: int = 10) -> Callable[[int, int], None]:
+    """Return a progress(done, total) callback that prints every step_pct percent."""
+    last_bucket = [-1]
+
+    def report(done: int, total: int) -> None:
+        if total <= 0:
+            return
+        bucket = (done * 100 // total) // max(1, step_pct)
+        if bucket == last_bucket[0] and done != total:
+            return
+        last_bucket[0] = bucket
+        print(f"[{label}] {done}/{total} ({done * 100 // total}%)", flush=True)
+
+    return report
+
+
+def format_materialize_stats(stats: MaterializeStats) -> str:
+    modes = ", ".join(f"{mode}={count}" for mode, count in sorted(stats.by_mode.items())) or "none"
+    return (
+        f"linked={stats.linked}, copied={stats.copied}, written={stats.written}, "
+        f"unchanged={stats.unchanged}, removed={stats.removed}, "
+        f"missing_sources={stats.missing_sources} (modes: {modes})"
+    )
@@ -4,8 +4,17 @@ import shutil
 from collections import defaultdict
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Callable
 
+from catalog import SessionCatalog
 from constants import *
+from materialize import (
+    DatasetMaterializer,
+    MaterializeEntry,
+    MaterializeStats,
+    format_materialize_stats,
+    make_progress_printer,
+)
 
 
 @dataclass(frozen=True)
@@ -231,19 +240,29 @@ def list_image_files(images_dir: Path) -> list[Path]:
     )
 
 
-def collect_manual_test_samples(all_data_dir: Path, manual_dir_name: str) -> list[Sample]:
+def collect_manual_test_samples(
+    all_data_dir: Path,
+    manual_dir_name: str,
+    catalog: SessionCatalog | None = None,
+) -> list[Sample]:
     manual_root = all_data_dir / manual_dir_name
     if not manual_root.exists() or not manual_root.is_dir():
         return []
 
     image_dirs: set[Path] = set()
-    direct_images = manual_root / "images"
-    if direct_images.exists() and direct_images.is_dir():
-        image_dirs.add(direct_images)
+    if catalog is not None:
+        for record in catalog.sessions(kind="label", under=manual_root.resolve()):
+            image_dirs.add(record.path / "images")
+        if (manual_root / "images").is_dir():
+            image_dirs.add(manual_root.resolve() / "images")
+    else:
+        direct_images = manual_root / "images"
+        if direct_images.exists() and direct_images.is_dir():
+            image_dirs.add(direct_images)
 
-    for candidate in manual_root.rglob("images"):
-        if candidate.is_dir():
-            image_dirs.add(candidate)
+        for candidate in manual_root.rglob("images"):
+            if candidate.is_dir():
+                image_dirs.add(candidate)
 
     samples: list[Sample] = []
     counter = 0
@@ -285,17 +304,9 @@ def resolve_manual_test_all_data_dir(class_dir: Path, configured_all_data_dir: s
     return configured
 
 
-def write_yolo_label(src_label: Path, dst_label: Path, single_class_mode: bool, target_class_id: int) -> None:
-    if not src_label.exists():
-        dst_label.write_text("")
-        return
-
-    if not single_class_mode:
-        shutil.copy2(src_label, dst_label)
-        return
-
+def remap_yolo_label_text(text: str, target_class_id: int) -> str:
     out_lines: list[str] = []
-    for raw_line in src_label.read_text().splitlines():
+    for raw_line in text.splitlines():
         line = raw_line.strip()
         if not line:
             continue
@@ -307,34 +318,56 @@ def write_yolo_label(src_label: Path, dst_label: Path, single_class_mode: bool,
         parts[0] = str(target_class_id)
         out_lines.append(" ".join(parts))
 
-    if out_lines:
-        dst_label.write_text("\n".join(out_lines) + "\n")
-    else:
+    return "\n".join(out_lines) + "\n" if out_lines else ""
+
+
+def build_label_transform(single_class_mode: bool, target_class_id: int) -> tuple[Callable[[bytes], bytes], str]:
+    """Return the label rewrite used for materialization plus a key identifying it."""
+    if not single_class_mode:
+        return (lambda raw: raw), "verbatim"
+
+    def remap(raw: bytes) -> bytes:
+        return remap_yolo_label_text(raw.decode(), target_class_id).encode()
+
+    return remap, f"single_class:{target_class_id}"
+
+
+def write_yolo_label(src_label: Path, dst_label: Path, single_class_mode: bool, target_class_id: int) -> None:
+    if not src_label.exists():
         dst_label.write_text("")
+        return
+
+    if not single_class_mode:
+        shutil.copy2(src_label, dst_label)
+        return
+
+    dst_label.write_text(remap_yolo_label_text(src_label.read_text(), target_class_id))
 
 
-def prepare_output_dirs(output_root: Path, overwrite: bool) -> None:
+def prepare_output_dirs(output_root: Path, overwrite: bool, keep_existing: bool = False) -> None:
     if output_root.exists():
         if not overwrite:
             raise RuntimeError(
                 f"Output directory already exists: {output_root}. "
                 "Set YOLO_OVERWRITE_OUTPUT=True to recreate."
             )
-        shutil.rmtree(output_root)
+        if not keep_existing:
+            shutil.rmtree(output_root)
 
     for split_name in ("train", "val", "test"):
-        (output_root / "images" / split_name).mkdir(parents=True, exist_ok=False)
-        (output_root / "labels" / split_name).mkdir(parents=True, exist_ok=False)
+        (output_root / "images" / split_name).mkdir(parents=True, exist_ok=True)
+        (output_root / "labels" / split_name).mkdir(parents=True, exist_ok=True)
 
 
-def copy_split_files(
+def build_split_entries(
     split_samples: dict[str, list[Sample]],
     source_images_dir: Path,
     source_labels_dir: Path,
-    output_root: Path,
     single_class_mode: bool,
     target_class_id: int,
-) -> tuple[int, int]:
+) -> tuple[list[MaterializeEntry], int, int]:
+    label_transform, transform_key = build_label_transform(single_class_mode, target_class_id)
+    entries: list[MaterializeEntry] = []
     copied = 0
     missing_images = 0
 
@@ -342,23 +375,47 @@ def copy_split_files(
         for sample in samples:
             src_image = sample.image_path or (source_images_dir / sample.image_name)
             src_label = sample.label_path or (source_labels_dir / sample.label_name)
-            dst_image = output_root / "images" / split_name / sample.image_name
-            dst_label = output_root / "labels" / split_name / sample.label_name
 
             if not src_image.exists():
                 missing_images += 1
                 continue
 
-            shutil.copy2(src_image, dst_image)
-            write_yolo_label(
-                src_label=src_label,
-                dst_label=dst_label,
-                single_class_mode=single_class_mode,
-                target_class_id=target_class_id,
+            entries.append(MaterializeEntry(dst_rel=f"images/{split_name}/{sample.image_name}", src=src_image))
+            entries.append(
+                MaterializeEntry(
+                    dst_rel=f"labels/{split_name}/{sample.label_name}",
+                    src=src_label,
+                    transform=label_transform,
+                    transform_key=transform_key,
+                )
             )
             copied += 1
 
-    return copied, missing_images
+    return entries, copied, missing_images
+
+
+def copy_split_files(
+    split_samples: dict[str, list[Sample]],
+    source_images_dir: Path,
+    source_labels_dir: Path,
+    output_root: Path,
+    single_class_mode: bool,
+    target_class_id: int,
+    materializer: DatasetMaterializer | None = None,
+    workers: int = 1,
+    progress: Callable[[int, int], None] | None = None,
+) -> tuple[int, int, MaterializeStats]:
+    entries, copied, missing_images = build_split_entries(
+        split_samples=split_samples,
+        source_images_dir=source_images_dir,
+        source_labels_dir=source_labels_dir,
+        single_class_mode=single_class_mode,
+        target_class_id=target_class_id,
+    )
+    if materializer is None:
+        materializer = DatasetMaterializer(output_root, link_mode="copy")
+    stats = materializer.sync(entries, workers=workers, progress=progress)
+    return copied, missing_images, stats
 
 
 def write_split_manifest(output_root: Path, split_samples: dict[str, list[Sample]]) -> Path:
@@ -466,23 +523,41 @@ def main() -> None:
     if test_ratio <= 1e-12:
         # User requested no random test split; keep test empty unless manual test data exists.
         split_samples["test"] = []
-        manual_test_samples = collect_manual_test_samples(
-            all_data_dir=manual_all_data_dir,
-            manual_dir_name=YOLO_MANUAL_TEST_DIR_NAME,
-        )
+        catalog = None
+        if CATALOG_ENABLED:
+            catalog = SessionCatalog(labels_root.resolve() / CATALOG_FILE_NAME)
+            catalog.refresh_labels(labels_root.resolve())
+        try:
+            manual_test_samples = collect_manual_test_samples(
+                all_data_dir=manual_all_data_dir,
+                manual_dir_name=YOLO_MANUAL_TEST_DIR_NAME,
+                catalog=catalog,
+            )
+        finally:
+            if catalog is not None:
+                catalog.close()
         if manual_test_samples:
             split_samples["test"] = manual_test_samples
             manual_test_used = True
             split_strategy = f"{split_strategy}+manual_test"
 
-    prepare_output_dirs(output_dataset_dir, YOLO_OVERWRITE_OUTPUT)
-    copied, missing_images = copy_split_files(
+    materializer = DatasetMaterializer(
+        output_dataset_dir,
+        link_mode=YOLO_LINK_MODE,
+        manifest_name=YOLO_MATERIALIZE_MANIFEST_NAME,
+    )
+    incremental = YOLO_INCREMENTAL_OUTPUT and materializer.has_manifest()
+    prepare_output_dirs(output_dataset_dir, YOLO_OVERWRITE_OUTPUT, keep_existing=incremental)
+    copied, missing_images, materialize_stats = copy_split_files(
         split_samples=split_samples,
         source_images_dir=source_images_dir,
         source_labels_dir=source_labels_dir,
         output_root=output_dataset_dir,
         single_class_mode=YOLO_SINGLE_CLASS_MODE,
         target_class_id=YOLO_TARGET_CLASS_ID,
+        materializer=materializer,
+        workers=YOLO_MATERIALIZE_WORKERS,
+        progress=make_progress_printer("materialize", YOLO_PROGRESS_STEP_PCT),
     )
     split_manifest = write_split_manifest(output_dataset_dir, split_samples)
     yaml_path = write_dataset_yaml(
@@ -504,7 +579,9 @@ def main() -> None:
     print(f"- source bucket image count ({source_bucket_dir}): {len(samples)}")
     if test_ratio <= 1e-12:
         print(f"- manual test image count ({manual_test_dir}): {len(manual_test_samples)}")
+    print(f"- build mode: {'incremental' if incremental else 'full'} (link mode: {YOLO_LINK_MODE})")
     print(f"- copied samples: {copied}")
+    print(f"- materialized files: {format_materialize_stats(materialize_stats)}")
     print(f"- missing source images skipped: {missing_images}")
     print(f"- split manifest: {split_manifest}")
     print(f"- dataset yaml: {yaml_path}")
@@ -0,0 +1,205 @@
+import queue
+import threading
+import time
+import zipfile
+from dataclasses import dataclass
+from pathlib import Path
+
+# Members that are already compressed; deflating them again burns CPU for ~0% gain.
+DEFAULT_STORED_EXTENSIONS = (".jpg", ".jpeg", ".png", ".webp", ".avi", ".mp4", ".mkv", ".mov", ".zip", ".npz")
+_COPY_BLOCK_BYTES = 1024 * 1024
+
+
+@dataclass
+class ZipStreamStats:
+    files: int = 0
+    stored: int = 0
+    deflated: int = 0
+    bytes_in: int = 0
+    bytes_out: int = 0
+    started_at: float = 0.0
+    finished_at: float = 0.0
+
+    @property
+    def elapsed_s(self) -> float:
+        end = self.finished_at or time.perf_counter()
+        return max(1e-9, end - self.started_at) if self.started_at else 0.0
+
+
+class _QueueWriter:
+    """Unseekable file object for zipfile: buffers writes and hands fixed-size blocks to a queue."""
+
+    def __init__(self, out_queue: queue.Queue, block_size: int, stop_event: threading.Event):
+        self.out_queue = out_queue
+        self.block_size = block_size
+        self.stop_event = stop_event
+        self.pending = bytearray()
+        self.position = 0
+
+    def write(self, data) -> int:
+        if self.stop_event.is_set():
+            raise RuntimeError("Zip stream consumer stopped.")
+        self.pending += data
+        self.position += len(data)
+        while len(self.pending) >= self.block_size:
+            self.out_queue.put(bytes(self.pending[: self.block_size]))
+            del self.pending[: self.block_size]
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self) -> None:
+        if self.pending:
+            self.out_queue.put(bytes(self.pending))
+            self.pending.clear()
+
+
+class ZipStream:
+    """
+    Build a zip of source_dir on a background thread and expose it as a byte stream.
+
+    The archive layout matches shutil.make_archive(root_dir=parent, base_dir=name).
+    Compression runs while the consumer uploads or writes earlier blocks; the
+    bounded queue keeps at most queue_blocks * block_size bytes in memory and
+    nothing is written to disk. Members with stored_extensions are written
+    without compression.
+    """
+
+    def __init__(
+        self,
+        source_dir: Path,
+        block_size: int = 8 * 1024 * 1024,
+        queue_blocks: int = 4,
+        compresslevel: int = 6,
+        stored_extensions: tuple[str, ...] = DEFAULT_STORED_EXTENSIONS,
+    ):
+        self.source_dir = Path(source_dir)
+        if not self.source_dir.is_dir():
+            raise RuntimeError(f"Missing source directory: {self.source_dir}")
+        self.block_size = int(block_size)
+        self.compresslevel = int(compresslevel)
+        self.stored_extensions = {ext.lower() for ext in stored_extensions}
+        self.stats = ZipStreamStats()
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, int(queue_blocks)))
+        self._stop = threading.Event()
+        self._error: BaseException | None = None
+        self._done = False
+        self._thread: threading.Thread | None = None
+
+        # Byte window kept for getbytes(); starts at absolute offset _buffer_start.
+        self._buffer = bytearray()
+        self._buffer_start = 0
+
+    def start(self) -> "ZipStream":
+        if self._thread is None:
+            self.stats.started_at = time.perf_counter()
+            self._thread = threading.Thread(target=self._produce, daemon=True, name="zip-stream")
+            self._thread.start()
+        return self
+
+    def _produce(self) -> None:
+        writer = _QueueWriter(self._queue, self.block_size, self._stop)
+        try:
+            with zipfile.ZipFile(writer, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=self.compresslevel) as zf:
+                base = self.source_dir.parent
+                for path in sorted(self.source_dir.rglob("*")):
+                    if not path.is_file():
+                        continue
+                    stored = path.suffix.lower() in self.stored_extensions
+                    info = zipfile.ZipInfo.from_file(path, arcname=path.relative_to(base).as_posix())
+                    info.compress_type = zipfile.ZIP_STORED if stored else zipfile.ZIP_DEFLATED
+                    with path.open("rb") as src, zf.open(info, "w") as dst:
+                        while True:
+                            block = src.read(_COPY_BLOCK_BYTES)
+                            if not block:
+                                break
+                            dst.write(block)
+                            self.stats.bytes_in += len(block)
+                    self.stats.files += 1
+                    if stored:
+                        self.stats.stored += 1
+                    else:
+                        self.stats.deflated += 1
+            writer.flush()
+        except BaseException as exc:
+            self._error = exc
+        finally:
+            self._queue.put(None)
+
+    def _next_block(self) -> bytes | None:
+        if self._done:
+            return None
+        block = self._queue.get()
+        if block is None:
+            self._done = True
+            self.stats.finished_at = time.perf_counter()
+            if self._error is not None:
+                raise RuntimeError(f"Zip stream failed for {self.source_dir}: {self._error}") from self._error
+            return None
+        self.stats.bytes_out += len(block)
+        return block
+
+    def iter_blocks(self):
+        self.start()
+        while True:
+            block = self._next_block()
+            if block is None:
+                return
+            yield block
+
+    def getbytes(self, begin: int, length: int) -> bytes:
+        """
+        Return up to length bytes starting at absolute offset begin.
+
+        begin never goes backwards past the last call's start, so bytes before it
+        are dropped; re-requesting the same window (an upload retry) is served
+        from the buffer. A short result means end of stream.
+        """
+        self.start()
+        if begin < self._buffer_start:
+            raise RuntimeError(f"Zip stream cannot rewind to {begin} (buffer starts at {self._buffer_start}).")
+        drop = min(begin - self._buffer_start, len(self._buffer))
+        del self._buffer[:drop]
+        self._buffer_start += drop
+        while len(self._buffer) < length:
+            block = self._next_block()
+            if block is None:
+                break
+            self._buffer += block
+        return bytes(self._buffer[:length])
+
+    def close(self) -> None:
+        self._stop.set()
+        # Drain so a producer blocked on a full queue can observe the stop flag.
+        while self._thread is not None and self._thread.is_alive():
+            try:
+                self._queue.get(timeout=0.05)
+            except queue.Empty:
+                pass
+
+    def __enter__(self) -> "ZipStream":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def write_zip_stream(stream: ZipStream, output_path: Path) -> Path:
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with output_path.open("wb") as f:
+        for block in stream.iter_blocks():
+            f.write(block)
+    return output_path
+
+
+def format_zip_stream_stats(stats: ZipStreamStats) -> str:
+    elapsed = stats.elapsed_s
+    ratio = stats.bytes_out / stats.bytes_in if stats.bytes_in else 1.0
+    return (
+        f"{stats.files} file(s) ({stats.stored} stored, {stats.deflated} deflated), "
+        f"{stats.bytes_in / 1e6:.1f} MB -> {stats.bytes_out / 1e6:.1f} MB ({ratio:.2f}x) in {elapsed:.1f}s, "
+        f"{stats.bytes_in / 1e6 / elapsed:.1f} MB/s in, {stats.bytes_out / 1e6 / elapsed:.1f} MB/s out"
+    )
@@ -1,6 +1,7 @@
 from pathlib import Path
 from constants import *
 from utils import *
+import argparse
 import csv
 import cv2
 
@@ -16,7 +17,24 @@ def _init_tracker_from_box(frame, box_xywh: tuple[int, int, int, int]):
     return tracker
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Tracker-assisted labeling of VIDEO_PATH.")
+    parser.add_argument(
+        "--auto",
+        action="store_true",
+        help="Headless batched YOLO labeling; writes review_segments.csv for the frames to check by hand.",
+    )
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
+    if args.auto:
+        from auto_label_video import run_auto_label
+
+        run_auto_label()
+        return
+
     video_path = Path(VIDEO_PATH)
     labels_root = Path(OUT_DIR)
     session_dir = create_unique_label_session_dir(labels_root, LABEL_CLASS_NAME)
@@ -67,10 +85,16 @@ def main():
     H, W = frame.shape[:2]
 
     class_name = sanitize_class_folder_name(LABEL_CLASS_NAME)
-    yolo_weights = find_labeling_yolo_weights(
-        class_name=LABEL_CLASS_NAME,
-        models_root=LABEL_YOLO_BEST_MODELS_DIR,
-    )
+    catalog = open_session_catalog(OUT_DIR)
+    try:
+        yolo_weights = find_labeling_yolo_weights(
+            class_name=LABEL_CLASS_NAME,
+            models_root=LABEL_YOLO_BEST_MODELS_DIR,
+            catalog=catalog,
+        )
+    finally:
+        if catalog is not None:
+            catalog.close()
     yolo_model = None
     if yolo_weights is not None:
         try:
@@ -1,11 +1,19 @@
+import argparse
 import os
 import re
-import shutil
-import tempfile
+import time
 from datetime import datetime
 from pathlib import Path
 from urllib.parse import parse_qs, urlparse
 from constants import *
+from chunked_backup import (
+    ChunkedBackup,
+    DriveBackend,
+    LocalDirectoryBackend,
+    format_backup_stats,
+    restore_snapshot,
+)
+from streaming_zip import ZipStream, format_zip_stream_stats
 
 
 def load_env_file(env_path: Path) -> None:
@@ -57,17 +65,41 @@ def build_backup_base_name() -> str:
     return f"{BACKUP_PREFIX}_{date_stamp}"
 
 
-def make_zip_for_directory(source_dir: Path, output_stem: Path) -> Path:
-    if not source_dir.exists() or not source_dir.is_dir():
-        raise RuntimeError(f"Missing source directory: {source_dir}")
-
-    archive_path = shutil.make_archive(
-        base_name=str(output_stem),
-        format=BACKUP_ARCHIVE_FORMAT,
-        root_dir=str(source_dir.parent),
-        base_dir=str(source_dir.name),
+def make_zip_stream(source_dir: Path) -> ZipStream:
+    return ZipStream(
+        source_dir,
+        block_size=BACKUP_STREAM_CHUNK_MB * 1024 * 1024,
+        queue_blocks=BACKUP_STREAM_QUEUE_CHUNKS,
+        compresslevel=BACKUP_ZIP_COMPRESSLEVEL,
+        stored_extensions=BACKUP_ZIP_STORED_EXTENSIONS,
     )
-    return Path(archive_path)
+
+
+def make_streaming_media_upload(stream: ZipStream, chunk_size: int):
+    from googleapiclient.http import MediaUpload
+
+    class StreamingZipUpload(MediaUpload):
+        """Resumable upload of unknown total size, fed block by block from a ZipStream."""
+
+        def chunksize(self):
+            return chunk_size
+
+        def mimetype(self):
+            return GDRIVE_UPLOAD_MIME_TYPE
+
+        def size(self):
+            return None
+
+        def resumable(self):
+            return True
+
+        def getbytes(self, begin, length):
+            return stream.getbytes(begin, length)
+
+        def has_stream(self):
+            return False
+
+    return StreamingZipUpload()
 
 
 def authenticate_drive_service(credentials_path: Path, token_path: Path):
@@ -98,25 +130,106 @@ def authenticate_drive_service(credentials_path: Path, token_path: Path):
     return build("drive", "v3", credentials=creds)
 
 
-def upload_file_to_drive(service, folder_id: str, local_file: Path) -> str:
-    from googleapiclient.http import MediaFileUpload
-
-    body = {"name": local_file.name, "parents": [folder_id]}
-    media = MediaFileUpload(str(local_file), mimetype=GDRIVE_UPLOAD_MIME_TYPE, resumable=True)
-    created = (
-        service.files()
-        .create(
-            body=body,
-            media_body=media,
-            fields=GDRIVE_UPLOAD_RESPONSE_FIELDS,
-            supportsAllDrives=GDRIVE_SUPPORTS_ALL_DRIVES,
-        )
-        .execute()
+def upload_zip_stream_to_drive(service, folder_id: str, stream: ZipStream, file_name: str) -> str:
+    from googleapiclient.errors import HttpError
+
+    # Drive requires resumable chunks in multiples of 256 KiB; block size is whole MB.
+    media = make_streaming_media_upload(stream, chunk_size=stream.block_size)
+    request = service.files().create(
+        body={"name": file_name, "parents": [folder_id]},
+        media_body=media,
+        fields=GDRIVE_UPLOAD_RESPONSE_FIELDS,
+        supportsAllDrives=GDRIVE_SUPPORTS_ALL_DRIVES,
     )
-    return created["id"]
+    response = None
+    failures = 0
+    last_report = time.perf_counter()
+    with stream:
+        while response is None:
+            try:
+                _, response = request.next_chunk()
+                failures = 0
+            except (HttpError, OSError) as exc:
+                status = getattr(getattr(exc, "resp", None), "status", None)
+                failures += 1
+                if failures >= GDRIVE_UPLOAD_RETRIES or (status is not None and int(status) < 500):
+                    raise
+                time.sleep(min(30.0, 2.0 ** failures))
+                continue
+            now = time.perf_counter()
+            if response is None and now - last_report >= BACKUP_STREAM_REPORT_INTERVAL_S:
+                last_report = now
+                elapsed = stream.stats.elapsed_s
+                print(
+                    f"[{file_name}] uploaded {request.resumable_progress / 1e6:.1f} MB "
+                    f"({request.resumable_progress / 1e6 / elapsed:.1f} MB/s), "
+                    f"read {stream.stats.bytes_in / 1e6:.1f} MB",
+                    flush=True,
+                )
+    print(f"[{file_name}] {format_zip_stream_stats(stream.stats)}")
+    return response["id"]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Back up raw_data and labels.")
+    parser.add_argument("--mode", choices=("zip", "chunked"), default=BACKUP_MODE)
+    parser.add_argument("--backend", choices=("drive", "local"), default=BACKUP_BACKEND, help="Chunked mode only.")
+    parser.add_argument("--local-dir", default=BACKUP_LOCAL_DIR, help="Chunk store for --backend local.")
+    parser.add_argument("--list-snapshots", action="store_true", help="List chunked snapshots and exit.")
+    parser.add_argument("--restore", metavar="SNAPSHOT", help="Restore a chunked snapshot and exit.")
+    parser.add_argument("--restore-dir", default="restored_backup", help="Output folder for --restore.")
+    return parser.parse_args()
+
+
+def build_chunked_backend(backend_name: str, local_dir: Path):
+    if backend_name == "local":
+        return LocalDirectoryBackend(local_dir)
+
+    folder_id = extract_drive_folder_id(get_drive_folder_ref(Path(ENV_FILE_PATH)))
+    print(f"Drive folder ID: {folder_id}")
+    service = authenticate_drive_service(Path(GDRIVE_CREDENTIALS_PATH), Path(GDRIVE_TOKEN_PATH))
+    return DriveBackend(
+        service,
+        folder_id,
+        chunks_folder_name=GDRIVE_CHUNKS_FOLDER_NAME,
+        snapshots_folder_name=GDRIVE_SNAPSHOTS_FOLDER_NAME,
+        supports_all_drives=GDRIVE_SUPPORTS_ALL_DRIVES,
+        upload_retries=GDRIVE_UPLOAD_RETRIES,
+    )
+
+
+def run_chunked_backup(args: argparse.Namespace) -> None:
+    backend = build_chunked_backend(args.backend, Path(args.local_dir))
+
+    if args.list_snapshots:
+        for name in backend.list_snapshots():
+            print(name)
+        return
+    if args.restore:
+        restored = restore_snapshot(backend, args.restore, Path(args.restore_dir))
+        print(f"Restored {restored} file(s) from {args.restore} to {args.restore_dir}")
+        return
+
+    roots = {BACKUP_RAW_SUFFIX: Path(RAW_DATA_ROOT), BACKUP_LABELS_SUFFIX: Path(OUT_DIR)}
+    snapshot_name = f"{BACKUP_PREFIX}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    print(f"Backend: {backend.key}")
+    for name, root in roots.items():
+        print(f"{name} dir: {root}")
+
+    with ChunkedBackup(Path(BACKUP_INDEX_PATH), backend, chunk_size=BACKUP_CHUNK_SIZE_MB * 1024 * 1024) as backup:
+        stats = backup.backup(roots, snapshot_name)
+
+    print("Backup complete.")
+    print(f"- snapshot: {snapshot_name}")
+    print(f"- {format_backup_stats(stats)}")
 
 
 def main():
+    args = parse_args()
+    if args.mode == "chunked" or args.list_snapshots or args.restore:
+        run_chunked_backup(args)
+        return
+
     raw_dir = Path(RAW_DATA_ROOT)
     labels_dir = Path(OUT_DIR)
     env_path = Path(ENV_FILE_PATH)
@@ -127,25 +240,21 @@ def main():
     folder_id = extract_drive_folder_id(folder_ref)
     backup_base = build_backup_base_name()
 
-    raw_zip_name = f"{backup_base}_{BACKUP_RAW_SUFFIX}"
-    labels_zip_name = f"{backup_base}_{BACKUP_LABELS_SUFFIX}"
+    raw_zip_name = f"{backup_base}_{BACKUP_RAW_SUFFIX}.{BACKUP_ARCHIVE_FORMAT}"
+    labels_zip_name = f"{backup_base}_{BACKUP_LABELS_SUFFIX}.{BACKUP_ARCHIVE_FORMAT}"
 
     print(f"Drive folder ID: {folder_id}")
     print(f"Raw dir: {raw_dir}")
     print(f"Labels dir: {labels_dir}")
 
-    with tempfile.TemporaryDirectory(prefix=BACKUP_TEMP_DIR_PREFIX) as tmp:
-        tmp_dir = Path(tmp)
-        raw_zip = make_zip_for_directory(raw_dir, tmp_dir / raw_zip_name)
-        labels_zip = make_zip_for_directory(labels_dir, tmp_dir / labels_zip_name)
-
-        service = authenticate_drive_service(credentials_path, token_path)
-        raw_file_id = upload_file_to_drive(service, folder_id, raw_zip)
-        labels_file_id = upload_file_to_drive(service, folder_id, labels_zip)
+    # Archives are compressed and uploaded at the same time; no temporary zip is written.
+    service = authenticate_drive_service(credentials_path, token_path)
+    raw_file_id = upload_zip_stream_to_drive(service, folder_id, make_zip_stream(raw_dir), raw_zip_name)
+    labels_file_id = upload_zip_stream_to_drive(service, folder_id, make_zip_stream(labels_dir), labels_zip_name)
 
     print("Upload complete.")
-    print(f"- {raw_zip.name} -> file id {raw_file_id}")
-    print(f"- {labels_zip.name} -> file id {labels_file_id}")
+    print(f"- {raw_zip_name} -> file id {raw_file_id}")
+    print(f"- {labels_zip_name} -> file id {labels_file_id}")
 
 
 if __name__ == "__main__":
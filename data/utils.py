@@ -5,6 +5,8 @@ import time
 from constants import *
 import cv2
 
+from catalog import SessionCatalog
+
 REPO_ROOT = Path(__file__).resolve().parent.parent
 
 ################################ RECORDING DATASET #################################
@@ -163,12 +165,45 @@ def _discover_best_pt_in_dir(model_dir: Path) -> Path | None:
     return max(candidates, key=lambda p: p.stat().st_mtime)
 
 
-def find_labeling_yolo_weights(class_name: str, models_root: str) -> Path | None:
+def open_session_catalog(labels_root: str) -> SessionCatalog | None:
+    if not CATALOG_ENABLED:
+        return None
+    return SessionCatalog(resolve_repo_path(labels_root) / CATALOG_FILE_NAME)
+
+
+def _find_labeling_yolo_weights_in_catalog(
+    catalog: SessionCatalog,
+    root: Path,
+    tokens: list[str],
+) -> Path | None:
+    catalog.refresh_model_runs(root, source="best_models")
+    runs = [r for r in catalog.model_runs(source="best_models") if r.best_path is not None]
+    runs = [r for r in runs if r.path.resolve().is_relative_to(root.resolve())]
+
+    # Same preference as the directory scan: exact top-level name, then partial match.
+    for token in tokens:
+        exact = [r for r in runs if r.path.resolve().relative_to(root.resolve()).parts[0].lower() == token]
+        if exact:
+            return exact[0].best_path
+    for run in runs:
+        top_name = run.path.resolve().relative_to(root.resolve()).parts[0].lower()
+        if any(token in top_name for token in tokens):
+            return run.best_path
+    return None
+
+
+def find_labeling_yolo_weights(
+    class_name: str,
+    models_root: str,
+    catalog: SessionCatalog | None = None,
+) -> Path | None:
     root = resolve_repo_path(models_root)
     if not root.exists() or not root.is_dir():
         return None
 
     tokens = _candidate_class_tokens(class_name)
+    if catalog is not None:
+        return _find_labeling_yolo_weights_in_catalog(catalog, root, tokens)
 
     # First pass: exact directory name match.
     for token in tokens:
@@ -208,29 +243,37 @@ def load_labeling_yolo_model(weights_path: Path):
     return YOLO(str(weights_path))
 
 
+def best_detection_from_result(result, frame_w: int, frame_h: int) -> tuple[int, int, int, int, float] | None:
+    boxes = getattr(result, "boxes", None)
+    if boxes is None or len(boxes) == 0:
+        return None
+
+    best: tuple[int, int, int, int, float] | None = None
+    xyxy_list = boxes.xyxy.cpu().tolist()
+    conf_list = boxes.conf.cpu().tolist() if getattr(boxes, "conf", None) is not None else [0.0] * len(xyxy_list)
+
+    for xyxy, conf_raw in zip(xyxy_list, conf_list):
+        x1, y1, x2, y2 = map(float, xyxy[:4])
+        conf = float(conf_raw)
+        x = int(round(x1))
+        y = int(round(y1))
+        bw = int(round(x2 - x1))
+        bh = int(round(y2 - y1))
+        x, y, bw, bh = clamp_bbox(x, y, bw, bh, frame_w, frame_h)
+        if best is None or conf > best[4]:
+            best = (x, y, bw, bh, conf)
+    return best
+
+
 def yolo_best_detection_xywh(yolo_model, frame_bgr, conf_threshold: float) -> tuple[int, int, int, int, float] | None:
     h, w = frame_bgr.shape[:2]
     results = yolo_model.predict(frame_bgr, conf=float(conf_threshold), verbose=False)
     best: tuple[int, int, int, int, float] | None = None
 
     for result in results:
-        boxes = getattr(result, "boxes", None)
-        if boxes is None or len(boxes) == 0:
-            continue
-
-        xyxy_list = boxes.xyxy.cpu().tolist()
-        conf_list = boxes.conf.cpu().tolist() if getattr(boxes, "conf", None) is not None else [0.0] * len(xyxy_list)
-
-        for xyxy, conf_raw in zip(xyxy_list, conf_list):
-            x1, y1, x2, y2 = map(float, xyxy[:4])
-            conf = float(conf_raw)
-            x = int(round(x1))
-            y = int(round(y1))
-            bw = int(round(x2 - x1))
-            bh = int(round(y2 - y1))
-            x, y, bw, bh = clamp_bbox(x, y, bw, bh, w, h)
-            if best is None or conf > best[4]:
-                best = (x, y, bw, bh, conf)
+        candidate = best_detection_from_result(result, w, h)
+        if candidate is not None and (best is None or candidate[4] > best[4]):
+            best = candidate
     return best
 
 
@@ -73,3 +73,15 @@ DEMO_SHOW_PREVIEW = True
 DEMO_PREVIEW_WINDOW_NAME = "Demo: Drone Follower"
 KEY_PREVIEW_QUIT = {ord("q"), 27}
 KEY_PREVIEW_TOGGLE_GATING = set(NAIVE_KEY_TOGGLE_GATING)
+# Write the flight recorder ring buffers to runs/flight_recorder/ now (flight continues).
+KEY_PREVIEW_DUMP_RECORDER = {ord("r")}
+
+# Offline replay (demos/drone_follower/replay.py).
+# Command logs are written here as <label>.json.
+DEMO_REPLAY_OUTPUT_DIR = "runs/replays"
+# Per-channel absolute tolerance when diffing two command logs (m/s, deg/s for yawrate).
+DEMO_REPLAY_DIFF_TOLERANCE = 1e-4
+
+# Flight recorder (black box): last frames/measurements/state/commands, dumped on
+# crash, takeover, Ctrl+C or KEY_PREVIEW_DUMP_RECORDER. Buffer sizes: flight_recorder/constants.py.
+DEMO_FLIGHT_RECORDER_ENABLED = True
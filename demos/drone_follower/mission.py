@@ -29,6 +29,7 @@ from demos.drone_follower.constants import (
     DEMO_FOLLOW_YAW_DEADBAND_DEG,
     DEMO_PREVIEW_WINDOW_NAME,
     DEMO_SHOW_PREVIEW,
+    KEY_PREVIEW_DUMP_RECORDER,
     KEY_PREVIEW_QUIT,
     KEY_PREVIEW_TOGGLE_GATING,
 )
@@ -36,9 +37,14 @@ from depth_estimation.live_depth_review import combine_frames, compose_display
 from depth_estimation.naive_bbox_depth.pipeline import NaiveBBoxDepthPipeline
 from depth_estimation.pipeline_base import LiveDepthPipeline, LiveFrameOutput
 from drone_control.autonomous.takeover_runner import AutonomousMission, TakeoverContext
+from flight_recorder import dump_recorder, mark_event, record_frame, record_measurement
+from presentation import create_presenter
+from profiling import span, traced
 
 
 DepthPipelineFactory = Callable[[], LiveDepthPipeline]
+# Returns an opened cv2.VideoCapture-like object (read()/release()); used by offline replay.
+CameraFactory = Callable[[], cv2.VideoCapture]
 
 
 def _as_float(value) -> float | None:
@@ -77,6 +83,7 @@ class DroneFollowerMission(AutonomousMission):
         yaw_deadband_deg: float = DEMO_FOLLOW_YAW_DEADBAND_DEG,
         show_preview: bool = DEMO_SHOW_PREVIEW,
         pipeline_factory: DepthPipelineFactory | None = None,
+        camera_factory: CameraFactory | None = None,
     ):
         self.target_distance_m = float(target_distance_m)
         self.takeoff_height_m = float(takeoff_height_m)
@@ -98,6 +105,7 @@ class DroneFollowerMission(AutonomousMission):
 
         self.show_preview = bool(show_preview)
         self.pipeline_factory = pipeline_factory or NaiveBBoxDepthPipeline
+        self.camera_factory = camera_factory
 
     @staticmethod
     def _clamp(value: float, lo: float, hi: float) -> float:
@@ -108,6 +116,8 @@ class DroneFollowerMission(AutonomousMission):
         return value
 
     def _open_camera(self) -> cv2.VideoCapture:
+        if self.camera_factory is not None:
+            return self.camera_factory()
         cap = cv2.VideoCapture(DEMO_CAMERA_DEVICE, cv2.CAP_V4L2)
         cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*DEMO_CAMERA_FOURCC))
         cap.set(cv2.CAP_PROP_FRAME_WIDTH, DEMO_CAMERA_WIDTH)
@@ -120,6 +130,7 @@ class DroneFollowerMission(AutonomousMission):
                 raise RuntimeError(f"Could not open camera at {DEMO_CAMERA_DEVICE}")
         return cap
 
+    @traced("follower.compute_command", "control")
     def _compute_command(self, metrics: dict) -> tuple[float, float, float, str]:
         track_state = str(metrics.get("track_state", "lost")).lower()
         estimate_source = str(metrics.get("estimate_source", "none")).lower()
@@ -204,6 +215,7 @@ class DroneFollowerMission(AutonomousMission):
             return bool(toggle())
         return None
 
+    @traced("follower.render_preview", "presentation")
     def _render_preview(
         self,
         output: LiveFrameOutput,
@@ -221,11 +233,14 @@ class DroneFollowerMission(AutonomousMission):
             outputs=[output],
             last_pose_by_method=self._last_pose_by_method,
         )
-        cv2.imshow(DEMO_PREVIEW_WINDOW_NAME, display)
-        key = cv2.waitKey(1) & 0xFF
+        self._presenter.present(display, {"frame_idx": frame_idx, "loop_fps": self._loop_fps, **output.metrics})
+        key = self._presenter.poll_key()
         if key in KEY_PREVIEW_QUIT:
             print("Preview quit requested.")
             return True
+        if key in KEY_PREVIEW_DUMP_RECORDER:
+            mark_event("key", "dump")
+            dump_recorder("key", blocking=False)
         if key in KEY_PREVIEW_TOGGLE_GATING:
             state = self._try_toggle_gating(pipeline)
             if state is None:
@@ -253,7 +268,9 @@ class DroneFollowerMission(AutonomousMission):
 
             frame_idx += 1
             warmed += 1
+            record_frame(frame_bgr, frame_idx)
             output = pipeline.process_live_frame(frame_bgr)
+            record_measurement(frame_idx, output.metrics, "warmup")
 
             if self.show_preview:
                 should_quit = self._render_preview(output, frame_idx, method_name, pipeline)
@@ -288,6 +305,12 @@ class DroneFollowerMission(AutonomousMission):
         self._last_pose_by_method: dict[str, dict[str, float]] = {}
         self._last_t = time.perf_counter()
         self._loop_fps = 0.0
+        # Local window, or MJPEG over HTTP when FPV_STREAM is set (headless ground station).
+        self._presenter = (
+            create_presenter(window_name=DEMO_PREVIEW_WINDOW_NAME, key_quit=KEY_PREVIEW_QUIT)
+            if self.show_preview
+            else None
+        )
         has_taken_off = False
 
         try:
@@ -300,7 +323,8 @@ class DroneFollowerMission(AutonomousMission):
             has_taken_off = True
 
             while True:
-                ok, frame_bgr = cap.read()
+                with span("capture.read", "capture"):
+                    ok, frame_bgr = cap.read()
                 if not ok:
                     print("Camera read failed. Hovering and continuing.")
                     if ctx.stop(self.dt):
@@ -308,10 +332,12 @@ class DroneFollowerMission(AutonomousMission):
                     continue
 
                 frame_idx += 1
+                record_frame(frame_bgr, frame_idx)
                 output = pipeline.process_live_frame(frame_bgr)
                 metrics = output.metrics
 
                 vx_cmd, vz_cmd, yawrate_cmd, reason = self._compute_command(metrics)
+                record_measurement(frame_idx, metrics, reason)
                 if ctx.command(vx=vx_cmd, vy=0.0, vz=vz_cmd, yawrate=yawrate_cmd, duration_s=self.dt):
                     return False
 
@@ -328,9 +354,10 @@ class DroneFollowerMission(AutonomousMission):
                         return True
         finally:
             cap.release()
-            if self.show_preview:
+            if self._presenter is not None:
                 try:
-                    cv2.destroyWindow(DEMO_PREVIEW_WINDOW_NAME)
+                    self._presenter.close()
                 except cv2.error:
                     pass
+                self._presenter = None
             pipeline.close()
@@ -0,0 +1,425 @@
+from __future__ import annotations
+
+import argparse
+import ast
+import hashlib
+import importlib
+import json
+from pathlib import Path
+import subprocess
+import sys
+import time
+
+import cv2
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from demos.drone_follower.constants import (
+    DEMO_DEPTH_METHOD,
+    DEMO_REPLAY_DIFF_TOLERANCE,
+    DEMO_REPLAY_OUTPUT_DIR,
+)
+from demos.drone_follower.mission import DroneFollowerMission
+from depth_estimation.live_depth_review import PIPELINE_SPECS
+from depth_estimation.pipeline_base import LiveDepthPipeline
+
+COMMAND_CHANNELS = ("vx", "vy", "vz", "yawrate")
+
+
+class ReplayFinished(Exception):
+    """Raised by RecordedFrameCapture.read() after the last frame; ends the mission loop."""
+
+
+class RecordedFrameCapture:
+    """
+    cv2.VideoCapture stand-in that serves recorded frames in order, as fast as they are read.
+    position is the index of the last frame returned (-1 before the first read).
+    """
+
+    def __init__(self, frames: list, timestamps_s: list[float], telemetry: np.ndarray | None = None) -> None:
+        self._frames = frames
+        self.timestamps_s = [float(t) for t in timestamps_s]
+        self.telemetry = telemetry
+        self.position = -1
+        self.released = False
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    @classmethod
+    def from_flight_recording(cls, path: Path) -> "RecordedFrameCapture":
+        from flight_recorder import load_flight_recording
+
+        rec = load_flight_recording(path)
+        if rec.frame_count == 0:
+            raise RuntimeError(f"Recording has no frames: {path}")
+        # Frames stay JPEG-encoded until read, like the camera delivering MJPG.
+        frames = [rec.frame_jpeg(i) for i in range(rec.frame_count)]
+        t0 = float(rec.frame_index["t"][0])
+        stamps = [float(t) - t0 for t in rec.frame_index["t"]]
+        telemetry = rec.states.copy()
+        if telemetry.size:
+            telemetry["t"] -= t0
+        return cls(frames, stamps, telemetry)
+
+    @classmethod
+    def from_video(cls, path: Path, max_frames: int | None = None) -> "RecordedFrameCapture":
+        cap = cv2.VideoCapture(str(path))
+        if not cap.isOpened():
+            raise RuntimeError(f"Could not open video: {path}")
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        frames, stamps = [], []
+        try:
+            while max_frames is None or len(frames) < max_frames:
+                ok, frame = cap.read()
+                if not ok:
+                    break
+                frames.append(frame)
+                stamps.append(len(stamps) / fps)
+        finally:
+            cap.release()
+        if not frames:
+            raise RuntimeError(f"Video has no frames: {path}")
+        return cls(frames, stamps)
+
+    def isOpened(self) -> bool:
+        return not self.released
+
+    def read(self):
+        if self.position + 1 >= len(self._frames):
+            raise ReplayFinished()
+        self.position += 1
+        frame = self._frames[self.position]
+        if isinstance(frame, bytes):
+            frame = cv2.imdecode(np.frombuffer(frame, dtype=np.uint8), cv2.IMREAD_COLOR)
+        else:
+            # Pipelines must not see a frame another pass already drew on.
+            frame = frame.copy()
+        return True, frame
+
+    def release(self) -> None:
+        self.released = True
+
+    def current_time_s(self) -> float:
+        return self.timestamps_s[self.position] if self.position >= 0 else 0.0
+
+
+class _ReplayTeleop:
+    """Just enough of TeleoperationController for missions: always flying, state from telemetry."""
+
+    def __init__(self) -> None:
+        self.flying = True
+        self.mc = object()
+        self.target_z = 0.0
+        self.state_estimate = {"x": 0.0, "y": 0.0, "z": 0.0}
+        self.landed = False
+
+    def joystick_activity(self) -> bool:
+        return False
+
+    def takeoff(self) -> None:
+        self.flying = True
+
+    def land(self) -> None:
+        self.landed = True
+        self.flying = False
+
+
+class ReplayTakeoverContext:
+    """
+    TakeoverContext with the same mission-facing API that records every command
+    (tagged with the replay frame) instead of sending it, and never sleeps.
+    """
+
+    def __init__(self, capture: RecordedFrameCapture, dt: float) -> None:
+        self.capture = capture
+        self.dt = float(dt)
+        self.teleop = _ReplayTeleop()
+        self.commands: list[dict] = []
+        self.events: list[dict] = []
+        self.last_reason = ""
+
+    def _sync_telemetry(self) -> None:
+        states = self.capture.telemetry
+        if states is None or states.size == 0:
+            return
+        i = int(np.searchsorted(states["t"], self.capture.current_time_s(), side="right")) - 1
+        if i >= 0:
+            self.teleop.state_estimate.update(x=float(states[i]["x"]), y=float(states[i]["y"]), z=float(states[i]["z"]))
+
+    def _event(self, kind: str, **fields) -> None:
+        self.events.append({"frame": self.capture.position, "kind": kind, **fields})
+
+    def ensure_takeoff(self, height_m: float) -> bool:
+        self.teleop.target_z = height_m
+        self._event("takeoff", height_m=height_m)
+        return False
+
+    def wait(self, duration_s: float) -> bool:
+        return False
+
+    def command(self, vx: float, vy: float, vz: float, yawrate: float, duration_s: float) -> bool:
+        self._sync_telemetry()
+        self.commands.append(
+            {
+                "frame": self.capture.position,
+                "t": round(self.capture.current_time_s(), 6),
+                "vx": float(vx),
+                "vy": float(vy),
+                "vz": float(vz),
+                "yawrate": float(yawrate),
+                "duration_s": float(duration_s),
+                "reason": self.last_reason,
+            }
+        )
+        return False
+
+    def stop(self, duration_s: float = 0.2) -> bool:
+        return self.command(0.0, 0.0, 0.0, 0.0, duration_s)
+
+    def goto_z(self, z_target: float, timeout_s: float = 5.0, tol: float = 0.03) -> bool:
+        self._event("goto_z", z_target=z_target)
+        return False
+
+    def handover_to_teleop_forever(self) -> None:
+        return None
+
+
+class _ReplayFollowerMission(DroneFollowerMission):
+    """DroneFollowerMission that also hands the command reason to the replay context."""
+
+    def run(self, ctx: ReplayTakeoverContext) -> bool:
+        self._replay_ctx = ctx
+        return super().run(ctx)
+
+    def _compute_command(self, metrics: dict) -> tuple[float, float, float, str]:
+        vx, vz, yawrate, reason = super()._compute_command(metrics)
+        self._replay_ctx.last_reason = reason
+        return vx, vz, yawrate, reason
+
+
+def _parse_overrides(items: list[str]) -> dict:
+    overrides = {}
+    for item in items:
+        key, sep, raw = item.partition("=")
+        if not sep:
+            raise ValueError(f"Expected KEY=VALUE, got '{item}'")
+        try:
+            value = ast.literal_eval(raw)
+        except (ValueError, SyntaxError):
+            value = raw
+        overrides[key.strip()] = value
+    return overrides
+
+
+def build_pipeline_with_overrides(method: str, pipeline_args: dict) -> LiveDepthPipeline:
+    if method not in PIPELINE_SPECS:
+        raise ValueError(f"Unsupported method '{method}'. Supported: {', '.join(sorted(PIPELINE_SPECS))}")
+    module_name, class_name = PIPELINE_SPECS[method]
+    cls = getattr(importlib.import_module(module_name), class_name)
+    return cls(**pipeline_args)
+
+
+def _git_revision() -> str:
+    try:
+        rev = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_ROOT, capture_output=True, text=True
+        ).stdout.strip()
+        return f"{rev}{'-dirty' if dirty else ''}"
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _file_sha1(path: Path) -> str:
+    digest = hashlib.sha1()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def replay_recording(
+    recording_path: Path,
+    *,
+    method: str = DEMO_DEPTH_METHOD,
+    mission_args: dict | None = None,
+    pipeline_args: dict | None = None,
+    pipeline_factory=None,
+    capture: RecordedFrameCapture | None = None,
+) -> dict:
+    """Run the follower mission over every recorded frame and return the command log."""
+    recording_path = Path(recording_path)
+    if capture is None:
+        if recording_path.suffix == ".fpvrec":
+            capture = RecordedFrameCapture.from_flight_recording(recording_path)
+        else:
+            capture = RecordedFrameCapture.from_video(recording_path)
+    mission_args = dict(mission_args or {})
+    pipeline_args = dict(pipeline_args or {})
+    if pipeline_factory is None:
+        pipeline_factory = lambda: build_pipeline_with_overrides(method, pipeline_args)
+
+    mission = _ReplayFollowerMission(
+        **{
+            **mission_args,
+            "show_preview": False,
+            "pipeline_factory": pipeline_factory,
+            "camera_factory": lambda: capture,
+        }
+    )
+    ctx = ReplayTakeoverContext(capture, dt=mission.dt)
+    t0 = time.perf_counter()
+    try:
+        mission.run(ctx)
+    except ReplayFinished:
+        pass
+    elapsed_s = time.perf_counter() - t0
+
+    return {
+        "header": {
+            "recording": str(recording_path),
+            "recording_sha1": _file_sha1(recording_path) if recording_path.is_file() else None,
+            "frames": len(capture),
+            "method": method,
+            "mission_args": mission_args,
+            "pipeline_args": pipeline_args,
+            "git_revision": _git_revision(),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "elapsed_s": round(elapsed_s, 3),
+            "replay_fps": round(len(capture) / elapsed_s, 1) if elapsed_s > 0 else None,
+        },
+        "events": ctx.events,
+        "commands": ctx.commands,
+    }
+
+
+def _reason_kind(reason: str) -> str:
+    # "tracked z=1.20m ..." -> "tracked"; numeric detail is covered by the channel diff.
+    return reason.split(" ", 1)[0]
+
+
+def diff_command_logs(base: dict, other: dict, tolerance: float = DEMO_REPLAY_DIFF_TOLERANCE) -> dict:
+    """Per-frame comparison of two replay command logs."""
+    base_by_frame = {c["frame"]: c for c in base["commands"]}
+    other_by_frame = {c["frame"]: c for c in other["commands"]}
+    common = sorted(set(base_by_frame) & set(other_by_frame))
+
+    max_abs = {ch: 0.0 for ch in COMMAND_CHANNELS}
+    differing: list[dict] = []
+    reason_changes = 0
+    for frame in common:
+        a, b = base_by_frame[frame], other_by_frame[frame]
+        deltas = {ch: float(b[ch]) - float(a[ch]) for ch in COMMAND_CHANNELS}
+        for ch, d in deltas.items():
+            max_abs[ch] = max(max_abs[ch], abs(d))
+        reason_changed = _reason_kind(a.get("reason", "")) != _reason_kind(b.get("reason", ""))
+        reason_changes += int(reason_changed)
+        if reason_changed or any(abs(d) > tolerance for d in deltas.values()):
+            differing.append(
+                {
+                    "frame": frame,
+                    "base": {ch: a[ch] for ch in COMMAND_CHANNELS} | {"reason": a.get("reason", "")},
+                    "other": {ch: b[ch] for ch in COMMAND_CHANNELS} | {"reason": b.get("reason", "")},
+                }
+            )
+
+    only_base = sorted(set(base_by_frame) - set(other_by_frame))
+    only_other = sorted(set(other_by_frame) - set(base_by_frame))
+    return {
+        "tolerance": tolerance,
+        "same_recording": base["header"].get("recording_sha1") == other["header"].get("recording_sha1"),
+        "compared_frames": len(common),
+        "differing_frames": len(differing),
+        "reason_changes": reason_changes,
+        "max_abs_delta": max_abs,
+        "only_in_base": only_base,
+        "only_in_other": only_other,
+        "first_differences": differing[:20],
+        "identical": not differing and not only_base and not only_other,
+    }
+
+
+def print_diff_report(base: dict, other: dict, report: dict) -> None:
+    bh, oh = base["header"], other["header"]
+    print(f"Base : {bh.get('git_revision')} method={bh.get('method')} mission={bh.get('mission_args')} pipeline={bh.get('pipeline_args')}")
+    print(f"Other: {oh.get('git_revision')} method={oh.get('method')} mission={oh.get('mission_args')} pipeline={oh.get('pipeline_args')}")
+    if not report["same_recording"]:
+        print("WARNING: logs come from different recordings.")
+    print(
+        f"Frames compared: {report['compared_frames']}  differing: {report['differing_frames']} "
+        f"(tol {report['tolerance']:g})  reason changes: {report['reason_changes']}"
+    )
+    print("Max |delta|: " + "  ".join(f"{ch}={v:.5f}" for ch, v in report["max_abs_delta"].items()))
+    if report["only_in_base"] or report["only_in_other"]:
+        print(f"Commands only in base: {len(report['only_in_base'])}, only in other: {len(report['only_in_other'])}")
+    for d in report["first_differences"][:10]:
+        a, b = d["base"], d["other"]
+        print(
+            f"  frame {d['frame']:5d}: "
+            + " ".join(f"{ch} {a[ch]:+.3f}->{b[ch]:+.3f}" for ch in COMMAND_CHANNELS)
+            + (f" | {_reason_kind(a['reason'])}->{_reason_kind(b['reason'])}" if a["reason"] != b["reason"] else "")
+        )
+    print("RESULT: identical" if report["identical"] else "RESULT: commands differ")
+
+
+def _default_output_path(label: str) -> Path:
+    return REPO_ROOT / DEMO_REPLAY_OUTPUT_DIR / f"{label}.json"
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Replay recorded flights through DroneFollowerMission offline and diff the commands."
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", help="Replay a recording (.fpvrec dump or video) and write the command log.")
+    run.add_argument("recording", help="Flight recorder dump (.fpvrec) or a video file.")
+    run.add_argument("--method", default=DEMO_DEPTH_METHOD, help=f"Depth method ({', '.join(sorted(PIPELINE_SPECS))}).")
+    run.add_argument("--label", default=None, help="Output name under runs/replays (default: <revision>_<method>).")
+    run.add_argument("--out", default=None, help="Explicit output JSON path.")
+    run.add_argument("--mission-arg", action="append", default=[], metavar="KEY=VALUE", help="DroneFollowerMission kwarg override.")
+    run.add_argument("--pipeline-arg", action="append", default=[], metavar="KEY=VALUE", help="Pipeline constructor kwarg.")
+
+    diff = sub.add_parser("diff", help="Compare two command logs; exit code 1 when they differ.")
+    diff.add_argument("base")
+    diff.add_argument("other")
+    diff.add_argument("--tol", type=float, default=DEMO_REPLAY_DIFF_TOLERANCE)
+    diff.add_argument("--report", default=None, help="Also write the diff report as JSON.")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _build_arg_parser().parse_args(argv)
+    if args.command == "run":
+        log = replay_recording(
+            Path(args.recording),
+            method=args.method,
+            mission_args=_parse_overrides(args.mission_arg),
+            pipeline_args=_parse_overrides(args.pipeline_arg),
+        )
+        label = args.label or f"{log['header']['git_revision']}_{args.method}"
+        out_path = Path(args.out) if args.out else _default_output_path(label)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        out_path.write_text(json.dumps(log, indent=1))
+        h = log["header"]
+        print(f"Replayed {h['frames']} frames in {h['elapsed_s']:.2f} s ({h['replay_fps']} FPS), {len(log['commands'])} commands.")
+        print(f"Wrote {out_path}")
+        return 0
+
+    base = json.loads(Path(args.base).read_text())
+    other = json.loads(Path(args.other).read_text())
+    report = diff_command_logs(base, other, tolerance=args.tol)
+    print_diff_report(base, other, report)
+    if args.report:
+        Path(args.report).write_text(json.dumps(report, indent=2))
+    return 0 if report["identical"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,6 +11,7 @@ if str(REPO_ROOT) not in sys.path:
 from demos.drone_follower.constants import (
     DEMO_DEPTH_METHOD,
     DEMO_DRONE_URI,
+    DEMO_FLIGHT_RECORDER_ENABLED,
     DEMO_FOLLOW_CONTROL_DT,
     DEMO_FOLLOW_TARGET_DISTANCE_M,
     DEMO_FOLLOW_TAKEOFF_HEIGHT_M,
@@ -25,6 +26,8 @@ from depth_estimation.live_depth_review import PIPELINE_SPECS, build_pipeline
 from depth_estimation.pipeline_base import LiveDepthPipeline
 from drone_control.autonomous.takeover_runner import TakeoverRunner
 from drone_control.joystick.teleoperation import TeleoperationController
+from flight_recorder import FlightRecorder, install_recorder
+from profiling import start_tracing_from_env
 
 
 PipelineFactory = Callable[[], LiveDepthPipeline]
@@ -88,13 +91,33 @@ class DroneFollowerDemoApp:
                 "(track_state + z_rel_m + yaw_error_deg)."
             )
 
+        recorder = None
+        if DEMO_FLIGHT_RECORDER_ENABLED:
+            recorder = install_recorder(
+                FlightRecorder(
+                    metadata={
+                        "app": "drone_follower",
+                        "depth_method": self.depth_method,
+                        "drone_uri": DEMO_DRONE_URI,
+                        "target_distance_m": DEMO_FOLLOW_TARGET_DISTANCE_M,
+                    }
+                )
+            )
+            print("- flight recorder: on (press 'r' in preview to dump)")
+
         teleop = self._build_teleop()
         runner = self._build_runner(teleop)
         mission = self._build_mission()
-        runner.run(mission)
+        try:
+            runner.run(mission)
+        finally:
+            if recorder is not None:
+                install_recorder(None)
+                recorder.close()
 
 
 def main() -> None:
+    start_tracing_from_env("drone_follower")
     DroneFollowerDemoApp().run()
 
 
@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+import queue
+import threading
+import time
+from typing import Callable
+
+import cv2
+import numpy as np
+
+from depth_estimation.constants import DEPTH_BATCH_QUEUE_BATCHES
+from profiling import span
+
+# list of BGR frames -> list of depth maps (any resolution; resized to the frame size here).
+BatchInferFn = Callable[[list[np.ndarray]], list[np.ndarray]]
+# (composed frame|depth image, depth map at frame size, 1-based frame index, inference ms per frame).
+AnnotateFn = Callable[[np.ndarray, np.ndarray, int, float], None]
+
+_END = object()
+
+
+def count_video_frames(video_path: Path) -> int:
+    """Exact frame count by grabbing (no decode) when the container does not report one."""
+    cap = cv2.VideoCapture(str(video_path))
+    try:
+        total = 0
+        while cap.grab():
+            total += 1
+        return total
+    finally:
+        cap.release()
+
+
+def truncate_npy_stack(path: Path, count: int) -> None:
+    """Shrink the first axis of an .npy file in place (header rewrite + file truncate)."""
+    with open(path, "r+b") as f:
+        version = np.lib.format.read_magic(f)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+        data_offset = f.tell()
+        if count >= shape[0]:
+            return
+        new_shape = (int(count),) + tuple(shape[1:])
+        header = "{'descr': %r, 'fortran_order': %r, 'shape': %r, }" % (
+            np.lib.format.dtype_to_descr(dtype),
+            fortran_order,
+            new_shape,
+        )
+        prefix_len = 6 + 2 + (2 if version == (1, 0) else 4)
+        pad = data_offset - prefix_len - len(header) - 1
+        if pad < 0:
+            raise RuntimeError(f"Cannot rewrite .npy header in place: {path}")
+        header_bytes = (header + " " * pad + "\n").encode("latin1")
+        f.seek(prefix_len)
+        f.write(header_bytes)
+        f.truncate(data_offset + int(np.prod(new_shape, dtype=np.int64)) * dtype.itemsize)
+
+
+class BatchedVideoDepthRunner:
+    """
+    Offline video depth with decode / inference / encode overlapped.
+
+    - decoder thread: reads frames and groups them into batches
+    - calling thread: runs infer_batch on each batch (the model stays on one thread)
+    - encoder thread: colorizes, composes frame|depth, draws the overlay, writes the video
+      and stores raw depth into a memory-mapped (N, H, W) .npy stack
+
+    Bounded queues (DEPTH_BATCH_QUEUE_BATCHES) keep memory flat when one stage is slower.
+    """
+
+    def __init__(
+        self,
+        infer_batch: BatchInferFn,
+        colorize: Callable[[np.ndarray], np.ndarray],
+        annotate: AnnotateFn | None = None,
+        batch_size: int = 4,
+        output_video_path: Path | None = None,
+        depth_stack_path: Path | None = None,
+        stack_dtype: str = "float16",
+        max_frames: int = 0,
+        queue_batches: int = DEPTH_BATCH_QUEUE_BATCHES,
+        print_every_n_frames: int = 50,
+        metadata: dict | None = None,
+    ):
+        self.infer_batch = infer_batch
+        self.colorize = colorize
+        self.annotate = annotate
+        self.batch_size = max(1, int(batch_size))
+        self.output_video_path = Path(output_video_path) if output_video_path else None
+        self.depth_stack_path = Path(depth_stack_path) if depth_stack_path else None
+        self.stack_dtype = np.dtype(stack_dtype)
+        self.max_frames = max(0, int(max_frames))
+        self.queue_batches = max(1, int(queue_batches))
+        self.print_every_n_frames = max(1, int(print_every_n_frames))
+        self.metadata = dict(metadata or {})
+        self._stop = threading.Event()
+        self._errors: list[BaseException] = []
+
+    def _put(self, q: queue.Queue, item) -> bool:
+        while not self._stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, q: queue.Queue):
+        while True:
+            try:
+                return q.get(timeout=0.1)
+            except queue.Empty:
+                if self._stop.is_set():
+                    return _END
+
+    def _fail(self, exc: BaseException) -> None:
+        self._errors.append(exc)
+        self._stop.set()
+
+    def _decode_loop(self, cap: cv2.VideoCapture, capacity: int, out_q: queue.Queue) -> None:
+        try:
+            frame_idx = 0
+            batch: list[np.ndarray] = []
+            start = 0
+            while frame_idx < capacity and not self._stop.is_set():
+                with span("batch_video.decode", "capture"):
+                    ok, frame = cap.read()
+                if not ok:
+                    break
+                batch.append(frame)
+                frame_idx += 1
+                if len(batch) == self.batch_size:
+                    if not self._put(out_q, (start, batch)):
+                        return
+                    start, batch = frame_idx, []
+            if batch:
+                self._put(out_q, (start, batch))
+        except BaseException as exc:
+            self._fail(exc)
+        finally:
+            self._put(out_q, _END)
+
+    def _encode_loop(
+        self,
+        in_q: queue.Queue,
+        writer: cv2.VideoWriter | None,
+        stack: np.ndarray | None,
+        progress: dict,
+    ) -> None:
+        composed: np.ndarray | None = None  # reused: written out before the next frame is composed
+        try:
+            while True:
+                item = self._get(in_q)
+                if item is _END:
+                    return
+                start, frames, depths, infer_ms_per_frame = item
+                with span("batch_video.encode", "overlay"):
+                    for offset, (frame, depth) in enumerate(zip(frames, depths)):
+                        idx = start + offset
+                        h, w = frame.shape[:2]
+                        if depth.shape[:2] != (h, w):
+                            depth = cv2.resize(depth, (w, h), interpolation=cv2.INTER_LINEAR)
+                        if stack is not None:
+                            stack[idx] = depth
+                        if writer is not None:
+                            if composed is None or composed.shape[:2] != (h, 2 * w):
+                                composed = np.empty((h, 2 * w, 3), dtype=np.uint8)
+                            composed[:, :w] = frame
+                            composed[:, w:] = self.colorize(depth)
+                            if self.annotate is not None:
+                                self.annotate(composed, depth, idx + 1, infer_ms_per_frame)
+                            writer.write(composed)
+                        progress["written"] = idx + 1
+                        if (idx + 1) % self.print_every_n_frames == 0:
+                            elapsed = time.perf_counter() - progress["t0"]
+                            print(f"frame {idx + 1}: {(idx + 1) / max(1e-6, elapsed):.2f} fps overall")
+        except BaseException as exc:
+            self._fail(exc)
+
+    def run(self, video_path: Path) -> dict:
+        video_path = Path(video_path)
+        cap = cv2.VideoCapture(str(video_path))
+        if not cap.isOpened():
+            raise RuntimeError(f"Could not open video: {video_path}")
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        fps = float(cap.get(cv2.CAP_PROP_FPS))
+        if fps <= 1e-6:
+            fps = 30.0
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        if total <= 0:
+            total = count_video_frames(video_path)
+        capacity = min(total, self.max_frames) if self.max_frames > 0 else total
+        if capacity <= 0:
+            cap.release()
+            raise RuntimeError(f"Video has no frames: {video_path}")
+
+        writer = None
+        if self.output_video_path is not None:
+            self.output_video_path.parent.mkdir(parents=True, exist_ok=True)
+            writer = cv2.VideoWriter(
+                str(self.output_video_path),
+                cv2.VideoWriter_fourcc(*"XVID"),
+                fps,
+                (width * 2, height),
+            )
+            if not writer.isOpened():
+                cap.release()
+                raise RuntimeError(f"Could not open output video writer: {self.output_video_path}")
+        stack = None
+        if self.depth_stack_path is not None:
+            self.depth_stack_path.parent.mkdir(parents=True, exist_ok=True)
+            stack = np.lib.format.open_memmap(
+                str(self.depth_stack_path),
+                mode="w+",
+                dtype=self.stack_dtype,
+                shape=(capacity, height, width),
+            )
+
+        print("Batched depth inference started (video).")
+        print(f"- input video: {video_path}")
+        print(f"- size: {width}x{height} @ {fps:.2f} fps, frames: {capacity}, batch size: {self.batch_size}")
+        if writer is not None:
+            print(f"- output video: {self.output_video_path}")
+        if stack is not None:
+            print(f"- depth stack: {self.depth_stack_path} ({self.stack_dtype.name})")
+
+        decode_q: queue.Queue = queue.Queue(maxsize=self.queue_batches)
+        encode_q: queue.Queue = queue.Queue(maxsize=self.queue_batches)
+        progress = {"written": 0, "t0": time.perf_counter()}
+        decoder = threading.Thread(target=self._decode_loop, args=(cap, capacity, decode_q), name="depth-decode", daemon=True)
+        encoder = threading.Thread(
+            target=self._encode_loop, args=(encode_q, writer, stack, progress), name="depth-encode", daemon=True
+        )
+        infer_s = 0.0
+        interrupted = False
+        decoder.start()
+        encoder.start()
+        try:
+            while True:
+                item = self._get(decode_q)
+                if item is _END:
+                    break
+                start, frames = item
+                t0 = time.perf_counter()
+                with span("batch_video.infer", "inference", batch=len(frames)):
+                    depths = [np.asarray(d, dtype=np.float32).squeeze() for d in self.infer_batch(frames)]
+                dt = time.perf_counter() - t0
+                infer_s += dt
+                if len(depths) != len(frames):
+                    raise RuntimeError(f"infer_batch returned {len(depths)} maps for {len(frames)} frames")
+                if not self._put(encode_q, (start, frames, depths, dt * 1000.0 / len(frames))):
+                    break
+            self._put(encode_q, _END)
+        except KeyboardInterrupt:
+            interrupted = True
+            print("Stopped by user.")
+        except BaseException as exc:
+            self._fail(exc)
+        finally:
+            if interrupted:
+                self._stop.set()
+            encoder.join()
+            self._stop.set()
+            decoder.join()
+            cap.release()
+            if writer is not None:
+                writer.release()
+
+        written = int(progress["written"])
+        wall_s = time.perf_counter() - progress["t0"]
+        if stack is not None:
+            stack.flush()
+            del stack
+            if written < capacity:
+                truncate_npy_stack(self.depth_stack_path, written)
+            meta = {
+                **self.metadata,
+                "video": str(video_path),
+                "fps": fps,
+                "frames": written,
+                "frame_size": [width, height],
+                "dtype": self.stack_dtype.name,
+            }
+            self.depth_stack_path.with_suffix(".json").write_text(json.dumps(meta, indent=2))
+        if self._errors:
+            raise RuntimeError(f"Batched video depth failed: {self._errors[0]}") from self._errors[0]
+
+        summary = {
+            "frames": written,
+            "wall_s": round(wall_s, 3),
+            "fps": round(written / max(1e-9, wall_s), 3),
+            "infer_s": round(infer_s, 3),
+            "infer_ms_per_frame": round(infer_s * 1000.0 / max(1, written), 2),
+        }
+        print("Batched depth inference finished (video).")
+        print(
+            f"- frames: {summary['frames']}  wall: {summary['wall_s']:.1f} s  "
+            f"({summary['fps']:.2f} fps, inference {summary['infer_ms_per_frame']:.1f} ms/frame)"
+        )
+        return summary
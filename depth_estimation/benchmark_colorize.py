@@ -0,0 +1,147 @@
+"""
+Depth colorization latency at camera resolution: the old per-call path vs DepthColorizer.
+
+    ./scripts/benchmark_colorize.sh
+    ./scripts/benchmark_colorize.sh --width 1280 --height 720 --colormap magma
+    ./scripts/benchmark_colorize.sh --depth-npy data/.../depth.npy
+
+Without --depth-npy the depth map is synthetic (smooth metric depth, sensor noise, a few NaN holes).
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import datetime
+import json
+from pathlib import Path
+import platform
+import sys
+import time
+from typing import Callable
+
+import cv2
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from depth_estimation.benchmark_roi_depth import latency_summary
+from depth_estimation.colorize import DepthColorizer, resolve_colormap_code
+from depth_estimation.constants import DEPTH_COLOR_BENCH_OUTPUT_DIR, DEPTH_COLOR_BENCH_REPEATS
+from depth_estimation.unidepth.utils import colorize_depth_map
+
+
+def synthetic_depth(width: int, height: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    yy, xx = np.mgrid[0:height, 0:width].astype(np.float32)
+    depth = 0.5 + 6.0 * (yy / max(1, height - 1)) + 0.5 * np.sin(xx / 40.0)
+    depth += rng.normal(0.0, 0.05, size=depth.shape).astype(np.float32)
+    holes = rng.random(depth.shape) < 0.002
+    depth[holes] = np.nan
+    return depth.astype(np.float32)
+
+
+def legacy_colorize(depth_map: np.ndarray, colormap_name: str, invert_colormap: bool) -> np.ndarray:
+    """The pre-DepthColorizer utils.colorize_depth_map, kept here as the baseline."""
+    finite = depth_map[np.isfinite(depth_map)]
+    if finite.size == 0:
+        depth_u8 = np.zeros(depth_map.shape, dtype=np.uint8)
+    else:
+        d_min = float(np.min(finite))
+        d_max = float(np.max(finite))
+        normalized = np.clip((depth_map - d_min) / max(1e-6, d_max - d_min), 0.0, 1.0)
+        with np.errstate(invalid="ignore"):  # NaN -> uint8 is undefined (0 in practice)
+            depth_u8 = (normalized * 255.0).astype(np.uint8)
+    if invert_colormap:
+        depth_u8 = 255 - depth_u8
+    return cv2.applyColorMap(depth_u8, resolve_colormap_code(colormap_name))
+
+
+def _timed_ms(fn: Callable[[], object], repeats: int, warmup: int = 5) -> list[float]:
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(max(1, repeats)):
+        t0 = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return samples
+
+
+def benchmark_colorize(depth: np.ndarray, colormap_name: str, invert_colormap: bool, repeats: int) -> dict:
+    finite = depth[np.isfinite(depth)]
+    fixed_range = (float(finite.min()), float(finite.max())) if finite.size else (0.0, 1.0)
+    robust = DepthColorizer(colormap_name, invert_colormap)
+    fixed = DepthColorizer(colormap_name, invert_colormap, depth_range=fixed_range)
+    modes = {
+        "legacy": lambda: legacy_colorize(depth, colormap_name, invert_colormap),
+        "colorize_depth_map": lambda: colorize_depth_map(depth, colormap_name, invert_colormap),
+        "colorizer_robust": lambda: robust.colorize(depth),
+        "colorizer_fixed": lambda: fixed.colorize(depth),
+    }
+    report = {name: latency_summary(_timed_ms(fn, repeats)) for name, fn in modes.items()}
+    base = report["legacy"]["median_ms"]
+    for name in modes:
+        report[name]["speedup"] = round(base / max(1e-6, report[name]["median_ms"]), 2)
+    # Same per-frame min/max scaling: outputs may only differ by uint8 rounding of the index.
+    diff = cv2.absdiff(legacy_colorize(depth, colormap_name, invert_colormap), fixed.colorize(depth))
+    report["legacy_vs_fixed_max_abs_diff"] = int(diff.max())
+    return report
+
+
+def print_report(report: dict) -> None:
+    print(f"Depth colorization benchmark ({report['width']}x{report['height']}, {report['colormap']})")
+    print(f"{'mode':<20} {'median ms':>10} {'p90 ms':>10} {'min ms':>10} {'speed-up':>9}")
+    for name in ("legacy", "colorize_depth_map", "colorizer_robust", "colorizer_fixed"):
+        s = report["modes"][name]
+        print(f"{name:<20} {s['median_ms']:>10.2f} {s['p90_ms']:>10.2f} {s['min_ms']:>10.2f} {s['speedup']:>8.2f}x")
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark depth map colorization (legacy vs DepthColorizer).")
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--depth-npy", default=None, help="2D depth map .npy instead of the synthetic map.")
+    parser.add_argument("--colormap", default="turbo")
+    parser.add_argument("--invert", action="store_true")
+    parser.add_argument("--repeats", type=int, default=DEPTH_COLOR_BENCH_REPEATS)
+    parser.add_argument("--output", default=None, help="Report JSON path (default: runs/benchmarks/colorize/).")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _build_arg_parser().parse_args(argv)
+    if args.depth_npy:
+        depth = np.load(args.depth_npy).astype(np.float32)
+        if depth.ndim == 3:
+            depth = depth[0]
+        depth = cv2.resize(depth, (args.width, args.height), interpolation=cv2.INTER_LINEAR)
+    else:
+        depth = synthetic_depth(args.width, args.height)
+
+    modes = benchmark_colorize(depth, args.colormap, args.invert, args.repeats)
+    report = {
+        "width": args.width,
+        "height": args.height,
+        "colormap": args.colormap,
+        "invert": bool(args.invert),
+        "source": args.depth_npy or "synthetic",
+        "repeats": args.repeats,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "host": {"machine": platform.machine(), "processor": platform.processor(), "python": platform.python_version()},
+        "legacy_vs_fixed_max_abs_diff": modes.pop("legacy_vs_fixed_max_abs_diff"),
+        "modes": modes,
+    }
+    print_report(report)
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output = Path(args.output) if args.output else (
+        REPO_ROOT / DEPTH_COLOR_BENCH_OUTPUT_DIR / f"colorize_{args.width}x{args.height}_{stamp}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Report: {output}")
+
+
+if __name__ == "__main__":
+    main()
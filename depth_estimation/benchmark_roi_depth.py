@@ -0,0 +1,252 @@
+"""
+Full-frame vs ROI-only dense depth: latency and bbox-depth agreement.
+
+    ./scripts/benchmark_roi_depth.sh --method unidepth --source data/raw_data/<session>/video.avi
+    ./scripts/benchmark_roi_depth.sh --method midas --source frame.png --bbox 300,200,360,240
+
+Without --bbox the target box comes from the naive YOLO pipeline on each frame
+(frames without a detection are skipped).
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import datetime
+import json
+from pathlib import Path
+import platform
+import sys
+import time
+from typing import Callable
+
+import cv2
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from depth_estimation.constants import (
+    DEPTH_ROI_BENCH_OUTPUT_DIR,
+    DEPTH_ROI_BENCH_REPEATS,
+    DEPTH_ROI_BENCH_WARMUP,
+    DEPTH_ROI_STATS_SHRINK,
+)
+from depth_estimation.roi_depth import RoiDepthResult, roi_depth_stats
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+
+BBox = tuple[float, float, float, float]
+
+
+def load_frames(source: Path, count: int) -> list[np.ndarray]:
+    """Up to count frames from an image, an image folder (or session with images/) or a video."""
+    source = Path(source)
+    if source.is_dir() and (source / "video.avi").is_file():
+        source = source / "video.avi"
+    elif source.is_dir() and (source / "images").is_dir():
+        source = source / "images"
+
+    frames: list[np.ndarray] = []
+    if source.is_dir():
+        paths = sorted(p for p in source.iterdir() if p.suffix.lower() in IMAGE_EXTS)
+        step = max(1, len(paths) // max(1, count))
+        for path in paths[::step][:count]:
+            frame = cv2.imread(str(path))
+            if frame is not None:
+                frames.append(frame)
+    elif source.suffix.lower() in IMAGE_EXTS:
+        frame = cv2.imread(str(source))
+        if frame is not None:
+            frames.append(frame)
+    elif source.is_file():
+        cap = cv2.VideoCapture(str(source))
+        try:
+            total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            step = max(1, total // max(1, count)) if total > 0 else 1
+            idx = 0
+            while len(frames) < count:
+                ok, frame = cap.read()
+                if not ok:
+                    break
+                if idx % step == 0:
+                    frames.append(frame)
+                idx += 1
+        finally:
+            cap.release()
+    if not frames:
+        raise RuntimeError(f"No frames could be read from {source}")
+    return frames
+
+
+def parse_bbox(raw: str) -> BBox:
+    parts = [float(v) for v in raw.split(",")]
+    if len(parts) != 4:
+        raise ValueError(f"--bbox expects x1,y1,x2,y2, got {raw!r}")
+    return parts[0], parts[1], parts[2], parts[3]
+
+
+def naive_bbox_provider() -> Callable[[np.ndarray], BBox | None]:
+    from depth_estimation.naive_bbox_depth.pipeline import NaiveBBoxDepthPipeline
+
+    naive = NaiveBBoxDepthPipeline()
+
+    def provide(frame: np.ndarray) -> BBox | None:
+        naive.reset_temporal_state()
+        m = naive.process_live_frame(frame).metrics
+        if m.get("estimate_source") != "measurement":
+            return None
+        cx, cy = float(m["raw_bbox_center_x_px"]), float(m["raw_bbox_center_y_px"])
+        hw, hh = 0.5 * float(m["raw_bbox_width_px"]), 0.5 * float(m["raw_bbox_height_px"])
+        return cx - hw, cy - hh, cx + hw, cy + hh
+
+    return provide
+
+
+def _timed(fn: Callable[[], object], repeats: int, warmup: int) -> tuple[list[float], object]:
+    out = None
+    for _ in range(max(0, warmup)):
+        out = fn()
+    samples = []
+    for _ in range(max(1, repeats)):
+        t0 = time.perf_counter()
+        out = fn()
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    return samples, out
+
+
+def latency_summary(samples_ms: list[float]) -> dict[str, float]:
+    arr = np.asarray(samples_ms, dtype=np.float64)
+    return {
+        "median_ms": round(float(np.median(arr)), 2),
+        "p90_ms": round(float(np.percentile(arr, 90)), 2),
+        "min_ms": round(float(arr.min()), 2),
+    }
+
+
+def benchmark_roi_vs_full(
+    frames: list[np.ndarray],
+    bboxes: list[BBox | None],
+    full_fn: Callable[[np.ndarray], np.ndarray],
+    roi_fn: Callable[[np.ndarray, BBox], RoiDepthResult],
+    repeats: int = DEPTH_ROI_BENCH_REPEATS,
+    warmup: int = DEPTH_ROI_BENCH_WARMUP,
+) -> dict:
+    """
+    Time full_fn(frame) -> depth map against roi_fn(frame, bbox) -> RoiDepthResult on every frame
+    with a bbox, and compare the bbox median depth of both.
+    """
+    full_ms: list[float] = []
+    roi_ms: list[float] = []
+    rows = []
+    for frame_idx, (frame, bbox) in enumerate(zip(frames, bboxes)):
+        if bbox is None:
+            continue
+        frame_size = (frame.shape[1], frame.shape[0])
+        full_samples, full_map = _timed(lambda: full_fn(frame), repeats, warmup)
+        roi_samples, roi = _timed(lambda: roi_fn(frame, bbox), repeats, warmup)
+        full_ms.extend(full_samples)
+        roi_ms.extend(roi_samples)
+
+        full_stats = roi_depth_stats(np.asarray(full_map), bbox, frame_size, DEPTH_ROI_STATS_SHRINK)
+        row = {
+            "frame": frame_idx,
+            "bbox_xyxy": [round(float(v), 1) for v in bbox],
+            "roi_input_size": list(roi.window.input_size),
+            "full_median_ms": round(float(np.median(full_samples)), 2),
+            "roi_median_ms": round(float(np.median(roi_samples)), 2),
+            "full_depth_median": full_stats.get("median"),
+            "roi_depth_median": roi.stats.get("median"),
+        }
+        if row["full_depth_median"] is not None and row["roi_depth_median"] is not None:
+            row["depth_abs_diff"] = round(abs(row["full_depth_median"] - row["roi_depth_median"]), 4)
+        rows.append(row)
+
+    if not rows:
+        raise RuntimeError("No frame had a target bbox; pass --bbox or use frames with a visible drone.")
+    full_summary = latency_summary(full_ms)
+    roi_summary = latency_summary(roi_ms)
+    diffs = [r["depth_abs_diff"] for r in rows if "depth_abs_diff" in r]
+    return {
+        "frames": len(rows),
+        "full": full_summary,
+        "roi": roi_summary,
+        "speedup": round(full_summary["median_ms"] / max(1e-9, roi_summary["median_ms"]), 2),
+        "depth_abs_diff_median": round(float(np.median(diffs)), 4) if diffs else None,
+        "rows": rows,
+    }
+
+
+def print_report(method: str, report: dict) -> None:
+    print(f"ROI depth benchmark ({method}, {report['frames']} frame(s))")
+    print(f"{'mode':<6} {'median ms':>10} {'p90 ms':>10} {'min ms':>10}")
+    for mode in ("full", "roi"):
+        s = report[mode]
+        print(f"{mode:<6} {s['median_ms']:>10.1f} {s['p90_ms']:>10.1f} {s['min_ms']:>10.1f}")
+    print(f"speed-up (median): {report['speedup']:.2f}x")
+    if report["depth_abs_diff_median"] is not None:
+        print(f"bbox depth |full - roi| (median over frames): {report['depth_abs_diff_median']:.4f}")
+        if method == "midas":
+            print("  (MiDaS is relative inverse depth, normalised per inference: the difference is not in metres)")
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark ROI-only vs full-frame dense depth inference.")
+    parser.add_argument("--method", choices=("unidepth", "midas"), default="unidepth")
+    parser.add_argument("--source", required=True, help="Image, image folder, session folder or video.")
+    parser.add_argument("--frames", type=int, default=5, help="Frames sampled from the source.")
+    parser.add_argument("--bbox", default=None, help="Fixed target box x1,y1,x2,y2 (default: naive YOLO detection).")
+    parser.add_argument("--repeats", type=int, default=DEPTH_ROI_BENCH_REPEATS)
+    parser.add_argument("--warmup", type=int, default=DEPTH_ROI_BENCH_WARMUP)
+    parser.add_argument("--output", default=None, help="Report JSON path (default: runs/benchmarks/roi_depth/).")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _build_arg_parser().parse_args(argv)
+    frames = load_frames(Path(args.source), args.frames)
+    if args.bbox:
+        fixed = parse_bbox(args.bbox)
+        bboxes: list[BBox | None] = [fixed] * len(frames)
+    else:
+        provide = naive_bbox_provider()
+        bboxes = [provide(frame) for frame in frames]
+
+    if args.method == "unidepth":
+        from depth_estimation.unidepth.pipeline import UniDepthPipeline
+
+        pipeline = UniDepthPipeline()
+    else:
+        from depth_estimation.midas.pipeline import MiDaSPipeline
+
+        pipeline = MiDaSPipeline()
+    try:
+        report = benchmark_roi_vs_full(
+            frames,
+            bboxes,
+            full_fn=lambda frame: pipeline._infer_depth(frame)[0],
+            roi_fn=pipeline.infer_roi,
+            repeats=args.repeats,
+            warmup=args.warmup,
+        )
+    finally:
+        pipeline.close()
+
+    report = {
+        "method": args.method,
+        "source": str(args.source),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "host": {"machine": platform.machine(), "processor": platform.processor(), "python": platform.python_version()},
+        **report,
+    }
+    print_report(args.method, report)
+    output = Path(args.output) if args.output else (
+        REPO_ROOT / DEPTH_ROI_BENCH_OUTPUT_DIR / f"{args.method}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"Report: {output}")
+
+
+if __name__ == "__main__":
+    main()
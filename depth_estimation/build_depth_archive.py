@@ -0,0 +1,219 @@
+"""
+Fill a session depth archive (depth_estimation/depth_archive.py) with dense depth once,
+so review/analysis tools can sample depth per frame without rerunning the model.
+
+    ./scripts/build_depth_archive.sh --session data/raw_data/<session> --method unidepth
+    ./scripts/build_depth_archive.sh --session data/labels/.../label_session_<ts> --method midas
+
+Works on sessions with images/ (timestamps from meta.csv when present) or video.avi.
+Re-running resumes: frames already filled are skipped. --overwrite starts over.
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+import sys
+import time
+
+import cv2
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from depth_estimation.batch_video import count_video_frames
+from depth_estimation.constants import (
+    DEPTH_ARCHIVE_BATCH_SIZE,
+    DEPTH_ARCHIVE_DTYPE,
+    DEPTH_ARCHIVE_STORE_SCALE,
+)
+from depth_estimation.depth_archive import DepthArchive, read_session_timestamps, session_archive_dir
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+
+
+class SessionFrames:
+    """Frame names, timestamps and batch reading for an images/ or video.avi session."""
+
+    def __init__(self, session_dir: Path):
+        self.session_dir = Path(session_dir)
+        images_dir = self.session_dir / "images"
+        video_path = self.session_dir / "video.avi"
+        if images_dir.is_dir():
+            self.image_paths = sorted(
+                (p for p in images_dir.iterdir() if p.is_file() and p.suffix.lower() in IMAGE_EXTS),
+                key=lambda p: p.name,
+            )
+            if not self.image_paths:
+                raise RuntimeError(f"No images found in {images_dir}")
+            self.video_path = None
+            self.names = [p.name for p in self.image_paths]
+            self.timestamps_s = read_session_timestamps(self.session_dir, self.names)
+            first = cv2.imread(str(self.image_paths[0]))
+            if first is None:
+                raise RuntimeError(f"Could not read image: {self.image_paths[0]}")
+            self.frame_size = (first.shape[1], first.shape[0])
+        elif video_path.is_file():
+            self.image_paths = []
+            self.video_path = video_path
+            cap = cv2.VideoCapture(str(video_path))
+            fps = float(cap.get(cv2.CAP_PROP_FPS)) or 30.0
+            self.frame_size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+            cap.release()
+            count = count_video_frames(video_path)
+            self.names = [f"frame_{i:06d}" for i in range(count)]
+            # Video sessions carry no wall clock per frame: time since the first frame.
+            self.timestamps_s = np.arange(count, dtype=np.float64) / fps
+        else:
+            raise RuntimeError(f"Session must contain images/ or video.avi: {self.session_dir}")
+
+    @property
+    def source(self) -> str:
+        return str(self.video_path or (self.session_dir / "images"))
+
+    def iter_batches(self, wanted: np.ndarray, batch_size: int):
+        """Yield (indices, frames_bgr) for the wanted frame indices, in order."""
+        wanted_set = set(int(i) for i in wanted)
+        indices: list[int] = []
+        frames: list[np.ndarray] = []
+        if self.video_path is None:
+            for i in sorted(wanted_set):
+                frame = cv2.imread(str(self.image_paths[i]))
+                if frame is None:
+                    print(f"Warning: could not read image {self.image_paths[i]}. Skipping.")
+                    continue
+                indices.append(i)
+                frames.append(frame)
+                if len(frames) == batch_size:
+                    yield indices, frames
+                    indices, frames = [], []
+        else:
+            cap = cv2.VideoCapture(str(self.video_path))
+            try:
+                i = 0
+                last = max(wanted_set) if wanted_set else -1
+                while i <= last:
+                    if i not in wanted_set:
+                        if not cap.grab():
+                            break
+                        i += 1
+                        continue
+                    ok, frame = cap.read()
+                    if not ok:
+                        break
+                    indices.append(i)
+                    frames.append(frame)
+                    i += 1
+                    if len(frames) == batch_size:
+                        yield indices, frames
+                        indices, frames = [], []
+            finally:
+                cap.release()
+        if frames:
+            yield indices, frames
+
+
+def build_pipeline(method: str):
+    """(pipeline, depth_units, model metadata) for a dense depth method."""
+    if method == "unidepth":
+        from depth_estimation.unidepth.pipeline import UniDepthPipeline
+
+        pipeline = UniDepthPipeline()
+        return pipeline, "m", {"model": "UniDepth v2 vitb14", "resolution_level": pipeline.resolution_level}
+    if method == "midas":
+        from depth_estimation.midas.pipeline import MiDaSPipeline
+
+        pipeline = MiDaSPipeline()
+        return pipeline, "relative_inverse", {"model_type": pipeline.model_type, "use_export": pipeline.use_export}
+    raise RuntimeError(f"Unsupported depth archive method: {method}")
+
+
+def open_or_create_archive(
+    archive_dir: Path,
+    frames: SessionFrames,
+    method: str,
+    depth_units: str,
+    model_meta: dict,
+    store_scale: float,
+    overwrite: bool,
+) -> DepthArchive:
+    if not overwrite and (archive_dir / "meta.json").is_file():
+        archive = DepthArchive.open(archive_dir, writable=True)
+        if archive.meta.get("frame_names") == frames.names and archive.meta.get("model") == model_meta:
+            return archive
+        print(f"Existing archive in {archive_dir} does not match this session/model; rebuilding.")
+        archive.close()
+    scale = min(1.0, max(0.05, float(store_scale)))
+    store_size = (max(1, round(frames.frame_size[0] * scale)), max(1, round(frames.frame_size[1] * scale)))
+    return DepthArchive.create(
+        archive_dir,
+        frame_count=len(frames.names),
+        frame_size=frames.frame_size,
+        method=method,
+        store_size=store_size,
+        frame_names=frames.names,
+        timestamps_s=frames.timestamps_s,
+        depth_units=depth_units,
+        model_meta=model_meta,
+        source=frames.source,
+        dtype=DEPTH_ARCHIVE_DTYPE,
+    )
+
+
+def fill_archive(archive: DepthArchive, frames: SessionFrames, infer_batch, batch_size: int) -> int:
+    """Run infer_batch(frames_bgr) -> depth maps on every unfilled frame; returns frames written."""
+    missing = archive.missing_indices()
+    if missing.size == 0:
+        return 0
+    written = 0
+    t_start = time.perf_counter()
+    for indices, batch in frames.iter_batches(missing, max(1, int(batch_size))):
+        t0 = time.perf_counter()
+        depths = infer_batch(batch)
+        per_frame_ms = (time.perf_counter() - t0) * 1000.0 / len(batch)
+        for frame_index, depth_map in zip(indices, depths):
+            archive.write(frame_index, depth_map, infer_ms=per_frame_ms)
+        written += len(indices)
+        elapsed = time.perf_counter() - t_start
+        print(f"{written}/{missing.size} frames ({written / max(1e-6, elapsed):.2f} fps)")
+    archive.flush()
+    return written
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Build a memory-mapped dense depth archive for a recorded session.")
+    parser.add_argument("--session", required=True, help="Session folder with images/ or video.avi.")
+    parser.add_argument("--method", choices=("unidepth", "midas"), default="unidepth")
+    parser.add_argument("--batch-size", type=int, default=DEPTH_ARCHIVE_BATCH_SIZE)
+    parser.add_argument("--store-scale", type=float, default=DEPTH_ARCHIVE_STORE_SCALE)
+    parser.add_argument("--overwrite", action="store_true", help="Discard an existing archive for this method.")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _build_arg_parser().parse_args(argv)
+    session_dir = Path(args.session)
+    if not session_dir.is_absolute():
+        session_dir = REPO_ROOT / session_dir
+    frames = SessionFrames(session_dir)
+    archive_dir = session_archive_dir(session_dir, args.method)
+
+    pipeline, depth_units, model_meta = build_pipeline(args.method)
+    archive = open_or_create_archive(
+        archive_dir, frames, args.method, depth_units, model_meta, args.store_scale, args.overwrite
+    )
+    print(f"Depth archive: {archive_dir}")
+    print(f"- frames: {len(archive)} ({len(archive.filled_indices())} already filled)")
+    print(f"- store size: {archive.meta['store_size'][0]}x{archive.meta['store_size'][1]} {archive.meta['dtype']}")
+    try:
+        written = fill_archive(archive, frames, pipeline._infer_depth_batch, args.batch_size)
+    finally:
+        archive.close()
+        pipeline.close()
+    print(f"Done: {written} frame(s) written.")
+
+
+if __name__ == "__main__":
+    main()
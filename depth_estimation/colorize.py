@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from functools import lru_cache
+
+import cv2
+import numpy as np
+
+from depth_estimation.constants import (
+    DEPTH_COLOR_PERCENTILES,
+    DEPTH_COLOR_RANGE_SAMPLE_STEP,
+    DEPTH_COLOR_RANGE_UPDATE_EVERY,
+)
+
+COLORMAP_CODES = {
+    "turbo": cv2.COLORMAP_TURBO,
+    "magma": cv2.COLORMAP_MAGMA,
+    "inferno": cv2.COLORMAP_INFERNO,
+    "jet": cv2.COLORMAP_JET,
+    "viridis": cv2.COLORMAP_VIRIDIS,
+}
+
+
+def resolve_colormap_code(colormap_name: str) -> int:
+    return COLORMAP_CODES.get(str(colormap_name).lower(), cv2.COLORMAP_TURBO)
+
+
+@lru_cache(maxsize=None)
+def _cached_lut(colormap_code: int, invert: bool) -> np.ndarray:
+    ramp = np.arange(256, dtype=np.uint8).reshape(256, 1)
+    lut = cv2.applyColorMap(ramp, colormap_code)
+    if invert:
+        lut = lut[::-1]
+    lut = np.ascontiguousarray(lut)
+    lut.setflags(write=False)
+    return lut
+
+
+def colormap_lut(colormap_name: str, invert: bool = False) -> np.ndarray:
+    """256x1 BGR lookup table for a colormap (built once per colormap); inverted tables map 0 to the top color."""
+    return _cached_lut(resolve_colormap_code(colormap_name), bool(invert))
+
+
+class DepthColorizer:
+    """
+    Depth map -> BGR visualization with reused buffers and a precomputed 256-entry LUT.
+
+    depth_range=(near, far) fixes the color scale. Otherwise the range is the percentiles of a
+    strided sample of the map, recomputed every range_update_every frames (1 = every frame;
+    percentiles=(0, 100) reproduces the old per-frame min/max). NaN/inf map to the range ends.
+
+    colorize() returns an internal buffer that the next call overwrites; pass out= or copy the
+    result if it has to outlive the call. One instance per thread.
+    """
+
+    def __init__(
+        self,
+        colormap_name: str = "turbo",
+        invert_colormap: bool = False,
+        depth_range: tuple[float, float] | None = None,
+        percentiles: tuple[float, float] = DEPTH_COLOR_PERCENTILES,
+        range_update_every: int = DEPTH_COLOR_RANGE_UPDATE_EVERY,
+        range_sample_step: int = DEPTH_COLOR_RANGE_SAMPLE_STEP,
+    ):
+        self.lut = colormap_lut(colormap_name, bool(invert_colormap))
+        self.fixed_range = None if depth_range is None else (float(depth_range[0]), float(depth_range[1]))
+        self.percentiles = (float(percentiles[0]), float(percentiles[1]))
+        self.range_update_every = max(1, int(range_update_every))
+        self.range_sample_step = max(1, int(range_sample_step))
+        self.depth_range: tuple[float, float] | None = self.fixed_range
+        self._frames_since_update = 0
+        self._scaled: np.ndarray | None = None
+        self._depth_u8: np.ndarray | None = None
+        self._bgr: np.ndarray | None = None
+
+    def reset_range(self) -> None:
+        """Force the robust range to be recomputed on the next frame (e.g. after a scene cut)."""
+        self.depth_range = self.fixed_range
+        self._frames_since_update = 0
+
+    def _estimate_range(self, depth_map: np.ndarray) -> tuple[float, float] | None:
+        step = self.range_sample_step
+        sample = depth_map[::step, ::step]
+        finite = sample[np.isfinite(sample)]
+        if finite.size == 0:
+            return None
+        lo_pct, hi_pct = self.percentiles
+        if lo_pct <= 0.0 and hi_pct >= 100.0:
+            return float(finite.min()), float(finite.max())
+        lo, hi = np.percentile(finite, (lo_pct, hi_pct))
+        return float(lo), float(hi)
+
+    def _current_range(self, depth_map: np.ndarray) -> tuple[float, float] | None:
+        if self.fixed_range is not None:
+            return self.fixed_range
+        if self.depth_range is None or self._frames_since_update >= self.range_update_every:
+            estimate = self._estimate_range(depth_map)
+            if estimate is not None:
+                self.depth_range = estimate
+                self._frames_since_update = 0
+        self._frames_since_update += 1
+        return self.depth_range
+
+    def _buffers(self, shape: tuple[int, int]) -> tuple[np.ndarray, np.ndarray]:
+        if self._scaled is None or self._scaled.shape != shape:
+            self._scaled = np.empty(shape, dtype=np.float32)
+            self._depth_u8 = np.empty(shape, dtype=np.uint8)
+            self._bgr = np.empty((*shape, 3), dtype=np.uint8)
+        return self._scaled, self._depth_u8
+
+    def colorize(self, depth_map: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
+        if depth_map.ndim != 2:
+            raise RuntimeError(f"Expected a 2D depth map, got shape {depth_map.shape}")
+        depth = depth_map if depth_map.dtype == np.float32 else depth_map.astype(np.float32)
+        scaled, depth_u8 = self._buffers(depth.shape)
+        if out is None:
+            out = self._bgr
+
+        depth_range = self._current_range(depth)
+        if depth_range is None:
+            depth_u8.fill(0)
+        else:
+            lo, hi = depth_range
+            hi = max(hi, lo + 1e-6)
+            # Clamp into the range, then one saturating affine pass to uint8 (cv::convertScaleAbs).
+            cv2.max(depth, lo, dst=scaled)
+            cv2.min(scaled, hi, dst=scaled)
+            cv2.patchNaNs(scaled, lo)
+            alpha = 255.0 / (hi - lo)
+            cv2.convertScaleAbs(scaled, depth_u8, alpha, -lo * alpha)
+        return cv2.applyColorMap(depth_u8, self.lut, out)
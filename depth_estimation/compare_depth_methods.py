@@ -0,0 +1,328 @@
+"""
+Offline depth method comparison over cached outputs of one recorded session.
+
+    ./scripts/compare_depth_methods.sh --session data/labels/<class>/all_data/test/<label_session>
+    ./scripts/compare_depth_methods.sh --session <session> --reference naive --naive-log <review_log.csv>
+
+Inputs (nothing is re-run):
+- naive bbox distances + raw bboxes from a session_depth_review.py CSV log (newest for the session by default)
+- dense depth archives under <session>/depth_archive/<method>/ (build_depth_archive.py), sampled in the raw bbox
+
+Frames are aligned by image name. Per band of reference distance the report gives coverage, bias,
+absolute/relative error, agreement rate, residual noise and frame-to-frame jitter of every method.
+MiDaS (relative inverse depth) is mapped to metres first by a least-squares fit 1/ref ~ a * x + b.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+from datetime import datetime
+import json
+from pathlib import Path
+import sys
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from depth_estimation.constants import (
+    DEPTH_ARCHIVE_DIRNAME,
+    DEPTH_COMPARE_AGREE_REL,
+    DEPTH_COMPARE_BANDS_M,
+    DEPTH_COMPARE_MIN_BAND_FRAMES,
+    DEPTH_COMPARE_OUTPUT_DIR,
+    DEPTH_COMPARE_REFERENCE,
+)
+from depth_estimation.depth_archive import DepthArchive
+from depth_estimation.naive_bbox_depth.constants import NAIVE_REVIEW_LOG_DIR, NAIVE_REVIEW_SESSION_DIR
+from depth_estimation.naive_bbox_depth.utils import resolve_repo_path
+
+
+def find_latest_naive_log(session_dir: Path, log_dir: str = NAIVE_REVIEW_LOG_DIR) -> Path:
+    logs = sorted(resolve_repo_path(log_dir).glob(f"{Path(session_dir).name}_naive_depth_*.csv"))
+    if not logs:
+        raise RuntimeError(
+            f"No naive review log for {Path(session_dir).name} in {log_dir}; "
+            "run ./scripts/session_naive_depth_review.sh on the session first."
+        )
+    return logs[-1]
+
+
+def _column(rows: list[dict], key: str) -> np.ndarray:
+    out = np.full(len(rows), np.nan, dtype=np.float64)
+    for i, row in enumerate(rows):
+        try:
+            out[i] = float(row.get(key, ""))
+        except (TypeError, ValueError):
+            continue
+    return out
+
+
+def load_naive_log(log_path: Path) -> dict[str, np.ndarray]:
+    """
+    Frame names, naive distances and raw bboxes (xyxy, NaN when no measurement) from a review log.
+    Re-running a review appends the same frames again, so only the last row per image_name is kept.
+    """
+    with Path(log_path).open(newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    if not rows:
+        raise RuntimeError(f"Empty naive review log: {log_path}")
+    latest: dict[object, dict] = {}
+    for i, row in enumerate(rows):
+        latest[row.get("image_name") or i] = row
+    if len(latest) < len(rows):
+        print(f"Note: {len(rows) - len(latest)} repeated frame rows in {log_path}; keeping the last row per frame.")
+        rows = list(latest.values())
+    measured = np.array([row.get("estimate_source") == "measurement" for row in rows])
+    width = _column(rows, "raw_bbox_width_px")
+    height = _column(rows, "raw_bbox_height_px")
+    # Logs written before raw_bbox_height_px was logged: fall back to a square box.
+    height = np.where(np.isfinite(height), height, width)
+    cx, cy = _column(rows, "raw_bbox_center_x_px"), _column(rows, "raw_bbox_center_y_px")
+    bboxes = np.stack([cx - 0.5 * width, cy - 0.5 * height, cx + 0.5 * width, cy + 0.5 * height], axis=1)
+    bboxes[~measured] = np.nan
+    raw_distance = np.where(measured, _column(rows, "raw_distance_m"), np.nan)
+    return {
+        "frame_index": _column(rows, "frame_index"),
+        "image_name": np.array([row.get("image_name", "") for row in rows]),
+        "bbox_xyxy": bboxes,
+        "naive_raw": raw_distance,
+        "naive": _column(rows, "distance_m"),
+    }
+
+
+def sample_archive_bbox_depth(archive: DepthArchive, image_names: np.ndarray, bboxes: np.ndarray) -> np.ndarray:
+    """Median archived depth inside each bbox (NaN for frames without a bbox or archive entry)."""
+    out = np.full(len(image_names), np.nan, dtype=np.float64)
+    for i, (name, bbox) in enumerate(zip(image_names, bboxes)):
+        if not np.all(np.isfinite(bbox)):
+            continue
+        frame_index = archive.index_of(str(name))
+        if frame_index is None:
+            continue
+        stats = archive.bbox_depth(frame_index, bbox)
+        if stats and "median" in stats:
+            out[i] = float(stats["median"])
+    return out
+
+
+def fit_inverse_to_metric(relative_inverse: np.ndarray, reference_m: np.ndarray) -> tuple[np.ndarray, dict]:
+    """Map relative inverse depth x to metres with 1/ref ~ a * x + b (least squares over shared frames)."""
+    valid = np.isfinite(relative_inverse) & np.isfinite(reference_m) & (reference_m > 0)
+    if int(valid.sum()) < 2:
+        return np.full_like(relative_inverse, np.nan), {"a": None, "b": None, "frames": int(valid.sum())}
+    design = np.stack([relative_inverse[valid], np.ones(int(valid.sum()))], axis=1)
+    (a, b), *_ = np.linalg.lstsq(design, 1.0 / reference_m[valid], rcond=None)
+    inverse = a * relative_inverse + b
+    with np.errstate(divide="ignore", invalid="ignore"):
+        metric = np.where(inverse > 1e-6, 1.0 / inverse, np.nan)
+    return metric, {"a": round(float(a), 6), "b": round(float(b), 6), "frames": int(valid.sum())}
+
+
+def _jitter(values: np.ndarray, frame_index: np.ndarray) -> np.ndarray:
+    """|v_t - v_{t-1}| for consecutive frames (NaN elsewhere), aligned to t."""
+    out = np.full(len(values), np.nan, dtype=np.float64)
+    if len(values) < 2:
+        return out
+    consecutive = np.diff(frame_index) == 1
+    out[1:] = np.where(consecutive, np.abs(np.diff(values)), np.nan)
+    return out
+
+
+def band_statistics(
+    values: np.ndarray,
+    reference: np.ndarray,
+    frame_index: np.ndarray,
+    band_edges: tuple[float, ...] = DEPTH_COMPARE_BANDS_M,
+    agree_rel: float = DEPTH_COMPARE_AGREE_REL,
+    min_band_frames: int = DEPTH_COMPARE_MIN_BAND_FRAMES,
+) -> list[dict]:
+    """Per reference-distance band: coverage, bias, errors, agreement, residual noise and jitter."""
+    edges = np.asarray(band_edges, dtype=np.float64)
+    n_bands = len(edges)
+    ref_ok = np.isfinite(reference) & (reference > 0)
+    band = np.full(len(reference), -1, dtype=np.int64)
+    band[ref_ok] = np.digitize(reference[ref_ok], edges) - 1
+    ref_ok &= band >= 0
+
+    both = ref_ok & np.isfinite(values)
+    diff = np.where(both, values - reference, 0.0)
+    rel = np.where(both, diff / np.where(ref_ok, reference, 1.0), 0.0)
+    agree = both & (np.abs(diff) <= agree_rel * np.where(ref_ok, reference, 0.0))
+    jitter = _jitter(values, frame_index)
+
+    idx = np.where(both, band, 0)
+    count = np.bincount(idx, weights=both.astype(np.float64), minlength=n_bands)
+    ref_count = np.bincount(np.where(ref_ok, band, 0), weights=ref_ok.astype(np.float64), minlength=n_bands)
+    sum_diff = np.bincount(idx, weights=diff, minlength=n_bands)
+    sum_abs = np.bincount(idx, weights=np.abs(diff), minlength=n_bands)
+    sum_sq = np.bincount(idx, weights=diff * diff, minlength=n_bands)
+    sum_agree = np.bincount(idx, weights=agree.astype(np.float64), minlength=n_bands)
+
+    rows = []
+    for b in range(n_bands):
+        upper = float(edges[b + 1]) if b + 1 < n_bands else None
+        n = int(count[b])
+        row: dict = {
+            "band_m": [float(edges[b]), upper],
+            "frames": n,
+            "coverage": round(n / ref_count[b], 4) if ref_count[b] else None,
+            "low_count": n < int(min_band_frames),
+        }
+        if n:
+            in_band = both & (band == b)
+            mean = sum_diff[b] / n
+            jit = jitter[in_band]
+            jit = jit[np.isfinite(jit)]
+            row.update(
+                {
+                    "bias_m": round(float(mean), 4),
+                    "mae_m": round(float(sum_abs[b] / n), 4),
+                    "median_abs_m": round(float(np.median(np.abs(diff[in_band]))), 4),
+                    "median_rel": round(float(np.median(rel[in_band])), 4),
+                    "agree_frac": round(float(sum_agree[b] / n), 4),
+                    "noise_std_m": round(float(np.sqrt(max(0.0, sum_sq[b] / n - mean * mean))), 4),
+                    "jitter_median_m": round(float(np.median(jit)), 4) if jit.size else None,
+                }
+            )
+        rows.append(row)
+    return rows
+
+
+def compare_methods(
+    table: dict[str, np.ndarray],
+    frame_index: np.ndarray,
+    reference: str = DEPTH_COMPARE_REFERENCE,
+    band_edges: tuple[float, ...] = DEPTH_COMPARE_BANDS_M,
+    agree_rel: float = DEPTH_COMPARE_AGREE_REL,
+) -> dict:
+    """table: method -> per-frame metric distance (NaN = no value), all aligned to frame_index."""
+    if reference not in table:
+        raise RuntimeError(f"Reference method {reference!r} not available; have {sorted(table)}")
+    ref = table[reference]
+    methods = {}
+    for name, values in table.items():
+        overall = band_statistics(values, ref, frame_index, (0.0,), agree_rel, 0)[0]
+        overall.pop("band_m")
+        overall.pop("low_count")
+        methods[name] = {
+            "frames_with_value": int(np.isfinite(values).sum()),
+            "overall": overall,
+            "bands": band_statistics(values, ref, frame_index, band_edges, agree_rel),
+        }
+    return {
+        "reference": reference,
+        "frames": int(len(frame_index)),
+        "band_edges_m": [float(e) for e in band_edges],
+        "agree_rel": float(agree_rel),
+        "methods": methods,
+    }
+
+
+def build_comparison_table(
+    session_dir: Path,
+    naive_log: Path,
+    archive_methods: list[str] | None = None,
+) -> tuple[dict[str, np.ndarray], dict[str, np.ndarray], dict]:
+    """(naive log columns, method -> metric distance per log row, notes about conversions)."""
+    naive = load_naive_log(naive_log)
+    table: dict[str, np.ndarray] = {"naive_raw": naive["naive_raw"], "naive": naive["naive"]}
+    archives: dict[str, DepthArchive] = {}
+    archive_root = Path(session_dir) / DEPTH_ARCHIVE_DIRNAME
+    if archive_methods is None:
+        archive_methods = sorted(p.name for p in archive_root.iterdir() if (p / "meta.json").is_file()) if archive_root.is_dir() else []
+    notes: dict = {"naive_log": str(naive_log), "archives": {}}
+    for method in archive_methods:
+        archive = DepthArchive.open(archive_root / method)
+        archives[method] = archive
+        table[method] = sample_archive_bbox_depth(archive, naive["image_name"], naive["bbox_xyxy"])
+        notes["archives"][method] = {"depth_units": archive.depth_units, "model": archive.meta.get("model")}
+    # Relative inverse depth gets a metric fit against a metric method (first metric archive, else naive).
+    metric_ref = next((m for m, a in archives.items() if a.depth_units == "m"), "naive_raw")
+    for method, archive in archives.items():
+        if archive.depth_units == "relative_inverse":
+            table[method], fit = fit_inverse_to_metric(table[method], table[metric_ref])
+            notes["archives"][method]["inverse_fit"] = {**fit, "against": metric_ref}
+        archive.close()
+    return naive, table, notes
+
+
+def write_aligned_csv(path: Path, naive: dict[str, np.ndarray], table: dict[str, np.ndarray]) -> None:
+    with Path(path).open("w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["frame_index", "image_name", *table])
+        for i in range(len(naive["image_name"])):
+            values = ["" if not np.isfinite(table[m][i]) else f"{table[m][i]:.4f}" for m in table]
+            writer.writerow([int(naive["frame_index"][i]), naive["image_name"][i], *values])
+
+
+def print_report(report: dict) -> None:
+    print(f"Depth method comparison vs {report['reference']} ({report['frames']} frames)")
+    for name, m in report["methods"].items():
+        o = m["overall"]
+        print(
+            f"\n{name}: {m['frames_with_value']} frames with a value, {o['frames']} aligned"
+            + (
+                f", bias {o['bias_m']:+.3f} m, MAE {o['mae_m']:.3f} m, agree {100 * o['agree_frac']:.0f}%"
+                if o["frames"]
+                else ""
+            )
+        )
+        if name == report["reference"]:
+            continue
+        print(f"  {'band m':<12} {'n':>5} {'cover':>6} {'bias':>7} {'MAE':>6} {'rel':>7} {'agree':>6} {'noise':>6} {'jitter':>7}")
+        for row in m["bands"]:
+            lo, hi = row["band_m"]
+            label = f"{lo:.1f}-{hi:.1f}" if hi is not None else f">{lo:.1f}"
+            if not row["frames"]:
+                print(f"  {label:<12} {0:>5}")
+                continue
+            jitter = row["jitter_median_m"]
+            print(
+                f"  {label:<12} {row['frames']:>5} {row['coverage'] or 0:>6.2f} {row['bias_m']:>+7.3f} "
+                f"{row['mae_m']:>6.3f} {row['median_rel']:>+7.3f} {row['agree_frac']:>6.2f} "
+                f"{row['noise_std_m']:>6.3f} {jitter if jitter is not None else float('nan'):>7.3f}"
+                + ("  (few frames)" if row["low_count"] else "")
+            )
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Compare cached depth methods on one recorded session.")
+    parser.add_argument("--session", default=NAIVE_REVIEW_SESSION_DIR)
+    parser.add_argument("--naive-log", default=None, help="session_depth_review CSV (default: newest for the session).")
+    parser.add_argument("--methods", default=None, help="Comma-separated archive methods (default: all archives found).")
+    parser.add_argument("--reference", default=DEPTH_COMPARE_REFERENCE)
+    parser.add_argument("--output", default=None, help="Report JSON path (default: runs/benchmarks/depth_compare/).")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _build_arg_parser().parse_args(argv)
+    session_dir = resolve_repo_path(args.session)
+    naive_log = Path(args.naive_log) if args.naive_log else find_latest_naive_log(session_dir)
+    methods = [m.strip() for m in args.methods.split(",") if m.strip()] if args.methods else None
+
+    naive, table, notes = build_comparison_table(session_dir, naive_log, methods)
+    report = {
+        "session": str(session_dir),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        **notes,
+        **compare_methods(table, naive["frame_index"], reference=args.reference),
+    }
+    print_report(report)
+
+    output = Path(args.output) if args.output else (
+        REPO_ROOT / DEPTH_COMPARE_OUTPUT_DIR / f"{session_dir.name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    aligned_csv = output.with_name(output.stem + "_frames.csv")
+    write_aligned_csv(aligned_csv, naive, table)
+    print(f"\nReport: {output}\nAligned frames: {aligned_csv}")
+
+
+if __name__ == "__main__":
+    main()
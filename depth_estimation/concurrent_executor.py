@@ -0,0 +1,201 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import threading
+import time
+from typing import Callable
+
+import cv2
+import numpy as np
+
+from depth_estimation.pipeline_base import LiveDepthPipeline, LiveFrameOutput
+from profiling import span
+
+
+@dataclass
+class MethodResult:
+    """Newest output of one method plus when the frame it used was captured and how long it took."""
+
+    output: LiveFrameOutput
+    frame_idx: int
+    capture_t: float
+    started_t: float
+    finished_t: float
+    rate_hz: float
+
+    @property
+    def latency_ms(self) -> float:
+        return (self.finished_t - self.started_t) * 1000.0
+
+    def age_ms(self, now: float | None = None) -> float:
+        return ((time.monotonic() if now is None else now) - self.capture_t) * 1000.0
+
+
+class _MethodWorker:
+    def __init__(self, executor: "ConcurrentPipelineExecutor", pipeline: LiveDepthPipeline):
+        self.executor = executor
+        self.pipeline = pipeline
+        self.method = pipeline.name
+        # Held while the pipeline processes a frame; apply() takes it to mutate the pipeline safely.
+        self.lock = threading.Lock()
+        self.result: MethodResult | None = None
+        self.frames_done = 0
+        self.frames_skipped = 0
+        self._last_seq = 0
+        self._rate_hz = 0.0
+        self.thread = threading.Thread(target=self._run, name=f"live-{self.method}", daemon=True)
+
+    def _run(self) -> None:
+        ex = self.executor
+        while True:
+            with ex._cond:
+                while ex._seq == self._last_seq and not ex._stop and ex._error is None:
+                    ex._cond.wait()
+                if ex._stop or ex._error is not None:
+                    return
+                frame, frame_idx, capture_t, seq = ex._frame, ex._frame_idx, ex._capture_t, ex._seq
+                if self._last_seq and seq - self._last_seq > 1:
+                    self.frames_skipped += seq - self._last_seq - 1
+                self._last_seq = seq
+            started_t = time.monotonic()
+            try:
+                with self.lock, span(f"executor.{self.method}", "pipeline"):
+                    output = self.pipeline.process_live_frame(frame)
+            except BaseException as exc:  # surfaced to the display thread by latest()
+                with ex._cond:
+                    ex._error = (self.method, exc)
+                    ex._cond.notify_all()
+                return
+            finished_t = time.monotonic()
+            previous = self.result
+            if previous is not None:
+                inst = 1.0 / max(1e-6, finished_t - previous.finished_t)
+                self._rate_hz = inst if self._rate_hz <= 0.0 else 0.2 * inst + 0.8 * self._rate_hz
+            with ex._cond:
+                self.result = MethodResult(output, frame_idx, capture_t, started_t, finished_t, self._rate_hz)
+                self.frames_done += 1
+                ex._cond.notify_all()
+
+
+class ConcurrentPipelineExecutor:
+    """
+    One worker thread per live pipeline, all reading a shared latest-frame slot.
+
+    submit() never blocks and overwrites the slot; each worker picks up the newest frame when
+    it is free, so a slow method (MiDaS, UniDepth) skips frames instead of throttling a fast one
+    (naive). latest() returns the most recent output of every method for display.
+    Pipelines must not modify the submitted frame in place (they all share it).
+    """
+
+    def __init__(self, pipelines: list[LiveDepthPipeline]):
+        if not pipelines:
+            raise RuntimeError("ConcurrentPipelineExecutor needs at least one pipeline.")
+        self._cond = threading.Condition()
+        self._frame: np.ndarray | None = None
+        self._frame_idx = 0
+        self._capture_t = 0.0
+        self._seq = 0
+        self._stop = False
+        self._error: tuple[str, BaseException] | None = None
+        self.workers = [_MethodWorker(self, pipeline) for pipeline in pipelines]
+        for worker in self.workers:
+            worker.thread.start()
+
+    @property
+    def methods(self) -> list[str]:
+        return [w.method for w in self.workers]
+
+    def submit(self, frame_bgr: np.ndarray, frame_idx: int, capture_t: float | None = None) -> None:
+        with self._cond:
+            self._frame = frame_bgr
+            self._frame_idx = int(frame_idx)
+            self._capture_t = time.monotonic() if capture_t is None else float(capture_t)
+            self._seq += 1
+            self._cond.notify_all()
+
+    def latest(self) -> dict[str, MethodResult | None]:
+        """Newest result per method (None until a method finished its first frame)."""
+        with self._cond:
+            if self._error is not None:
+                method, exc = self._error
+                raise RuntimeError(f"Live pipeline '{method}' failed: {exc}") from exc
+            return {w.method: w.result for w in self.workers}
+
+    def wait_for_all(self, frame_idx: int, timeout_s: float | None = None) -> bool:
+        """Block until every method has output for frame_idx or later (tests, replays)."""
+        deadline = None if timeout_s is None else time.monotonic() + timeout_s
+        with self._cond:
+            while self._error is None and any(w.result is None or w.result.frame_idx < frame_idx for w in self.workers):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0.0:
+                    return False
+                self._cond.wait(remaining)
+            return self._error is None
+
+    def apply(self, fn: Callable[[LiveDepthPipeline], object]) -> list[tuple[str, object]]:
+        """Call fn(pipeline) for every pipeline between frames (e.g. toggle_gating)."""
+        out = []
+        for worker in self.workers:
+            with worker.lock:
+                out.append((worker.method, fn(worker.pipeline)))
+        return out
+
+    def stats(self) -> dict[str, dict[str, int]]:
+        with self._cond:
+            return {w.method: {"done": w.frames_done, "skipped": w.frames_skipped} for w in self.workers}
+
+    def close(self, timeout_s: float = 5.0) -> None:
+        with self._cond:
+            self._stop = True
+            self._cond.notify_all()
+        for worker in self.workers:
+            worker.thread.join(timeout_s)
+
+
+def placeholder_frame(method: str, width: int, height: int) -> np.ndarray:
+    frame = np.zeros((height, width, 3), dtype=np.uint8)
+    cv2.putText(
+        frame,
+        f"{method}: waiting for first output",
+        (10, height // 2),
+        cv2.FONT_HERSHEY_SIMPLEX,
+        0.6,
+        (200, 200, 200),
+        1,
+        cv2.LINE_AA,
+    )
+    return frame
+
+
+def outputs_with_age_labels(
+    results: dict[str, MethodResult | None],
+    frame_size: tuple[int, int],
+    now: float | None = None,
+) -> list[LiveFrameOutput]:
+    """
+    One LiveFrameOutput per method for display: the newest output with an age/latency label drawn
+    on a copy of its frame (or a placeholder), plus age_ms / latency_ms / method_rate_hz metrics.
+    """
+    now = time.monotonic() if now is None else now
+    outputs = []
+    for method, result in results.items():
+        if result is None:
+            outputs.append(LiveFrameOutput(method=method, frame_bgr=placeholder_frame(method, *frame_size)))
+            continue
+        frame = result.output.frame_bgr.copy()
+        age_ms = result.age_ms(now)
+        label = f"{method}: age {age_ms:.0f} ms | {result.latency_ms:.0f} ms/frame | {result.rate_hz:.1f} Hz"
+        h = frame.shape[0]
+        cv2.rectangle(frame, (0, h - 26), (min(frame.shape[1], 12 + 9 * len(label)), h), (0, 0, 0), -1)
+        cv2.putText(frame, label, (6, h - 8), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1, cv2.LINE_AA)
+        metrics = dict(result.output.metrics)
+        metrics.update(
+            {
+                "age_ms": round(age_ms, 1),
+                "latency_ms": round(result.latency_ms, 1),
+                "method_rate_hz": round(result.rate_hz, 2),
+                "method_frame_idx": result.frame_idx,
+            }
+        )
+        outputs.append(LiveFrameOutput(method=result.output.method, frame_bgr=frame, metrics=metrics))
+    return outputs
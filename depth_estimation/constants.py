@@ -12,6 +12,7 @@ from depth_estimation.naive_bbox_depth.constants import (
 # Methods to run in the top-level live depth reviewer.
 # Keep this list small for real-time performance.
 # Example future config: ("naive", "unidepth")
+# "fused" = naive bbox distance corrected by a background dense depth worker (see fused_depth/).
 DEPTH_LIVE_REVIEW_METHODS = ("naive",)
 
 # Camera settings.
@@ -35,3 +36,53 @@ DEPTH_LIVE_REVIEW_TEXT_THICKNESS = 2
 # Controls.
 KEY_QUIT = set(NAIVE_KEY_QUIT)
 KEY_TOGGLE_GATING = set(NAIVE_KEY_TOGGLE_GATING)
+
+# ROI depth inference (infer_roi on the dense pipelines + benchmark_roi_depth.py).
+# Crop = bbox scaled by DEPTH_ROI_CONTEXT_SCALE around its center (context helps the model),
+# at least DEPTH_ROI_MIN_SIDE_PX per side, then padded to the model aspect range.
+DEPTH_ROI_CONTEXT_SCALE = 3.0
+DEPTH_ROI_MIN_SIDE_PX = 96
+# Stats are computed on the central part of the bbox (fraction kept) to stay off the background.
+DEPTH_ROI_STATS_SHRINK = 0.6
+# Benchmark defaults.
+DEPTH_ROI_BENCH_REPEATS = 10
+DEPTH_ROI_BENCH_WARMUP = 2
+DEPTH_ROI_BENCH_OUTPUT_DIR = "runs/benchmarks/roi_depth"
+
+# Batched offline video depth (depth_estimation/batch_video.py, --batched on the *_video scripts).
+# Max batches waiting between decode -> inference and inference -> encode; bounds memory.
+DEPTH_BATCH_QUEUE_BATCHES = 2
+
+# Session depth archive (depth_archive.py, built by build_depth_archive.py).
+# Stored under <session>/DEPTH_ARCHIVE_DIRNAME/<method>/ and read by the session review tools.
+DEPTH_ARCHIVE_DIRNAME = "depth_archive"
+DEPTH_ARCHIVE_DTYPE = "float16"
+# Depth is stored at this fraction of the frame size (0.5: ~150 KB per 640x480 frame in float16).
+DEPTH_ARCHIVE_STORE_SCALE = 0.5
+# Frames per model call while building; flush the memmaps every N written frames.
+DEPTH_ARCHIVE_BATCH_SIZE = 4
+DEPTH_ARCHIVE_FLUSH_EVERY = 50
+
+# Offline cross-method comparison (compare_depth_methods.py) over review logs + depth archives.
+# Methods are compared against DEPTH_COMPARE_REFERENCE per band of reference distance (m).
+DEPTH_COMPARE_REFERENCE = "unidepth"
+DEPTH_COMPARE_BANDS_M = (0.0, 0.5, 1.0, 1.5, 2.0, 3.0)
+# |method - reference| <= this fraction of the reference counts as agreement.
+DEPTH_COMPARE_AGREE_REL = 0.10
+# Bands with fewer aligned frames are reported but flagged.
+DEPTH_COMPARE_MIN_BAND_FRAMES = 10
+DEPTH_COMPARE_OUTPUT_DIR = "runs/benchmarks/depth_compare"
+
+# Multi-method live runners (live_depth_estimation.py, live_depth_review.py).
+# With more than one method, each pipeline runs on its own worker thread over the latest camera
+# frame (concurrent_executor.py) so a slow dense method does not throttle naive.
+DEPTH_LIVE_CONCURRENT = True
+
+# Depth colorization (colorize.py DepthColorizer) for the live / video views.
+# Without a fixed range, the color scale spans these percentiles of every DEPTH_COLOR_RANGE_SAMPLE_STEP-th
+# pixel, recomputed every DEPTH_COLOR_RANGE_UPDATE_EVERY frames (stable colors, cheap per frame).
+DEPTH_COLOR_PERCENTILES = (2.0, 98.0)
+DEPTH_COLOR_RANGE_UPDATE_EVERY = 15
+DEPTH_COLOR_RANGE_SAMPLE_STEP = 4
+DEPTH_COLOR_BENCH_REPEATS = 200
+DEPTH_COLOR_BENCH_OUTPUT_DIR = "runs/benchmarks/colorize"
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import csv
+from datetime import datetime
+import json
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from depth_estimation.constants import (
+    DEPTH_ARCHIVE_DIRNAME,
+    DEPTH_ARCHIVE_DTYPE,
+    DEPTH_ARCHIVE_FLUSH_EVERY,
+)
+from depth_estimation.roi_depth import roi_depth_stats
+
+ARCHIVE_VERSION = 1
+DEPTH_FILE = "depth.npy"
+INDEX_FILE = "index.npy"
+META_FILE = "meta.json"
+
+# Per-frame record; `filled` is set only after the depth slice is written, so a crash mid-run
+# leaves at worst one frame unfilled (and it is redone on resume).
+INDEX_DTYPE = np.dtype([("filled", "u1"), ("timestamp_s", "f8"), ("infer_ms", "f4")])
+
+
+def session_archive_dir(session_dir: Path, method: str) -> Path:
+    return Path(session_dir) / DEPTH_ARCHIVE_DIRNAME / method
+
+
+def read_session_timestamps(session_dir: Path, frame_names: list[str]) -> np.ndarray:
+    """
+    Wall-clock timestamps per frame from the session meta.csv (images_get_data.py), NaN where
+    a frame is not listed or the session has no meta.csv.
+    """
+    out = np.full(len(frame_names), np.nan, dtype=np.float64)
+    meta_path = Path(session_dir) / "meta.csv"
+    if not meta_path.is_file():
+        return out
+    by_name: dict[str, float] = {}
+    with meta_path.open(newline="") as f:
+        for row in csv.DictReader(f):
+            try:
+                by_name[row["filename"]] = float(row["t_wall"])
+            except (KeyError, TypeError, ValueError):
+                continue
+    for i, name in enumerate(frame_names):
+        if name in by_name:
+            out[i] = by_name[name]
+    return out
+
+
+class DepthArchive:
+    """
+    Session-level dense depth store: one memory-mapped (N, H, W) array plus a per-frame index.
+
+        <session>/depth_archive/<method>/
+            depth.npy   float16 (N, H, W), depth at DEPTH_ARCHIVE_STORE_SCALE of the frame size
+            index.npy   structured (N,): filled, timestamp_s, infer_ms
+            meta.json   method, model metadata, depth units, frame size, frame names
+
+    Frames are addressed by position in the session (frame_names[i]) and can be written in any
+    order; readers map only the pages they touch.
+    """
+
+    def __init__(self, archive_dir: Path, depth: np.ndarray, index: np.ndarray, meta: dict, writable: bool):
+        self.archive_dir = Path(archive_dir)
+        self.depth = depth
+        self.index = index
+        self.meta = meta
+        self.writable = writable
+        self._name_to_index = {name: i for i, name in enumerate(meta.get("frame_names") or [])}
+        self._writes_since_flush = 0
+
+    @classmethod
+    def create(
+        cls,
+        archive_dir: Path,
+        frame_count: int,
+        frame_size: tuple[int, int],
+        method: str,
+        store_size: tuple[int, int] | None = None,
+        frame_names: list[str] | None = None,
+        timestamps_s: np.ndarray | None = None,
+        depth_units: str = "m",
+        model_meta: dict | None = None,
+        source: str = "",
+        dtype: str = DEPTH_ARCHIVE_DTYPE,
+    ) -> "DepthArchive":
+        archive_dir = Path(archive_dir)
+        frame_count = int(frame_count)
+        if frame_count <= 0:
+            raise RuntimeError(f"Depth archive needs at least one frame, got {frame_count}")
+        if frame_names is not None and len(frame_names) != frame_count:
+            raise RuntimeError(f"frame_names has {len(frame_names)} entries for {frame_count} frames")
+        store_w, store_h = store_size or frame_size
+        archive_dir.mkdir(parents=True, exist_ok=True)
+
+        depth = np.lib.format.open_memmap(
+            str(archive_dir / DEPTH_FILE), mode="w+", dtype=np.dtype(dtype), shape=(frame_count, int(store_h), int(store_w))
+        )
+        index = np.lib.format.open_memmap(str(archive_dir / INDEX_FILE), mode="w+", dtype=INDEX_DTYPE, shape=(frame_count,))
+        index["filled"] = 0
+        index["timestamp_s"] = np.nan if timestamps_s is None else np.asarray(timestamps_s, dtype=np.float64)
+        index["infer_ms"] = np.nan
+        index.flush()
+
+        meta = {
+            "version": ARCHIVE_VERSION,
+            "method": method,
+            "depth_units": depth_units,
+            "model": dict(model_meta or {}),
+            "source": source,
+            "frame_count": frame_count,
+            "frame_size": [int(frame_size[0]), int(frame_size[1])],
+            "store_size": [int(store_w), int(store_h)],
+            "dtype": np.dtype(dtype).name,
+            "frame_names": list(frame_names) if frame_names is not None else None,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        (archive_dir / META_FILE).write_text(json.dumps(meta, indent=2))
+        return cls(archive_dir, depth, index, meta, writable=True)
+
+    @classmethod
+    def open(cls, archive_dir: Path, writable: bool = False) -> "DepthArchive":
+        archive_dir = Path(archive_dir)
+        meta_path = archive_dir / META_FILE
+        if not meta_path.is_file():
+            raise RuntimeError(f"Not a depth archive (missing {META_FILE}): {archive_dir}")
+        meta = json.loads(meta_path.read_text())
+        if int(meta.get("version", 0)) != ARCHIVE_VERSION:
+            raise RuntimeError(f"Unsupported depth archive version {meta.get('version')} in {archive_dir}")
+        mode = "r+" if writable else "r"
+        depth = np.load(archive_dir / DEPTH_FILE, mmap_mode=mode)
+        index = np.load(archive_dir / INDEX_FILE, mmap_mode=mode)
+        if depth.shape[0] != index.shape[0]:
+            raise RuntimeError(f"Depth archive is inconsistent: {depth.shape[0]} maps, {index.shape[0]} index rows")
+        return cls(archive_dir, depth, index, meta, writable=writable)
+
+    def __len__(self) -> int:
+        return int(self.depth.shape[0])
+
+    @property
+    def method(self) -> str:
+        return str(self.meta.get("method", ""))
+
+    @property
+    def depth_units(self) -> str:
+        return str(self.meta.get("depth_units", ""))
+
+    @property
+    def frame_size(self) -> tuple[int, int]:
+        w, h = self.meta["frame_size"]
+        return int(w), int(h)
+
+    def index_of(self, frame_name: str) -> int | None:
+        return self._name_to_index.get(frame_name)
+
+    def has(self, frame_index: int) -> bool:
+        return 0 <= frame_index < len(self) and bool(self.index["filled"][frame_index])
+
+    def filled_indices(self) -> np.ndarray:
+        return np.flatnonzero(np.asarray(self.index["filled"]))
+
+    def missing_indices(self) -> np.ndarray:
+        return np.flatnonzero(np.asarray(self.index["filled"]) == 0)
+
+    def timestamp(self, frame_index: int) -> float | None:
+        value = float(self.index["timestamp_s"][frame_index])
+        return None if np.isnan(value) else value
+
+    def write(
+        self,
+        frame_index: int,
+        depth_map: np.ndarray,
+        infer_ms: float | None = None,
+        timestamp_s: float | None = None,
+    ) -> None:
+        if not self.writable:
+            raise RuntimeError(f"Depth archive opened read-only: {self.archive_dir}")
+        store_w, store_h = self.meta["store_size"]
+        depth_map = np.asarray(depth_map, dtype=np.float32).squeeze()
+        if depth_map.shape != (store_h, store_w):
+            interpolation = cv2.INTER_AREA if depth_map.shape[1] > store_w else cv2.INTER_LINEAR
+            depth_map = cv2.resize(depth_map, (store_w, store_h), interpolation=interpolation)
+        self.depth[frame_index] = depth_map
+        if infer_ms is not None:
+            self.index["infer_ms"][frame_index] = float(infer_ms)
+        if timestamp_s is not None:
+            self.index["timestamp_s"][frame_index] = float(timestamp_s)
+        self.index["filled"][frame_index] = 1
+        self._writes_since_flush += 1
+        if self._writes_since_flush >= max(1, DEPTH_ARCHIVE_FLUSH_EVERY):
+            self.flush()
+
+    def read(self, frame_index: int) -> np.ndarray | None:
+        """Depth map at store resolution as float32, or None if the frame is not filled yet."""
+        if not self.has(frame_index):
+            return None
+        return np.asarray(self.depth[frame_index], dtype=np.float32)
+
+    def bbox_depth(self, frame_index: int, bbox_xyxy, shrink: float | None = None) -> dict | None:
+        """roi_depth_stats inside bbox_xyxy (frame pixel coordinates) without loading the full map."""
+        if not self.has(frame_index):
+            return None
+        kwargs = {} if shrink is None else {"shrink": shrink}
+        return roi_depth_stats(self.depth[frame_index], bbox_xyxy, self.frame_size, **kwargs)
+
+    def flush(self) -> None:
+        if self.writable:
+            self.depth.flush()
+            self.index.flush()
+        self._writes_since_flush = 0
+
+    def close(self) -> None:
+        self.flush()
+        self.depth = None
+        self.index = None
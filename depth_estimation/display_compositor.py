@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+FONT = cv2.FONT_HERSHEY_SIMPLEX
+Color = tuple[int, int, int]
+PanelLine = tuple[str, Color, float]
+
+
+class TextCache:
+    """LRU of rendered text, so labels/headers that repeat every frame are rasterized once."""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max(1, int(max_entries))
+        self._entries: OrderedDict[tuple, np.ndarray] = OrderedDict()
+
+    def _get(self, key: tuple) -> np.ndarray | None:
+        patch = self._entries.get(key)
+        if patch is not None:
+            self._entries.move_to_end(key)
+        return patch
+
+    def _put(self, key: tuple, patch: np.ndarray) -> np.ndarray:
+        self._entries[key] = patch
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return patch
+
+    def block(self, text: str, scale: float, color: Color, thickness: int, bg: Color, height: int, descent: int):
+        """Text on a solid bg band of the given height, baseline `descent` px above the bottom."""
+        key = ("block", text, float(scale), color, int(thickness), bg, int(height), int(descent))
+        patch = self._get(key)
+        if patch is None:
+            (w, _h), _ = cv2.getTextSize(text, FONT, float(scale), int(thickness))
+            patch = np.empty((int(height), w + 2, 3), dtype=np.uint8)
+            patch[:] = bg
+            cv2.putText(patch, text, (0, int(height) - int(descent)), FONT, float(scale), color, int(thickness), cv2.LINE_AA)
+            patch = self._put(key, patch)
+        return patch
+
+    def mask(self, text: str, scale: float, thickness: int) -> tuple[np.ndarray, int]:
+        """(alpha mask, baseline offset from the mask top) for drawing text over an image."""
+        key = ("mask", text, float(scale), int(thickness))
+        entry = self._get(key)
+        if entry is None:
+            (w, h), baseline = cv2.getTextSize(text, FONT, float(scale), int(thickness))
+            top = h + int(thickness)
+            mask = np.zeros((top + baseline + int(thickness), w + 2), dtype=np.uint8)
+            cv2.putText(mask, text, (0, top), FONT, float(scale), 255, int(thickness), cv2.LINE_AA)
+            entry = self._put(key, (mask, top))
+        return entry
+
+
+class DisplayCompositor:
+    """
+    Multi-panel display (frames side by side + optional text side panel) on one preallocated canvas.
+
+    Frames are resized straight into views of the canvas; the canvas is reallocated only when the
+    layout (input shapes, panel width) changes. Panel lines are cached rendered text blocks and a line
+    is only redrawn when its text changed since the previous frame. The returned canvas is reused by
+    the next compose() call.
+    """
+
+    def __init__(
+        self,
+        target_height: int,
+        panel_width: int = 0,
+        panel_bg: Color = (22, 22, 22),
+        line_height: int = 22,
+        text_thickness: int = 2,
+        panel_pad_x: int = 14,
+        panel_top_y: int = 28,
+        text_cache_size: int = 512,
+    ):
+        self.target_height = int(target_height)
+        self.panel_width = max(0, int(panel_width))
+        self.panel_bg = tuple(int(c) for c in panel_bg)
+        self.line_height = max(8, int(line_height))
+        self.text_thickness = int(text_thickness)
+        self.panel_pad_x = int(panel_pad_x)
+        self.panel_top_y = int(panel_top_y)
+        self.text = TextCache(text_cache_size)
+        self.canvas: np.ndarray | None = None
+        self._layout_key: tuple | None = None
+        self._frame_slots: list[tuple[int, int]] = []
+        self._panel_x = 0
+        self._slot_keys: dict[int, tuple] = {}
+
+    ###################################### Layout ##########################################################
+
+    def _layout(self, frames: list[np.ndarray]) -> np.ndarray:
+        key = (tuple(f.shape for f in frames), self.panel_width, self.target_height)
+        if key == self._layout_key and self.canvas is not None:
+            return self.canvas
+        h = self.target_height
+        slots = []
+        x = 0
+        for frame in frames:
+            fh, fw = frame.shape[:2]
+            w = fw if fh == h else max(1, int(fw * (h / fh)))
+            slots.append((x, x + w))
+            x += w
+        self.canvas = np.empty((h, x + self.panel_width, 3), dtype=np.uint8)
+        self._frame_slots = slots
+        self._panel_x = x
+        self._slot_keys = {}
+        if self.panel_width:
+            self.canvas[:, x:] = self.panel_bg
+            cv2.line(self.canvas, (x, 0), (x, h - 1), (80, 80, 80), 1)
+        self._layout_key = key
+        return self.canvas
+
+    def place_frames(self, frames: list[np.ndarray]) -> np.ndarray:
+        canvas = self._layout(frames)
+        for frame, (x0, x1) in zip(frames, self._frame_slots):
+            view = canvas[:, x0:x1]
+            if frame.shape[:2] == view.shape[:2]:
+                np.copyto(view, frame)
+            else:
+                cv2.resize(frame, (x1 - x0, self.target_height), dst=view, interpolation=cv2.INTER_AREA)
+        return canvas
+
+    @property
+    def frames_width(self) -> int:
+        return self._panel_x
+
+    ###################################### Text ############################################################
+
+    def _panel_slot(self, y: int, line: PanelLine | None) -> None:
+        """Draw one panel line with baseline y; skipped when the same line is already there."""
+        key = (line,) if line is None else (line[0], tuple(int(c) for c in line[1]), float(line[2]))
+        if self._slot_keys.get(y) == key:
+            return
+        self._slot_keys[y] = key
+        descent = max(3, self.line_height // 4)
+        top = y - self.line_height + descent
+        x0 = self._panel_x + 2
+        band = self.canvas[max(0, top):y + descent, x0:]
+        band[:] = self.panel_bg
+        if line is None or not line[0]:
+            return
+        text, color, scale = line
+        patch = self.text.block(
+            text, scale, tuple(int(c) for c in color), self.text_thickness, self.panel_bg, self.line_height, descent
+        )
+        px = self.panel_pad_x - 2
+        width = min(patch.shape[1], band.shape[1] - px)
+        if width > 0:
+            row0 = max(0, top) - top
+            band[:, px:px + width] = patch[row0:row0 + band.shape[0], :width]
+
+    def draw_panel(self, lines: list[PanelLine], footer: PanelLine | None = None) -> None:
+        if not self.panel_width or self.canvas is None:
+            return
+        h = self.canvas.shape[0]
+        footer_y = h - 12
+        max_y = footer_y - self.line_height if footer is not None else h - 4
+        slots = list(range(self.panel_top_y, max_y + 1, self.line_height))
+        shown = list(lines)
+        if len(shown) > len(slots) and slots:
+            shown = shown[: len(slots) - 1] + [("...", shown[len(slots) - 1][1], 0.55)]
+        for k, y in enumerate(slots):
+            self._panel_slot(y, shown[k] if k < len(shown) else None)
+        if footer is not None:
+            self._panel_slot(footer_y, footer)
+
+    def overlay_text(self, text: str, org: tuple[int, int], scale: float, color: Color, thickness: int = 2) -> None:
+        """Draw text over the frame area (redrawn every frame, rasterized once via a cached mask)."""
+        if self.canvas is None or not text:
+            return
+        mask, top = self.text.mask(text, scale, thickness)
+        x, y = int(org[0]), int(org[1]) - top
+        h, w = self.canvas.shape[:2]
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(w, x + mask.shape[1]), min(h, y + mask.shape[0])
+        if x1 <= x0 or y1 <= y0:
+            return
+        # Blend with the anti-aliased mask as coverage, like cv2.putText(..., LINE_AA) on the frame.
+        alpha = mask[y0 - y:y1 - y, x0 - x:x1 - x, None].astype(np.float32) * (1.0 / 255.0)
+        roi = self.canvas[y0:y1, x0:x1]
+        blended = roi + (np.asarray(color, dtype=np.float32) - roi) * alpha
+        np.copyto(roi, blended + 0.5, casting="unsafe")
+
+    def compose(
+        self,
+        frames: list[np.ndarray],
+        panel_lines: list[PanelLine] | None = None,
+        footer: PanelLine | None = None,
+    ) -> np.ndarray:
+        canvas = self.place_frames(frames)
+        if panel_lines is not None:
+            self.draw_panel(panel_lines, footer)
+        return canvas
@@ -0,0 +1,13 @@
+"""Fused bbox + dense depth pipeline package."""
+
+from typing import Any
+
+__all__ = ["FusedDepthPipeline"]
+
+
+def __getattr__(name: str) -> Any:
+    if name == "FusedDepthPipeline":
+        from .pipeline import FusedDepthPipeline
+
+        return FusedDepthPipeline
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
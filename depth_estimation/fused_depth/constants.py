@@ -0,0 +1,54 @@
+########################################## Dense Worker Constants ##########################################
+
+# Dense metric depth model run in the background worker.
+# Only metric methods make sense as a reference ("unidepth"); MiDaS outputs relative inverse depth.
+FUSED_DENSE_METHOD = "unidepth"
+
+# UniDepth resolution level for the worker (None = model default, lower = faster).
+FUSED_DENSE_RESOLUTION_LEVEL = None
+
+# Depth inside the bbox is sampled from the central part of the box only
+# (fraction of width/height kept) to stay off the background around the thin drone frame.
+FUSED_BBOX_SAMPLE_SHRINK = 0.5
+# Low percentile of the sampled depths: the nearest surfaces belong to the drone, background is farther.
+FUSED_BBOX_SAMPLE_PERCENTILE = 25.0
+# Minimum finite depth pixels inside the sampled box for a usable reference.
+FUSED_BBOX_MIN_PIXELS = 9
+
+# Dense reference values outside this range are dropped (metres).
+FUSED_DENSE_MIN_DEPTH_M = 0.05
+FUSED_DENSE_MAX_DEPTH_M = 10.0
+
+
+########################################## Scale / Bias Fit Constants ######################################
+
+# dense_depth ~= scale * bbox_distance + bias, fitted with exponential forgetting.
+# Per-sample forgetting factor: 0.95 => the last ~20 dense samples dominate.
+FUSED_FORGETTING = 0.95
+# Ridge prior pulling the fit towards scale=1, bias=0 (identity) when samples are few/degenerate.
+FUSED_PRIOR_SCALE_WEIGHT = 2.0
+FUSED_PRIOR_BIAS_WEIGHT = 4.0
+# Identity correction is used until this many dense samples were accepted.
+FUSED_MIN_SAMPLES = 3
+
+# Outlier rejection once the fit is active: residual > N * residual std is rejected.
+FUSED_OUTLIER_SIGMA = 3.0
+# Floor for the residual std so a very tight fit does not reject everything (metres).
+FUSED_RESIDUAL_STD_FLOOR_M = 0.05
+
+# Hard limits on the fitted correction.
+FUSED_SCALE_LIMITS = (0.5, 2.0)
+FUSED_BIAS_LIMIT_M = 0.5
+
+
+########################################## Display Constants ###############################################
+
+# Colorized dense depth inset (top-right corner of the naive frame).
+FUSED_SHOW_DENSE_INSET = True
+FUSED_INSET_WIDTH = 200
+FUSED_INSET_COLORMAP = "turbo"
+FUSED_INSET_INVERT_COLORMAP = True
+FUSED_TEXT_COLOR = (0, 220, 255)
+FUSED_TEXT_SCALE = 0.55
+FUSED_TEXT_THICKNESS = 2
+FUSED_TEXT_LINE_HEIGHT = 22
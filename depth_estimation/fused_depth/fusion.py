@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import math
+
+import numpy as np
+
+from depth_estimation.fused_depth.constants import (
+    FUSED_BBOX_MIN_PIXELS,
+    FUSED_BBOX_SAMPLE_PERCENTILE,
+    FUSED_BBOX_SAMPLE_SHRINK,
+    FUSED_BIAS_LIMIT_M,
+    FUSED_DENSE_MAX_DEPTH_M,
+    FUSED_DENSE_MIN_DEPTH_M,
+    FUSED_FORGETTING,
+    FUSED_MIN_SAMPLES,
+    FUSED_OUTLIER_SIGMA,
+    FUSED_PRIOR_BIAS_WEIGHT,
+    FUSED_PRIOR_SCALE_WEIGHT,
+    FUSED_RESIDUAL_STD_FLOOR_M,
+    FUSED_SCALE_LIMITS,
+)
+from depth_estimation.roi_depth import bbox_depth_values
+
+
+def sample_bbox_depth(
+    depth_map: np.ndarray,
+    bbox_xyxy: tuple[float, float, float, float],
+    frame_size: tuple[int, int],
+    shrink: float = FUSED_BBOX_SAMPLE_SHRINK,
+    percentile: float = FUSED_BBOX_SAMPLE_PERCENTILE,
+    min_pixels: int = FUSED_BBOX_MIN_PIXELS,
+) -> float | None:
+    """Robust depth inside a frame-space bbox; the depth map may have a different resolution."""
+    _pixels, values = bbox_depth_values(depth_map, bbox_xyxy, frame_size, shrink)
+    values = values[values > 0.0]
+    if values.size < max(1, int(min_pixels)):
+        return None
+    return float(np.percentile(values, percentile))
+
+
+class ScaleBiasFit:
+    """
+    Exponentially weighted least squares fit of dense_depth ~= scale * bbox_distance + bias.
+
+    Sufficient statistics decay by `forgetting` per accepted sample, so the correction
+    tracks slow changes (lighting, bbox tightness, model drift) without storing history.
+    A ridge prior towards the identity keeps the 2x2 system well conditioned while the
+    samples still span a narrow distance range.
+    """
+
+    def __init__(
+        self,
+        forgetting: float = FUSED_FORGETTING,
+        prior_scale_weight: float = FUSED_PRIOR_SCALE_WEIGHT,
+        prior_bias_weight: float = FUSED_PRIOR_BIAS_WEIGHT,
+        min_samples: int = FUSED_MIN_SAMPLES,
+        outlier_sigma: float = FUSED_OUTLIER_SIGMA,
+        residual_std_floor_m: float = FUSED_RESIDUAL_STD_FLOOR_M,
+        scale_limits: tuple[float, float] = FUSED_SCALE_LIMITS,
+        bias_limit_m: float = FUSED_BIAS_LIMIT_M,
+        min_depth_m: float = FUSED_DENSE_MIN_DEPTH_M,
+        max_depth_m: float = FUSED_DENSE_MAX_DEPTH_M,
+    ):
+        if not 0.0 < forgetting <= 1.0:
+            raise ValueError(f"forgetting must be in (0, 1], got {forgetting}")
+        self.forgetting = float(forgetting)
+        self.prior_scale_weight = max(0.0, float(prior_scale_weight))
+        self.prior_bias_weight = max(0.0, float(prior_bias_weight))
+        self.min_samples = max(1, int(min_samples))
+        self.outlier_sigma = float(outlier_sigma)
+        self.residual_std_floor_m = max(1e-6, float(residual_std_floor_m))
+        self.scale_limits = (float(scale_limits[0]), float(scale_limits[1]))
+        self.bias_limit_m = abs(float(bias_limit_m))
+        self.min_depth_m = float(min_depth_m)
+        self.max_depth_m = float(max_depth_m)
+        self.reset()
+
+    def reset(self) -> None:
+        self.scale = 1.0
+        self.bias = 0.0
+        self.samples = 0
+        self.rejected = 0
+        self._sw = 0.0
+        self._sb = 0.0
+        self._sbb = 0.0
+        self._sd = 0.0
+        self._sbd = 0.0
+        self._residual_var = self.residual_std_floor_m**2
+
+    @property
+    def active(self) -> bool:
+        return self.samples >= self.min_samples
+
+    @property
+    def residual_std_m(self) -> float:
+        return max(self.residual_std_floor_m, math.sqrt(self._residual_var))
+
+    def update(self, bbox_distance_m: float, dense_depth_m: float) -> bool:
+        """Add one (bbox, dense) pair measured on the same frame. Returns False if rejected."""
+        b = float(bbox_distance_m)
+        d = float(dense_depth_m)
+        if not (math.isfinite(b) and math.isfinite(d)) or b <= 0.0:
+            self.rejected += 1
+            return False
+        if not self.min_depth_m <= d <= self.max_depth_m:
+            self.rejected += 1
+            return False
+
+        residual = d - self.apply(b)
+        if self.active and abs(residual) > self.outlier_sigma * self.residual_std_m:
+            self.rejected += 1
+            return False
+
+        lam = self.forgetting
+        self._sw = lam * self._sw + 1.0
+        self._sb = lam * self._sb + b
+        self._sbb = lam * self._sbb + b * b
+        self._sd = lam * self._sd + d
+        self._sbd = lam * self._sbd + b * d
+        self.samples += 1
+        if self.samples > 1:
+            self._residual_var = lam * self._residual_var + (1.0 - lam) * residual * residual
+        self._solve()
+        return True
+
+    def _solve(self) -> None:
+        # Normal equations of sum(w * (d - s*b - c)^2) + a*(s - 1)^2 + g*c^2.
+        a11 = self._sbb + self.prior_scale_weight
+        a12 = self._sb
+        a22 = self._sw + self.prior_bias_weight
+        r1 = self._sbd + self.prior_scale_weight
+        r2 = self._sd
+        det = a11 * a22 - a12 * a12
+        if det <= 1e-12:
+            return
+        scale = (r1 * a22 - a12 * r2) / det
+        bias = (a11 * r2 - a12 * r1) / det
+        self.scale = min(self.scale_limits[1], max(self.scale_limits[0], scale))
+        self.bias = min(self.bias_limit_m, max(-self.bias_limit_m, bias))
+
+    def apply(self, bbox_distance_m: float) -> float:
+        if not self.active:
+            return float(bbox_distance_m)
+        return self.scale * float(bbox_distance_m) + self.bias
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import time
+
+import cv2
+import numpy as np
+
+from depth_estimation.fused_depth.constants import (
+    FUSED_INSET_WIDTH,
+    FUSED_SHOW_DENSE_INSET,
+    FUSED_TEXT_COLOR,
+    FUSED_TEXT_LINE_HEIGHT,
+    FUSED_TEXT_SCALE,
+    FUSED_TEXT_THICKNESS,
+)
+from depth_estimation.fused_depth.fusion import ScaleBiasFit
+from depth_estimation.fused_depth.worker import DenseDepthFn, DenseDepthWorker, DenseSample
+from depth_estimation.pipeline_base import LiveDepthPipeline, LiveFrameOutput
+from profiling import traced
+
+
+class FusedDepthPipeline(LiveDepthPipeline):
+    """
+    Naive bbox-width distance at full frame rate, corrected by a slowly updated
+    scale/bias fitted against dense metric depth sampled inside the tracked bbox.
+
+    The dense model runs in DenseDepthWorker on the newest measured frame; each
+    finished sample is paired with the bbox distance of that same frame, so the
+    fit is not biased by the worker latency.
+    """
+
+    name = "fused"
+
+    def __init__(
+        self,
+        naive_pipeline: LiveDepthPipeline | None = None,
+        dense_depth_fn: DenseDepthFn | None = None,
+        fit: ScaleBiasFit | None = None,
+        show_dense_inset: bool = FUSED_SHOW_DENSE_INSET,
+    ):
+        if naive_pipeline is None:
+            from depth_estimation.naive_bbox_depth.pipeline import NaiveBBoxDepthPipeline
+
+            naive_pipeline = NaiveBBoxDepthPipeline()
+        self.naive = naive_pipeline
+        self.fit = fit or ScaleBiasFit()
+        self.show_dense_inset = bool(show_dense_inset)
+        self.worker = DenseDepthWorker(
+            dense_depth_fn=dense_depth_fn,
+            inset_width=FUSED_INSET_WIDTH if self.show_dense_inset else 0,
+        )
+        self._frame_idx = 0
+        self._last_sample: DenseSample | None = None
+        self._dense_fps = 0.0
+
+    @property
+    def gating_enabled(self) -> bool:
+        return bool(getattr(self.naive, "gating_enabled", False))
+
+    def set_gating_enabled(self, enabled: bool) -> bool:
+        return self.naive.set_gating_enabled(enabled)
+
+    def toggle_gating(self) -> bool:
+        return self.naive.toggle_gating()
+
+    def _consume_dense_samples(self) -> None:
+        for sample in self.worker.poll():
+            if self._last_sample is not None:
+                dt = sample.finished_t - self._last_sample.finished_t
+                if dt > 0.0:
+                    rate = 1.0 / dt
+                    self._dense_fps = rate if self._dense_fps <= 0.0 else 0.7 * self._dense_fps + 0.3 * rate
+            self._last_sample = sample
+            if sample.dense_depth_m is not None:
+                self.fit.update(sample.bbox_distance_m, sample.dense_depth_m)
+
+    def _maybe_submit(self, frame_bgr: np.ndarray, metrics: dict) -> None:
+        # Only fresh detections are worth a dense pass; held/stale boxes are history.
+        if metrics.get("estimate_source") != "measurement" or self.worker.busy:
+            return
+        try:
+            cx = float(metrics["raw_bbox_center_x_px"])
+            cy = float(metrics["raw_bbox_center_y_px"])
+            half_w = 0.5 * float(metrics["raw_bbox_width_px"])
+            half_h = 0.5 * float(metrics["raw_bbox_height_px"])
+            bbox_distance_m = float(metrics["raw_distance_m"])
+        except (KeyError, TypeError, ValueError):
+            return
+        self.worker.submit(
+            frame_bgr.copy(),
+            (cx - half_w, cy - half_h, cx + half_w, cy + half_h),
+            bbox_distance_m,
+            self._frame_idx,
+        )
+
+    def _apply_fusion(self, metrics: dict) -> None:
+        distance = metrics.get("distance_m")
+        if distance is None:
+            return
+        bbox_distance = float(distance)
+        fused = self.fit.apply(bbox_distance)
+        metrics["bbox_distance_m"] = round(bbox_distance, 4)
+        metrics["fused_distance_m"] = round(fused, 4)
+        metrics["distance_m"] = round(fused, 4)
+        # Relative position is linear in z for a fixed pixel, so it scales with the distance.
+        ratio = fused / bbox_distance if bbox_distance > 0.0 else 1.0
+        for key in ("x_rel_m", "y_rel_m", "z_rel_m"):
+            if key in metrics:
+                metrics[key] = round(float(metrics[key]) * ratio, 4)
+
+    def _fusion_metrics(self) -> dict[str, float | int]:
+        sample = self._last_sample
+        metrics: dict[str, float | int] = {
+            "fusion_active": 1 if self.fit.active else 0,
+            "fusion_scale": round(self.fit.scale, 4),
+            "fusion_bias": round(self.fit.bias, 4),
+            "fusion_samples": int(self.fit.samples),
+            "fusion_rejected": int(self.fit.rejected),
+            "fusion_residual_std_m": round(self.fit.residual_std_m, 4),
+            "dense_fps": round(self._dense_fps, 3),
+        }
+        if sample is not None:
+            metrics["dense_infer_ms"] = round(sample.infer_ms, 1)
+            metrics["dense_age_s"] = round(time.monotonic() - sample.submitted_t, 3)
+            metrics["dense_frame_lag"] = int(self._frame_idx - sample.frame_idx)
+            if sample.dense_depth_m is not None:
+                metrics["dense_depth_m"] = round(sample.dense_depth_m, 4)
+        return metrics
+
+    def _draw_overlay(self, frame: np.ndarray, metrics: dict) -> None:
+        sample = self._last_sample
+        if self.show_dense_inset and sample is not None and sample.thumbnail_bgr is not None:
+            thumb = sample.thumbnail_bgr
+            th, tw = thumb.shape[:2]
+            fh, fw = frame.shape[:2]
+            if th < fh and tw < fw:
+                x0 = fw - tw - 8
+                frame[8 : 8 + th, x0 : x0 + tw] = thumb
+                cv2.rectangle(frame, (x0 - 1, 7), (x0 + tw, 8 + th), (255, 255, 255), 1)
+
+        lines = []
+        if "fused_distance_m" in metrics:
+            lines.append(f"fused {metrics['fused_distance_m']:.3f} m  (bbox {metrics['bbox_distance_m']:.3f} m)")
+        state = "on" if metrics["fusion_active"] else "warming up"
+        lines.append(
+            f"fit {state}: s {metrics['fusion_scale']:.3f} b {metrics['fusion_bias']:+.3f} "
+            f"n {metrics['fusion_samples']}"
+        )
+        if "dense_infer_ms" in metrics:
+            dense = f"{metrics['dense_depth_m']:.3f} m" if "dense_depth_m" in metrics else "n/a"
+            lines.append(f"dense {dense} @ {metrics['dense_fps']:.2f} fps, age {metrics['dense_age_s']:.1f} s")
+        x = 10
+        y = frame.shape[0] - 60 - FUSED_TEXT_LINE_HEIGHT * (len(lines) - 1)
+        for line in lines:
+            cv2.putText(
+                frame,
+                line,
+                (x, y),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                FUSED_TEXT_SCALE,
+                FUSED_TEXT_COLOR,
+                FUSED_TEXT_THICKNESS,
+                cv2.LINE_AA,
+            )
+            y += FUSED_TEXT_LINE_HEIGHT
+
+    @traced("fused.process_live_frame", "pipeline")
+    def process_live_frame(self, frame_bgr: np.ndarray) -> LiveFrameOutput:
+        self._frame_idx += 1
+        out = self.naive.process_live_frame(frame_bgr)
+        metrics = dict(out.metrics)
+
+        self._consume_dense_samples()
+        self._maybe_submit(frame_bgr, metrics)
+        self._apply_fusion(metrics)
+        metrics.update(self._fusion_metrics())
+        self._draw_overlay(out.frame_bgr, metrics)
+        return LiveFrameOutput(method=self.name, frame_bgr=out.frame_bgr, metrics=metrics)
+
+    def reset_temporal_state(self) -> None:
+        reset = getattr(self.naive, "reset_temporal_state", None)
+        if callable(reset):
+            reset()
+
+    def close(self) -> None:
+        self.worker.stop()
+        self.naive.close()
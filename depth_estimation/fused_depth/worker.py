@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+import threading
+import time
+from typing import Callable
+
+import cv2
+import numpy as np
+
+from depth_estimation.fused_depth.constants import (
+    FUSED_DENSE_METHOD,
+    FUSED_DENSE_RESOLUTION_LEVEL,
+    FUSED_INSET_COLORMAP,
+    FUSED_INSET_INVERT_COLORMAP,
+    FUSED_INSET_WIDTH,
+)
+from depth_estimation.fused_depth.fusion import sample_bbox_depth
+from profiling import span
+
+# frame_bgr -> metric depth map (any resolution, same aspect as the frame).
+DenseDepthFn = Callable[[np.ndarray], np.ndarray]
+
+
+@dataclass
+class DenseJob:
+    frame_bgr: np.ndarray
+    bbox_xyxy: tuple[float, float, float, float]
+    bbox_distance_m: float
+    frame_idx: int
+    submitted_t: float
+
+
+@dataclass
+class DenseSample:
+    frame_idx: int
+    submitted_t: float
+    finished_t: float
+    infer_ms: float
+    bbox_distance_m: float
+    dense_depth_m: float | None
+    thumbnail_bgr: np.ndarray | None = None
+
+
+def build_dense_depth_fn(method: str = FUSED_DENSE_METHOD, resolution_level=FUSED_DENSE_RESOLUTION_LEVEL) -> DenseDepthFn:
+    method = method.strip().lower()
+    if method == "unidepth":
+        from depth_estimation.unidepth.pipeline import UniDepthPipeline
+
+        pipeline = UniDepthPipeline(resolution_level=resolution_level)
+        return lambda frame_bgr: pipeline._infer_depth(frame_bgr)[0]
+    if method == "midas":
+        raise RuntimeError("MiDaS predicts relative inverse depth; fused depth needs a metric model (unidepth).")
+    raise RuntimeError(f"Unsupported dense depth method for fusion: {method!r}")
+
+
+def _depth_thumbnail(depth_map: np.ndarray, bbox_xyxy, frame_size: tuple[int, int], width: int) -> np.ndarray:
+    from depth_estimation.unidepth.utils import colorize_depth_map
+
+    frame_w, frame_h = frame_size
+    height = max(1, int(round(width * frame_h / max(1, frame_w))))
+    small = cv2.resize(depth_map, (width, height), interpolation=cv2.INTER_NEAREST)
+    thumb = colorize_depth_map(small, FUSED_INSET_COLORMAP, invert_colormap=FUSED_INSET_INVERT_COLORMAP)
+    s = width / max(1, frame_w)
+    x1, y1, x2, y2 = (int(round(float(v) * s)) for v in bbox_xyxy)
+    cv2.rectangle(thumb, (x1, y1), (x2, y2), (255, 255, 255), 1)
+    return thumb
+
+
+class DenseDepthWorker:
+    """
+    Runs a dense depth model on the newest submitted frame in a background thread.
+
+    submit() never blocks: a newer job overwrites the pending one, so the worker always
+    starts on the freshest frame and runs at whatever rate the model manages.
+    The model is built lazily inside the worker thread so startup stays fast.
+    """
+
+    def __init__(
+        self,
+        dense_depth_fn: DenseDepthFn | None = None,
+        dense_fn_factory: Callable[[], DenseDepthFn] = build_dense_depth_fn,
+        inset_width: int = FUSED_INSET_WIDTH,
+        max_results: int = 8,
+    ):
+        self._dense_depth_fn = dense_depth_fn
+        self._dense_fn_factory = dense_fn_factory
+        self.inset_width = max(0, int(inset_width))
+        self._cond = threading.Condition()
+        self._pending: DenseJob | None = None
+        self._results: deque[DenseSample] = deque(maxlen=max(1, int(max_results)))
+        self._error: BaseException | None = None
+        self._busy = False
+        self._stop = False
+        self.jobs_submitted = 0
+        self.jobs_replaced = 0
+        self.jobs_done = 0
+        self._thread = threading.Thread(target=self._run, name="dense-depth-worker", daemon=True)
+        self._thread.start()
+
+    @property
+    def busy(self) -> bool:
+        with self._cond:
+            return self._busy or self._pending is not None
+
+    def submit(
+        self,
+        frame_bgr: np.ndarray,
+        bbox_xyxy: tuple[float, float, float, float],
+        bbox_distance_m: float,
+        frame_idx: int,
+    ) -> None:
+        job = DenseJob(
+            frame_bgr=frame_bgr,
+            bbox_xyxy=tuple(float(v) for v in bbox_xyxy),
+            bbox_distance_m=float(bbox_distance_m),
+            frame_idx=int(frame_idx),
+            submitted_t=time.monotonic(),
+        )
+        with self._cond:
+            if self._stop:
+                return
+            if self._pending is not None:
+                self.jobs_replaced += 1
+            self._pending = job
+            self.jobs_submitted += 1
+            self._cond.notify()
+
+    def poll(self) -> list[DenseSample]:
+        """Finished samples since the last poll (oldest first). Re-raises worker failures."""
+        with self._cond:
+            if self._error is not None:
+                raise RuntimeError(f"Dense depth worker failed: {self._error}") from self._error
+            results = list(self._results)
+            self._results.clear()
+        return results
+
+    def wait_idle(self, timeout_s: float | None = None) -> bool:
+        deadline = None if timeout_s is None else time.monotonic() + timeout_s
+        with self._cond:
+            while (self._busy or self._pending is not None) and self._error is None and not self._stop:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0.0:
+                    return False
+                self._cond.wait(remaining)
+            return True
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._pending is None and not self._stop:
+                    self._cond.wait()
+                if self._stop:
+                    return
+                job = self._pending
+                self._pending = None
+                self._busy = True
+            try:
+                sample = self._process(job)
+            except BaseException as exc:  # surfaced to the pipeline thread by poll()
+                with self._cond:
+                    self._error = exc
+                    self._busy = False
+                    self._cond.notify_all()
+                return
+            with self._cond:
+                self._results.append(sample)
+                self.jobs_done += 1
+                self._busy = False
+                self._cond.notify_all()
+
+    def _process(self, job: DenseJob) -> DenseSample:
+        if self._dense_depth_fn is None:
+            self._dense_depth_fn = self._dense_fn_factory()
+        frame_size = (job.frame_bgr.shape[1], job.frame_bgr.shape[0])
+        t0 = time.perf_counter()
+        with span("fused.dense_depth", "inference"):
+            depth_map = np.asarray(self._dense_depth_fn(job.frame_bgr), dtype=np.float32)
+        infer_ms = (time.perf_counter() - t0) * 1000.0
+        if depth_map.ndim != 2:
+            depth_map = depth_map.squeeze()
+        dense_depth_m = sample_bbox_depth(depth_map, job.bbox_xyxy, frame_size)
+        thumbnail = None
+        if self.inset_width > 0:
+            thumbnail = _depth_thumbnail(depth_map, job.bbox_xyxy, frame_size, self.inset_width)
+        return DenseSample(
+            frame_idx=job.frame_idx,
+            submitted_t=job.submitted_t,
+            finished_t=time.monotonic(),
+            infer_ms=infer_ms,
+            bbox_distance_m=job.bbox_distance_m,
+            dense_depth_m=dense_depth_m,
+            thumbnail_bgr=thumbnail,
+        )
+
+    def stop(self, timeout_s: float = 5.0) -> None:
+        with self._cond:
+            self._stop = True
+            self._pending = None
+            self._cond.notify_all()
+        self._thread.join(timeout=timeout_s)
@@ -7,12 +7,14 @@ from pathlib import Path
 import sys
 
 import cv2
-import numpy as np
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
+from depth_estimation.concurrent_executor import ConcurrentPipelineExecutor, outputs_with_age_labels
+from depth_estimation.constants import DEPTH_LIVE_CONCURRENT
+from depth_estimation.display_compositor import DisplayCompositor
 from depth_estimation.naive_bbox_depth.constants import BUFFER_SIZE, DEVICE, FOURCC, FPS_HINT, HEIGHT, WIDTH
 from depth_estimation.pipeline_base import LiveDepthPipeline, LiveFrameOutput
 
@@ -21,6 +23,7 @@ PIPELINE_SPECS: dict[str, tuple[str, str]] = {
     "naive": ("depth_estimation.naive_bbox_depth.pipeline", "NaiveBBoxDepthPipeline"),
     "unidepth": ("depth_estimation.unidepth.pipeline", "UniDepthPipeline"),
     "midas": ("depth_estimation.midas.pipeline", "MiDaSPipeline"),
+    "fused": ("depth_estimation.fused_depth.pipeline", "FusedDepthPipeline"),
 }
 
 
@@ -74,21 +77,6 @@ def open_camera(
     return cap
 
 
-def resize_to_height(frame: np.ndarray, target_height: int) -> np.ndarray:
-    if frame.shape[0] == target_height:
-        return frame
-    scale = target_height / frame.shape[0]
-    new_width = max(1, int(frame.shape[1] * scale))
-    return cv2.resize(frame, (new_width, target_height), interpolation=cv2.INTER_AREA)
-
-
-def combine_frames(outputs: list[LiveFrameOutput], target_height: int) -> np.ndarray:
-    frames = [resize_to_height(out.frame_bgr, target_height) for out in outputs]
-    if len(frames) == 1:
-        return frames[0]
-    return np.hstack(frames)
-
-
 def format_metric_text(outputs: list[LiveFrameOutput]) -> list[str]:
     lines: list[str] = []
     for out in outputs:
@@ -99,6 +87,8 @@ def format_metric_text(outputs: list[LiveFrameOutput]) -> list[str]:
             parts.append(f"dist={out.metrics['distance_m']:.3f}m")
         if "infer_ms" in out.metrics:
             parts.append(f"{out.metrics['infer_ms']:.1f}ms")
+        if "age_ms" in out.metrics:
+            parts.append(f"age={out.metrics['age_ms']:.0f}ms")
         lines.append(" | ".join(parts))
     return lines
 
@@ -110,7 +100,7 @@ def main() -> None:
             "Examples: --methods naive OR --methods naive,unidepth OR --methods midas"
         )
     )
-    parser.add_argument("--methods", type=str, default="naive", help="Comma-separated methods: naive,unidepth,midas")
+    parser.add_argument("--methods", type=str, default="naive", help="Comma-separated methods: naive,unidepth,midas,fused")
     parser.add_argument("--device", type=str, default=DEVICE, help="Camera device (e.g., /dev/video2)")
     parser.add_argument("--width", type=int, default=WIDTH)
     parser.add_argument("--height", type=int, default=HEIGHT)
@@ -118,12 +108,19 @@ def main() -> None:
     parser.add_argument("--fourcc", type=str, default=FOURCC)
     parser.add_argument("--buffer-size", type=int, default=BUFFER_SIZE)
     parser.add_argument("--window-name", type=str, default="Live Depth Estimation")
+    parser.add_argument(
+        "--sequential",
+        action="store_true",
+        default=not DEPTH_LIVE_CONCURRENT,
+        help="Run all methods one after another on every frame instead of one worker thread per method.",
+    )
     args = parser.parse_args()
 
     methods = parse_methods(args.methods)
     pipelines: list[LiveDepthPipeline] = [build_pipeline(m) for m in methods]
+    executor = ConcurrentPipelineExecutor(pipelines) if len(pipelines) > 1 and not args.sequential else None
 
-    print("Live depth methods:", ", ".join(methods))
+    print("Live depth methods:", ", ".join(methods), "(concurrent)" if executor is not None else "")
 
     cap = open_camera(
         device=args.device,
@@ -134,6 +131,7 @@ def main() -> None:
         buffer_size=args.buffer_size,
     )
 
+    compositor = DisplayCompositor(target_height=args.height)
     frame_idx = 0
     try:
         while True:
@@ -143,33 +141,19 @@ def main() -> None:
                 break
 
             frame_idx += 1
-            outputs = [pipeline.process_live_frame(frame_bgr) for pipeline in pipelines]
-            combined = combine_frames(outputs, target_height=args.height)
-
-            metric_lines = format_metric_text(outputs)
-            cv2.putText(
-                combined,
-                f"frame: {frame_idx}",
-                (10, 24),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                0.7,
-                (255, 255, 255),
-                2,
-                cv2.LINE_AA,
-            )
+            if executor is None:
+                outputs = [pipeline.process_live_frame(frame_bgr) for pipeline in pipelines]
+            else:
+                # Each method works on the newest frame it can get; show whatever each has finished last.
+                executor.submit(frame_bgr, frame_idx)
+                outputs = outputs_with_age_labels(executor.latest(), (frame_bgr.shape[1], frame_bgr.shape[0]))
+            # Frames are resized into one reused canvas; text is rasterized once per distinct string.
+            combined = compositor.place_frames([out.frame_bgr for out in outputs])
+            compositor.overlay_text(f"frame: {frame_idx}", (10, 24), 0.7, (255, 255, 255), 2)
 
             y = 50
-            for line in metric_lines:
-                cv2.putText(
-                    combined,
-                    line,
-                    (10, y),
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    0.55,
-                    (255, 255, 255),
-                    2,
-                    cv2.LINE_AA,
-                )
+            for line in format_metric_text(outputs):
+                compositor.overlay_text(line, (10, y), 0.55, (255, 255, 255), 2)
                 y += 24
 
             cv2.imshow(args.window_name, combined)
@@ -178,6 +162,8 @@ def main() -> None:
                 print("Stopped by user.")
                 break
     finally:
+        if executor is not None:
+            executor.close()
         cap.release()
         cv2.destroyAllWindows()
         for pipeline in pipelines:
@@ -13,7 +13,9 @@ REPO_ROOT = Path(__file__).resolve().parents[1]
 if str(REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(REPO_ROOT))
 
+from depth_estimation.concurrent_executor import ConcurrentPipelineExecutor, outputs_with_age_labels
 from depth_estimation.constants import (
+    DEPTH_LIVE_CONCURRENT,
     DEPTH_LIVE_REVIEW_BUFFER_SIZE,
     DEPTH_LIVE_REVIEW_DEVICE,
     DEPTH_LIVE_REVIEW_FOURCC,
@@ -32,13 +34,17 @@ from depth_estimation.constants import (
     KEY_QUIT,
     KEY_TOGGLE_GATING,
 )
+from depth_estimation.display_compositor import DisplayCompositor, PanelLine
 from depth_estimation.pipeline_base import LiveDepthPipeline, LiveFrameOutput
+from presentation import create_presenter
+from profiling import span, start_tracing_from_env
 
 
 PIPELINE_SPECS: dict[str, tuple[str, str]] = {
     "naive": ("depth_estimation.naive_bbox_depth.pipeline", "NaiveBBoxDepthPipeline"),
     "unidepth": ("depth_estimation.unidepth.pipeline", "UniDepthPipeline"),
     "midas": ("depth_estimation.midas.pipeline", "MiDaSPipeline"),
+    "fused": ("depth_estimation.fused_depth.pipeline", "FusedDepthPipeline"),
 }
 
 
@@ -136,6 +142,11 @@ def _method_lines(
     process_fps = _as_float(m.get("process_fps"))
     if process_fps is not None:
         lines.append(f"FPS (no delay): {process_fps:.1f}")
+    age_ms = _as_float(m.get("age_ms"))
+    if age_ms is not None:
+        lines.append(
+            f"Age: {age_ms:.0f} ms | {_fmt(m.get('latency_ms'), 0, ' ms')} | {_fmt(m.get('method_rate_hz'), 1, ' Hz')}"
+        )
 
     if m.get("gating_enabled") is not None:
         try:
@@ -190,6 +201,80 @@ def _method_lines(
     return lines
 
 
+CONTROLS_TEXT = "Controls: q/ESC quit, g toggle gating"
+
+
+def _side_panel_width() -> int:
+    return max(260, int(DEPTH_LIVE_REVIEW_SIDE_PANEL_WIDTH))
+
+
+def side_panel_lines(
+    frame_idx: int,
+    loop_fps: float,
+    methods: list[str],
+    outputs: list[LiveFrameOutput],
+    last_pose_by_method: dict[str, dict[str, float]],
+) -> list[PanelLine]:
+    text_color = tuple(int(c) for c in DEPTH_LIVE_REVIEW_SIDE_PANEL_TEXT_COLOR)
+    accent_color = tuple(int(c) for c in DEPTH_LIVE_REVIEW_SIDE_PANEL_ACCENT_COLOR)
+    lines: list[PanelLine] = [
+        ("Telemetry", accent_color, 0.72),
+        ("Mode: LIVE", text_color, 0.56),
+        (f"Frame: {frame_idx}", text_color, 0.56),
+        (f"Loop FPS: {loop_fps:.1f}", text_color, 0.56),
+        ("", text_color, 0.56),
+    ]
+    if len(methods) > 1:
+        lines.insert(4, (f"Methods: {','.join(methods)}", text_color, 0.56))
+    for out in outputs:
+        method_color = accent_color if out.method == "naive" else text_color
+        method_lines = _method_lines(
+            out,
+            last_pose_by_method.get(out.method),
+            include_method_name=(len(outputs) > 1),
+        )
+        for i, line in enumerate(method_lines):
+            scale = 0.56 if i == 0 else 0.55
+            color = method_color if line.startswith("Method:") else text_color
+            lines.append((line, color, scale))
+        lines.append(("", text_color, 0.56))
+    return lines
+
+
+def build_review_compositor(target_height: int = DEPTH_LIVE_REVIEW_HEIGHT) -> DisplayCompositor:
+    return DisplayCompositor(
+        target_height=target_height,
+        panel_width=_side_panel_width() if DEPTH_LIVE_REVIEW_USE_SIDE_PANEL else 0,
+        panel_bg=DEPTH_LIVE_REVIEW_SIDE_PANEL_BG_COLOR,
+        line_height=DEPTH_LIVE_REVIEW_LINE_HEIGHT,
+        text_thickness=DEPTH_LIVE_REVIEW_TEXT_THICKNESS,
+    )
+
+
+def compose_review_frame(
+    compositor: DisplayCompositor,
+    frame_idx: int,
+    loop_fps: float,
+    methods: list[str],
+    outputs: list[LiveFrameOutput],
+    last_pose_by_method: dict[str, dict[str, float]],
+) -> np.ndarray:
+    """Same view as combine_frames + compose_display, drawn into the compositor's reused canvas."""
+    frames = [out.frame_bgr for out in outputs]
+    lines = side_panel_lines(frame_idx, loop_fps, methods, outputs, last_pose_by_method)
+    if compositor.panel_width:
+        text_color = tuple(int(c) for c in DEPTH_LIVE_REVIEW_SIDE_PANEL_TEXT_COLOR)
+        return compositor.compose(frames, lines, footer=(CONTROLS_TEXT, text_color, 0.50))
+
+    canvas = compositor.place_frames(frames)
+    y = 24
+    lines[0] = ("Live Telemetry", lines[0][1], lines[0][2])
+    for line, _color, _scale in lines:
+        compositor.overlay_text(line, (10, y), 0.55, (255, 255, 255), DEPTH_LIVE_REVIEW_TEXT_THICKNESS)
+        y += DEPTH_LIVE_REVIEW_LINE_HEIGHT
+    return canvas
+
+
 def compose_display(
     combined_frame: np.ndarray,
     frame_idx: int,
@@ -234,40 +319,18 @@ def compose_display(
         return overlay
 
     h, w = combined_frame.shape[:2]
-    panel_w = max(260, int(DEPTH_LIVE_REVIEW_SIDE_PANEL_WIDTH))
+    panel_w = _side_panel_width()
     canvas = np.zeros((h, w + panel_w, 3), dtype=combined_frame.dtype)
     canvas[:, :w] = combined_frame
     canvas[:, w:] = DEPTH_LIVE_REVIEW_SIDE_PANEL_BG_COLOR
 
     text_color = tuple(int(c) for c in DEPTH_LIVE_REVIEW_SIDE_PANEL_TEXT_COLOR)
-    accent_color = tuple(int(c) for c in DEPTH_LIVE_REVIEW_SIDE_PANEL_ACCENT_COLOR)
 
     x = w + 14
     y = 28
 
-    lines: list[tuple[str, tuple[int, int, int], float]] = [
-        ("Telemetry", accent_color, 0.72),
-        ("Mode: LIVE", text_color, 0.56),
-        (f"Frame: {frame_idx}", text_color, 0.56),
-        (f"Loop FPS: {loop_fps:.1f}", text_color, 0.56),
-        ("", text_color, 0.56),
-    ]
-    if len(methods) > 1:
-        lines.insert(4, (f"Methods: {','.join(methods)}", text_color, 0.56))
-    for out in outputs:
-        method_color = accent_color if out.method == "naive" else text_color
-        method_lines = _method_lines(
-            out,
-            last_pose_by_method.get(out.method),
-            include_method_name=(len(outputs) > 1),
-        )
-        for i, line in enumerate(method_lines):
-            scale = 0.56 if i == 0 else 0.55
-            color = method_color if line.startswith("Method:") else text_color
-            lines.append((line, color, scale))
-        lines.append(("", text_color, 0.56))
-
-    controls_text = "Controls: q/ESC quit, g toggle gating"
+    lines = side_panel_lines(frame_idx, loop_fps, methods, outputs, last_pose_by_method)
+    controls_text = CONTROLS_TEXT
 
     controls_y = h - 12
     max_text_baseline_y = controls_y - DEPTH_LIVE_REVIEW_LINE_HEIGHT
@@ -317,39 +380,57 @@ def compose_display(
     return canvas
 
 
-def toggle_available_gating(pipelines: list[LiveDepthPipeline]) -> list[tuple[str, bool]]:
-    toggled: list[tuple[str, bool]] = []
-    for pipeline in pipelines:
-        toggle_fn = getattr(pipeline, "toggle_gating", None)
-        if callable(toggle_fn):
-            new_state = bool(toggle_fn())
-            toggled.append((pipeline.name, new_state))
-    return toggled
+def _toggle_gating(pipeline: LiveDepthPipeline) -> bool | None:
+    toggle_fn = getattr(pipeline, "toggle_gating", None)
+    if callable(toggle_fn):
+        return bool(toggle_fn())
+    return None
+
+
+def toggle_available_gating(
+    pipelines: list[LiveDepthPipeline],
+    executor: ConcurrentPipelineExecutor | None = None,
+) -> list[tuple[str, bool]]:
+    if executor is not None:
+        # Between frames of each worker, never while its pipeline is mid-frame.
+        results = executor.apply(_toggle_gating)
+    else:
+        results = [(pipeline.name, _toggle_gating(pipeline)) for pipeline in pipelines]
+    return [(name, state) for name, state in results if state is not None]
 
 
 def main() -> None:
+    start_tracing_from_env("live_depth_review")
     methods = parse_methods(DEPTH_LIVE_REVIEW_METHODS)
     pipelines: list[LiveDepthPipeline] = [build_pipeline(m) for m in methods]
     cap = open_camera()
+    executor = ConcurrentPipelineExecutor(pipelines) if DEPTH_LIVE_CONCURRENT and len(pipelines) > 1 else None
 
     print("Live depth review started.")
-    print("Methods:", ", ".join(methods))
+    print("Methods:", ", ".join(methods), "(concurrent)" if executor is not None else "")
     print("Controls: q/ESC quit, g toggle gating (if supported by loaded method).")
 
     frame_idx = 0
     last_t = time.perf_counter()
     loop_fps = 0.0
     last_pose_by_method: dict[str, dict[str, float]] = {}
+    compositor = build_review_compositor()
+    presenter = create_presenter(window_name=DEPTH_LIVE_REVIEW_WINDOW_NAME, key_quit=KEY_QUIT)
 
     try:
         while True:
-            ok, frame_bgr = cap.read()
+            with span("capture.read", "capture"):
+                ok, frame_bgr = cap.read()
             if not ok:
                 print("Failed to read frame from camera.")
                 break
 
             frame_idx += 1
-            outputs = [pipeline.process_live_frame(frame_bgr) for pipeline in pipelines]
+            if executor is None:
+                outputs = [pipeline.process_live_frame(frame_bgr) for pipeline in pipelines]
+            else:
+                executor.submit(frame_bgr, frame_idx)
+                outputs = outputs_with_age_labels(executor.latest(), (frame_bgr.shape[1], frame_bgr.shape[0]))
             for out in outputs:
                 m = out.metrics
                 x_rel = _as_float(m.get("x_rel_m"))
@@ -363,7 +444,6 @@ def main() -> None:
                         "z_rel_m": z_rel,
                         "yaw_error_deg": yaw_deg,
                     }
-            combined = combine_frames(outputs, target_height=DEPTH_LIVE_REVIEW_HEIGHT)
 
             now = time.perf_counter()
             dt = max(1e-6, now - last_t)
@@ -371,30 +451,41 @@ def main() -> None:
             loop_fps = inst_fps if loop_fps <= 0.0 else (0.2 * inst_fps + 0.8 * loop_fps)
             last_t = now
 
-            display = compose_display(
-                combined_frame=combined,
-                frame_idx=frame_idx,
-                loop_fps=loop_fps,
-                methods=methods,
-                outputs=outputs,
-                last_pose_by_method=last_pose_by_method,
-            )
+            with span("review.compose", "presentation"):
+                display = compose_review_frame(
+                    compositor,
+                    frame_idx=frame_idx,
+                    loop_fps=loop_fps,
+                    methods=methods,
+                    outputs=outputs,
+                    last_pose_by_method=last_pose_by_method,
+                )
 
-            cv2.imshow(DEPTH_LIVE_REVIEW_WINDOW_NAME, display)
-            key = cv2.waitKey(1) & 0xFF
+            with span("review.show", "presentation"):
+                presenter.present(
+                    display,
+                    {
+                        "frame_idx": frame_idx,
+                        "loop_fps": loop_fps,
+                        "methods": {out.method: out.metrics for out in outputs},
+                    },
+                )
+                key = presenter.poll_key()
             if key in KEY_QUIT:
                 print("Stopped by user.")
                 break
             if key in KEY_TOGGLE_GATING:
-                toggled = toggle_available_gating(pipelines)
+                toggled = toggle_available_gating(pipelines, executor)
                 if not toggled:
                     print("[live-review] no loaded pipeline exposes gating toggle.")
                 else:
                     summary = ", ".join([f"{name}={'ON' if state else 'OFF'}" for name, state in toggled])
                     print(f"[live-review] {summary}")
     finally:
+        if executor is not None:
+            executor.close()
         cap.release()
-        cv2.destroyAllWindows()
+        presenter.close()
         for pipeline in pipelines:
             pipeline.close()
 
@@ -10,6 +10,24 @@ MIDAS_MODEL_TYPE = "DPT_Hybrid"
 MIDAS_DEVICE = "auto"
 
 
+########################################## Export Constants ##############################################
+
+# One-time TorchScript export (depth_estimation/midas/export_midas.py) for a fixed input size.
+# The live/image/video pipelines load the artifact directly and skip torch.hub when it exists.
+MIDAS_USE_EXPORT = True
+MIDAS_EXPORT_DIR = "runs/cache/exports/midas"
+# Network input (width, height), multiples of 32. 512x384 is what the hub DPT transform
+# produces for 640x480 frames; MiDaS_small uses 256x192 for the same frames.
+MIDAS_EXPORT_INPUT_SIZE = (512, 384)
+# Relative width/height aspect difference between a frame and the export input size above which the
+# exported model warns that it stretches the frame (the hub transform keeps the aspect ratio).
+MIDAS_EXPORT_ASPECT_TOLERANCE = 0.02
+# Freeze + optimize_for_inference (conv/bn folding, MKLDNN) for CPU inference.
+MIDAS_EXPORT_OPTIMIZE_FOR_CPU = True
+# Frames used by the export report to compare hub vs exported latency (0 = skip timing).
+MIDAS_EXPORT_BENCH_FRAMES = 10
+
+
 ########################################## Single Image Constants ########################################
 
 # Input image to estimate depth from.
@@ -43,6 +61,15 @@ MIDAS_VIDEO_WINDOW_NAME = "MiDaS Video Inference"
 # Optional frame cap for quick checks. Set to 0 to process all frames.
 MIDAS_VIDEO_MAX_FRAMES = 0
 
+# Batched offline mode (depth_video_inference.py --batched): a decoder thread feeds batches of
+# MIDAS_VIDEO_BATCH_SIZE frames to the model while an encoder thread colorizes and writes the
+# output video. No preview window; raw depth (relative inverse depth) is stored as an (N, H, W) .npy stack.
+MIDAS_VIDEO_BATCH_SIZE = 4
+MIDAS_VIDEO_WRITE_DEPTH_STACK = True
+MIDAS_VIDEO_DEPTH_STACK_PATH = MIDAS_OUTPUT_ROOT + "/" + CUSTOM_PATH_VIDEO + "/video_depth.npy"
+# float16 halves disk use (~0.6 MB per 640x480 frame) at ~1e-3 relative precision.
+MIDAS_VIDEO_DEPTH_STACK_DTYPE = "float16"
+
 
 ########################################## Depth Measurement Constants ###################################
 
@@ -54,6 +81,13 @@ MIDAS_CENTER_PATCH_SIZE = 9
 MIDAS_PRINT_EVERY_N_FRAMES = 10
 
 
+########################################## ROI Inference Constants #######################################
+
+# Width/height range for ROI crops (infer_roi). MiDaS resizes the shorter side to the net size,
+# so a square crop gives the smallest network input.
+MIDAS_ROI_ASPECT_RATIO_RANGE = (1.0, 1.0)
+
+
 ########################################## Visualization Constants #######################################
 
 # Supported: "turbo", "magma", "inferno", "jet", "viridis".
@@ -1,3 +1,4 @@
+import argparse
 from pathlib import Path
 import sys
 
@@ -8,9 +9,23 @@ if str(REPO_ROOT) not in sys.path:
 from depth_estimation.midas.pipeline import MiDaSPipeline
 
 
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="MiDaS depth on the configured .avi video.")
+    parser.add_argument(
+        "--batched",
+        action="store_true",
+        help="Offline mode: batched inference with decode/encode threads and a raw depth .npy stack (no preview).",
+    )
+    return parser.parse_args()
+
+
 def main() -> None:
+    args = parse_args()
     pipeline = MiDaSPipeline()
-    pipeline.run_video()
+    if args.batched:
+        pipeline.run_video_batched()
+    else:
+        pipeline.run_video()
 
 
 if __name__ == "__main__":
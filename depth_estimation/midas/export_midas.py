@@ -0,0 +1,229 @@
+"""
+One-time TorchScript export of the MiDaS model for a fixed input size, plus a startup/latency report.
+
+    ./scripts/export_midas.sh                               # MIDAS_MODEL_TYPE at MIDAS_EXPORT_INPUT_SIZE
+    ./scripts/export_midas.sh --model-type MiDaS_small --input-size 256x192
+    ./scripts/export_midas.sh --source data/raw_data/<session>/video.avi
+
+Writes <MIDAS_EXPORT_DIR>/<model_type>_<W>x<H>.pt + .json (preprocessing + provenance) and
+<...>_report.json with cold start (fresh process: imports + load + first frame) and per-frame
+latency for the torch.hub path vs the exported artifact.
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import datetime
+import json
+from pathlib import Path
+import subprocess
+import sys
+import time
+
+import cv2
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from depth_estimation.midas.constants import (
+    MIDAS_DEVICE,
+    MIDAS_EXPORT_BENCH_FRAMES,
+    MIDAS_EXPORT_DIR,
+    MIDAS_EXPORT_INPUT_SIZE,
+    MIDAS_EXPORT_OPTIMIZE_FOR_CPU,
+    MIDAS_MODEL_TYPE,
+)
+from depth_estimation.midas.utils import export_artifact_stem, midas_normalization, resolve_repo_path
+
+
+def parse_input_size(raw: str) -> tuple[int, int]:
+    width, _, height = raw.lower().partition("x")
+    size = (int(width), int(height))
+    if size[0] % 32 or size[1] % 32:
+        raise ValueError(f"--input-size must be multiples of 32, got {raw}")
+    return size
+
+
+def export_torchscript(
+    module,
+    input_size: tuple[int, int],
+    output_path: Path,
+    meta: dict,
+    optimize_for_cpu: bool = MIDAS_EXPORT_OPTIMIZE_FOR_CPU,
+) -> Path:
+    """Trace module at (1, 3, H, W), freeze it and write the artifact + JSON sidecar."""
+    import torch
+
+    module = module.to("cpu").eval()
+    example = torch.zeros(1, 3, int(input_size[1]), int(input_size[0]), dtype=torch.float32)
+    with torch.no_grad():
+        traced = torch.jit.trace(module, example, check_trace=False)
+        if optimize_for_cpu:
+            traced = torch.jit.optimize_for_inference(torch.jit.freeze(traced.eval()))
+        else:
+            traced = torch.jit.freeze(traced.eval())
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    traced.save(str(output_path))
+    sidecar = {
+        **meta,
+        "input_size": [int(input_size[0]), int(input_size[1])],
+        "optimized_for_cpu": bool(optimize_for_cpu),
+        "torch_version": torch.__version__,
+        "exported_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    output_path.with_suffix(".json").write_text(json.dumps(sidecar, indent=2))
+    return output_path
+
+
+def _synthetic_frames(count: int) -> list[np.ndarray]:
+    rng = np.random.default_rng(0)
+    return [
+        cv2.GaussianBlur(rng.integers(0, 255, size=(480, 640, 3), dtype=np.uint8), (9, 9), 0)
+        for _ in range(max(1, count))
+    ]
+
+
+def frame_latency_ms(model, frames_rgb: list[np.ndarray], warmup: int = 1) -> dict[str, float]:
+    for frame in frames_rgb[:warmup]:
+        model.predict(frame)
+    samples = []
+    for frame in frames_rgb:
+        t0 = time.perf_counter()
+        model.predict(frame)
+        samples.append((time.perf_counter() - t0) * 1000.0)
+    arr = np.asarray(samples)
+    return {
+        "median_ms": round(float(np.median(arr)), 2),
+        "p90_ms": round(float(np.percentile(arr, 90)), 2),
+        "frames": len(samples),
+    }
+
+
+def _cold_start_probe(mode: str, model_type: str, artifact: str | None) -> None:
+    """Runs in a fresh interpreter: time imports + model load + first prediction, print one JSON line."""
+    t0 = time.perf_counter()
+    from depth_estimation.midas.midas_model import MiDaSModel, MiDaSTorchScriptModel
+
+    t_import = time.perf_counter()
+    if mode == "export":
+        model = MiDaSTorchScriptModel(Path(artifact), device=MIDAS_DEVICE)
+    else:
+        model = MiDaSModel(model_type=model_type, device=MIDAS_DEVICE)
+    t_load = time.perf_counter()
+    model.predict(_synthetic_frames(1)[0])
+    t_first = time.perf_counter()
+    print(
+        "COLD_START "
+        + json.dumps(
+            {
+                "import_s": round(t_import - t0, 3),
+                "load_s": round(t_load - t_import, 3),
+                "first_frame_s": round(t_first - t_load, 3),
+                "total_s": round(t_first - t0, 3),
+            }
+        )
+    )
+
+
+def measure_cold_start(mode: str, model_type: str, artifact: Path | None) -> dict | None:
+    cmd = [sys.executable, str(Path(__file__).resolve()), "--cold-start-probe", mode, "--model-type", model_type]
+    if artifact is not None:
+        cmd += ["--artifact", str(artifact)]
+    proc = subprocess.run(cmd, capture_output=True, text=True, cwd=str(REPO_ROOT))
+    for line in proc.stdout.splitlines():
+        if line.startswith("COLD_START "):
+            return json.loads(line[len("COLD_START ") :])
+    print(f"Cold start probe ({mode}) failed:\n{proc.stderr.strip()[-2000:]}")
+    return None
+
+
+def print_report(report: dict) -> None:
+    print(f"MiDaS export report ({report['model_type']} {report['input_size'][0]}x{report['input_size'][1]})")
+    print(f"{'path':<8} {'cold start s':>13} {'load s':>8} {'median ms':>10} {'p90 ms':>8}")
+    for path in ("hub", "export"):
+        cold = report["cold_start"].get(path) or {}
+        lat = report["latency"].get(path) or {}
+        print(
+            f"{path:<8} {cold.get('total_s', float('nan')):>13.2f} {cold.get('load_s', float('nan')):>8.2f} "
+            f"{lat.get('median_ms', float('nan')):>10.1f} {lat.get('p90_ms', float('nan')):>8.1f}"
+        )
+    if report.get("max_rel_diff") is not None:
+        print(f"max relative depth difference hub vs export: {report['max_rel_diff']:.4f}")
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Export MiDaS to TorchScript for fast startup/inference.")
+    parser.add_argument("--model-type", default=MIDAS_MODEL_TYPE)
+    parser.add_argument("--input-size", type=parse_input_size, default=MIDAS_EXPORT_INPUT_SIZE, help="WxH, e.g. 512x384.")
+    parser.add_argument("--output-dir", default=MIDAS_EXPORT_DIR)
+    parser.add_argument("--no-optimize", action="store_true", help="Skip optimize_for_inference (e.g. for CUDA).")
+    parser.add_argument("--source", default=None, help="Frames for the latency report (default: synthetic 640x480).")
+    parser.add_argument("--bench-frames", type=int, default=MIDAS_EXPORT_BENCH_FRAMES)
+    parser.add_argument("--skip-cold-start", action="store_true", help="Do not spawn the cold start probes.")
+    parser.add_argument("--cold-start-probe", choices=("hub", "export"), default=None, help=argparse.SUPPRESS)
+    parser.add_argument("--artifact", default=None, help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _build_arg_parser().parse_args(argv)
+    if args.cold_start_probe:
+        _cold_start_probe(args.cold_start_probe, args.model_type, args.artifact)
+        return
+
+    from depth_estimation.midas.midas_model import MiDaSModel, MiDaSTorchScriptModel
+
+    input_size = tuple(args.input_size)
+    export_dir = resolve_repo_path(args.output_dir)
+    artifact = export_dir / f"{export_artifact_stem(args.model_type, input_size)}.pt"
+    mean, std = midas_normalization(args.model_type)
+
+    hub_model = MiDaSModel(model_type=args.model_type, device="cpu")
+    t0 = time.perf_counter()
+    export_torchscript(
+        hub_model.model,
+        input_size,
+        artifact,
+        meta={"model_type": args.model_type, "mean": list(mean), "std": list(std), "source": "torch.hub intel-isl/MiDaS"},
+        optimize_for_cpu=not args.no_optimize,
+    )
+    print(f"Exported {artifact} in {time.perf_counter() - t0:.1f} s")
+    exported = MiDaSTorchScriptModel(artifact, device="cpu")
+
+    report: dict = {
+        "model_type": args.model_type,
+        "input_size": list(input_size),
+        "artifact": str(artifact),
+        "cold_start": {},
+        "latency": {},
+        "max_rel_diff": None,
+    }
+    if args.bench_frames > 0:
+        if args.source:
+            from depth_estimation.benchmark_roi_depth import load_frames
+
+            frames_bgr = load_frames(Path(args.source), args.bench_frames)
+        else:
+            frames_bgr = _synthetic_frames(args.bench_frames)
+        frames_rgb = [cv2.cvtColor(f, cv2.COLOR_BGR2RGB) for f in frames_bgr]
+        report["latency"]["hub"] = frame_latency_ms(hub_model, frames_rgb)
+        report["latency"]["export"] = frame_latency_ms(exported, frames_rgb)
+        ref, out = hub_model.predict(frames_rgb[0]), exported.predict(frames_rgb[0])
+        report["max_rel_diff"] = round(float(np.max(np.abs(ref - out)) / max(1e-6, float(np.max(np.abs(ref))))), 4)
+
+    if not args.skip_cold_start:
+        report["cold_start"]["hub"] = measure_cold_start("hub", args.model_type, None)
+        report["cold_start"]["export"] = measure_cold_start("export", args.model_type, artifact)
+
+    print_report(report)
+    report_path = artifact.with_name(f"{artifact.stem}_report.json")
+    report_path.write_text(json.dumps(report, indent=2))
+    print(f"Report: {report_path}")
+
+
+if __name__ == "__main__":
+    main()
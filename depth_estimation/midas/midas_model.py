@@ -1,9 +1,19 @@
+import json
 import numpy as np
 import torch
 import torch.nn.functional as F
 from contextlib import contextmanager
 from pathlib import Path
 import sys
+import time
+
+from depth_estimation.midas.constants import MIDAS_EXPORT_ASPECT_TOLERANCE
+from depth_estimation.midas.utils import (
+    DPT_MODEL_TYPES,
+    aspect_mismatch,
+    find_exported_midas,
+    prepare_midas_input,
+)
 
 
 class MiDaSModel:
@@ -132,18 +142,7 @@ class MiDaSModel:
 
     @staticmethod
     def _select_transform(transforms, model_type: str):
-        dpt_models = {
-            "DPT_Large",
-            "DPT_Hybrid",
-            "DPT_BEiT_L_512",
-            "DPT_BEiT_L_384",
-            "DPT_BEiT_B_384",
-            "DPT_SwinV2_L_384",
-            "DPT_SwinV2_B_384",
-            "DPT_SwinV2_T_256",
-            "DPT_LeViT_224",
-        }
-        if model_type in dpt_models:
+        if model_type in DPT_MODEL_TYPES:
             return transforms.dpt_transform
         return transforms.small_transform
 
@@ -164,3 +163,135 @@ class MiDaSModel:
 
         depth_map = prediction.squeeze().detach().cpu().numpy().astype(np.float32)
         return depth_map
+
+    def _check_aspect(self, frame_shape: tuple[int, ...]) -> None:
+        shape = (int(frame_shape[0]), int(frame_shape[1]))
+        if shape in self._warned_shapes:
+            return
+        self._warned_shapes.add(shape)
+        if aspect_mismatch(frame_shape, self.input_size, MIDAS_EXPORT_ASPECT_TOLERANCE):
+            print(
+                f"Warning: exported MiDaS input is {self.input_size[0]}x{self.input_size[1]} but frames are "
+                f"{shape[1]}x{shape[0]}; they are stretched to fit. Re-export with a matching --input-size "
+                "or set MIDAS_USE_EXPORT = False for the aspect-preserving hub transform."
+            )
+
+    def predict_batch(self, frames_rgb: list[np.ndarray]) -> list[np.ndarray]:
+        """One forward pass for same-size RGB frames; same output as predict() per frame."""
+        if not frames_rgb:
+            return []
+        input_batch = torch.cat([self.transform(frame) for frame in frames_rgb]).to(self.device)
+
+        with torch.no_grad():
+            prediction = self.model(input_batch)
+            prediction = F.interpolate(
+                prediction.unsqueeze(1),
+                size=frames_rgb[0].shape[:2],
+                mode="bicubic",
+                align_corners=False,
+            ).squeeze(1)
+
+        depth = prediction.detach().cpu().numpy().astype(np.float32)
+        return list(depth)
+
+
+class MiDaSTorchScriptModel:
+    """
+    MiDaS exported by export_midas.py: TorchScript module + JSON sidecar with the preprocessing.
+
+    Same predict() contract as MiDaSModel, without torch.hub, the hub transforms or
+    the sys.path/sys.modules handling. Input size is fixed at export time; frames with another
+    aspect ratio are stretched, which predict() warns about once per frame size.
+    """
+
+    def __init__(self, artifact_path: Path, device: str = "auto", model_type: str | None = None):
+        self.artifact_path = Path(artifact_path)
+        self.meta = json.loads(self.artifact_path.with_suffix(".json").read_text())
+        self.model_type = str(self.meta["model_type"])
+        if model_type is not None and self.model_type != model_type:
+            raise ValueError(f"{self.artifact_path.name} is a '{self.model_type}' export, expected '{model_type}'")
+        self.input_size = (int(self.meta["input_size"][0]), int(self.meta["input_size"][1]))
+        self.mean = tuple(float(v) for v in self.meta["mean"])
+        self.std = tuple(float(v) for v in self.meta["std"])
+        self.device = MiDaSModel._resolve_device(device)
+        if self.meta.get("optimized_for_cpu") and self.device != "cpu":
+            print(f"Warning: {self.artifact_path.name} was optimized for CPU; running it on CPU.")
+            self.device = "cpu"
+
+        t0 = time.perf_counter()
+        self.model = torch.jit.load(str(self.artifact_path), map_location=self.device)
+        self.model.eval()
+        self.load_s = time.perf_counter() - t0
+        self._batch_ok = True
+        self._warned_shapes: set[tuple[int, int]] = set()
+        print(
+            f"Loaded exported MiDaS '{self.model_type}' {self.input_size[0]}x{self.input_size[1]} "
+            f"on '{self.device}' in {self.load_s:.2f} s ({self.artifact_path})."
+        )
+
+    def predict(self, frame_rgb: np.ndarray) -> np.ndarray:
+        if frame_rgb.ndim != 3 or frame_rgb.shape[2] != 3:
+            raise ValueError("Expected RGB frame with shape (H, W, 3).")
+
+        self._check_aspect(frame_rgb.shape)
+        batch = prepare_midas_input(frame_rgb, self.input_size, self.mean, self.std)
+        with torch.inference_mode():
+            prediction = self.model(torch.from_numpy(batch).to(self.device))
+            prediction = F.interpolate(
+                prediction.unsqueeze(1),
+                size=frame_rgb.shape[:2],
+                mode="bicubic",
+                align_corners=False,
+            ).squeeze(1)
+        return prediction.squeeze().detach().cpu().numpy().astype(np.float32)
+
+    def predict_batch(self, frames_rgb: list[np.ndarray]) -> list[np.ndarray]:
+        """
+        One forward pass for same-size RGB frames. The trace is made at batch 1; if the graph
+        does not generalise to larger batches, fall back to per-frame predict() from then on.
+        """
+        if not frames_rgb:
+            return []
+        if len(frames_rgb) == 1 or not self._batch_ok:
+            return [self.predict(frame) for frame in frames_rgb]
+
+        self._check_aspect(frames_rgb[0].shape)
+        batch = np.concatenate(
+            [prepare_midas_input(frame, self.input_size, self.mean, self.std) for frame in frames_rgb]
+        )
+        try:
+            with torch.inference_mode():
+                prediction = self.model(torch.from_numpy(batch).to(self.device))
+                prediction = F.interpolate(
+                    prediction.unsqueeze(1),
+                    size=frames_rgb[0].shape[:2],
+                    mode="bicubic",
+                    align_corners=False,
+                ).squeeze(1)
+        except RuntimeError as exc:
+            print(f"Warning: exported MiDaS does not run batched ({exc}); using batch size 1.")
+            self._batch_ok = False
+            return [self.predict(frame) for frame in frames_rgb]
+        return list(prediction.detach().cpu().numpy().astype(np.float32))
+
+
+def load_midas_model(
+    model_type: str,
+    device: str = "auto",
+    export_dir: Path | None = None,
+    use_export: bool = True,
+):
+    """Exported TorchScript model when available (fast start), otherwise the torch.hub model."""
+    if use_export and export_dir is not None:
+        artifact = find_exported_midas(export_dir, model_type)
+        if artifact is not None:
+            try:
+                return MiDaSTorchScriptModel(artifact, device=device, model_type=model_type)
+            except (RuntimeError, OSError, KeyError, ValueError) as exc:
+                print(f"Warning: could not load exported MiDaS {artifact}: {exc}. Falling back to torch.hub.")
+        else:
+            print(
+                f"No exported MiDaS '{model_type}' in {export_dir}; loading from torch.hub "
+                "(run ./scripts/export_midas.sh once for a faster start)."
+            )
+    return MiDaSModel(model_type=model_type, device=device)
@@ -10,6 +10,7 @@ from depth_estimation.midas.constants import (
     MIDAS_CENTER_PATCH_SIZE,
     MIDAS_COLORMAP,
     MIDAS_DEVICE,
+    MIDAS_EXPORT_DIR,
     MIDAS_IMAGE_FALLBACK_EXTENSIONS,
     MIDAS_IMAGE_INPUT_PATH,
     MIDAS_IMAGE_OUTPUT_DIR,
@@ -18,19 +19,27 @@ from depth_estimation.midas.constants import (
     MIDAS_INVERT_COLORMAP,
     MIDAS_MODEL_TYPE,
     MIDAS_PRINT_EVERY_N_FRAMES,
+    MIDAS_ROI_ASPECT_RATIO_RANGE,
     MIDAS_TEXT_COLOR,
     MIDAS_TEXT_LINE_HEIGHT,
     MIDAS_TEXT_ORIGIN,
     MIDAS_TEXT_SCALE,
     MIDAS_TEXT_THICKNESS,
+    MIDAS_USE_EXPORT,
     MIDAS_VIDEO_INPUT_PATH,
+    MIDAS_VIDEO_BATCH_SIZE,
+    MIDAS_VIDEO_DEPTH_STACK_DTYPE,
+    MIDAS_VIDEO_DEPTH_STACK_PATH,
     MIDAS_VIDEO_MAX_FRAMES,
     MIDAS_VIDEO_OUTPUT_PATH,
     MIDAS_VIDEO_SHOW_PREVIEW,
     MIDAS_VIDEO_WINDOW_NAME,
+    MIDAS_VIDEO_WRITE_DEPTH_STACK,
     MIDAS_VIDEO_WRITE_OUTPUT,
 )
-from depth_estimation.midas.midas_model import MiDaSModel
+from depth_estimation.batch_video import BatchedVideoDepthRunner
+from depth_estimation.colorize import DepthColorizer
+from depth_estimation.midas.midas_model import MiDaSModel, MiDaSTorchScriptModel, load_midas_model
 from depth_estimation.midas.utils import (
     colorize_depth_map,
     compute_center_depth,
@@ -40,21 +49,37 @@ from depth_estimation.midas.utils import (
     resize_depth_to_frame,
 )
 from depth_estimation.pipeline_base import LiveDepthPipeline, LiveFrameOutput
+from depth_estimation.roi_depth import RoiDepthResult, RoiWindow, infer_roi_depth
+from profiling import traced
 
 
 class MiDaSPipeline(LiveDepthPipeline):
     name = "midas"
 
-    def __init__(self, model_type: str = MIDAS_MODEL_TYPE, device: str = MIDAS_DEVICE):
+    def __init__(
+        self,
+        model_type: str = MIDAS_MODEL_TYPE,
+        device: str = MIDAS_DEVICE,
+        use_export: bool = MIDAS_USE_EXPORT,
+    ):
         self.model_type = model_type
         self.device = device
-        self._model: MiDaSModel | None = None
+        self.use_export = bool(use_export)
+        self._model: MiDaSModel | MiDaSTorchScriptModel | None = None
+        # Live frames only (one thread per pipeline); colorizes straight into the composed frame.
+        self._colorizer = DepthColorizer(MIDAS_COLORMAP, MIDAS_INVERT_COLORMAP)
 
-    def _get_model(self) -> MiDaSModel:
+    def _get_model(self) -> MiDaSModel | MiDaSTorchScriptModel:
         if self._model is None:
-            self._model = MiDaSModel(model_type=self.model_type, device=self.device)
+            self._model = load_midas_model(
+                self.model_type,
+                device=self.device,
+                export_dir=resolve_repo_path(MIDAS_EXPORT_DIR),
+                use_export=self.use_export,
+            )
         return self._model
 
+    @traced("midas.infer_depth", "inference")
     def _infer_depth(self, frame_bgr: np.ndarray):
         t0 = time.perf_counter()
         frame_rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
@@ -62,6 +87,28 @@ class MiDaSPipeline(LiveDepthPipeline):
         infer_ms = (time.perf_counter() - t0) * 1000.0
         return depth_map, infer_ms
 
+    @traced("midas.infer_depth_batch", "inference")
+    def _infer_depth_batch(self, frames_bgr: list[np.ndarray]) -> list[np.ndarray]:
+        frames_rgb = [cv2.cvtColor(frame, cv2.COLOR_BGR2RGB) for frame in frames_bgr]
+        return self._get_model().predict_batch(frames_rgb)
+
+    @traced("midas.infer_roi", "inference")
+    def infer_roi(self, frame_bgr: np.ndarray, bbox_xyxy) -> RoiDepthResult:
+        """Relative inverse depth for a context window around bbox_xyxy only (higher = closer)."""
+        model = self._get_model()
+
+        def infer(roi_bgr: np.ndarray, _window: RoiWindow) -> np.ndarray:
+            return model.predict(cv2.cvtColor(roi_bgr, cv2.COLOR_BGR2RGB))
+
+        aspect_ratio_range = MIDAS_ROI_ASPECT_RATIO_RANGE
+        if isinstance(model, MiDaSTorchScriptModel):
+            # Fixed export input: crop to its aspect so the resize does not distort the drone.
+            export_aspect = model.input_size[0] / model.input_size[1]
+            aspect_ratio_range = (export_aspect, export_aspect)
+        result = infer_roi_depth(frame_bgr, bbox_xyxy, infer, aspect_ratio_range=aspect_ratio_range)
+        result.extras["depth_units"] = "relative_inverse"
+        return result
+
     def run_image(self, image_path: str | None = None) -> None:
         image_path_obj = resolve_existing_image_path(
             image_path or MIDAS_IMAGE_INPUT_PATH,
@@ -115,18 +162,18 @@ class MiDaSPipeline(LiveDepthPipeline):
                 cv2.LINE_AA,
             )
 
+    @traced("midas.process_live_frame", "pipeline")
     def process_live_frame(self, frame_bgr: np.ndarray) -> LiveFrameOutput:
         depth_map, infer_ms = self._infer_depth(frame_bgr)
         height, width = frame_bgr.shape[:2]
         depth_map = resize_depth_to_frame(depth_map, width, height)
         center_depth = compute_center_depth(depth_map, MIDAS_CENTER_PATCH_SIZE)
 
-        depth_color = colorize_depth_map(
-            depth_map,
-            MIDAS_COLORMAP,
-            invert_colormap=MIDAS_INVERT_COLORMAP,
-        )
-        composed = np.hstack([frame_bgr, depth_color])
+        # frame | depth side by side without an intermediate color image. A new array per frame, since
+        # callers (and the concurrent executor) keep the returned output around.
+        composed = np.empty((height, width * 2, 3), dtype=np.uint8)
+        composed[:, :width] = frame_bgr
+        self._colorizer.colorize(depth_map, out=composed[:, width:])
 
         self._draw_overlay(
             composed,
@@ -227,5 +274,41 @@ class MiDaSPipeline(LiveDepthPipeline):
         print("Depth inference finished (video, MiDaS).")
         print(f"- processed frames: {frame_idx}")
 
+    def run_video_batched(self, video_path: str | None = None) -> dict:
+        """Offline video mode: batched inference with decode/encode overlapped (see batch_video.py)."""
+        resolved_video_path = resolve_repo_path(video_path or MIDAS_VIDEO_INPUT_PATH)
+        if not resolved_video_path.exists():
+            raise RuntimeError(
+                f"Video not found: {resolved_video_path}\n"
+                "Set MIDAS_VIDEO_INPUT_PATH in depth_estimation/midas/constants.py."
+            )
+
+        def annotate(composed: np.ndarray, depth_map: np.ndarray, frame_idx: int, infer_ms: float) -> None:
+            center_depth = compute_center_depth(depth_map, MIDAS_CENTER_PATCH_SIZE)
+            self._draw_overlay(
+                composed,
+                [
+                    f"method: {self.name} ({self.model_type}, batch {MIDAS_VIDEO_BATCH_SIZE})",
+                    f"inference: {infer_ms:.1f} ms/frame",
+                    f"center depth: {center_depth:.3f}",
+                    f"frame: {frame_idx}",
+                ],
+            )
+
+        runner = BatchedVideoDepthRunner(
+            infer_batch=self._infer_depth_batch,
+            # Called on the encoder thread only; the colored map is copied into the composed frame.
+            colorize=DepthColorizer(MIDAS_COLORMAP, MIDAS_INVERT_COLORMAP).colorize,
+            annotate=annotate,
+            batch_size=MIDAS_VIDEO_BATCH_SIZE,
+            output_video_path=resolve_repo_path(MIDAS_VIDEO_OUTPUT_PATH) if MIDAS_VIDEO_WRITE_OUTPUT else None,
+            depth_stack_path=resolve_repo_path(MIDAS_VIDEO_DEPTH_STACK_PATH) if MIDAS_VIDEO_WRITE_DEPTH_STACK else None,
+            stack_dtype=MIDAS_VIDEO_DEPTH_STACK_DTYPE,
+            max_frames=MIDAS_VIDEO_MAX_FRAMES,
+            print_every_n_frames=MIDAS_PRINT_EVERY_N_FRAMES,
+            metadata={"method": self.name, "model_type": self.model_type, "depth_units": "relative_inverse"},
+        )
+        return runner.run(resolved_video_path)
+
     def close(self) -> None:
         self._model = None
@@ -1,7 +1,11 @@
+import json
+import re
 from pathlib import Path
 
 import numpy as np
 
+from depth_estimation.colorize import DepthColorizer
+
 REPO_ROOT = Path(__file__).resolve().parents[2]
 
 
@@ -60,43 +64,14 @@ def compute_center_depth(depth_map: np.ndarray, patch_size: int) -> float:
     return float(np.median(finite))
 
 
-def _normalize_depth_to_uint8(depth_map: np.ndarray) -> np.ndarray:
-    finite = depth_map[np.isfinite(depth_map)]
-    if finite.size == 0:
-        return np.zeros(depth_map.shape, dtype=np.uint8)
-
-    d_min = float(np.min(finite))
-    d_max = float(np.max(finite))
-    denom = max(1e-6, d_max - d_min)
-    normalized = np.clip((depth_map - d_min) / denom, 0.0, 1.0)
-    return (normalized * 255.0).astype(np.uint8)
-
-
-def _resolve_colormap_code(colormap_name: str) -> int:
-    import cv2
-
-    lookup = {
-        "turbo": cv2.COLORMAP_TURBO,
-        "magma": cv2.COLORMAP_MAGMA,
-        "inferno": cv2.COLORMAP_INFERNO,
-        "jet": cv2.COLORMAP_JET,
-        "viridis": cv2.COLORMAP_VIRIDIS,
-    }
-    return lookup.get(colormap_name.lower(), cv2.COLORMAP_TURBO)
-
-
 def colorize_depth_map(
     depth_map: np.ndarray,
     colormap_name: str,
     invert_colormap: bool = False,
 ) -> np.ndarray:
-    import cv2
-
-    colormap = _resolve_colormap_code(colormap_name)
-    depth_u8 = _normalize_depth_to_uint8(depth_map)
-    if invert_colormap:
-        depth_u8 = 255 - depth_u8
-    return cv2.applyColorMap(depth_u8, colormap)
+    """Per-frame min/max colorization into a new array; live/video paths keep a DepthColorizer instead."""
+    colorizer = DepthColorizer(colormap_name, invert_colormap, percentiles=(0.0, 100.0), range_sample_step=1)
+    return colorizer.colorize(depth_map)
 
 
 def resize_depth_to_frame(depth_map: np.ndarray, width: int, height: int) -> np.ndarray:
@@ -105,3 +80,81 @@ def resize_depth_to_frame(depth_map: np.ndarray, width: int, height: int) -> np.
     if depth_map.shape[1] == width and depth_map.shape[0] == height:
         return depth_map
     return cv2.resize(depth_map, (width, height), interpolation=cv2.INTER_LINEAR)
+
+
+# Input normalisation of the hub transforms: DPT models use 0.5/0.5, MiDaS_small uses ImageNet stats.
+DPT_MODEL_TYPES = {
+    "DPT_Large",
+    "DPT_Hybrid",
+    "DPT_BEiT_L_512",
+    "DPT_BEiT_L_384",
+    "DPT_BEiT_B_384",
+    "DPT_SwinV2_L_384",
+    "DPT_SwinV2_B_384",
+    "DPT_SwinV2_T_256",
+    "DPT_LeViT_224",
+}
+DPT_NORMALIZATION = ((0.5, 0.5, 0.5), (0.5, 0.5, 0.5))
+IMAGENET_NORMALIZATION = ((0.485, 0.456, 0.406), (0.229, 0.224, 0.225))
+
+
+def midas_normalization(model_type: str) -> tuple[tuple[float, ...], tuple[float, ...]]:
+    return DPT_NORMALIZATION if model_type in DPT_MODEL_TYPES else IMAGENET_NORMALIZATION
+
+
+def export_artifact_stem(model_type: str, input_size: tuple[int, int]) -> str:
+    return f"{model_type}_{int(input_size[0])}x{int(input_size[1])}"
+
+
+def find_exported_midas(export_dir: Path, model_type: str) -> Path | None:
+    """
+    Newest exported artifact for exactly model_type in export_dir (any input size). The stem must be
+    export_artifact_stem(model_type, ...) and the sidecar must name the same model type, so "MiDaS"
+    never picks up a MiDaS_small export.
+    """
+    export_dir = Path(export_dir)
+    if not export_dir.is_dir():
+        return None
+    stem_re = re.compile(rf"{re.escape(model_type)}_(\d+)x(\d+)")
+    candidates = []
+    for path in export_dir.glob("*.pt"):
+        sidecar = path.with_suffix(".json")
+        if not stem_re.fullmatch(path.stem) or not sidecar.is_file():
+            continue
+        try:
+            meta = json.loads(sidecar.read_text())
+        except (OSError, ValueError):
+            continue
+        if isinstance(meta, dict) and meta.get("model_type") == model_type:
+            candidates.append(path)
+    candidates.sort(key=lambda p: p.stat().st_mtime, reverse=True)
+    return candidates[0] if candidates else None
+
+
+def aspect_mismatch(frame_shape: tuple[int, ...], input_size: tuple[int, int], tolerance: float) -> bool:
+    """True when prepare_midas_input would visibly stretch a frame of frame_shape (H, W, ...) to input_size (W, H)."""
+    frame_aspect = float(frame_shape[1]) / float(frame_shape[0])
+    input_aspect = float(input_size[0]) / float(input_size[1])
+    return abs(frame_aspect / input_aspect - 1.0) > tolerance
+
+
+def prepare_midas_input(
+    frame_rgb: np.ndarray,
+    input_size: tuple[int, int],
+    mean: tuple[float, ...],
+    std: tuple[float, ...],
+) -> np.ndarray:
+    """
+    RGB uint8 frame -> normalised float32 NCHW batch at the fixed export size. Matches the hub transform
+    only when the frame has the export aspect ratio; other frames are stretched (see aspect_mismatch).
+    """
+    import cv2
+
+    width, height = int(input_size[0]), int(input_size[1])
+    if width % 32 or height % 32:
+        raise ValueError(f"MiDaS input size must be a multiple of 32, got {width}x{height}")
+    resized = cv2.resize(frame_rgb, (width, height), interpolation=cv2.INTER_CUBIC)
+    image = resized.astype(np.float32) * (1.0 / 255.0)
+    image -= np.asarray(mean, dtype=np.float32)
+    image /= np.asarray(std, dtype=np.float32)
+    return np.ascontiguousarray(image.transpose(2, 0, 1)[None])
@@ -140,6 +140,9 @@ NAIVE_REVIEW_ALLOW_IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
 NAIVE_REVIEW_WRITE_LOG = True
 NAIVE_REVIEW_LOG_DIR = OUTPUT_DIR + "/review_logs"
 NAIVE_REVIEW_PRINT_EVERY_N_FRAMES = 50
+# Dense depth archive to sample inside the bbox (built once by ./scripts/build_depth_archive.sh).
+# "unidepth" / "midas" reads <session>/depth_archive/<method>/; None disables. Skipped if missing.
+NAIVE_REVIEW_DEPTH_ARCHIVE_METHOD = "unidepth"
 
 # Overlay text for session review.
 NAIVE_REVIEW_TEXT_ORIGIN = (12, 28)
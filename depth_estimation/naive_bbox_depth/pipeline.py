@@ -3,7 +3,6 @@ from __future__ import annotations
 import time
 
 import cv2
-from ultralytics import YOLO
 
 from depth_estimation.naive_bbox_depth.constants import (
     BUFFER_SIZE,
@@ -69,9 +68,12 @@ from depth_estimation.naive_bbox_depth.utils import (
     ensure_output_dir,
     estimate_distance_from_bbox,
     load_intrinsics_from_camera_matrix,
+    load_ultralytics_yolo,
     resolve_repo_path,
 )
 from depth_estimation.pipeline_base import LiveDepthPipeline, LiveFrameOutput
+from presentation import create_presenter
+from profiling import record_yolo_stages, span, traced
 
 
 class NaiveBBoxDepthPipeline(LiveDepthPipeline):
@@ -206,7 +208,7 @@ class NaiveBBoxDepthPipeline(LiveDepthPipeline):
 
         self._missed_frames = 0
         self._last_estimate_metrics: dict[str, float | int | str] | None = None
-        self._model: YOLO | None = None
+        self._model = None
 
     def _configure_intrinsics(self) -> None:
         if self.intrinsics_source == "manual":
@@ -233,12 +235,12 @@ class NaiveBBoxDepthPipeline(LiveDepthPipeline):
         self.cy = float(values["cy"])
         self.intrinsics_loaded_from = "calibration_npy"
 
-    def _get_model(self) -> YOLO:
+    def _get_model(self):
         if self._model is None:
             model_abs = resolve_repo_path(self.model_path)
             if not model_abs.exists():
                 raise FileNotFoundError(f"Could not read model weights: {model_abs}")
-            self._model = YOLO(str(model_abs))
+            self._model = load_ultralytics_yolo()(str(model_abs))
         return self._model
 
     def set_gating_enabled(self, enabled: bool) -> bool:
@@ -263,6 +265,7 @@ class NaiveBBoxDepthPipeline(LiveDepthPipeline):
             y_axis_convention=self.y_axis_convention,
         )
 
+    @traced("naive.gating", "gating")
     def _evaluate_gating(
         self,
         raw: dict[str, float],
@@ -389,6 +392,7 @@ class NaiveBBoxDepthPipeline(LiveDepthPipeline):
 
         return cap
 
+    @traced("naive.rank_candidates", "postprocess")
     def _ranked_detections(
         self,
         results,
@@ -415,12 +419,15 @@ class NaiveBBoxDepthPipeline(LiveDepthPipeline):
 
     def _predict(self, source):
         t0 = time.perf_counter()
-        results = self._get_model().predict(
-            source,
-            conf=self.conf_threshold,
-            verbose=False,
-        )
+        with span("naive.predict", "inference"):
+            results = self._get_model().predict(
+                source,
+                conf=self.conf_threshold,
+                verbose=False,
+            )
         infer_ms = (time.perf_counter() - t0) * 1000.0
+        if results:
+            record_yolo_stages(results[0], t0)
         return results, infer_ms
 
     def _attach_runtime_metrics(
@@ -444,11 +451,13 @@ class NaiveBBoxDepthPipeline(LiveDepthPipeline):
         return {
             "confidence": round(float(conf), 4),
             "raw_bbox_width_px": round(float(estimate["bbox_width_px"]), 2),
+            "raw_bbox_height_px": round(float(xyxy[3] - xyxy[1]), 2),
             "raw_bbox_center_x_px": round(float(estimate["center_px"][0]), 2),
             "raw_bbox_center_y_px": round(float(estimate["center_px"][1]), 2),
             "raw_distance_m": round(float(estimate["z_est_m"]), 4),
         }
 
+    @traced("naive.filter", "filtering")
     def _filtered_measurement_from_raw(
         self, raw: dict[str, float]
     ) -> dict[str, float | int | str]:
@@ -481,6 +490,7 @@ class NaiveBBoxDepthPipeline(LiveDepthPipeline):
         metrics = {
             "confidence": float(raw["confidence"]),
             "raw_bbox_width_px": round(raw_width, 2),
+            "raw_bbox_height_px": float(raw["raw_bbox_height_px"]),
             "bbox_width_px": round(filtered_width, 2),
             "raw_bbox_center_x_px": round(raw_center_x, 2),
             "raw_bbox_center_y_px": round(raw_center_y, 2),
@@ -552,6 +562,7 @@ class NaiveBBoxDepthPipeline(LiveDepthPipeline):
             self.reset_temporal_state()
         return metrics
 
+    @traced("naive.annotate_best", "annotation")
     def _annotate_best_detection(
         self, frame_bgr, xyxy, metrics: dict[str, float | int | str]
     ) -> None:
@@ -627,6 +638,7 @@ class NaiveBBoxDepthPipeline(LiveDepthPipeline):
                 cv2.LINE_AA,
             )
 
+    @traced("naive.annotate_rejected", "annotation")
     def _annotate_rejected_detection(
         self,
         frame_bgr,
@@ -694,6 +706,7 @@ class NaiveBBoxDepthPipeline(LiveDepthPipeline):
                 cv2.LINE_AA,
             )
 
+    @traced("naive.annotate_missing", "annotation")
     def _annotate_missing_detection(self, frame_bgr, metrics: dict[str, float | int | str]) -> None:
         track_state = str(metrics.get("track_state", "lost")).upper()
         frames_since_detection = int(metrics.get("frames_since_detection", 0))
@@ -719,6 +732,7 @@ class NaiveBBoxDepthPipeline(LiveDepthPipeline):
             2,
         )
 
+    @traced("naive.relative_overlay", "annotation")
     def _draw_relative_overlay(self, frame_bgr, metrics: dict[str, float | int | str]) -> None:
         if not self.enable_relative_position:
             return
@@ -747,6 +761,7 @@ class NaiveBBoxDepthPipeline(LiveDepthPipeline):
                 2,
             )
 
+    @traced("naive.process_live_frame", "pipeline")
     def process_live_frame(self, frame_bgr) -> LiveFrameOutput:
         process_t0 = time.perf_counter()
         display_frame = frame_bgr.copy()
@@ -863,6 +878,7 @@ class NaiveBBoxDepthPipeline(LiveDepthPipeline):
     ) -> None:
         self.reset_temporal_state()
         cap = self._open_camera(device, width, height, fps_hint, fourcc, buffer_size)
+        presenter = create_presenter(window_name=window_name, key_quit=KEY_QUIT)
         frame_count = 0
         print("Live naive depth started.")
         print("Controls: q/ESC quit, g toggle gating.")
@@ -896,9 +912,9 @@ class NaiveBBoxDepthPipeline(LiveDepthPipeline):
                     (255, 255, 255),
                     2,
                 )
-                cv2.imshow(window_name, display)
+                presenter.present(display, result.metrics)
 
-                key = cv2.waitKey(1) & 0xFF
+                key = presenter.poll_key()
                 if key in KEY_QUIT:
                     break
                 if key in KEY_TOGGLE_GATING:
@@ -906,7 +922,7 @@ class NaiveBBoxDepthPipeline(LiveDepthPipeline):
                     print(f"[live] gating={'ON' if new_state else 'OFF'}")
         finally:
             cap.release()
-            cv2.destroyAllWindows()
+            presenter.close()
 
     def reset_temporal_state(self) -> None:
         self._distance_filter.reset()
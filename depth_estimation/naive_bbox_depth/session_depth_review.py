@@ -31,6 +31,7 @@ from depth_estimation.naive_bbox_depth.constants import (
     NAIVE_INTRINSICS_SOURCE,
     NAIVE_REVIEW_ALLOW_IMAGE_EXTS,
     NAIVE_REVIEW_DELAY_S,
+    NAIVE_REVIEW_DEPTH_ARCHIVE_METHOD,
     NAIVE_REVIEW_LOG_DIR,
     NAIVE_REVIEW_PRINT_EVERY_N_FRAMES,
     NAIVE_REVIEW_SESSION_DIR,
@@ -50,6 +51,7 @@ from depth_estimation.naive_bbox_depth.constants import (
     NAIVE_Y_AXIS_CONVENTION,
     YOLO_CONF_THRESHOLD,
 )
+from depth_estimation.depth_archive import DepthArchive, session_archive_dir
 from depth_estimation.naive_bbox_depth.pipeline import NaiveBBoxDepthPipeline
 from depth_estimation.naive_bbox_depth.utils import ensure_output_dir, resolve_repo_path
 
@@ -110,6 +112,7 @@ def open_metrics_logger(session_dir: Path, log_dir: str):
             "detection_count",
             "confidence",
             "raw_bbox_width_px",
+            "raw_bbox_height_px",
             "bbox_width_px",
             "raw_bbox_center_x_px",
             "raw_bbox_center_y_px",
@@ -127,6 +130,9 @@ def open_metrics_logger(session_dir: Path, log_dir: str):
             "raw_yaw_error_deg",
             "yaw_error_rad",
             "yaw_error_deg",
+            "archive_depth",
+            "archive_depth_p10",
+            "archive_depth_p90",
         ],
     )
     writer.writeheader()
@@ -160,6 +166,7 @@ def write_metrics_row(
             "detection_count": metrics.get("detection_count", 0),
             "confidence": metrics.get("confidence", ""),
             "raw_bbox_width_px": metrics.get("raw_bbox_width_px", ""),
+            "raw_bbox_height_px": metrics.get("raw_bbox_height_px", ""),
             "bbox_width_px": metrics.get("bbox_width_px", ""),
             "raw_bbox_center_x_px": metrics.get("raw_bbox_center_x_px", ""),
             "raw_bbox_center_y_px": metrics.get("raw_bbox_center_y_px", ""),
@@ -177,11 +184,51 @@ def write_metrics_row(
             "raw_yaw_error_deg": metrics.get("raw_yaw_error_deg", ""),
             "yaw_error_rad": metrics.get("yaw_error_rad", ""),
             "yaw_error_deg": metrics.get("yaw_error_deg", ""),
+            "archive_depth": metrics.get("archive_depth", ""),
+            "archive_depth_p10": metrics.get("archive_depth_p10", ""),
+            "archive_depth_p90": metrics.get("archive_depth_p90", ""),
         }
     )
     log_file.flush()
 
 
+def open_review_depth_archive(session_dir: Path, method: str | None) -> DepthArchive | None:
+    if not method:
+        return None
+    archive_dir = session_archive_dir(session_dir, method)
+    if not (archive_dir / "meta.json").is_file():
+        print(
+            f"No {method} depth archive for this session ({archive_dir}); "
+            f"build one with ./scripts/build_depth_archive.sh --session {session_dir} --method {method}"
+        )
+        return None
+    archive = DepthArchive.open(archive_dir)
+    print(f"Depth archive: {archive_dir} ({len(archive.filled_indices())}/{len(archive)} frames filled)")
+    return archive
+
+
+def sample_archive_depth(archive: DepthArchive, image_name: str, metrics: dict) -> dict:
+    """Archived dense depth inside the raw bbox of a measurement frame (empty dict otherwise)."""
+    if metrics.get("estimate_source") != "measurement":
+        return {}
+    frame_index = archive.index_of(image_name)
+    if frame_index is None:
+        return {}
+    try:
+        cx, cy = float(metrics["raw_bbox_center_x_px"]), float(metrics["raw_bbox_center_y_px"])
+        hw, hh = 0.5 * float(metrics["raw_bbox_width_px"]), 0.5 * float(metrics["raw_bbox_height_px"])
+    except (KeyError, TypeError, ValueError):
+        return {}
+    stats = archive.bbox_depth(frame_index, (cx - hw, cy - hh, cx + hw, cy + hh))
+    if not stats or "median" not in stats:
+        return {}
+    return {
+        "archive_depth": stats["median"],
+        "archive_depth_p10": stats["p10"],
+        "archive_depth_p90": stats["p90"],
+    }
+
+
 def _as_float(value):
     try:
         return float(value)
@@ -205,8 +252,11 @@ def compose_review_display(
     playing: bool,
     delay_s: float,
     metrics: dict,
+    archive: DepthArchive | None = None,
 ) -> np.ndarray:
     status = "PLAY" if playing else "PAUSE"
+    archive_label = archive.method if archive is not None else "no archive"
+    archive_unit = " m" if archive is not None and archive.depth_units == "m" else ""
 
     track_state = str(metrics.get("track_state", "unknown"))
     estimate_source = str(metrics.get("estimate_source", "none"))
@@ -252,7 +302,8 @@ def compose_review_display(
             ),
             (
                 f"conf: {_format_value(conf, 2)} "
-                f"raw/filt dist: {_format_value(raw_dist, 3)}/{_format_value(filt_dist, 3)} m"
+                f"raw/filt dist: {_format_value(raw_dist, 3)}/{_format_value(filt_dist, 3)} m "
+                f"dense: {_format_value(metrics.get('archive_depth'), 3, archive_unit)}"
             ),
             f"session: {session_name}",
             f"image: {image_name}",
@@ -314,6 +365,11 @@ def compose_review_display(
             (f"Y: {_format_value(y_rel, 3, ' m')}", text_color, 0.56),
             (f"Z: {_format_value(z_rel, 3, ' m')}", text_color, 0.56),
             (f"Yaw err: {_format_value(yaw_deg, 1, ' deg')}", text_color, 0.56),
+            (
+                f"Dense ({archive_label}): {_format_value(metrics.get('archive_depth'), 3, archive_unit)}",
+                text_color,
+                0.56,
+            ),
             ("", text_color, 0.56),
             (f"Session: {session_name}", text_color, 0.50),
             (
@@ -350,6 +406,7 @@ def ensure_processed_upto_index(
     pipeline: NaiveBBoxDepthPipeline,
     log_writer: csv.DictWriter | None,
     log_file: TextIO | None,
+    archive: DepthArchive | None = None,
 ) -> tuple[list, list[dict], list[Path]]:
     while len(processed_frames) <= target_index and len(processed_frames) < len(image_paths):
         frame_index = len(processed_frames)
@@ -363,6 +420,8 @@ def ensure_processed_upto_index(
             continue
 
         output = pipeline.process_live_frame(frame)
+        if archive is not None:
+            output.metrics.update(sample_archive_depth(archive, image_path.name, output.metrics))
         processed_frames.append(output.frame_bgr)
         processed_metrics.append(dict(output.metrics))
 
@@ -433,6 +492,8 @@ def main() -> None:
     print("g: toggle gating + reprocess timeline")
     print("q or ESC: quit")
 
+    archive = open_review_depth_archive(session_dir, NAIVE_REVIEW_DEPTH_ARCHIVE_METHOD)
+
     log_path = None
     log_file = None
     log_writer = None
@@ -457,6 +518,7 @@ def main() -> None:
                 pipeline=pipeline,
                 log_writer=log_writer,
                 log_file=log_file,
+                archive=archive,
             )
             if not image_paths:
                 print("No readable images left. Exiting.")
@@ -473,6 +535,7 @@ def main() -> None:
                 playing=playing,
                 delay_s=delay_s,
                 metrics=processed_metrics[index],
+                archive=archive,
             )
 
             cv2.imshow(NAIVE_REVIEW_WINDOW_NAME, display)
@@ -524,6 +587,8 @@ def main() -> None:
             log_file.close()
         cv2.destroyAllWindows()
         pipeline.close()
+        if archive is not None:
+            archive.close()
 
 
 if __name__ == "__main__":
@@ -3,7 +3,6 @@ import math
 
 import cv2
 import numpy as np
-from ultralytics import YOLO
 
 from depth_estimation.naive_bbox_depth.constants import (
     BUFFER_SIZE,
@@ -24,6 +23,12 @@ def resolve_repo_path(path_like: str) -> Path:
     return path if path.is_absolute() else (REPO_ROOT / path)
 
 
+def load_ultralytics_yolo():
+    # Imported on first use so the pipeline/filters stay importable without torch.
+    from ultralytics import YOLO
+    return YOLO
+
+
 def ensure_output_dir(path: str | Path) -> Path:
     output_dir = resolve_repo_path(str(path))
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -113,7 +118,7 @@ def yolo_inference(image_path: str, model_path: str, conf_threshold: float):
     if not model_abs.exists():
         raise FileNotFoundError(f"Could not read model weights: {model_abs}")
 
-    model = YOLO(str(model_abs))
+    model = load_ultralytics_yolo()(str(model_abs))
     results = model.predict(str(image_abs), conf=conf_threshold)
     return results, image_abs
 
@@ -205,7 +210,7 @@ def live_distance_inference(model_path: str, conf_threshold: float):
     if not model_abs.exists():
         raise FileNotFoundError(f"Could not read model weights: {model_abs}")
 
-    yolo_model = YOLO(str(model_abs))
+    yolo_model = load_ultralytics_yolo()(str(model_abs))
     cap = open_camera()
 
     print("Live distance inference started. Press ESC to exit.")
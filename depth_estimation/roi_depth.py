@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import math
+import time
+from typing import Callable
+
+import cv2
+import numpy as np
+
+from depth_estimation.constants import (
+    DEPTH_ROI_CONTEXT_SCALE,
+    DEPTH_ROI_MIN_SIDE_PX,
+    DEPTH_ROI_STATS_SHRINK,
+)
+from depth_estimation.unidepth.utils import fixed_get_paddings
+
+
+@dataclass(frozen=True)
+class RoiWindow:
+    """Crop [x0:x1, y0:y1] of the frame plus border padding (left, right, top, bottom) around it."""
+
+    x0: int
+    y0: int
+    x1: int
+    y1: int
+    pad: tuple[int, int, int, int]
+    bbox_xyxy: tuple[float, float, float, float]
+
+    @property
+    def crop_size(self) -> tuple[int, int]:
+        return self.x1 - self.x0, self.y1 - self.y0
+
+    @property
+    def input_size(self) -> tuple[int, int]:
+        left, right, top, bottom = self.pad
+        w, h = self.crop_size
+        return w + left + right, h + top + bottom
+
+    def to_input(self, x: float, y: float) -> tuple[float, float]:
+        return x - self.x0 + self.pad[0], y - self.y0 + self.pad[2]
+
+    def bbox_in_input(self) -> tuple[float, float, float, float]:
+        x1, y1 = self.to_input(self.bbox_xyxy[0], self.bbox_xyxy[1])
+        x2, y2 = self.to_input(self.bbox_xyxy[2], self.bbox_xyxy[3])
+        return x1, y1, x2, y2
+
+    def adjust_intrinsics(self, fx: float, fy: float, cx: float, cy: float) -> tuple[float, float, float, float]:
+        # Cropping/padding only shifts the principal point; focal length is unchanged.
+        cx_in, cy_in = self.to_input(cx, cy)
+        return fx, fy, cx_in, cy_in
+
+
+@dataclass
+class RoiDepthResult:
+    window: RoiWindow
+    depth_map: np.ndarray
+    stats: dict[str, float | int]
+    infer_ms: float
+    extras: dict = field(default_factory=dict)
+
+
+def _fit_span(center: float, length: int, limit: int) -> tuple[int, int]:
+    """Integer span of the given length centred on center, shifted (not shrunk) to stay inside [0, limit)."""
+    length = max(1, min(int(length), int(limit)))
+    start = int(round(center - 0.5 * length))
+    start = min(max(0, start), int(limit) - length)
+    return start, start + length
+
+
+def compute_roi_window(
+    bbox_xyxy,
+    frame_size: tuple[int, int],
+    aspect_ratio_range: tuple[float, float],
+    context_scale: float = DEPTH_ROI_CONTEXT_SCALE,
+    min_side_px: int = DEPTH_ROI_MIN_SIDE_PX,
+) -> RoiWindow:
+    """
+    Context window around the bbox that satisfies the model aspect range.
+
+    The crop grows inside the frame towards the aspect given by fixed_get_paddings first;
+    only what does not fit in the frame is added as padding.
+    """
+    frame_w, frame_h = int(frame_size[0]), int(frame_size[1])
+    x1, y1, x2, y2 = (float(v) for v in bbox_xyxy)
+    if x2 <= x1 or y2 <= y1:
+        raise ValueError(f"Invalid bbox: {bbox_xyxy}")
+    cx, cy = 0.5 * (x1 + x2), 0.5 * (y1 + y2)
+    scale = max(1.0, float(context_scale))
+    want_w = max(int(min_side_px), int(math.ceil((x2 - x1) * scale)))
+    want_h = max(int(min_side_px), int(math.ceil((y2 - y1) * scale)))
+
+    # Target shape the model accepts; the crop takes as much of it from real pixels as possible.
+    _pads, (target_h, target_w) = fixed_get_paddings((want_h, want_w), aspect_ratio_range)
+    x0, x1_crop = _fit_span(cx, target_w, frame_w)
+    y0, y1_crop = _fit_span(cy, target_h, frame_h)
+
+    crop_h, crop_w = y1_crop - y0, x1_crop - x0
+    (left, right, top, bottom), _shape = fixed_get_paddings((crop_h, crop_w), aspect_ratio_range)
+    return RoiWindow(
+        x0=x0,
+        y0=y0,
+        x1=x1_crop,
+        y1=y1_crop,
+        pad=(left, right, top, bottom),
+        bbox_xyxy=(x1, y1, x2, y2),
+    )
+
+
+def extract_roi(frame: np.ndarray, window: RoiWindow) -> np.ndarray:
+    crop = frame[window.y0 : window.y1, window.x0 : window.x1]
+    left, right, top, bottom = window.pad
+    if left or right or top or bottom:
+        crop = cv2.copyMakeBorder(crop, top, bottom, left, right, cv2.BORDER_REPLICATE)
+    return np.ascontiguousarray(crop)
+
+
+def bbox_depth_values(
+    depth_map: np.ndarray,
+    bbox_xyxy,
+    map_size: tuple[int, int] | None = None,
+    shrink: float = DEPTH_ROI_STATS_SHRINK,
+) -> tuple[int, np.ndarray]:
+    """
+    (pixel count, finite depth values) of the shrunken bbox, given in coordinates of an image
+    of size map_size (default: the depth map itself).
+    """
+    map_h, map_w = depth_map.shape[:2]
+    src_w, src_h = map_size if map_size is not None else (map_w, map_h)
+    sx, sy = map_w / max(1, src_w), map_h / max(1, src_h)
+    x1, y1, x2, y2 = (float(v) for v in bbox_xyxy)
+    keep = min(1.0, max(0.05, float(shrink)))
+    cx, cy = 0.5 * (x1 + x2), 0.5 * (y1 + y2)
+    half_w, half_h = 0.5 * keep * (x2 - x1), 0.5 * keep * (y2 - y1)
+
+    mx1 = max(0, int(math.floor((cx - half_w) * sx)))
+    mx2 = min(map_w, max(mx1 + 1, int(math.ceil((cx + half_w) * sx))))
+    my1 = max(0, int(math.floor((cy - half_h) * sy)))
+    my2 = min(map_h, max(my1 + 1, int(math.ceil((cy + half_h) * sy))))
+    patch = depth_map[my1:my2, mx1:mx2]
+    return int(patch.size), patch[np.isfinite(patch)]
+
+
+def roi_depth_stats(
+    depth_map: np.ndarray,
+    bbox_xyxy,
+    map_size: tuple[int, int] | None = None,
+    shrink: float = DEPTH_ROI_STATS_SHRINK,
+) -> dict[str, float | int]:
+    """
+    Depth statistics inside bbox_xyxy, given in coordinates of an image of size map_size
+    (default: the depth map itself). Works for ROI maps and full-frame maps alike.
+    """
+    pixels, finite = bbox_depth_values(depth_map, bbox_xyxy, map_size, shrink)
+
+    stats: dict[str, float | int] = {
+        "pixels": pixels,
+        "valid_fraction": round(float(finite.size) / max(1, pixels), 4),
+    }
+    if finite.size == 0:
+        return stats
+    p10, median, p90 = np.percentile(finite, (10.0, 50.0, 90.0))
+    stats.update(
+        {
+            "median": round(float(median), 4),
+            "p10": round(float(p10), 4),
+            "p90": round(float(p90), 4),
+            "min": round(float(finite.min()), 4),
+            "max": round(float(finite.max()), 4),
+        }
+    )
+    return stats
+
+
+def infer_roi_depth(
+    frame_bgr: np.ndarray,
+    bbox_xyxy,
+    infer_fn: Callable[[np.ndarray, RoiWindow], np.ndarray],
+    aspect_ratio_range: tuple[float, float],
+    context_scale: float = DEPTH_ROI_CONTEXT_SCALE,
+    min_side_px: int = DEPTH_ROI_MIN_SIDE_PX,
+    stats_shrink: float = DEPTH_ROI_STATS_SHRINK,
+) -> RoiDepthResult:
+    """
+    Crop + pad a context window around the bbox, run infer_fn(roi_bgr, window) on it only,
+    and return the ROI depth map (input/padded coordinates) with bbox depth statistics.
+    """
+    frame_h, frame_w = frame_bgr.shape[:2]
+    window = compute_roi_window(bbox_xyxy, (frame_w, frame_h), aspect_ratio_range, context_scale, min_side_px)
+    roi_bgr = extract_roi(frame_bgr, window)
+    t0 = time.perf_counter()
+    depth_map = np.asarray(infer_fn(roi_bgr, window), dtype=np.float32).squeeze()
+    infer_ms = (time.perf_counter() - t0) * 1000.0
+    stats = roi_depth_stats(depth_map, window.bbox_in_input(), window.input_size, stats_shrink)
+    return RoiDepthResult(window=window, depth_map=depth_map, stats=stats, infer_ms=infer_ms)
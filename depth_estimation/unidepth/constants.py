@@ -1,3 +1,13 @@
+from depth_estimation.naive_bbox_depth.constants import (
+    CX as NAIVE_CX,
+    CY as NAIVE_CY,
+    FX as NAIVE_FX,
+    FY as NAIVE_FY,
+    HEIGHT as NAIVE_HEIGHT,
+    WIDTH as NAIVE_WIDTH,
+)
+
+
 ########################################## Model Constants ###############################################
 
 # UniDepth v2 resolution setting.
@@ -39,6 +49,15 @@ DEPTH_VIDEO_WINDOW_NAME = "UniDepth V2 Video Inference"
 # Optional frame cap for quick checks. Set to 0 to process all frames.
 DEPTH_VIDEO_MAX_FRAMES = 0
 
+# Batched offline mode (depth_video_inference.py --batched): a decoder thread feeds batches of
+# DEPTH_VIDEO_BATCH_SIZE frames to the model while an encoder thread colorizes and writes the
+# output video. No preview window; raw depth (metres) is stored as an (N, H, W) .npy stack.
+DEPTH_VIDEO_BATCH_SIZE = 4
+DEPTH_VIDEO_WRITE_DEPTH_STACK = True
+DEPTH_VIDEO_DEPTH_STACK_PATH = DEPTH_OUTPUT_ROOT + "/" + CUSTOM_PATH_VIDEO + "/video_depth.npy"
+# float16 halves disk use (~0.6 MB per 640x480 frame) at ~1e-3 relative precision.
+DEPTH_VIDEO_DEPTH_STACK_DTYPE = "float16"
+
 
 ########################################## Depth Measurement Constants ###################################
 
@@ -50,6 +69,19 @@ DEPTH_CENTER_PATCH_SIZE = 9
 DEPTH_PRINT_EVERY_N_FRAMES = 10
 
 
+########################################## ROI Inference Constants #######################################
+
+# Resolution level used for ROI crops (infer_roi). The crop covers a small part of the FOV,
+# so even the lowest level puts more model pixels on the target than a full frame does.
+DEPTH_ROI_RESOLUTION_LEVEL = 0
+# Pass the known camera intrinsics (shifted to the crop) instead of letting UniDepth guess them;
+# a crop looks like a narrow-FOV camera and predicted intrinsics would skew metric depth.
+DEPTH_ROI_USE_CAMERA_INTRINSICS = True
+# Pinhole intrinsics (fx, fy, cx, cy) valid at DEPTH_ROI_INTRINSICS_SIZE (same camera as naive depth).
+DEPTH_ROI_INTRINSICS = (NAIVE_FX, NAIVE_FY, NAIVE_CX, NAIVE_CY)
+DEPTH_ROI_INTRINSICS_SIZE = (NAIVE_WIDTH, NAIVE_HEIGHT)
+
+
 ########################################## Visualization Constants #######################################
 
 # Supported: "turbo", "magma", "inferno", "jet", "viridis".
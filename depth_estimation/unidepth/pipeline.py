@@ -5,6 +5,8 @@ import time
 import cv2
 import numpy as np
 
+from depth_estimation.batch_video import BatchedVideoDepthRunner
+from depth_estimation.colorize import DepthColorizer
 from depth_estimation.pipeline_base import LiveDepthPipeline, LiveFrameOutput
 from depth_estimation.unidepth.constants import (
     DEPTH_CENTER_PATCH_SIZE,
@@ -17,19 +19,28 @@ from depth_estimation.unidepth.constants import (
     DEPTH_INVERT_COLORMAP,
     DEPTH_PRINT_EVERY_N_FRAMES,
     DEPTH_RESOLUTION_LEVEL,
+    DEPTH_ROI_INTRINSICS,
+    DEPTH_ROI_INTRINSICS_SIZE,
+    DEPTH_ROI_RESOLUTION_LEVEL,
+    DEPTH_ROI_USE_CAMERA_INTRINSICS,
     DEPTH_TEXT_COLOR,
     DEPTH_TEXT_LINE_HEIGHT,
     DEPTH_TEXT_ORIGIN,
     DEPTH_TEXT_SCALE,
     DEPTH_TEXT_THICKNESS,
+    DEPTH_VIDEO_BATCH_SIZE,
+    DEPTH_VIDEO_DEPTH_STACK_DTYPE,
+    DEPTH_VIDEO_DEPTH_STACK_PATH,
     DEPTH_VIDEO_MAX_FRAMES,
     DEPTH_VIDEO_OUTPUT_PATH,
     DEPTH_VIDEO_SHOW_PREVIEW,
     DEPTH_VIDEO_WINDOW_NAME,
+    DEPTH_VIDEO_WRITE_DEPTH_STACK,
     DEPTH_VIDEO_WRITE_OUTPUT,
     DEPTH_VIDEO_INPUT_PATH,
     KEY_QUIT,
 )
+from depth_estimation.roi_depth import RoiDepthResult, RoiWindow, infer_roi_depth
 from depth_estimation.unidepth.unidepth_v2 import UniDepthV2
 from depth_estimation.unidepth.utils import (
     colorize_depth_map,
@@ -39,6 +50,7 @@ from depth_estimation.unidepth.utils import (
     resolve_repo_path,
     resize_depth_to_frame,
 )
+from profiling import traced
 
 
 class UniDepthPipeline(LiveDepthPipeline):
@@ -47,12 +59,15 @@ class UniDepthPipeline(LiveDepthPipeline):
     def __init__(self, resolution_level=DEPTH_RESOLUTION_LEVEL):
         self.resolution_level = resolution_level
         self._model: UniDepthV2 | None = None
+        # Live frames only (one thread per pipeline); colorizes straight into the composed frame.
+        self._colorizer = DepthColorizer(DEPTH_COLORMAP, DEPTH_INVERT_COLORMAP)
 
     def _get_model(self) -> UniDepthV2:
         if self._model is None:
             self._model = UniDepthV2(resolution_level=self.resolution_level)
         return self._model
 
+    @traced("unidepth.infer_depth", "inference")
     def _infer_depth(self, frame_bgr: np.ndarray):
         t0 = time.perf_counter()
         frame_rgb = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB)
@@ -61,6 +76,42 @@ class UniDepthPipeline(LiveDepthPipeline):
         depth_map = depth_tensor.detach().cpu().numpy().squeeze().astype(np.float32)
         return depth_map, intrinsics, infer_ms
 
+    @traced("unidepth.infer_depth_batch", "inference")
+    def _infer_depth_batch(self, frames_bgr: list[np.ndarray]) -> list[np.ndarray]:
+        """One forward pass for a batch of same-size frames (B, H, W, 3) -> B depth maps."""
+        batch_rgb = np.stack([cv2.cvtColor(frame, cv2.COLOR_BGR2RGB) for frame in frames_bgr])
+        depth_tensor, _intrinsics = self._get_model()(batch_rgb)
+        depth = depth_tensor.detach().cpu().numpy().astype(np.float32)
+        return [d.squeeze() for d in depth]
+
+    def _roi_camera(self, window: RoiWindow, frame_size: tuple[int, int]) -> np.ndarray | None:
+        if not DEPTH_ROI_USE_CAMERA_INTRINSICS:
+            return None
+        fx, fy, cx, cy = DEPTH_ROI_INTRINSICS
+        sx = frame_size[0] / float(DEPTH_ROI_INTRINSICS_SIZE[0])
+        sy = frame_size[1] / float(DEPTH_ROI_INTRINSICS_SIZE[1])
+        fx, fy, cx, cy = window.adjust_intrinsics(fx * sx, fy * sy, cx * sx, cy * sy)
+        return np.array([[fx, 0.0, cx], [0.0, fy, cy], [0.0, 0.0, 1.0]], dtype=np.float32)
+
+    @traced("unidepth.infer_roi", "inference")
+    def infer_roi(self, frame_bgr: np.ndarray, bbox_xyxy) -> RoiDepthResult:
+        """Metric depth for a context window around bbox_xyxy only (see depth_estimation/roi_depth.py)."""
+        model = self._get_model()
+        frame_size = (frame_bgr.shape[1], frame_bgr.shape[0])
+
+        def infer(roi_bgr: np.ndarray, window: RoiWindow) -> np.ndarray:
+            roi_rgb = cv2.cvtColor(roi_bgr, cv2.COLOR_BGR2RGB)
+            depth_tensor, _intrinsics = model(
+                roi_rgb,
+                camera=self._roi_camera(window, frame_size),
+                resolution_level=DEPTH_ROI_RESOLUTION_LEVEL,
+            )
+            return depth_tensor.detach().cpu().numpy().squeeze().astype(np.float32)
+
+        result = infer_roi_depth(frame_bgr, bbox_xyxy, infer, aspect_ratio_range=model.aspect_ratio_range)
+        result.extras["depth_units"] = "m"
+        return result
+
     def run_image(self, image_path: str | None = None) -> None:
         image_path_obj = resolve_existing_image_path(
             image_path or DEPTH_IMAGE_INPUT_PATH,
@@ -115,18 +166,18 @@ class UniDepthPipeline(LiveDepthPipeline):
                 cv2.LINE_AA,
             )
 
+    @traced("unidepth.process_live_frame", "pipeline")
     def process_live_frame(self, frame_bgr: np.ndarray) -> LiveFrameOutput:
         depth_map, _intrinsics, infer_ms = self._infer_depth(frame_bgr)
         height, width = frame_bgr.shape[:2]
         depth_map = resize_depth_to_frame(depth_map, width, height)
         center_depth = compute_center_depth(depth_map, DEPTH_CENTER_PATCH_SIZE)
 
-        depth_color = colorize_depth_map(
-            depth_map,
-            DEPTH_COLORMAP,
-            invert_colormap=DEPTH_INVERT_COLORMAP,
-        )
-        composed = np.hstack([frame_bgr, depth_color])
+        # frame | depth side by side without an intermediate color image. A new array per frame, since
+        # callers (and the concurrent executor) keep the returned output around.
+        composed = np.empty((height, width * 2, 3), dtype=np.uint8)
+        composed[:, :width] = frame_bgr
+        self._colorizer.colorize(depth_map, out=composed[:, width:])
 
         self._draw_overlay(
             composed,
@@ -227,5 +278,41 @@ class UniDepthPipeline(LiveDepthPipeline):
         print("Depth inference finished (video).")
         print(f"- processed frames: {frame_idx}")
 
+    def run_video_batched(self, video_path: str | None = None) -> dict:
+        """Offline video mode: batched inference with decode/encode overlapped (see batch_video.py)."""
+        resolved_video_path = resolve_repo_path(video_path or DEPTH_VIDEO_INPUT_PATH)
+        if not resolved_video_path.exists():
+            raise RuntimeError(
+                f"Video not found: {resolved_video_path}\n"
+                "Set DEPTH_VIDEO_INPUT_PATH in depth_estimation/unidepth/constants.py."
+            )
+
+        def annotate(composed: np.ndarray, depth_map: np.ndarray, frame_idx: int, infer_ms: float) -> None:
+            center_depth = compute_center_depth(depth_map, DEPTH_CENTER_PATCH_SIZE)
+            self._draw_overlay(
+                composed,
+                [
+                    f"method: {self.name} (batch {DEPTH_VIDEO_BATCH_SIZE})",
+                    f"inference: {infer_ms:.1f} ms/frame",
+                    f"center depth: {center_depth:.3f}",
+                    f"frame: {frame_idx}",
+                ],
+            )
+
+        runner = BatchedVideoDepthRunner(
+            infer_batch=self._infer_depth_batch,
+            # Called on the encoder thread only; the colored map is copied into the composed frame.
+            colorize=DepthColorizer(DEPTH_COLORMAP, DEPTH_INVERT_COLORMAP).colorize,
+            annotate=annotate,
+            batch_size=DEPTH_VIDEO_BATCH_SIZE,
+            output_video_path=resolve_repo_path(DEPTH_VIDEO_OUTPUT_PATH) if DEPTH_VIDEO_WRITE_OUTPUT else None,
+            depth_stack_path=resolve_repo_path(DEPTH_VIDEO_DEPTH_STACK_PATH) if DEPTH_VIDEO_WRITE_DEPTH_STACK else None,
+            stack_dtype=DEPTH_VIDEO_DEPTH_STACK_DTYPE,
+            max_frames=DEPTH_VIDEO_MAX_FRAMES,
+            print_every_n_frames=DEPTH_PRINT_EVERY_N_FRAMES,
+            metadata={"method": self.name, "depth_units": "m"},
+        )
+        return runner.run(resolved_video_path)
+
     def close(self) -> None:
         self._model = None
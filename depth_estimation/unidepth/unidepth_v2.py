@@ -1,12 +1,20 @@
 import torch
 from PIL import Image
 import numpy as np
-import math
 from pathlib import Path
 import sys
 from contextlib import contextmanager
 import importlib
 
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from depth_estimation.unidepth.utils import fixed_get_paddings
+
+# Fallback when the hub model does not expose shape_constraints["ratio_bounds"].
+DEFAULT_ASPECT_RATIO_RANGE = (0.5, 2.5)
+
 class UniDepthV2(torch.nn.Module):
     def __init__(self, resolution_level=None):
         super(UniDepthV2, self).__init__()
@@ -137,46 +145,6 @@ class UniDepthV2(torch.nn.Module):
         The bug is in line 47 and 53 of unidepthv2.py where int() is used instead of
         math.ceil(), causing dimensions to shrink rather than expand.
         """
-        def fixed_get_paddings(original_shape, aspect_ratio_range):
-            """
-            Fixed padding calculation that prevents negative padding values.
-
-            Args:
-                original_shape: (H, W) tuple
-                aspect_ratio_range: (min_ratio, max_ratio) tuple
-
-            Returns:
-                padding: (left, right, top, bottom) padding values (all non-negative)
-                new_shape: (H_new, W_new) tuple
-            """
-            H_ori, W_ori = original_shape
-            orig_aspect_ratio = W_ori / H_ori
-
-            # Determine the closest aspect ratio within the range
-            min_ratio, max_ratio = aspect_ratio_range
-            target_aspect_ratio = min(max_ratio, max(min_ratio, orig_aspect_ratio))
-
-            if orig_aspect_ratio > target_aspect_ratio:  # Too wide
-                W_new = W_ori
-                # FIX: Use ceil instead of int to ensure H_new >= H_ori
-                H_new = math.ceil(W_ori / target_aspect_ratio)
-                pad_top = (H_new - H_ori) // 2
-                pad_bottom = H_new - H_ori - pad_top
-                pad_left, pad_right = 0, 0
-            else:  # Too tall
-                H_new = H_ori
-                # FIX: Use ceil instead of int to ensure W_new >= W_ori
-                W_new = math.ceil(H_ori * target_aspect_ratio)
-                pad_left = (W_new - W_ori) // 2
-                pad_right = W_new - W_ori - pad_left
-                pad_top, pad_bottom = 0, 0
-
-            # Ensure all padding values are non-negative
-            assert pad_left >= 0 and pad_right >= 0 and pad_top >= 0 and pad_bottom >= 0, \
-                f"Negative padding detected: ({pad_left}, {pad_right}, {pad_top}, {pad_bottom})"
-
-            return (pad_left, pad_right, pad_top, pad_bottom), (H_new, W_new)
-
         # Monkey-patch the module-level function on the already-loaded module.
         try:
             module_name = self.model.__class__.__module__
@@ -188,7 +156,21 @@ class UniDepthV2(torch.nn.Module):
         except (ImportError, AttributeError) as e:
             print(f"  Warning: Could not patch get_paddings function: {e}")
 
-    def forward(self, image):
+    @property
+    def aspect_ratio_range(self) -> tuple[float, float]:
+        """Width/height range the model accepts without its own padding (from the hub config)."""
+        constraints = getattr(self.model, "shape_constraints", None) or {}
+        bounds = constraints.get("ratio_bounds") if isinstance(constraints, dict) else None
+        if bounds is None or len(bounds) != 2:
+            return DEFAULT_ASPECT_RATIO_RANGE
+        return float(bounds[0]), float(bounds[1])
+
+    def forward(self, image, camera=None, resolution_level=None):
+        """
+        camera: optional 3x3 pinhole K for the given image; UniDepth then uses it instead of
+        predicting intrinsics (needed for crops, whose apparent FOV is not the camera's).
+        resolution_level: optional per-call override of the model resolution level.
+        """
         if isinstance(image, Image.Image):
             image = image.convert("RGB")
             image = torch.Tensor(np.array(image)).unsqueeze(0).permute(0, 3, 1, 2)
@@ -198,11 +180,19 @@ class UniDepthV2(torch.nn.Module):
                 image = image.unsqueeze(0)
             if image.shape[-1] == 3:
                 image = image.permute(0, 3, 1, 2)
-        with torch.no_grad():
-            out = self.model.infer(image)
-            return out["depth"], out["intrinsics"]
-    
+        if camera is not None:
+            camera = torch.as_tensor(np.asarray(camera, dtype=np.float32)).to(image.device)
 
+        previous_level = getattr(self.model, "resolution_level", None)
+        if resolution_level is not None:
+            self.model.resolution_level = resolution_level
+        try:
+            with torch.no_grad():
+                out = self.model.infer(image, camera) if camera is not None else self.model.infer(image)
+                return out["depth"], out["intrinsics"]
+        finally:
+            if resolution_level is not None:
+                self.model.resolution_level = previous_level
 
 
 if __name__ == "__main__":
@@ -1,7 +1,10 @@
+import math
 from pathlib import Path
 
 import numpy as np
 
+from depth_estimation.colorize import DepthColorizer
+
 REPO_ROOT = Path(__file__).resolve().parents[2]
 
 
@@ -60,43 +63,14 @@ def compute_center_depth(depth_map: np.ndarray, patch_size: int) -> float:
     return float(np.median(finite))
 
 
-def _normalize_depth_to_uint8(depth_map: np.ndarray) -> np.ndarray:
-    finite = depth_map[np.isfinite(depth_map)]
-    if finite.size == 0:
-        return np.zeros(depth_map.shape, dtype=np.uint8)
-
-    d_min = float(np.min(finite))
-    d_max = float(np.max(finite))
-    denom = max(1e-6, d_max - d_min)
-    normalized = np.clip((depth_map - d_min) / denom, 0.0, 1.0)
-    return (normalized * 255.0).astype(np.uint8)
-
-
-def _resolve_colormap_code(colormap_name: str) -> int:
-    import cv2
-
-    lookup = {
-        "turbo": cv2.COLORMAP_TURBO,
-        "magma": cv2.COLORMAP_MAGMA,
-        "inferno": cv2.COLORMAP_INFERNO,
-        "jet": cv2.COLORMAP_JET,
-        "viridis": cv2.COLORMAP_VIRIDIS,
-    }
-    return lookup.get(colormap_name.lower(), cv2.COLORMAP_TURBO)
-
-
 def colorize_depth_map(
     depth_map: np.ndarray,
     colormap_name: str,
     invert_colormap: bool = False,
 ) -> np.ndarray:
-    import cv2
-
-    colormap = _resolve_colormap_code(colormap_name)
-    depth_u8 = _normalize_depth_to_uint8(depth_map)
-    if invert_colormap:
-        depth_u8 = 255 - depth_u8
-    return cv2.applyColorMap(depth_u8, colormap)
+    """Per-frame min/max colorization into a new array; live/video paths keep a DepthColorizer instead."""
+    colorizer = DepthColorizer(colormap_name, invert_colormap, percentiles=(0.0, 100.0), range_sample_step=1)
+    return colorizer.colorize(depth_map)
 
 
 def resize_depth_to_frame(depth_map: np.ndarray, width: int, height: int) -> np.ndarray:
@@ -105,3 +79,46 @@ def resize_depth_to_frame(depth_map: np.ndarray, width: int, height: int) -> np.
     if depth_map.shape[1] == width and depth_map.shape[0] == height:
         return depth_map
     return cv2.resize(depth_map, (width, height), interpolation=cv2.INTER_LINEAR)
+
+
+def fixed_get_paddings(original_shape, aspect_ratio_range):
+    """
+    Fixed padding calculation that prevents negative padding values.
+
+    Patched into UniDepth (GitHub issue #139) and reused by the ROI crop padding.
+
+    Args:
+        original_shape: (H, W) tuple
+        aspect_ratio_range: (min_ratio, max_ratio) tuple
+
+    Returns:
+        padding: (left, right, top, bottom) padding values (all non-negative)
+        new_shape: (H_new, W_new) tuple
+    """
+    H_ori, W_ori = original_shape
+    orig_aspect_ratio = W_ori / H_ori
+
+    # Determine the closest aspect ratio within the range
+    min_ratio, max_ratio = aspect_ratio_range
+    target_aspect_ratio = min(max_ratio, max(min_ratio, orig_aspect_ratio))
+
+    if orig_aspect_ratio > target_aspect_ratio:  # Too wide
+        W_new = W_ori
+        # FIX: Use ceil instead of int to ensure H_new >= H_ori
+        H_new = math.ceil(W_ori / target_aspect_ratio)
+        pad_top = (H_new - H_ori) // 2
+        pad_bottom = H_new - H_ori - pad_top
+        pad_left, pad_right = 0, 0
+    else:  # Too tall
+        H_new = H_ori
+        # FIX: Use ceil instead of int to ensure W_new >= W_ori
+        W_new = math.ceil(H_ori * target_aspect_ratio)
+        pad_left = (W_new - W_ori) // 2
+        pad_right = W_new - W_ori - pad_left
+        pad_top, pad_bottom = 0, 0
+
+    # Ensure all padding values are non-negative
+    assert pad_left >= 0 and pad_right >= 0 and pad_top >= 0 and pad_bottom >= 0, \
+        f"Negative padding detected: ({pad_left}, {pad_right}, {pad_top}, {pad_bottom})"
+
+    return (pad_left, pad_right, pad_top, pad_bottom), (H_new, W_new)
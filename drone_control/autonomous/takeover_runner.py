@@ -7,6 +7,8 @@ from drone_control.autonomous.constants import (
     TAKEOVER_ON_ANY_INPUT,
 )
 from drone_control.joystick.teleoperation import TeleoperationController
+from flight_recorder import dump_recorder, mark_event, record_command
+from profiling import span
 
 
 class TakeoverContext:
@@ -82,7 +84,9 @@ class TakeoverContext:
             if (not self.teleop.flying) or (self.teleop.mc is None):
                 return True
 
-            self.teleop.mc.start_linear_motion(vx, vy, vz, yawrate)
+            with span("control.send", "control", vx=vx, vy=vy, vz=vz, yawrate=yawrate):
+                self.teleop.mc.start_linear_motion(vx, vy, vz, yawrate)
+            record_command(vx, vy, vz, yawrate, "mission")
             time.sleep(self.dt)
 
         return False
@@ -120,7 +124,9 @@ class TakeoverContext:
             vz = 1.2 * err
             vz = max(-0.4, min(0.4, vz))
 
-            self.teleop.mc.start_linear_motion(0.0, 0.0, vz, 0.0)
+            with span("control.send", "control", vz=vz):
+                self.teleop.mc.start_linear_motion(0.0, 0.0, vz, 0.0)
+            record_command(0.0, 0.0, vz, 0.0, "goto_z")
             time.sleep(self.dt)
 
         # timeout, stop but keep running
@@ -171,6 +177,9 @@ class TakeoverRunner:
             ok = mission.run(ctx)
 
             if not ok:
+                # Write the black box in the background so teleop gets control immediately.
+                mark_event("takeover")
+                dump_recorder("takeover", blocking=False)
                 ctx.handover_to_teleop_forever()
                 return
 
@@ -184,5 +193,10 @@ class TakeoverRunner:
 
         except (KeyboardInterrupt, SystemExit):
             print("Interrupted. Landing if flying.")
+            dump_recorder("interrupt", blocking=False)
+        except Exception as exc:
+            mark_event("crash", type(exc).__name__)
+            dump_recorder("crash")
+            raise
         finally:
             self.teleop.stop()
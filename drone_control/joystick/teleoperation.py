@@ -31,6 +31,8 @@ from drone_control.joystick.constants import (
     URI,
 )
 from drone_control.safety.battery_guard import BatteryGuard
+from flight_recorder import record_command, record_state
+from profiling import span
 
 logging.basicConfig(level=logging.CRITICAL)
 
@@ -120,6 +122,7 @@ class TeleoperationController:
         self.state_estimate["z"] = data["stateEstimate.z"]
         self.state_estimate["y"] = data["stateEstimate.y"]
         self.state_estimate["x"] = data["stateEstimate.x"]
+        record_state(data["stateEstimate.x"], data["stateEstimate.y"], data["stateEstimate.z"])
 
     @staticmethod
     def _clamp(x, lo, hi):
@@ -341,7 +344,9 @@ class TeleoperationController:
         vy = self._clamp(roll_cmd * t.max_vxy, -t.max_vxy, t.max_vxy)
         yawrate = self._clamp(yaw_cmd * t.max_yawrate, -t.max_yawrate, t.max_yawrate)
 
-        self.mc.start_linear_motion(vx, vy, vz, yawrate)
+        with span("teleop.send", "control"):
+            self.mc.start_linear_motion(vx, vy, vz, yawrate)
+        record_command(vx, vy, vz, yawrate, "teleop")
         time.sleep(t.dt)
 
     # -----------------------
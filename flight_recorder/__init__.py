@@ -0,0 +1,29 @@
+"""Always-on flight recorder: ring buffers of frames, measurements, state and commands."""
+
+from .reader import FlightRecording, load_flight_recording, metrics_from_measurement
+from .recorder import (
+    FlightRecorder,
+    dump_recorder,
+    get_recorder,
+    install_recorder,
+    mark_event,
+    record_command,
+    record_frame,
+    record_measurement,
+    record_state,
+)
+
+__all__ = [
+    "FlightRecorder",
+    "FlightRecording",
+    "dump_recorder",
+    "get_recorder",
+    "install_recorder",
+    "load_flight_recording",
+    "mark_event",
+    "metrics_from_measurement",
+    "record_command",
+    "record_frame",
+    "record_measurement",
+    "record_state",
+]
@@ -0,0 +1,35 @@
+########################################## Recorder Buffers ###############################################
+
+# All buffers are allocated once at start; recording never allocates on the control path.
+# Frames kept as JPEG bytes (newest wins). 300 frames ~= 10 s at 30 FPS.
+RECORDER_FRAME_CAPACITY = 300
+# Fixed slot size per JPEG frame. Frames that still exceed it after one lower-quality retry are skipped.
+# 640x480 at quality 70 is usually 25-60 KB -> 300 x 96 KB ~= 29 MB preallocated.
+RECORDER_FRAME_SLOT_BYTES = 96 * 1024
+RECORDER_JPEG_QUALITY = 70
+# Store every Nth frame handed to the recorder (1 = all).
+RECORDER_FRAME_STRIDE = 1
+
+# Structured record rings (pipeline measurements, stateEstimate samples, sent commands, events).
+RECORDER_MEASUREMENT_CAPACITY = 3000
+# stateEstimate log runs at 50 Hz -> 6000 samples ~= 2 minutes.
+RECORDER_STATE_CAPACITY = 6000
+# TakeoverContext sends at 1/TAKEOVER_DT; teleop at 1/TELEOP_DT.
+RECORDER_COMMAND_CAPACITY = 6000
+RECORDER_EVENT_CAPACITY = 256
+
+########################################## Dumps ##########################################################
+
+# Dump folder (repo-relative). Files: <YYYYmmdd_HHMMSS>_<reason>.fpvrec
+RECORDER_DUMP_DIR = "runs/flight_recorder"
+# Binary file signature + format version.
+RECORDER_MAGIC = b"FPVREC\x00\x01"
+
+########################################## Replay #########################################################
+
+RECORDER_REPLAY_WINDOW_NAME = "Flight Recorder Replay"
+RECORDER_REPLAY_HEIGHT = 480
+# Playback speed multiplier against recorded timestamps (0 = as fast as possible).
+RECORDER_REPLAY_SPEED = 1.0
+KEY_REPLAY_QUIT = {ord("q"), 27}
+KEY_REPLAY_PAUSE = {ord(" ")}
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+import json
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from flight_recorder.constants import RECORDER_MAGIC
+from flight_recorder.recorder import MEASUREMENT_FIELDS
+
+
+@dataclass
+class FlightRecording:
+    """
+    Parsed .fpvrec dump. Record arrays are numpy structured arrays (oldest first);
+    all `t` columns share one time.monotonic() clock.
+    """
+
+    path: Path
+    header: dict
+    frame_index: np.ndarray
+    frame_bytes: np.ndarray
+    measurements: np.ndarray
+    states: np.ndarray
+    commands: np.ndarray
+    events: np.ndarray
+
+    @property
+    def reason(self) -> str:
+        return str(self.header.get("reason", ""))
+
+    @property
+    def frame_count(self) -> int:
+        return int(self.frame_index.shape[0])
+
+    def frame_jpeg(self, i: int) -> bytes:
+        row = self.frame_index[i]
+        offset, length = int(row["offset"]), int(row["length"])
+        return self.frame_bytes[offset : offset + length].tobytes()
+
+    def frame(self, i: int) -> np.ndarray:
+        row = self.frame_index[i]
+        offset, length = int(row["offset"]), int(row["length"])
+        frame = cv2.imdecode(self.frame_bytes[offset : offset + length], cv2.IMREAD_COLOR)
+        if frame is None:
+            raise RuntimeError(f"Could not decode frame {i} in {self.path}")
+        return frame
+
+    def measurement_for_frame(self, frame_idx: int) -> np.void | None:
+        hits = np.flatnonzero(self.measurements["frame_idx"] == frame_idx)
+        return None if hits.size == 0 else self.measurements[hits[-1]]
+
+    @staticmethod
+    def latest_before(records: np.ndarray, t: float) -> np.void | None:
+        """Newest record with records['t'] <= t (records are time-ordered)."""
+        if records.shape[0] == 0:
+            return None
+        i = int(np.searchsorted(records["t"], t, side="right")) - 1
+        return None if i < 0 else records[i]
+
+    def command_source(self, record: np.void) -> str:
+        sources = self.header.get("command_sources", [])
+        code = int(record["source"])
+        return sources[code] if code < len(sources) else str(code)
+
+    def time_span_s(self) -> float:
+        stamps = [arr["t"] for arr in (self.frame_index, self.measurements, self.states, self.commands) if arr.size]
+        if not stamps:
+            return 0.0
+        all_t = np.concatenate(stamps)
+        return float(all_t.max() - all_t.min())
+
+
+def metrics_from_measurement(record: np.void) -> dict[str, float | int | str]:
+    """Rebuild the pipeline metrics dict (NaN fields dropped) for the review overlay."""
+    metrics: dict[str, float | int | str] = {}
+    for name in MEASUREMENT_FIELDS:
+        value = float(record[name])
+        if not np.isnan(value):
+            metrics[name] = value
+    for name in ("track_state", "estimate_source", "command_reason"):
+        text = bytes(record[name]).decode("utf-8", errors="replace")
+        if text:
+            metrics[name] = text
+    return metrics
+
+
+def load_flight_recording(path: str | Path) -> FlightRecording:
+    path = Path(path)
+    data = path.read_bytes()
+    magic_len = len(RECORDER_MAGIC)
+    if data[:magic_len] != RECORDER_MAGIC:
+        raise RuntimeError(f"Not a flight recorder dump (bad signature): {path}")
+    header_len = int.from_bytes(data[magic_len : magic_len + 4], "little")
+    header_start = magic_len + 4
+    header = json.loads(data[header_start : header_start + header_len].decode("utf-8"))
+    body = memoryview(data)[header_start + header_len :]
+
+    sections: dict[str, np.ndarray] = {}
+    for section in header["sections"]:
+        dtype = np.lib.format.descr_to_dtype(section["dtype"])
+        chunk = body[section["offset"] : section["offset"] + section["nbytes"]]
+        sections[section["name"]] = np.frombuffer(chunk, dtype=dtype, count=section["count"])
+
+    return FlightRecording(
+        path=path,
+        header=header,
+        frame_index=sections["frame_index"],
+        frame_bytes=sections["frame_bytes"],
+        measurements=sections["measurements"],
+        states=sections["states"],
+        commands=sections["commands"],
+        events=sections["events"],
+    )
@@ -0,0 +1,386 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+from pathlib import Path
+import queue
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from flight_recorder.constants import (
+    RECORDER_COMMAND_CAPACITY,
+    RECORDER_DUMP_DIR,
+    RECORDER_EVENT_CAPACITY,
+    RECORDER_FRAME_CAPACITY,
+    RECORDER_FRAME_SLOT_BYTES,
+    RECORDER_FRAME_STRIDE,
+    RECORDER_JPEG_QUALITY,
+    RECORDER_MAGIC,
+    RECORDER_MEASUREMENT_CAPACITY,
+    RECORDER_STATE_CAPACITY,
+)
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Numeric pipeline metrics kept per frame (NaN when a method does not report one).
+MEASUREMENT_FIELDS = (
+    "infer_ms",
+    "process_ms",
+    "detection_count",
+    "yolo_detection_count",
+    "confidence",
+    "raw_distance_m",
+    "distance_m",
+    "bbox_width_px",
+    "bbox_center_x_px",
+    "bbox_center_y_px",
+    "x_rel_m",
+    "y_rel_m",
+    "z_rel_m",
+    "yaw_error_deg",
+    "frames_since_detection",
+    "gating_passed",
+    "selected_candidate_rank",
+    "center_depth",
+)
+
+MEASUREMENT_DTYPE = np.dtype(
+    [("t", "<f8"), ("frame_idx", "<i8")]
+    + [(name, "<f4") for name in MEASUREMENT_FIELDS]
+    + [("track_state", "S8"), ("estimate_source", "S16"), ("command_reason", "S24")]
+)
+STATE_DTYPE = np.dtype([("t", "<f8"), ("x", "<f4"), ("y", "<f4"), ("z", "<f4")])
+# source: which loop sent the setpoint (see COMMAND_SOURCES).
+COMMAND_DTYPE = np.dtype(
+    [("t", "<f8"), ("vx", "<f4"), ("vy", "<f4"), ("vz", "<f4"), ("yawrate", "<f4"), ("source", "u1")]
+)
+EVENT_DTYPE = np.dtype([("t", "<f8"), ("kind", "S16"), ("detail", "S48")])
+FRAME_INDEX_DTYPE = np.dtype([("t", "<f8"), ("frame_idx", "<i8"), ("offset", "<u8"), ("length", "<u4")])
+
+COMMAND_SOURCES = ("mission", "teleop", "goto_z")
+
+
+def _as_float32(value) -> float:
+    if value is None:
+        # Common case for fields a method does not report; skip the exception path.
+        return math.nan
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+class RecordRing:
+    """Fixed-capacity ring over a preallocated structured array; push() only assigns one row."""
+
+    def __init__(self, dtype: np.dtype, capacity: int) -> None:
+        self.capacity = max(1, int(capacity))
+        self.data = np.zeros(self.capacity, dtype=dtype)
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def push(self, row: tuple) -> None:
+        with self._lock:
+            self.data[self.count % self.capacity] = row
+            self.count += 1
+
+    def snapshot(self) -> np.ndarray:
+        """Oldest-to-newest copy of the stored rows."""
+        with self._lock:
+            n = min(self.count, self.capacity)
+            if self.count <= self.capacity:
+                return self.data[:n].copy()
+            start = self.count % self.capacity
+            return np.concatenate([self.data[start:], self.data[:start]])
+
+
+class FrameRing:
+    """Ring of JPEG-encoded frames in one preallocated byte block (fixed slot per frame)."""
+
+    def __init__(self, capacity: int, slot_bytes: int) -> None:
+        self.capacity = max(1, int(capacity))
+        self.slot_bytes = int(slot_bytes)
+        self.slots = np.zeros((self.capacity, self.slot_bytes), dtype=np.uint8)
+        self.index = np.zeros(self.capacity, dtype=FRAME_INDEX_DTYPE)
+        self.count = 0
+        self.oversized = 0
+        self._lock = threading.Lock()
+
+    def push(self, t: float, frame_idx: int, jpeg: np.ndarray) -> bool:
+        size = int(jpeg.size)
+        if size > self.slot_bytes:
+            self.oversized += 1
+            return False
+        with self._lock:
+            slot = self.count % self.capacity
+            self.slots[slot, :size] = jpeg.reshape(-1)
+            self.index[slot] = (t, frame_idx, 0, size)
+            self.count += 1
+        return True
+
+    def snapshot(self) -> tuple[np.ndarray, np.ndarray]:
+        """(index rows with offsets into the packed bytes, packed JPEG bytes), oldest first."""
+        with self._lock:
+            n = min(self.count, self.capacity)
+            start = self.count % self.capacity if self.count > self.capacity else 0
+            order = [(start + i) % self.capacity for i in range(n)]
+            index = self.index[order].copy()
+            packed = np.empty(int(index["length"].sum()), dtype=np.uint8)
+            offset = 0
+            lengths = index["length"]
+            for row, slot in enumerate(order):
+                length = int(lengths[row])
+                packed[offset : offset + length] = self.slots[slot, :length]
+                index["offset"][row] = offset
+                offset += length
+        return index, packed
+
+
+class FlightRecorder:
+    """
+    Always-on black box for follow flights.
+
+    Keeps the last N frames (JPEG), pipeline measurements, stateEstimate samples,
+    sent velocity setpoints and events in preallocated rings, stamped with
+    time.monotonic(). JPEG encoding runs on a background thread: the caller only
+    hands over the frame reference, and frames arriving while the encoder is busy
+    are dropped (counted in frames_dropped). dump() writes one .fpvrec file that
+    flight_recorder/reader.py loads.
+    """
+
+    def __init__(
+        self,
+        *,
+        frame_capacity: int = RECORDER_FRAME_CAPACITY,
+        frame_slot_bytes: int = RECORDER_FRAME_SLOT_BYTES,
+        jpeg_quality: int = RECORDER_JPEG_QUALITY,
+        frame_stride: int = RECORDER_FRAME_STRIDE,
+        measurement_capacity: int = RECORDER_MEASUREMENT_CAPACITY,
+        state_capacity: int = RECORDER_STATE_CAPACITY,
+        command_capacity: int = RECORDER_COMMAND_CAPACITY,
+        event_capacity: int = RECORDER_EVENT_CAPACITY,
+        dump_dir: str | Path = RECORDER_DUMP_DIR,
+        metadata: dict | None = None,
+    ) -> None:
+        self.frames = FrameRing(frame_capacity, frame_slot_bytes)
+        self.measurements = RecordRing(MEASUREMENT_DTYPE, measurement_capacity)
+        self.states = RecordRing(STATE_DTYPE, state_capacity)
+        self.commands = RecordRing(COMMAND_DTYPE, command_capacity)
+        self.events = RecordRing(EVENT_DTYPE, event_capacity)
+        self.jpeg_quality = int(jpeg_quality)
+        self.frame_stride = max(1, int(frame_stride))
+        dump_path = Path(dump_dir)
+        self.dump_dir = dump_path if dump_path.is_absolute() else REPO_ROOT / dump_path
+        self.metadata = dict(metadata or {})
+        self.frames_seen = 0
+        self.frames_dropped = 0
+        self.last_dump_path: Path | None = None
+
+        self._encode_queue: queue.Queue = queue.Queue(maxsize=1)
+        self._frames_queued = 0
+        self._frames_encoded = 0
+        self._encoded_cond = threading.Condition()
+        self._encoder = threading.Thread(target=self._encode_loop, name="flight-recorder-jpeg", daemon=True)
+        self._encoder.start()
+        self._dump_lock = threading.Lock()
+
+    ###################################### Recording (hot path) ###########################################
+
+    def record_frame(self, frame_bgr: np.ndarray, frame_idx: int) -> None:
+        """Queue a frame for encoding. The frame must not be modified afterwards."""
+        self.frames_seen += 1
+        if (self.frames_seen - 1) % self.frame_stride:
+            return
+        try:
+            self._encode_queue.put_nowait((time.monotonic(), int(frame_idx), frame_bgr))
+        except queue.Full:
+            self.frames_dropped += 1
+            return
+        self._frames_queued += 1
+
+    def record_measurement(self, frame_idx: int, metrics: dict, command_reason: str = "") -> None:
+        get = metrics.get
+        self.measurements.push(
+            (time.monotonic(), int(frame_idx))
+            + tuple(_as_float32(get(name)) for name in MEASUREMENT_FIELDS)
+            + (
+                str(get("track_state", "")).encode()[:8],
+                str(get("estimate_source", "")).encode()[:16],
+                command_reason.encode()[:24],
+            )
+        )
+
+    def record_state(self, x: float, y: float, z: float) -> None:
+        self.states.push((time.monotonic(), x, y, z))
+
+    def record_command(self, vx: float, vy: float, vz: float, yawrate: float, source: str = "mission") -> None:
+        self.commands.push((time.monotonic(), vx, vy, vz, yawrate, COMMAND_SOURCES.index(source)))
+
+    def mark(self, kind: str, detail: str = "") -> None:
+        self.events.push((time.monotonic(), kind.encode()[:16], detail.encode()[:48]))
+
+    def _encode_loop(self) -> None:
+        params = [int(cv2.IMWRITE_JPEG_QUALITY), self.jpeg_quality]
+        retry_params = [int(cv2.IMWRITE_JPEG_QUALITY), max(10, self.jpeg_quality // 2)]
+        while True:
+            item = self._encode_queue.get()
+            if item is None:
+                return
+            t, frame_idx, frame_bgr = item
+            ok, jpeg = cv2.imencode(".jpg", frame_bgr, params)
+            if ok and jpeg.size > self.frames.slot_bytes:
+                ok, jpeg = cv2.imencode(".jpg", frame_bgr, retry_params)
+            if ok:
+                self.frames.push(t, frame_idx, jpeg)
+            with self._encoded_cond:
+                self._frames_encoded += 1
+                self._encoded_cond.notify_all()
+
+    def flush(self, timeout_s: float = 1.0) -> bool:
+        """Wait until every queued frame is encoded; False on timeout."""
+        target = self._frames_queued
+        with self._encoded_cond:
+            return self._encoded_cond.wait_for(lambda: self._frames_encoded >= target, timeout=timeout_s)
+
+    def close(self) -> None:
+        try:
+            self._encode_queue.put(None, timeout=1.0)
+        except queue.Full:
+            return
+        self._encoder.join(timeout=2.0)
+
+    ###################################### Dump ###########################################################
+
+    def dump(self, reason: str, *, blocking: bool = True) -> Path:
+        """
+        Snapshot all rings and write <dump_dir>/<timestamp>_<reason>.fpvrec.
+        blocking=False snapshots on the caller thread and writes on a background
+        thread (use it where the caller must keep flying, e.g. takeover).
+        """
+        self.mark("dump", reason)
+        self.flush(timeout_s=0.2)
+        frame_index, frame_bytes = self.frames.snapshot()
+        sections = {
+            "frame_index": frame_index,
+            "frame_bytes": frame_bytes,
+            "measurements": self.measurements.snapshot(),
+            "states": self.states.snapshot(),
+            "commands": self.commands.snapshot(),
+            "events": self.events.snapshot(),
+        }
+        header = {
+            "reason": reason,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "monotonic_at_dump": time.monotonic(),
+            "metadata": self.metadata,
+            "command_sources": list(COMMAND_SOURCES),
+            "frames_seen": self.frames_seen,
+            "frames_dropped": self.frames_dropped,
+            "frames_oversized": self.frames.oversized,
+        }
+        stamp = time.strftime("%Y%m%d_%H%M%S")
+        safe_reason = "".join(c if c.isalnum() or c in "-_" else "_" for c in reason) or "dump"
+        out_path = self.dump_dir / f"{stamp}_{safe_reason}.fpvrec"
+        if blocking:
+            return self._write(out_path, header, sections)
+        threading.Thread(
+            target=self._write,
+            args=(out_path, header, sections),
+            name="flight-recorder-dump",
+            daemon=False,
+        ).start()
+        return out_path
+
+    def _write(self, out_path: Path, header: dict, sections: dict[str, np.ndarray]) -> Path:
+        with self._dump_lock:
+            out_path.parent.mkdir(parents=True, exist_ok=True)
+            header = dict(header)
+            header["sections"] = []
+            offset = 0
+            for name, array in sections.items():
+                header["sections"].append(
+                    {
+                        "name": name,
+                        "dtype": np.lib.format.dtype_to_descr(array.dtype),
+                        "count": int(array.shape[0]),
+                        "offset": offset,
+                        "nbytes": int(array.nbytes),
+                    }
+                )
+                offset += int(array.nbytes)
+            header_bytes = json.dumps(header).encode("utf-8")
+
+            tmp_path = out_path.with_name(out_path.name + ".tmp")
+            with tmp_path.open("wb") as f:
+                f.write(RECORDER_MAGIC)
+                f.write(len(header_bytes).to_bytes(4, "little"))
+                f.write(header_bytes)
+                for array in sections.values():
+                    f.write(np.ascontiguousarray(array).tobytes())
+            os.replace(tmp_path, out_path)
+            self.last_dump_path = out_path
+            print(f"[flight-recorder] {header['reason']}: wrote {out_path}")
+            return out_path
+
+
+########################################## Process-wide recorder ##########################################
+
+# Instrumented code (TakeoverContext, teleop, follower mission) calls the module
+# functions below; they are no-ops until a recorder is installed.
+_RECORDER: FlightRecorder | None = None
+
+
+def install_recorder(recorder: FlightRecorder | None) -> FlightRecorder | None:
+    global _RECORDER
+    _RECORDER = recorder
+    return recorder
+
+
+def get_recorder() -> FlightRecorder | None:
+    return _RECORDER
+
+
+def record_frame(frame_bgr: np.ndarray, frame_idx: int) -> None:
+    recorder = _RECORDER
+    if recorder is not None:
+        recorder.record_frame(frame_bgr, frame_idx)
+
+
+def record_measurement(frame_idx: int, metrics: dict, command_reason: str = "") -> None:
+    recorder = _RECORDER
+    if recorder is not None:
+        recorder.record_measurement(frame_idx, metrics, command_reason)
+
+
+def record_state(x: float, y: float, z: float) -> None:
+    recorder = _RECORDER
+    if recorder is not None:
+        recorder.record_state(x, y, z)
+
+
+def record_command(vx: float, vy: float, vz: float, yawrate: float, source: str = "mission") -> None:
+    recorder = _RECORDER
+    if recorder is not None:
+        recorder.record_command(vx, vy, vz, yawrate, source)
+
+
+def mark_event(kind: str, detail: str = "") -> None:
+    recorder = _RECORDER
+    if recorder is not None:
+        recorder.mark(kind, detail)
+
+
+def dump_recorder(reason: str, *, blocking: bool = True) -> Path | None:
+    recorder = _RECORDER
+    if recorder is None:
+        return None
+    try:
+        return recorder.dump(reason, blocking=blocking)
+    except Exception as exc:
+        # Never let the black box take the flight down with it.
+        print(f"[flight-recorder] dump failed: {exc}")
+        return None
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import argparse
+import csv
+from pathlib import Path
+import sys
+
+import cv2
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from flight_recorder.constants import (
+    KEY_REPLAY_PAUSE,
+    KEY_REPLAY_QUIT,
+    RECORDER_DUMP_DIR,
+    RECORDER_REPLAY_HEIGHT,
+    RECORDER_REPLAY_SPEED,
+    RECORDER_REPLAY_WINDOW_NAME,
+)
+from flight_recorder.reader import FlightRecording, load_flight_recording, metrics_from_measurement
+
+
+def _latest_dump() -> Path:
+    dumps = sorted((REPO_ROOT / RECORDER_DUMP_DIR).glob("*.fpvrec"))
+    if not dumps:
+        raise RuntimeError(f"No dumps found in {REPO_ROOT / RECORDER_DUMP_DIR}")
+    return dumps[-1]
+
+
+def print_summary(rec: FlightRecording) -> None:
+    h = rec.header
+    print(f"Dump: {rec.path}")
+    print(f"- reason: {rec.reason} ({h.get('created_at')})")
+    for key, value in sorted(h.get("metadata", {}).items()):
+        print(f"- {key}: {value}")
+    print(
+        f"- frames: {rec.frame_count} stored / {h.get('frames_seen')} seen "
+        f"({h.get('frames_dropped')} dropped by busy encoder, {h.get('frames_oversized')} oversized)"
+    )
+    print(f"- measurements: {len(rec.measurements)}  states: {len(rec.states)}  commands: {len(rec.commands)}")
+    print(f"- time span: {rec.time_span_s():.2f} s")
+    if len(rec.events):
+        t_end = float(h.get("monotonic_at_dump", rec.events["t"][-1]))
+        print("- events:")
+        for ev in rec.events:
+            kind = bytes(ev["kind"]).decode()
+            detail = bytes(ev["detail"]).decode()
+            print(f"    t-{t_end - float(ev['t']):7.2f}s  {kind}  {detail}")
+
+
+def export_csv(rec: FlightRecording, out_dir: Path) -> None:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for name in ("measurements", "states", "commands", "events"):
+        records: np.ndarray = getattr(rec, name)
+        out_path = out_dir / f"{name}.csv"
+        with out_path.open("w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(records.dtype.names)
+            for row in records:
+                values = []
+                for field in records.dtype.names:
+                    value = row[field]
+                    if field == "source" and name == "commands":
+                        value = rec.command_source(row)
+                    elif isinstance(value, bytes):
+                        value = value.decode("utf-8", errors="replace")
+                    values.append(value)
+                writer.writerow(values)
+        print(f"Wrote {out_path}")
+    frames_dir = out_dir / "frames"
+    frames_dir.mkdir(exist_ok=True)
+    for i in range(rec.frame_count):
+        frame_idx = int(rec.frame_index[i]["frame_idx"])
+        (frames_dir / f"frame_{frame_idx:06d}.jpg").write_bytes(rec.frame_jpeg(i))
+    print(f"Wrote {rec.frame_count} frames to {frames_dir}")
+
+
+def _draw_flight_lines(frame: np.ndarray, rec: FlightRecording, t: float) -> None:
+    lines = [f"t-dump {float(rec.header.get('monotonic_at_dump', t)) - t:6.2f} s"]
+    cmd = rec.latest_before(rec.commands, t)
+    if cmd is not None:
+        lines.append(
+            f"cmd[{rec.command_source(cmd)}] vx {cmd['vx']:+.2f} vy {cmd['vy']:+.2f} "
+            f"vz {cmd['vz']:+.2f} yaw {cmd['yawrate']:+.0f}"
+        )
+    state = rec.latest_before(rec.states, t)
+    if state is not None:
+        lines.append(f"state x {state['x']:+.2f} y {state['y']:+.2f} z {state['z']:.2f}")
+    y = frame.shape[0] - 12 - 22 * (len(lines) - 1)
+    for line in lines:
+        cv2.putText(frame, line, (10, y), cv2.FONT_HERSHEY_SIMPLEX, 0.55, (0, 0, 0), 3, cv2.LINE_AA)
+        cv2.putText(frame, line, (10, y), cv2.FONT_HERSHEY_SIMPLEX, 0.55, (0, 255, 255), 1, cv2.LINE_AA)
+        y += 22
+
+
+def replay(rec: FlightRecording, reprocess_methods: list[str], speed: float) -> None:
+    # Review tools: same panel layout as live_depth_review, fed with recorded metrics.
+    from depth_estimation.live_depth_review import build_pipeline, combine_frames, compose_display
+    from depth_estimation.pipeline_base import LiveFrameOutput
+
+    if rec.frame_count == 0:
+        raise RuntimeError(f"Dump has no frames: {rec.path}")
+    pipelines = [build_pipeline(m) for m in reprocess_methods]
+    methods = ["recorded"] + [p.name for p in pipelines]
+    last_pose_by_method: dict[str, dict[str, float]] = {}
+    paused = False
+    prev_t = None
+    try:
+        i = 0
+        while i < rec.frame_count:
+            row = rec.frame_index[i]
+            t = float(row["t"])
+            frame_idx = int(row["frame_idx"])
+            frame = rec.frame(i)
+
+            record = rec.measurement_for_frame(frame_idx)
+            metrics = {} if record is None else metrics_from_measurement(record)
+            recorded = frame.copy()
+            _draw_flight_lines(recorded, rec, t)
+            outputs = [LiveFrameOutput(method="recorded", frame_bgr=recorded, metrics=metrics)]
+            outputs.extend(p.process_live_frame(frame) for p in pipelines)
+            for out in outputs:
+                m = out.metrics
+                if all(k in m for k in ("x_rel_m", "y_rel_m", "z_rel_m", "yaw_error_deg")):
+                    last_pose_by_method[out.method] = {
+                        k: float(m[k]) for k in ("x_rel_m", "y_rel_m", "z_rel_m", "yaw_error_deg")
+                    }
+
+            dt = 0.0 if prev_t is None else max(0.0, t - prev_t)
+            prev_t = t
+            display = compose_display(
+                combined_frame=combine_frames(outputs, target_height=RECORDER_REPLAY_HEIGHT),
+                frame_idx=frame_idx,
+                loop_fps=(1.0 / dt) if dt > 0 else 0.0,
+                methods=methods,
+                outputs=outputs,
+                last_pose_by_method=last_pose_by_method,
+            )
+            cv2.imshow(RECORDER_REPLAY_WINDOW_NAME, display)
+
+            wait_ms = 1 if speed <= 0 else max(1, int(dt * 1000.0 / speed))
+            key = cv2.waitKey(0 if paused else wait_ms) & 0xFF
+            if key in KEY_REPLAY_QUIT:
+                break
+            if key in KEY_REPLAY_PAUSE:
+                paused = not paused
+            i += 1
+    finally:
+        cv2.destroyAllWindows()
+        for p in pipelines:
+            p.close()
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Inspect and replay a flight recorder dump (.fpvrec).")
+    parser.add_argument("dump", nargs="?", default=None, help="Dump path (default: newest in runs/flight_recorder).")
+    parser.add_argument("--summary", action="store_true", help="Print header/counts/events and exit.")
+    parser.add_argument("--export", metavar="DIR", default=None, help="Write CSVs + JPEG frames to DIR and exit.")
+    parser.add_argument(
+        "--reprocess",
+        default="",
+        help="Comma-separated live depth methods to re-run on the recorded frames side by side (e.g. naive).",
+    )
+    parser.add_argument("--speed", type=float, default=RECORDER_REPLAY_SPEED, help="Playback speed (0 = max).")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = _build_arg_parser().parse_args(argv)
+    rec = load_flight_recording(args.dump or _latest_dump())
+    print_summary(rec)
+    if args.summary:
+        return
+    if args.export:
+        export_csv(rec, Path(args.export))
+        return
+    methods = [m.strip().lower() for m in args.reprocess.split(",") if m.strip()]
+    print("Controls: q/ESC quit, SPACE pause/resume.")
+    replay(rec, methods, args.speed)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,12 @@
-from flight_vision.app import ConcurrentFlightVisionApp
-
 __all__ = [
     "ConcurrentFlightVisionApp",
 ]
+
+
+def __getattr__(name: str):
+    # Lazy so flight_vision.vision_runtime / camera_sources import without the drone stack (cflib).
+    if name == "ConcurrentFlightVisionApp":
+        from flight_vision.app import ConcurrentFlightVisionApp
+
+        return ConcurrentFlightVisionApp
+    raise AttributeError(f"module 'flight_vision' has no attribute {name!r}")
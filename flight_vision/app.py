@@ -16,7 +16,6 @@ from flight_vision.constants import (
     VISION_MODEL_WEIGHTS,
 )
 from flight_vision.vision_runtime import (
-    OpenCVPresenter,
     OverlayRenderer,
     VisionRuntime,
     YOLODetector,
@@ -38,6 +37,7 @@ from inference.constants import (
     SHOW_LABELS,
     WINDOW_NAME,
 )
+from presentation import create_presenter
 
 if TYPE_CHECKING:
     from drone_control.start_drone import DroneControlApp
@@ -58,6 +58,7 @@ class ConcurrentFlightVisionApp:
         *,
         enable_drone_control: bool = True,
         drone_control_app: DroneControlApp | None = None,
+        stream: str | None = None,
     ) -> None:
         self.enable_drone_control = enable_drone_control
         self._mission_name = FLIGHT_MISSION
@@ -103,9 +104,11 @@ class ConcurrentFlightVisionApp:
             text_color=OVERLAY_TEXT_COLOR,
             text_origin=OVERLAY_TEXT_ORIGIN,
         )
-        presenter = OpenCVPresenter(
+        # Local window, or MJPEG over HTTP when --stream / FPV_STREAM is set.
+        presenter = create_presenter(
             window_name=WINDOW_NAME,
             key_quit=KEY_QUIT,
+            stream=stream,
         )
         self.vision_runtime = VisionRuntime(
             source=source,
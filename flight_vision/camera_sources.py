@@ -6,6 +6,8 @@ from typing import Any
 
 import cv2
 
+from profiling import span
+
 
 class FrameSource(ABC):
     """
@@ -69,7 +71,13 @@ class OpenCVCaptureSource(FrameSource):
     def read(self) -> tuple[bool, Any]:
         if self._cap is None:
             raise RuntimeError("Camera source must be opened before read()")
-        return self._cap.read()
+        # grab()+retrieve() is what read() does; split so capture wait and decode trace separately.
+        with span("capture.grab", "capture"):
+            ok = self._cap.grab()
+        if not ok:
+            return False, None
+        with span("capture.decode", "decode"):
+            return self._cap.retrieve()
 
     def close(self) -> None:
         if self._cap is not None:
@@ -17,14 +17,42 @@ def _build_arg_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Run camera + YOLO only (skip Crazyradio/Crazyflie control).",
     )
+    parser.add_argument(
+        "--trace",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="PATH",
+        help=(
+            "Record per-stage spans and write a Chrome trace JSON on exit "
+            "(default: runs/traces/flight_vision_<timestamp>.json). Open it in ui.perfetto.dev."
+        ),
+    )
+    parser.add_argument(
+        "--stream",
+        nargs="?",
+        const="1",
+        default=None,
+        metavar="ADDR",
+        help=(
+            "Serve the annotated stream as MJPEG over HTTP instead of opening a window "
+            "(default 127.0.0.1:8090; ADDR is <port> or <host>:<port>). Overrides FPV_STREAM."
+        ),
+    )
     return parser
 
 
 def main(argv: list[str] | None = None) -> None:
     args = _build_arg_parser().parse_args(argv)
+    from profiling import default_trace_path, enable_trace_output, start_tracing_from_env
+
+    if args.trace is not None:
+        enable_trace_output(args.trace or default_trace_path("flight_vision"))
+    else:
+        start_tracing_from_env("flight_vision")
     from flight_vision.app import ConcurrentFlightVisionApp
 
-    app = ConcurrentFlightVisionApp(enable_drone_control=not args.vision_only)
+    app = ConcurrentFlightVisionApp(enable_drone_control=not args.vision_only, stream=args.stream)
     app.run()
 
 
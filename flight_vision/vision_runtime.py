@@ -3,12 +3,13 @@ from __future__ import annotations
 import time
 from dataclasses import dataclass
 from threading import Event
-from typing import Iterable
 
 import cv2
 
 from flight_vision.camera_sources import FrameSource
 from inference.utils import load_yolo_model
+from presentation import MJPEGPresenter, OpenCVPresenter
+from profiling import record_yolo_stages, span
 
 
 @dataclass(slots=True, frozen=True)
@@ -46,23 +47,26 @@ class YOLODetector:
 
     def detect(self, frame: object) -> DetectionOutput:
         t0 = time.perf_counter()
-        results = self.model.predict(
-            source=frame,
-            imgsz=self.image_size,
-            conf=self.conf_threshold,
-            iou=self.iou_threshold,
-            max_det=self.max_detections,
-            device=self.device,
-            verbose=self.verbose,
-        )
+        with span("yolo.predict", "inference"):
+            results = self.model.predict(
+                source=frame,
+                imgsz=self.image_size,
+                conf=self.conf_threshold,
+                iou=self.iou_threshold,
+                max_det=self.max_detections,
+                device=self.device,
+                verbose=self.verbose,
+            )
         infer_ms = (time.perf_counter() - t0) * 1000.0
 
         result = results[0]
-        annotated = result.plot(
-            labels=self.show_labels,
-            conf=self.show_confidence,
-            line_width=self.box_line_width,
-        )
+        record_yolo_stages(result, t0)
+        with span("yolo.plot", "annotation"):
+            annotated = result.plot(
+                labels=self.show_labels,
+                conf=self.show_confidence,
+                line_width=self.box_line_width,
+            )
         detection_count = 0 if result.boxes is None else len(result.boxes)
         return DetectionOutput(
             frame=annotated,
@@ -107,33 +111,13 @@ class OverlayRenderer:
             )
 
 
-class OpenCVPresenter:
-    def __init__(
-        self,
-        *,
-        window_name: str,
-        key_quit: Iterable[int],
-    ) -> None:
-        self.window_name = window_name
-        self.key_quit = frozenset(key_quit)
-
-    def show(self, frame: object) -> bool:
-        cv2.imshow(self.window_name, frame)
-        key = cv2.waitKey(1) & 0xFF
-        return key not in self.key_quit
-
-    @staticmethod
-    def close() -> None:
-        cv2.destroyAllWindows()
-
-
 class VisionRuntime:
     def __init__(
         self,
         source: FrameSource,
         detector: YOLODetector,
         overlay: OverlayRenderer,
-        presenter: OpenCVPresenter,
+        presenter: OpenCVPresenter | MJPEGPresenter,
         *,
         frame_poll_backoff_s: float,
     ) -> None:
@@ -150,25 +134,35 @@ class VisionRuntime:
         prev_loop_time = time.perf_counter()
         try:
             while not stop_event.is_set():
-                ok, frame = self.source.read()
-                if not ok:
-                    # Avoid hot loop when feed drops.
-                    time.sleep(self.frame_poll_backoff_s)
-                    continue
-
-                output = self.detector.detect(frame)
-                now = time.perf_counter()
-                loop_dt = max(1e-6, now - prev_loop_time)
-                prev_loop_time = now
-                display_fps = 1.0 / loop_dt
-
-                self.overlay.draw(
-                    output.frame,
-                    detection_count=output.detection_count,
-                    inference_ms=output.inference_ms,
-                    display_fps=display_fps,
-                )
-                should_continue = self.presenter.show(output.frame)
+                with span("vision.frame", "frame"):
+                    ok, frame = self.source.read()
+                    if not ok:
+                        # Avoid hot loop when feed drops.
+                        time.sleep(self.frame_poll_backoff_s)
+                        continue
+
+                    output = self.detector.detect(frame)
+                    now = time.perf_counter()
+                    loop_dt = max(1e-6, now - prev_loop_time)
+                    prev_loop_time = now
+                    display_fps = 1.0 / loop_dt
+
+                    with span("overlay.draw", "annotation"):
+                        self.overlay.draw(
+                            output.frame,
+                            detection_count=output.detection_count,
+                            inference_ms=output.inference_ms,
+                            display_fps=display_fps,
+                        )
+                    with span("presenter.show", "presentation"):
+                        should_continue = self.presenter.show(
+                            output.frame,
+                            {
+                                "detection_count": output.detection_count,
+                                "inference_ms": output.inference_ms,
+                                "display_fps": display_fps,
+                            },
+                        )
                 if not should_continue:
                     stop_event.set()
                     break
@@ -54,6 +54,11 @@ INFER_REVIEW_WINDOW_NAME = "YOLO Session Inference Review"
 INFER_REVIEW_START_PAUSED = False
 INFER_REVIEW_DELAY_S = 0.15
 INFER_REVIEW_ALLOW_IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+# Reuse stored detections (shared with models/: runs/cache/predictions) when stepping through a session again.
+# Changing INFER_CONF_THRESHOLD / INFER_OVERLAP_SUPPRESSION_PERCENT does not require re-running the model.
+INFER_REVIEW_PREDICTION_CACHE_ENABLED = True
+INFER_REVIEW_PREDICTION_CACHE_DIR = "runs/cache/predictions"
+INFER_REVIEW_PREDICTION_CACHE_CONF_FLOOR = 0.05
 
 
 ########################################## Keyboard Controls ###############################################
@@ -45,14 +45,18 @@ def run_inference_on_frame(model, frame, overlap_threshold: float):
         imgsz=INFER_IMAGE_SIZE,
         conf=INFER_CONF_THRESHOLD,
         iou=INFER_IOU_THRESHOLD,
-        max_det=INFER_MAX_DETECTIONS,
         device=INFER_DEVICE,
         verbose=INFER_VERBOSE,
     )
     infer_ms = (time.perf_counter() - t0) * 1000.0
 
+    # max_det after suppression, like the cached path (the cache stores up to its own max_det).
     result = results[0]
-    detection_count = apply_overlap_suppression_to_result(result, overlap_threshold=overlap_threshold)
+    detection_count = apply_overlap_suppression_to_result(
+        result,
+        overlap_threshold=overlap_threshold,
+        max_detections=INFER_MAX_DETECTIONS,
+    )
     annotated = result.plot(
         labels=SHOW_LABELS,
         conf=SHOW_CONFIDENCE,
@@ -61,8 +65,61 @@ def run_inference_on_frame(model, frame, overlap_threshold: float):
     return annotated, detection_count, infer_ms
 
 
+def run_cached_inference_on_image(get_model, prediction_cache, image_path, frame, overlap_threshold: float):
+    t0 = time.perf_counter()
+    prediction = prediction_cache.predict_paths(
+        get_model,
+        [image_path],
+        {"imgsz": INFER_IMAGE_SIZE, "device": INFER_DEVICE},
+    )[0].above(INFER_CONF_THRESHOLD)
+    infer_ms = (time.perf_counter() - t0) * 1000.0
+
+    kept = suppress_overlapping_detections_indices(
+        boxes_xyxy=[tuple(map(float, b)) for b in prediction.xyxy],
+        confidences=[float(c) for c in prediction.conf],
+        overlap_threshold=overlap_threshold,
+    )[:INFER_MAX_DETECTIONS]
+    annotated = frame.copy()
+    draw_prediction_boxes(
+        annotated,
+        prediction.xyxy[kept],
+        prediction.conf[kept],
+        prediction.cls[kept],
+        class_names=prediction_cache.class_names,
+        show_labels=SHOW_LABELS,
+        show_confidence=SHOW_CONFIDENCE,
+        line_width=BOX_LINE_WIDTH,
+    )
+    return annotated, len(kept), infer_ms
+
+
+class LazyModel:
+    """Loads the weights on first call; a session served fully from cache never loads them."""
+
+    def __init__(self, model_ref: str):
+        self.model_ref = model_ref
+        self.loaded = None
+
+    def __call__(self):
+        if self.loaded is None:
+            self.loaded = load_yolo_model(self.model_ref)
+        return self.loaded
+
+
 def main() -> None:
-    model = load_yolo_model(INFER_MODEL_WEIGHTS)
+    get_model = LazyModel(INFER_MODEL_WEIGHTS)
+    prediction_cache = None
+    if INFER_REVIEW_PREDICTION_CACHE_ENABLED:
+        prediction_cache = open_prediction_cache(
+            INFER_REVIEW_PREDICTION_CACHE_DIR,
+            INFER_MODEL_WEIGHTS,
+            imgsz=INFER_IMAGE_SIZE,
+            iou=INFER_IOU_THRESHOLD,
+            conf_floor=min(INFER_REVIEW_PREDICTION_CACHE_CONF_FLOOR, INFER_CONF_THRESHOLD),
+            device=INFER_DEVICE,
+        )
+    else:
+        get_model()
     session_dir = resolve_review_session_dir(
         session_dir_like=INFER_REVIEW_SESSION_DIR,
     )
@@ -76,7 +133,11 @@ def main() -> None:
     delay_ms = max(1, int(delay_s * 1000))
     playing = not INFER_REVIEW_START_PAUSED
 
-    print(f"Loaded model: {INFER_MODEL_WEIGHTS}")
+    if prediction_cache is not None:
+        print(f"Model: {INFER_MODEL_WEIGHTS} (loaded on first cache miss)")
+        print(f"Prediction cache: {prediction_cache.store_dir}")
+    else:
+        print(f"Loaded model: {INFER_MODEL_WEIGHTS}")
     print(f"Review session: {session_dir}")
     print(f"Images: {len(image_paths)}")
     print(f"Overlap suppression: {INFER_OVERLAP_SUPPRESSION_PERCENT:.1f}% overlap")
@@ -106,11 +167,20 @@ def main() -> None:
                 cached_index = -1
                 continue
 
-            cached_annotated, cached_detection_count, cached_infer_ms = run_inference_on_frame(
-                model=model,
-                frame=frame,
-                overlap_threshold=overlap_threshold,
-            )
+            if prediction_cache is not None:
+                cached_annotated, cached_detection_count, cached_infer_ms = run_cached_inference_on_image(
+                    get_model=get_model,
+                    prediction_cache=prediction_cache,
+                    image_path=image_path,
+                    frame=frame,
+                    overlap_threshold=overlap_threshold,
+                )
+            else:
+                cached_annotated, cached_detection_count, cached_infer_ms = run_inference_on_frame(
+                    model=get_model(),
+                    frame=frame,
+                    overlap_threshold=overlap_threshold,
+                )
             cached_index = index
 
         display = cached_annotated.copy()
@@ -1,7 +1,7 @@
+import sys
 from pathlib import Path
 
 import cv2
-from ultralytics import YOLO
 
 REPO_ROOT = Path(__file__).resolve().parent.parent
 
@@ -11,7 +11,14 @@ def resolve_repo_path(path_like: str) -> Path:
     return path if path.is_absolute() else (REPO_ROOT / path)
 
 
-def load_yolo_model(model_ref: str) -> YOLO:
+def load_ultralytics_yolo():
+    # Imported on first use so hot-path helpers here stay importable without torch.
+    from ultralytics import YOLO
+    return YOLO
+
+
+def load_yolo_model(model_ref: str):
+    YOLO = load_ultralytics_yolo()
     model_path = resolve_repo_path(model_ref)
     if model_path.exists():
         return YOLO(str(model_path))
@@ -67,7 +74,7 @@ def suppress_overlapping_detections_indices(
     return kept
 
 
-def apply_overlap_suppression_to_result(result, overlap_threshold: float) -> int:
+def apply_overlap_suppression_to_result(result, overlap_threshold: float, max_detections: int | None = None) -> int:
     if result.boxes is None or len(result.boxes) == 0:
         return 0
 
@@ -78,10 +85,68 @@ def apply_overlap_suppression_to_result(result, overlap_threshold: float) -> int
         confidences=confidences,
         overlap_threshold=overlap_threshold,
     )
+    if max_detections is not None:
+        kept_indices = kept_indices[: max(0, int(max_detections))]
     result.boxes = result.boxes[kept_indices]
     return len(result.boxes)
 
 
+def open_prediction_cache(
+    cache_dir: str,
+    model_ref: str,
+    imgsz: int,
+    iou: float,
+    conf_floor: float,
+    device: object,
+):
+    # models/ is a flat script folder; import its cache as a namespace package from the repo root.
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+    from models.prediction_cache import PredictionCache
+
+    model_path = resolve_repo_path(model_ref)
+    return PredictionCache(
+        resolve_repo_path(cache_dir),
+        str(model_path) if model_path.exists() else model_ref,
+        imgsz=imgsz,
+        iou=iou,
+        conf_floor=conf_floor,
+        device=device,
+    )
+
+
+def draw_prediction_boxes(
+    frame,
+    boxes_xyxy,
+    confidences,
+    class_ids,
+    class_names: dict,
+    show_labels: bool,
+    show_confidence: bool,
+    line_width: int,
+    color: tuple[int, int, int] = (0, 200, 255),
+) -> None:
+    for (x1, y1, x2, y2), conf, cls in zip(boxes_xyxy, confidences, class_ids):
+        p1, p2 = (int(x1), int(y1)), (int(x2), int(y2))
+        cv2.rectangle(frame, p1, p2, color, line_width, cv2.LINE_AA)
+        parts = []
+        if show_labels:
+            parts.append(str(class_names.get(int(cls), int(cls))))
+        if show_confidence:
+            parts.append(f"{float(conf):.2f}")
+        if parts:
+            cv2.putText(
+                frame,
+                " ".join(parts),
+                (p1[0], max(16, p1[1] - 6)),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                0.6,
+                color,
+                2,
+                cv2.LINE_AA,
+            )
+
+
 def clamp_overlap_threshold_from_percent(overlap_percent: float) -> float:
     return max(0.0, min(1.0, overlap_percent / 100.0))
 
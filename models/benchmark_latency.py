@@ -0,0 +1,353 @@
+import importlib.util
+import json
+import multiprocessing
+import os
+import platform
+import shutil
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from time import perf_counter
+
+import cv2
+import numpy as np
+
+from constants import *
+from utils import *
+from eval_engine import IMAGE_EXTS, _init_eval_worker, list_split_image_paths
+from prediction_cache import hash_file
+
+# Backend name -> (Ultralytics export format, module that must be importable to run it).
+BENCH_BACKENDS = {
+    "torch": (None, "torch"),
+    "onnx": ("onnx", "onnxruntime"),
+    "openvino": ("openvino", "openvino"),
+}
+
+
+########################################## Frames ##########################################################
+
+
+def _evenly_spaced(total: int, count: int) -> list[int]:
+    if total <= 0:
+        return []
+    return sorted({int(i) for i in np.linspace(0, total - 1, num=min(count, total))})
+
+
+def load_benchmark_frames(source: Path, count: int) -> list[np.ndarray]:
+    """
+    Read up to count evenly spaced frames from a capture/label session, a video or an image folder.
+
+    Session folders are searched for video.avi first, then images/.
+    """
+    source = Path(source)
+    if source.is_dir() and (source / YOLO_BENCH_VIDEO_FILE_NAME).is_file():
+        source = source / YOLO_BENCH_VIDEO_FILE_NAME
+    elif source.is_dir() and (source / "images").is_dir():
+        source = source / "images"
+
+    frames: list[np.ndarray] = []
+    if source.is_dir():
+        paths = sorted(p for p in source.iterdir() if p.is_file() and p.suffix.lower() in IMAGE_EXTS)
+        for idx in _evenly_spaced(len(paths), count):
+            frame = cv2.imread(str(paths[idx]))
+            if frame is not None:
+                frames.append(frame)
+    elif source.is_file():
+        cap = cv2.VideoCapture(str(source))
+        try:
+            total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            wanted = set(_evenly_spaced(total, count))
+            idx = 0
+            while wanted and idx <= max(wanted):
+                ok, frame = cap.read()
+                if not ok:
+                    break
+                if idx in wanted:
+                    frames.append(frame)
+                idx += 1
+        finally:
+            cap.release()
+    if not frames:
+        raise RuntimeError(f"No benchmark frames could be read from: {source}")
+    return frames
+
+
+def resolve_frame_source() -> Path:
+    if YOLO_BENCH_FRAME_SOURCE:
+        source = resolve_repo_path(YOLO_BENCH_FRAME_SOURCE)
+        if not source.exists():
+            raise RuntimeError(f"YOLO_BENCH_FRAME_SOURCE not found: {source}")
+        return source
+    dataset_yaml = require_dataset_yaml(
+        labels_root=YOLO_LABELS_ROOT,
+        target_class_name=YOLO_TARGET_CLASS_NAME,
+        output_dataset_name=YOLO_OUTPUT_DATASET_NAME,
+        dataset_yaml_name=YOLO_DATASET_YAML_NAME,
+    )
+    return list_split_image_paths(dataset_yaml.parent, YOLO_TEST_SPLIT)[0].parent
+
+
+########################################## Stats ###########################################################
+
+
+def latency_summary(samples_ms: list[float]) -> dict[str, float]:
+    values = np.asarray(samples_ms, dtype=np.float64)
+    if len(values) == 0:
+        return {"mean_ms": None, "p50_ms": None, "p95_ms": None, "p99_ms": None, "fps": None}
+    mean = float(values.mean())
+    p50, p95, p99 = (float(v) for v in np.percentile(values, [50, 95, 99]))
+    return {"mean_ms": mean, "p50_ms": p50, "p95_ms": p95, "p99_ms": p99, "fps": 1000.0 / mean if mean > 0 else None}
+
+
+def build_benchmark_matrix(
+    model_refs: list[str],
+    backends: tuple[str, ...],
+    img_sizes: tuple[int, ...],
+    threads: tuple[int, ...],
+) -> list[dict]:
+    for backend in backends:
+        if backend not in BENCH_BACKENDS:
+            raise RuntimeError(f"Unknown benchmark backend: {backend}. Use one of {sorted(BENCH_BACKENDS)}.")
+    return [
+        {"model_ref": ref, "backend": backend, "imgsz": int(imgsz), "threads": int(n)}
+        for ref in model_refs
+        for backend in backends
+        for imgsz in img_sizes
+        for n in threads
+    ]
+
+
+def backend_available(backend: str) -> bool:
+    return importlib.util.find_spec(BENCH_BACKENDS[backend][1]) is not None
+
+
+########################################## Worker ##########################################################
+
+
+def export_model_for_backend(weights_path: Path, backend: str, imgsz: int, export_root: Path) -> str:
+    """
+    Export once per (weights content, backend, imgsz) and reuse on later runs.
+
+    Ultralytics writes exports next to the weights, so the .pt is copied into its
+    own cache folder first; different imgsz exports then never overwrite each other.
+    """
+    export_format = BENCH_BACKENDS[backend][0]
+    if export_format is None:
+        return str(weights_path)
+    export_dir = export_root / f"{hash_file(weights_path)[:16]}_{backend}_{imgsz}"
+    marker = export_dir / "export.json"
+    if marker.is_file():
+        return json.loads(marker.read_text())["path"]
+    export_dir.mkdir(parents=True, exist_ok=True)
+    local_weights = export_dir / weights_path.name
+    shutil.copy2(weights_path, local_weights)
+    exported = load_ultralytics_yolo()(str(local_weights)).export(
+        format=export_format, imgsz=imgsz, device="cpu", half=False, dynamic=False, verbose=False
+    )
+    marker.write_text(json.dumps({"path": str(exported), "source": str(weights_path)}, indent=2))
+    return str(exported)
+
+
+def limit_backend_threads(backend: str, threads: int) -> list[str]:
+    """
+    Make runtimes created later in this process use `threads` intra-op threads.
+
+    Ultralytics builds its onnxruntime session / OpenVINO compiled model without thread
+    options (OMP/torch settings do not reach them), so their constructors are wrapped
+    here; each cell runs in its own process. Returns a list that records every runtime
+    the limit was applied to.
+    """
+    applied: list[str] = []
+    if backend == "onnx":
+        import onnxruntime as ort
+
+        class ThreadLimitedSession(ort.InferenceSession):
+            def __init__(self, path_or_bytes, sess_options=None, *args, **kwargs):
+                options = sess_options if sess_options is not None else ort.SessionOptions()
+                options.intra_op_num_threads = threads
+                options.inter_op_num_threads = 1
+                super().__init__(path_or_bytes, options, *args, **kwargs)
+                applied.append(f"onnxruntime intra_op_num_threads={threads}")
+
+        ort.InferenceSession = ThreadLimitedSession
+    elif backend == "openvino":
+        import openvino as ov
+
+        class ThreadLimitedCore(ov.Core):
+            def compile_model(self, model, device_name=None, config=None, **kwargs):
+                config = dict(config or {})
+                config["INFERENCE_NUM_THREADS"] = threads
+                compiled = super().compile_model(model, device_name, config, **kwargs)
+                applied.append(f"openvino INFERENCE_NUM_THREADS={threads}")
+                return compiled
+
+        ov.Core = ThreadLimitedCore
+    return applied
+
+
+def benchmark_task(task: dict) -> dict:
+    """Spawned-process entry point: one (model, backend, imgsz, threads) cell of the matrix."""
+    row = {k: task[k] for k in ("model_ref", "backend", "imgsz", "threads")}
+    try:
+        thread_limits = limit_backend_threads(task["backend"], task["threads"])
+        YOLO = load_ultralytics_yolo()
+        weights_path = Path(task["resolved_ref"])
+        if not weights_path.exists():
+            # Hub alias: let Ultralytics download it, then export from the local file.
+            weights_path = Path(YOLO(task["resolved_ref"]).ckpt_path)
+        model_path = export_model_for_backend(weights_path, task["backend"], task["imgsz"], Path(task["export_root"]))
+        model = YOLO(model_path, task="detect")
+        frames = load_benchmark_frames(Path(task["frame_source"]), task["frame_count"])
+        predict_kwargs = {"imgsz": task["imgsz"], "device": "cpu", "conf": YOLO_BENCH_CONF, "verbose": False}
+
+        for i in range(max(1, task["warmup"])):
+            model.predict(frames[i % len(frames)], **predict_kwargs)
+        if task["backend"] == "torch":
+            row["thread_limit"] = f"torch.set_num_threads({task['threads']})"
+        elif thread_limits:
+            row["thread_limit"] = thread_limits[0]
+        else:
+            # The runtime was built somewhere the wrapper does not reach; do not report a thread count.
+            row["threads"] = "n/a"
+            row["thread_limit"] = "not applied"
+
+        total_ms: list[float] = []
+        stage_ms = {"preprocess": [], "inference": [], "postprocess": []}
+        run_t0 = perf_counter()
+        for i in range(task["iterations"]):
+            t0 = perf_counter()
+            results = model.predict(frames[i % len(frames)], **predict_kwargs)
+            total_ms.append((perf_counter() - t0) * 1000.0)
+            speed = getattr(results[0], "speed", None) or {}
+            for stage, samples in stage_ms.items():
+                if speed.get(stage) is not None:
+                    samples.append(float(speed[stage]))
+        wall_s = perf_counter() - run_t0
+
+        row.update(latency_summary(total_ms))
+        row["throughput_fps"] = task["iterations"] / wall_s if wall_s > 0 else None
+        for stage, samples in stage_ms.items():
+            row[f"{stage}_p50_ms"] = float(np.median(samples)) if samples else None
+        row["model_path"] = model_path
+        row["samples_ms"] = [round(v, 3) for v in total_ms]
+        row["status"] = "ok"
+    except Exception as exc:
+        row["status"] = "failed"
+        row["error"] = str(exc)
+    return row
+
+
+def run_benchmark_cell(task: dict) -> dict:
+    # Fresh spawn process per cell so thread settings apply before torch/onnxruntime/OpenVINO start.
+    with ProcessPoolExecutor(
+        max_workers=1,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_eval_worker,
+        initargs=(task["threads"],),
+    ) as pool:
+        return pool.submit(benchmark_task, task).result()
+
+
+########################################## Report ##########################################################
+
+
+def collect_host_info() -> dict:
+    info = {
+        "hostname": platform.node(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+    }
+    for module_name in ("torch", "ultralytics", "onnxruntime", "openvino"):
+        try:
+            module = __import__(module_name)
+            info[f"{module_name}_version"] = getattr(module, "__version__", "unknown")
+        except ImportError:
+            info[f"{module_name}_version"] = None
+    return info
+
+
+def print_benchmark_table(rows: list[dict]) -> None:
+    print(f"{'model':<28} | {'backend':<8} | {'imgsz':>5} | {'thr':>3} | {'p50':>7} | {'p95':>7} | {'p99':>7} | {'fps':>6}")
+    print("-" * 92)
+    for r in rows:
+        name = Path(r["model_ref"]).name[:28]
+        if r.get("status") != "ok":
+            print(f"{name:<28} | {r['backend']:<8} | {r['imgsz']:>5} | {r['threads']:>3} | {r.get('status', '').upper()}")
+            if r.get("error"):
+                print(f"    {r['error']}")
+            continue
+        print(
+            f"{name:<28} | {r['backend']:<8} | {r['imgsz']:>5} | {r['threads']:>3} | "
+            f"{r['p50_ms']:>7.2f} | {r['p95_ms']:>7.2f} | {r['p99_ms']:>7.2f} | {r['throughput_fps']:>6.1f}"
+        )
+
+
+def main() -> None:
+    model_refs = list(YOLO_BENCH_MODEL_REFS)
+    if not model_refs:
+        raise RuntimeError("YOLO_BENCH_MODEL_REFS is empty in models/constants.py.")
+    frame_source = resolve_frame_source()
+    matrix = build_benchmark_matrix(model_refs, YOLO_BENCH_BACKENDS, YOLO_BENCH_IMG_SIZES, YOLO_BENCH_THREADS)
+
+    bench_root = resolve_repo_path(YOLO_RUNS_ROOT) / YOLO_BENCH_RUNS_DIR
+    bench_root.mkdir(parents=True, exist_ok=True)
+    run_name = ensure_unique_run_name(bench_root, build_dated_run_name(YOLO_BENCH_RUN_LABEL, YOLO_RUN_DATE_FORMAT))
+    run_dir = bench_root / run_name
+    run_dir.mkdir(parents=True, exist_ok=False)
+
+    print("CPU latency benchmark")
+    print(f"- frames: {frame_source} ({YOLO_BENCH_FRAME_COUNT} max)")
+    print(f"- warmup/iterations: {YOLO_BENCH_WARMUP_ITERS}/{YOLO_BENCH_TIMED_ITERS}")
+    print(f"- cells: {len(matrix)}")
+    print()
+
+    rows: list[dict] = []
+    for idx, cell in enumerate(matrix, start=1):
+        label = f"{Path(cell['model_ref']).name} {cell['backend']} imgsz={cell['imgsz']} threads={cell['threads']}"
+        if not backend_available(cell["backend"]):
+            print(f"[{idx}/{len(matrix)}] {label}: skipped ({BENCH_BACKENDS[cell['backend']][1]} not installed)")
+            rows.append({**cell, "status": "skipped"})
+            continue
+        task = {
+            **cell,
+            "resolved_ref": resolve_model_reference(
+                cell["model_ref"],
+                runs_root=YOLO_RUNS_ROOT,
+                models_runs_dir=YOLO_MODELS_RUNS_DIR,
+                catalog_path=YOLO_CATALOG_PATH,
+            ),
+            "export_root": str(resolve_repo_path(YOLO_BENCH_EXPORT_DIR)),
+            "frame_source": str(frame_source),
+            "frame_count": YOLO_BENCH_FRAME_COUNT,
+            "warmup": YOLO_BENCH_WARMUP_ITERS,
+            "iterations": YOLO_BENCH_TIMED_ITERS,
+        }
+        print(f"[{idx}/{len(matrix)}] {label}", flush=True)
+        rows.append(run_benchmark_cell(task))
+
+    print()
+    print_benchmark_table(rows)
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "host": collect_host_info(),
+        "frame_source": str(frame_source),
+        "warmup_iters": YOLO_BENCH_WARMUP_ITERS,
+        "timed_iters": YOLO_BENCH_TIMED_ITERS,
+        "results": rows,
+    }
+    (run_dir / "latency.json").write_text(json.dumps(report, indent=2))
+    # One summary line per run (no raw samples) for comparing runs over time.
+    summary = dict(report, results=[{k: v for k, v in r.items() if k != "samples_ms"} for r in rows])
+    with (bench_root / YOLO_BENCH_HISTORY_FILE).open("a") as f:
+        f.write(json.dumps(summary) + "\n")
+    print()
+    print(f"Saved: {run_dir / 'latency.json'}")
+    print(f"History: {bench_root / YOLO_BENCH_HISTORY_FILE}")
+
+
+if __name__ == "__main__":
+    main()
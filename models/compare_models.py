@@ -4,50 +4,21 @@ from time import perf_counter
 
 from constants import *
 from utils import *
+from eval_engine import (
+    EvalSettings,
+    build_letterbox_cache,
+    list_split_image_paths,
+    resolve_worker_layout,
+    run_parallel_evaluation,
+)
 
 
-def main() -> None:
-    dataset_yaml = require_dataset_yaml(
-        labels_root=YOLO_LABELS_ROOT,
-        target_class_name=YOLO_TARGET_CLASS_NAME,
-        output_dataset_name=YOLO_OUTPUT_DATASET_NAME,
-        dataset_yaml_name=YOLO_DATASET_YAML_NAME,
-    )
-
-    if not YOLO_COMPARE_MODEL_REFS:
-        raise RuntimeError("YOLO_COMPARE_MODEL_REFS is empty in models/constants.py.")
-
-    comparison_root = resolve_repo_path(YOLO_RUNS_ROOT) / YOLO_COMPARISON_RUNS_DIR
-    comparison_root.mkdir(parents=True, exist_ok=True)
-    desired_session = build_comparison_session_name(
-        run_label=YOLO_COMPARE_RUN_LABEL,
-        model_refs=list(YOLO_COMPARE_MODEL_REFS),
-        date_format=YOLO_RUN_DATE_FORMAT,
-    )
-    comparison_session_name = ensure_unique_run_name(comparison_root, desired_session)
-    comparison_session_dir = comparison_root / comparison_session_name
-    comparison_session_dir.mkdir(parents=True, exist_ok=False)
-
+def evaluate_with_val(dataset_yaml: Path, model_entries: list[tuple], comparison_session_dir: Path) -> list[dict]:
     YOLO = load_ultralytics_yolo()
     results: list[dict] = []
 
-    print("Evaluating models on shared split...")
-    print(f"- dataset: {dataset_yaml}")
-    print(f"- split: {YOLO_TEST_SPLIT}")
-    print(f"- overlap suppression: {YOLO_EVAL_OVERLAP_SUPPRESSION_PERCENT:.1f}% (intersection/smaller-box-area)")
-    print(f"- comparison dir: {comparison_session_dir}")
-    print()
-
-    for idx, model_ref in enumerate(YOLO_COMPARE_MODEL_REFS, start=1):
-        resolved_ref = resolve_model_reference(
-            str(model_ref),
-            runs_root=YOLO_RUNS_ROOT,
-            models_runs_dir=YOLO_MODELS_RUNS_DIR,
-        )
-        model_name = Path(resolved_ref).name if Path(resolved_ref).exists() else str(model_ref)
-        run_name = f"{idx:02d}_{sanitize_token(Path(model_name).stem)}"
-
-        print(f"[{idx}/{len(YOLO_COMPARE_MODEL_REFS)}] {model_name}")
+    for idx, (model_ref, resolved_ref, model_name, run_name) in enumerate(model_entries, start=1):
+        print(f"[{idx}/{len(model_entries)}] {model_name}")
         try:
             model = YOLO(resolved_ref)
             t0 = perf_counter()
@@ -71,7 +42,7 @@ def main() -> None:
 
             results.append(
                 {
-                    "model_ref": str(model_ref),
+                    "model_ref": model_ref,
                     "resolved_ref": resolved_ref,
                     "status": "ok",
                     "model_name": model_name,
@@ -86,13 +57,108 @@ def main() -> None:
         except Exception as exc:
             results.append(
                 {
-                    "model_ref": str(model_ref),
+                    "model_ref": model_ref,
                     "resolved_ref": resolved_ref,
                     "status": "failed",
                     "model_name": model_name,
                     "error": str(exc),
                 }
             )
+    return results
+
+
+def evaluate_parallel(dataset_yaml: Path, model_entries: list[tuple], comparison_session_dir: Path) -> list[dict]:
+    image_paths = list_split_image_paths(dataset_yaml.parent, YOLO_TEST_SPLIT)
+    t0 = perf_counter()
+    cache = build_letterbox_cache(image_paths, YOLO_IMG_SIZE, resolve_repo_path(YOLO_COMPARE_CACHE_DIR))
+    print(f"- letterbox cache: {cache.cache_dir} ({len(cache)} images, {perf_counter() - t0:.1f}s)")
+
+    workers, threads = resolve_worker_layout(
+        num_models=len(model_entries),
+        workers=YOLO_COMPARE_WORKERS,
+        threads_per_worker=YOLO_COMPARE_THREADS_PER_WORKER,
+    )
+    print(f"- workers: {workers} x {threads} thread(s)")
+    print()
+
+    settings = EvalSettings(
+        imgsz=YOLO_IMG_SIZE,
+        batch=YOLO_TEST_BATCH,
+        conf=YOLO_TEST_CONF,
+        iou=YOLO_TEST_IOU,
+        device=YOLO_DEVICE,
+        overlap_threshold=clamp_overlap_threshold_from_percent(YOLO_EVAL_OVERLAP_SUPPRESSION_PERCENT),
+    )
+    tasks = [
+        {
+            "model_ref": model_ref,
+            "resolved_ref": resolved_ref,
+            "model_name": model_name,
+            "cache_dir": str(cache.cache_dir),
+            "output_dir": str(comparison_session_dir / run_name),
+            "settings": settings,
+            "prediction_cache_dir": (
+                str(resolve_repo_path(YOLO_PREDICTION_CACHE_DIR)) if YOLO_PREDICTION_CACHE_ENABLED else ""
+            ),
+            "conf_floor": YOLO_PREDICTION_CACHE_CONF_FLOOR,
+        }
+        for model_ref, resolved_ref, model_name, run_name in model_entries
+    ]
+
+    def report(row: dict) -> None:
+        print(f"[done] {row['model_name']} ({row.get('status')}, {row.get('elapsed_s', 0.0):.1f}s)", flush=True)
+
+    return run_parallel_evaluation(tasks, workers=workers, threads_per_worker=threads, on_result=report)
+
+
+def main() -> None:
+    dataset_yaml = require_dataset_yaml(
+        labels_root=YOLO_LABELS_ROOT,
+        target_class_name=YOLO_TARGET_CLASS_NAME,
+        output_dataset_name=YOLO_OUTPUT_DATASET_NAME,
+        dataset_yaml_name=YOLO_DATASET_YAML_NAME,
+    )
+
+    if not YOLO_COMPARE_MODEL_REFS:
+        raise RuntimeError("YOLO_COMPARE_MODEL_REFS is empty in models/constants.py.")
+
+    comparison_root = resolve_repo_path(YOLO_RUNS_ROOT) / YOLO_COMPARISON_RUNS_DIR
+    comparison_root.mkdir(parents=True, exist_ok=True)
+    desired_session = build_comparison_session_name(
+        run_label=YOLO_COMPARE_RUN_LABEL,
+        model_refs=list(YOLO_COMPARE_MODEL_REFS),
+        date_format=YOLO_RUN_DATE_FORMAT,
+    )
+    comparison_session_name = ensure_unique_run_name(comparison_root, desired_session)
+    comparison_session_dir = comparison_root / comparison_session_name
+    comparison_session_dir.mkdir(parents=True, exist_ok=False)
+
+    model_entries = []
+    for idx, model_ref in enumerate(YOLO_COMPARE_MODEL_REFS, start=1):
+        resolved_ref = resolve_model_reference(
+            str(model_ref),
+            runs_root=YOLO_RUNS_ROOT,
+            models_runs_dir=YOLO_MODELS_RUNS_DIR,
+            catalog_path=YOLO_CATALOG_PATH,
+        )
+        model_name = Path(resolved_ref).name if Path(resolved_ref).exists() else str(model_ref)
+        run_name = f"{idx:02d}_{sanitize_token(Path(model_name).stem)}"
+        model_entries.append((str(model_ref), resolved_ref, model_name, run_name))
+
+    print("Evaluating models on shared split...")
+    print(f"- dataset: {dataset_yaml}")
+    print(f"- split: {YOLO_TEST_SPLIT}")
+    print(f"- overlap suppression: {YOLO_EVAL_OVERLAP_SUPPRESSION_PERCENT:.1f}% (intersection/smaller-box-area)")
+    print(f"- engine: {YOLO_COMPARE_ENGINE}")
+    print(f"- comparison dir: {comparison_session_dir}")
+    print()
+
+    if YOLO_COMPARE_ENGINE == "parallel":
+        results = evaluate_parallel(dataset_yaml, model_entries, comparison_session_dir)
+    elif YOLO_COMPARE_ENGINE == "val":
+        results = evaluate_with_val(dataset_yaml, model_entries, comparison_session_dir)
+    else:
+        raise RuntimeError(f"Invalid YOLO_COMPARE_ENGINE: {YOLO_COMPARE_ENGINE}. Use 'val' or 'parallel'.")
 
     print()
     print("Comparison results:")
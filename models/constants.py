@@ -8,6 +8,10 @@ YOLO_TARGET_CLASS_NAME = "brushless_drone"
 YOLO_OUTPUT_DATASET_NAME = YOLO_TARGET_CLASS_NAME + "_yolo"
 YOLO_DATASET_YAML_NAME = "dataset.yaml"
 
+# Session/model catalog shared with data/ (see data/catalog.py). Used to resolve
+# latest_best/latest_last without scanning runs/. Set to "" to always scan.
+YOLO_CATALOG_PATH = YOLO_LABELS_ROOT + "/.catalog.sqlite"
+
 
 ########################################## Training Constants #############################################
 
@@ -72,6 +76,30 @@ YOLO_TEST_IOU = 0.7
 # keep only the higher-confidence box.
 YOLO_EVAL_OVERLAP_SUPPRESSION_PERCENT = 30.0
 YOLO_TEST_RUN_LABEL = YOLO_TARGET_CLASS_NAME + "_eval"
+# Evaluation engine for test_yolo.py:
+# - "val": Ultralytics model.val() (writes plots/curves to the run dir).
+# - "cached": same metrics from the prediction cache below; only unseen images hit the model.
+YOLO_TEST_ENGINE = "val"
+
+# Prediction cache shared by test_yolo ("cached"), compare_models ("parallel") and random_test_preview.
+# Detections are stored down to YOLO_PREDICTION_CACHE_CONF_FLOOR, keyed by weights hash, image hash,
+# imgsz, backend and NMS IoU, so changing conf thresholds or overlap suppression reuses them.
+YOLO_PREDICTION_CACHE_ENABLED = True
+YOLO_PREDICTION_CACHE_DIR = "runs/cache/predictions"
+YOLO_PREDICTION_CACHE_CONF_FLOOR = 0.001
+
+########################################## Threshold Sweep Constants ######################################
+
+# models/threshold_sweep.py: score every conf x NMS IoU x overlap combination on one split from a
+# single cached inference pass (NMS at max(YOLO_SWEEP_NMS_IOUS)) and report the precision/recall Pareto front.
+# Tune on "val" so the test split stays untouched.
+YOLO_SWEEP_WEIGHTS = YOLO_TEST_WEIGHTS
+YOLO_SWEEP_SPLIT = "val"
+YOLO_SWEEP_CONF_THRESHOLDS = (0.10, 0.20, 0.25, 0.30, 0.40, 0.50, 0.60, 0.70)
+YOLO_SWEEP_NMS_IOUS = (0.50, 0.60, 0.70, 0.80, 0.90)
+# Same rule as INFER_OVERLAP_SUPPRESSION_PERCENT; 100 = no extra suppression.
+YOLO_SWEEP_OVERLAP_PERCENTS = (10.0, 30.0, 50.0, 70.0, 100.0)
+YOLO_SWEEP_RUN_LABEL = YOLO_TARGET_CLASS_NAME + "_threshold_sweep"
 
 ########################################## Prediction Preview Constants ###################################
 
@@ -99,3 +127,37 @@ YOLO_COMPARE_MODEL_REFS = (
 
 )
 YOLO_COMPARE_RUN_LABEL = YOLO_TARGET_CLASS_NAME + "_compare"
+# Comparison engine:
+# - "val": Ultralytics model.val() per model, one after another.
+# - "parallel": models scored concurrently in a process pool on one shared letterboxed copy of the split.
+YOLO_COMPARE_ENGINE = "val"
+# Process count and torch threads per process for "parallel"; 0 = split available cores automatically.
+YOLO_COMPARE_WORKERS = 0
+YOLO_COMPARE_THREADS_PER_WORKER = 0
+# Decoded split images (uint8 memmap, imgsz x imgsz x 3 each) reused while the split is unchanged.
+YOLO_COMPARE_CACHE_DIR = "runs/cache/letterbox"
+
+
+########################################## CPU Latency Benchmark Constants ################################
+
+# models/benchmark_latency.py: time every model x backend x imgsz x threads cell on the CPU.
+YOLO_BENCH_MODEL_REFS = YOLO_COMPARE_MODEL_REFS
+# "torch", "onnx", "openvino"; backends whose runtime is not installed are reported as skipped.
+YOLO_BENCH_BACKENDS = ("torch", "onnx", "openvino")
+YOLO_BENCH_IMG_SIZES = (320, 480, 640)
+YOLO_BENCH_THREADS = (1, 2, 4)
+# Real frames to time on: a capture/label session folder (video.avi or images/), a video or an image folder.
+# "" => images of YOLO_TEST_SPLIT from the prepared dataset.
+YOLO_BENCH_FRAME_SOURCE = ""
+YOLO_BENCH_VIDEO_FILE_NAME = "video.avi"
+YOLO_BENCH_FRAME_COUNT = 32
+YOLO_BENCH_WARMUP_ITERS = 10
+YOLO_BENCH_TIMED_ITERS = 100
+# Same as live inference, so postprocess time reflects deployment.
+YOLO_BENCH_CONF = 0.4
+# ONNX/OpenVINO exports, one folder per (weights hash, backend, imgsz).
+YOLO_BENCH_EXPORT_DIR = "runs/cache/exports"
+# runs/benchmarks/<label>_<date>/latency.json, plus one line per run appended to the history file.
+YOLO_BENCH_RUNS_DIR = "benchmarks"
+YOLO_BENCH_HISTORY_FILE = "latency_history.jsonl"
+YOLO_BENCH_RUN_LABEL = "cpu_latency"
@@ -0,0 +1,529 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from time import perf_counter
+
+import cv2
+import numpy as np
+
+from prediction_cache import CachedPrediction, PredictionCache
+from utils import load_ultralytics_yolo, suppress_overlap_indices
+
+IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+LETTERBOX_PAD_VALUE = 114
+# COCO-style IoU thresholds 0.50:0.05:0.95, as used by Ultralytics val.
+IOU_THRESHOLDS = np.linspace(0.5, 0.95, 10)
+CACHE_VERSION = 2
+
+
+########################################## Letterbox Cache #################################################
+
+
+def letterbox_image(image_bgr: np.ndarray, imgsz: int) -> tuple[np.ndarray, float, tuple[int, int]]:
+    """Resize keeping aspect ratio and pad to imgsz x imgsz (Ultralytics LetterBox, auto=False)."""
+    h, w = image_bgr.shape[:2]
+    ratio = min(imgsz / h, imgsz / w)
+    new_w, new_h = int(round(w * ratio)), int(round(h * ratio))
+    dw, dh = (imgsz - new_w) / 2.0, (imgsz - new_h) / 2.0
+    if (new_w, new_h) != (w, h):
+        image_bgr = cv2.resize(image_bgr, (new_w, new_h), interpolation=cv2.INTER_LINEAR)
+    top, bottom = int(round(dh - 0.1)), int(round(dh + 0.1))
+    left, right = int(round(dw - 0.1)), int(round(dw + 0.1))
+    padded = cv2.copyMakeBorder(
+        image_bgr, top, bottom, left, right, cv2.BORDER_CONSTANT, value=(LETTERBOX_PAD_VALUE,) * 3
+    )
+    return padded, ratio, (left, top)
+
+
+def read_yolo_labels(label_path: Path) -> tuple[np.ndarray, np.ndarray]:
+    """Return (class_ids[N], boxes_cxcywh_norm[N,4]) from a YOLO label file."""
+    classes: list[int] = []
+    boxes: list[list[float]] = []
+    if label_path.exists():
+        for line in label_path.read_text().splitlines():
+            parts = line.split()
+            if len(parts) < 5:
+                continue
+            try:
+                classes.append(int(float(parts[0])))
+                boxes.append([float(v) for v in parts[1:5]])
+            except ValueError:
+                continue
+    return np.asarray(classes, dtype=np.int32), np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+
+
+def list_split_image_paths(dataset_root: Path, split_name: str) -> list[Path]:
+    images_dir = dataset_root / "images" / split_name
+    if not images_dir.exists():
+        raise RuntimeError(f"Split images directory not found: {images_dir}")
+    image_paths = sorted(p for p in images_dir.iterdir() if p.is_file() and p.suffix.lower() in IMAGE_EXTS)
+    if not image_paths:
+        raise RuntimeError(f"No images found in split directory: {images_dir}")
+    return image_paths
+
+
+def split_label_path(image_path: Path) -> Path:
+    # dataset/images/<split>/x.jpg -> dataset/labels/<split>/x.txt
+    return image_path.parent.parent.parent / "labels" / image_path.parent.name / f"{image_path.stem}.txt"
+
+
+@dataclass
+class LetterboxCache:
+    """
+    Decoded, letterboxed split images in one uint8 memmap plus ground truth.
+
+    Boxes are stored in letterboxed pixel coordinates (xyxy). Predictions made on
+    the cached images land in the same frame, and IoU is invariant to the
+    letterbox scale/offset, so metrics match the original image coordinates.
+    """
+
+    cache_dir: Path
+    imgsz: int
+    image_paths: list[Path]
+    ratios: np.ndarray
+    pads: np.ndarray
+    orig_shapes: np.ndarray
+    gt_classes: list[np.ndarray]
+    gt_boxes_xyxy: list[np.ndarray]
+
+    @property
+    def images_path(self) -> Path:
+        return self.cache_dir / "images.u8"
+
+    def __len__(self) -> int:
+        return len(self.image_paths)
+
+    def open_images(self) -> np.memmap:
+        return np.memmap(self.images_path, dtype=np.uint8, mode="r", shape=(len(self), self.imgsz, self.imgsz, 3))
+
+    @classmethod
+    def load(cls, cache_dir: Path) -> "LetterboxCache":
+        index = json.loads((cache_dir / "index.json").read_text())
+        return cls(
+            cache_dir=cache_dir,
+            imgsz=int(index["imgsz"]),
+            image_paths=[Path(p) for p in index["image_paths"]],
+            ratios=np.asarray(index["ratios"], dtype=np.float32),
+            pads=np.asarray(index["pads"], dtype=np.float32).reshape(-1, 2),
+            orig_shapes=np.asarray(index["orig_shapes"], dtype=np.int32).reshape(-1, 2),
+            gt_classes=[np.asarray(c, dtype=np.int32) for c in index["gt_classes"]],
+            gt_boxes_xyxy=[np.asarray(b, dtype=np.float32).reshape(-1, 4) for b in index["gt_boxes_xyxy"]],
+        )
+
+
+def split_cache_key(image_paths: list[Path], imgsz: int) -> str:
+    digest = hashlib.sha1(f"v{CACHE_VERSION}:{imgsz}".encode())
+    for path in image_paths:
+        st = path.stat()
+        label_path = split_label_path(path)
+        label_mtime = label_path.stat().st_mtime_ns if label_path.exists() else 0
+        digest.update(f"{path.resolve()}:{st.st_size}:{st.st_mtime_ns}:{label_mtime}\n".encode())
+    return digest.hexdigest()[:16]
+
+
+def build_letterbox_cache(image_paths: list[Path], imgsz: int, cache_root: Path) -> LetterboxCache:
+    """Decode + letterbox every split image once; reused while the split is unchanged."""
+    cache_dir = Path(cache_root) / split_cache_key(image_paths, imgsz)
+    if (cache_dir / "index.json").exists():
+        return LetterboxCache.load(cache_dir)
+
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp_images = cache_dir / "images.u8.tmp"
+    images = np.memmap(tmp_images, dtype=np.uint8, mode="w+", shape=(len(image_paths), imgsz, imgsz, 3))
+    ratios: list[float] = []
+    pads: list[tuple[int, int]] = []
+    orig_shapes: list[tuple[int, int]] = []
+    gt_classes: list[list[int]] = []
+    gt_boxes: list[list[list[float]]] = []
+    for idx, path in enumerate(image_paths):
+        image = cv2.imread(str(path), cv2.IMREAD_COLOR)
+        if image is None:
+            raise RuntimeError(f"Could not read image: {path}")
+        h, w = image.shape[:2]
+        images[idx], ratio, (pad_x, pad_y) = letterbox_image(image, imgsz)
+        ratios.append(ratio)
+        pads.append((pad_x, pad_y))
+        orig_shapes.append((h, w))
+
+        classes, cxcywh = read_yolo_labels(split_label_path(path))
+        xyxy = np.empty_like(cxcywh)
+        xyxy[:, 0] = (cxcywh[:, 0] - cxcywh[:, 2] / 2) * w * ratio + pad_x
+        xyxy[:, 1] = (cxcywh[:, 1] - cxcywh[:, 3] / 2) * h * ratio + pad_y
+        xyxy[:, 2] = (cxcywh[:, 0] + cxcywh[:, 2] / 2) * w * ratio + pad_x
+        xyxy[:, 3] = (cxcywh[:, 1] + cxcywh[:, 3] / 2) * h * ratio + pad_y
+        gt_classes.append(classes.tolist())
+        gt_boxes.append(xyxy.tolist())
+    images.flush()
+    del images
+    os.replace(tmp_images, cache_dir / "images.u8")
+
+    index = {
+        "version": CACHE_VERSION,
+        "imgsz": imgsz,
+        "image_paths": [str(p.resolve()) for p in image_paths],
+        "ratios": ratios,
+        "pads": pads,
+        "orig_shapes": orig_shapes,
+        "gt_classes": gt_classes,
+        "gt_boxes_xyxy": gt_boxes,
+    }
+    (cache_dir / "index.json").write_text(json.dumps(index))
+    return LetterboxCache.load(cache_dir)
+
+
+########################################## Metrics #########################################################
+
+
+def box_iou_matrix(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """IoU between every xyxy box in boxes_a (N,4) and boxes_b (M,4) -> (N, M)."""
+    if len(boxes_a) == 0 or len(boxes_b) == 0:
+        return np.zeros((len(boxes_a), len(boxes_b)), dtype=np.float32)
+    a = boxes_a[:, None, :]
+    b = boxes_b[None, :, :]
+    inter_w = np.clip(np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0, None)
+    inter_h = np.clip(np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0, None)
+    inter = inter_w * inter_h
+    area_a = (boxes_a[:, 2] - boxes_a[:, 0]) * (boxes_a[:, 3] - boxes_a[:, 1])
+    area_b = (boxes_b[:, 2] - boxes_b[:, 0]) * (boxes_b[:, 3] - boxes_b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0).astype(np.float32)
+
+
+def match_predictions(
+    pred_classes: np.ndarray,
+    gt_classes: np.ndarray,
+    iou: np.ndarray,
+    iou_thresholds: np.ndarray = IOU_THRESHOLDS,
+) -> np.ndarray:
+    """
+    Greedy one-to-one matching per IoU threshold (Ultralytics match_predictions).
+
+    iou is (num_gt, num_pred); returns bool (num_pred, num_thresholds).
+    """
+    correct = np.zeros((len(pred_classes), len(iou_thresholds)), dtype=bool)
+    if len(pred_classes) == 0 or len(gt_classes) == 0:
+        return correct
+    iou = iou * (gt_classes[:, None] == pred_classes[None, :])
+    for t, threshold in enumerate(iou_thresholds):
+        gt_idx, pred_idx = np.nonzero(iou >= threshold)
+        if len(gt_idx) == 0:
+            continue
+        order = np.argsort(-iou[gt_idx, pred_idx], kind="stable")
+        gt_idx, pred_idx = gt_idx[order], pred_idx[order]
+        _, first = np.unique(pred_idx, return_index=True)
+        gt_idx, pred_idx = gt_idx[np.sort(first)], pred_idx[np.sort(first)]
+        _, first = np.unique(gt_idx, return_index=True)
+        correct[pred_idx[first], t] = True
+    return correct
+
+
+def compute_ap(recall: np.ndarray, precision: np.ndarray) -> float:
+    """Area under the precision envelope with 101-point interpolation (COCO)."""
+    mrec = np.concatenate(([0.0], recall, [1.0]))
+    mpre = np.concatenate(([1.0], precision, [0.0]))
+    mpre = np.flip(np.maximum.accumulate(np.flip(mpre)))
+    x = np.linspace(0, 1, 101)
+    return float(np.trapezoid(np.interp(x, mrec, mpre), x))
+
+
+def _smooth(values: np.ndarray, fraction: float = 0.1) -> np.ndarray:
+    kernel = round(len(values) * fraction * 2) // 2 + 1
+    padded = np.concatenate((np.full(kernel // 2, values[0]), values, np.full(kernel // 2, values[-1])))
+    return np.convolve(padded, np.ones(kernel) / kernel, mode="valid")
+
+
+def detection_metrics(
+    correct: np.ndarray,
+    conf: np.ndarray,
+    pred_classes: np.ndarray,
+    gt_classes: np.ndarray,
+) -> dict[str, float]:
+    """
+    Precision/recall at the max-F1 confidence and mAP50 / mAP50-95 over classes,
+    computed the way Ultralytics val reports them.
+    """
+    result = {"precision": 0.0, "recall": 0.0, "map50": 0.0, "map5095": 0.0}
+    classes = np.unique(gt_classes)
+    if len(classes) == 0:
+        return result
+
+    order = np.argsort(-conf, kind="stable")
+    correct, conf, pred_classes = correct[order], conf[order], pred_classes[order]
+    px = np.linspace(0, 1, 1000)
+    p_curves = np.zeros((len(classes), len(px)))
+    r_curves = np.zeros((len(classes), len(px)))
+    ap = np.zeros((len(classes), correct.shape[1]))
+
+    for ci, cls in enumerate(classes):
+        mask = pred_classes == cls
+        n_gt = int((gt_classes == cls).sum())
+        n_pred = int(mask.sum())
+        if n_pred == 0 or n_gt == 0:
+            continue
+        tp = correct[mask].cumsum(0)
+        fp = (1 - correct[mask]).cumsum(0)
+        recall = tp / (n_gt + 1e-16)
+        precision = tp / (tp + fp)
+        r_curves[ci] = np.interp(-px, -conf[mask], recall[:, 0], left=0)
+        p_curves[ci] = np.interp(-px, -conf[mask], precision[:, 0], left=1)
+        for t in range(correct.shape[1]):
+            ap[ci, t] = compute_ap(recall[:, t], precision[:, t])
+
+    f1 = 2 * p_curves * r_curves / (p_curves + r_curves + 1e-16)
+    best = int(_smooth(f1.mean(0)).argmax())
+    result["precision"] = float(p_curves[:, best].mean())
+    result["recall"] = float(r_curves[:, best].mean())
+    result["map50"] = float(ap[:, 0].mean())
+    result["map5095"] = float(ap.mean())
+    return result
+
+
+########################################## Model Evaluation ################################################
+
+
+@dataclass
+class EvalSettings:
+    imgsz: int
+    batch: int
+    conf: float
+    iou: float
+    device: object
+    overlap_threshold: float
+
+
+def predict_cached_batch(model, images: np.ndarray, settings: EvalSettings) -> tuple[list[tuple], float]:
+    """Run one batch; returns per-image (xyxy, conf, cls) arrays and inference ms per image."""
+    results = model.predict(
+        source=[np.ascontiguousarray(img) for img in images],
+        imgsz=settings.imgsz,
+        conf=settings.conf,
+        iou=settings.iou,
+        device=settings.device,
+        verbose=False,
+    )
+    outputs: list[tuple] = []
+    infer_ms: list[float] = []
+    for result in results:
+        boxes = result.boxes
+        xyxy = boxes.xyxy.cpu().numpy().astype(np.float32).reshape(-1, 4)
+        conf = boxes.conf.cpu().numpy().astype(np.float32).reshape(-1)
+        cls = boxes.cls.cpu().numpy().astype(np.int32).reshape(-1)
+        outputs.append((xyxy, conf, cls))
+        speed = getattr(result, "speed", None) or {}
+        if speed.get("inference") is not None:
+            infer_ms.append(float(speed["inference"]))
+    return outputs, float(np.mean(infer_ms)) if infer_ms else float("nan")
+
+
+def apply_overlap_suppression(xyxy: np.ndarray, conf: np.ndarray, cls: np.ndarray, threshold: float) -> tuple:
+    if threshold <= 0.0 or len(xyxy) <= 1:
+        return xyxy, conf, cls
+    keep = suppress_overlap_indices(
+        boxes_xyxy=[tuple(map(float, b)) for b in xyxy],
+        confidences=[float(c) for c in conf],
+        overlap_threshold=threshold,
+    )
+    keep = np.asarray(keep, dtype=np.int64)
+    return xyxy[keep], conf[keep], cls[keep]
+
+
+class LazyYOLO:
+    """model.predict() stand-in that loads the weights on the first cache miss only."""
+
+    def __init__(self, model_ref: str):
+        self.model_ref = model_ref
+        self.model = None
+
+    @property
+    def names(self) -> dict:
+        return dict(getattr(self.model, "names", {}) or {})
+
+    def predict(self, **kwargs):
+        if self.model is None:
+            self.model = load_ultralytics_yolo()(self.model_ref)
+        return self.model.predict(**kwargs)
+
+
+def predict_batch_with_cache(
+    model,
+    cache: LetterboxCache,
+    images: np.ndarray,
+    indices: range,
+    settings: EvalSettings,
+    prediction_cache,
+) -> tuple[list[tuple], float]:
+    """
+    Like predict_cached_batch, but serves images from a PredictionCache when possible.
+
+    The prediction cache stores original-image coordinates down to its conf floor;
+    boxes are mapped back into the letterbox frame and cut at settings.conf here.
+    """
+    keys = [prediction_cache.image_key(cache.image_paths[i]) for i in indices]
+    missing = [j for j, key in enumerate(keys) if prediction_cache.get(key) is None]
+    prediction_cache.hits += len(keys) - len(missing)
+    prediction_cache.misses += len(missing)
+    infer_ms = float("nan")
+    if missing:
+        floor_settings = EvalSettings(
+            imgsz=settings.imgsz,
+            batch=settings.batch,
+            conf=prediction_cache.conf_floor,
+            iou=settings.iou,
+            device=settings.device,
+            overlap_threshold=settings.overlap_threshold,
+        )
+        outputs, infer_ms = predict_cached_batch(model, images[[indices[j] for j in missing]], floor_settings)
+        prediction_cache.remember_class_names(getattr(model, "names", None))
+        for j, (xyxy, conf, cls) in zip(missing, outputs):
+            i = indices[j]
+            orig = (xyxy - np.tile(cache.pads[i], 2)) / cache.ratios[i]
+            order = np.argsort(-conf, kind="stable")
+            h, w = (int(v) for v in cache.orig_shapes[i])
+            prediction_cache.put(keys[j], CachedPrediction(orig[order], conf[order], cls[order].astype(np.int16), (h, w)))
+        prediction_cache.flush()
+
+    outputs = []
+    for j, key in enumerate(keys):
+        i = indices[j]
+        pred = prediction_cache.get(key).above(settings.conf)
+        xyxy = pred.xyxy * cache.ratios[i] + np.tile(cache.pads[i], 2)
+        outputs.append((xyxy.astype(np.float32), pred.conf, pred.cls.astype(np.int32)))
+    return outputs, infer_ms
+
+
+def open_letterbox_prediction_cache(
+    cache_root: Path, model_ref: str, settings: EvalSettings, conf_floor: float
+) -> PredictionCache:
+    return PredictionCache(
+        cache_root,
+        model_ref,
+        imgsz=settings.imgsz,
+        iou=settings.iou,
+        conf_floor=min(conf_floor, settings.conf),
+        device=settings.device,
+        variant="letterbox",
+    )
+
+
+def evaluate_model_on_cache(model, cache: LetterboxCache, settings: EvalSettings, prediction_cache=None) -> dict:
+    images = cache.open_images()
+    all_correct: list[np.ndarray] = []
+    all_conf: list[np.ndarray] = []
+    all_cls: list[np.ndarray] = []
+    batch_ms: list[tuple[float, int]] = []
+
+    for start in range(0, len(cache), max(1, settings.batch)):
+        stop = min(len(cache), start + max(1, settings.batch))
+        if prediction_cache is None:
+            outputs, infer_ms = predict_cached_batch(model, images[start:stop], settings)
+        else:
+            outputs, infer_ms = predict_batch_with_cache(
+                model, cache, images, range(start, stop), settings, prediction_cache
+            )
+        if not np.isnan(infer_ms):
+            batch_ms.append((infer_ms, stop - start))
+        for idx, (xyxy, conf, cls) in zip(range(start, stop), outputs):
+            xyxy, conf, cls = apply_overlap_suppression(xyxy, conf, cls, settings.overlap_threshold)
+            iou = box_iou_matrix(cache.gt_boxes_xyxy[idx], xyxy)
+            all_correct.append(match_predictions(cls, cache.gt_classes[idx], iou))
+            all_conf.append(conf)
+            all_cls.append(cls)
+
+    metrics = detection_metrics(
+        correct=np.concatenate(all_correct) if all_correct else np.zeros((0, len(IOU_THRESHOLDS)), dtype=bool),
+        conf=np.concatenate(all_conf) if all_conf else np.zeros(0, dtype=np.float32),
+        pred_classes=np.concatenate(all_cls) if all_cls else np.zeros(0, dtype=np.int32),
+        gt_classes=np.concatenate(cache.gt_classes) if cache.gt_classes else np.zeros(0, dtype=np.int32),
+    )
+    if batch_ms:
+        metrics["inference_ms"] = sum(ms * n for ms, n in batch_ms) / sum(n for _, n in batch_ms)
+    else:
+        metrics["inference_ms"] = None
+    return metrics
+
+
+def _init_eval_worker(threads: int) -> None:
+    # Spawned workers have not imported torch yet, so the env vars take effect.
+    for key in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[key] = str(threads)
+    cv2.setNumThreads(1)
+    try:
+        import torch
+
+        torch.set_num_threads(threads)
+        torch.set_num_interop_threads(1)
+    except (ImportError, RuntimeError):
+        pass
+
+
+def evaluate_model_task(task: dict) -> dict:
+    """Process-pool entry point: load one model and score it on the shared cache."""
+    row = {
+        "model_ref": task["model_ref"],
+        "resolved_ref": task["resolved_ref"],
+        "model_name": task["model_name"],
+    }
+    try:
+        cache = LetterboxCache.load(Path(task["cache_dir"]))
+        model = load_ultralytics_yolo()(task["resolved_ref"])
+        prediction_cache = None
+        if task.get("prediction_cache_dir"):
+            prediction_cache = open_letterbox_prediction_cache(
+                Path(task["prediction_cache_dir"]), task["resolved_ref"], task["settings"], task["conf_floor"]
+            )
+        t0 = perf_counter()
+        metrics = evaluate_model_on_cache(model, cache, task["settings"], prediction_cache=prediction_cache)
+        if prediction_cache is not None:
+            row["cache_hits"] = prediction_cache.hits
+        row.update(metrics)
+        row["elapsed_s"] = perf_counter() - t0
+        row["status"] = "ok"
+        out_dir = Path(task["output_dir"])
+        out_dir.mkdir(parents=True, exist_ok=True)
+        (out_dir / "metrics.json").write_text(json.dumps(row, indent=2))
+    except Exception as exc:
+        row["status"] = "failed"
+        row["error"] = str(exc)
+    return row
+
+
+def resolve_worker_layout(num_models: int, workers: int, threads_per_worker: int) -> tuple[int, int]:
+    """Split the machine's cores into (workers, threads per worker); 0 means auto."""
+    cpu_total = os.cpu_count() or 1
+    if threads_per_worker <= 0:
+        threads_per_worker = max(1, cpu_total // max(1, min(num_models, cpu_total)))
+    if workers <= 0:
+        workers = max(1, cpu_total // threads_per_worker)
+    return max(1, min(workers, num_models)), max(1, threads_per_worker)
+
+
+def run_parallel_evaluation(
+    tasks: list[dict],
+    workers: int,
+    threads_per_worker: int,
+    on_result=None,
+) -> list[dict]:
+    """
+    Evaluate every task (see evaluate_model_task) in a spawn process pool.
+
+    Results keep the task order regardless of completion order.
+    """
+    import multiprocessing
+
+    results: list[dict | None] = [None] * len(tasks)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_eval_worker,
+        initargs=(threads_per_worker,),
+    ) as pool:
+        futures = {pool.submit(evaluate_model_task, task): idx for idx, task in enumerate(tasks)}
+        for future in as_completed(futures):
+            idx = futures[future]
+            results[idx] = future.result()
+            if on_result is not None:
+                on_result(results[idx])
+    return [r for r in results if r is not None]
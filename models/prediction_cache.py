@@ -0,0 +1,285 @@
+import hashlib
+import json
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+# Stdlib + numpy only: inference/ imports this module as `models.prediction_cache`,
+# where `constants`/`utils` would resolve to the inference/ copies.
+
+CACHE_VERSION = 1
+_HASH_BLOCK_BYTES = 1024 * 1024
+# Merge shard files once there are more than this many.
+_MAX_SHARDS = 16
+# Only complete shards match; temp files from an interrupted write (".shard_N.npz.tmp") are ignored.
+_SHARD_NAME = re.compile(r"shard_(\d{6})\.npz")
+
+
+def hash_file(path: Path) -> str:
+    digest = hashlib.sha1()
+    with Path(path).open("rb") as f:
+        while True:
+            block = f.read(_HASH_BLOCK_BYTES)
+            if not block:
+                break
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def infer_backend_name(model_ref: str) -> str:
+    ref = str(model_ref).rstrip("/")
+    if ref.endswith("_openvino_model"):
+        return "openvino"
+    suffix = Path(ref).suffix.lower()
+    return {".onnx": "onnx", ".engine": "tensorrt", ".torchscript": "torchscript"}.get(suffix, "torch")
+
+
+@dataclass
+class CachedPrediction:
+    """Detections for one image in original pixel coordinates, sorted by confidence."""
+
+    xyxy: np.ndarray
+    conf: np.ndarray
+    cls: np.ndarray
+    orig_shape: tuple[int, int]
+
+    def __len__(self) -> int:
+        return len(self.conf)
+
+    def above(self, conf_threshold: float) -> "CachedPrediction":
+        keep = self.conf >= conf_threshold
+        return CachedPrediction(self.xyxy[keep], self.conf[keep], self.cls[keep], self.orig_shape)
+
+
+def prediction_from_result(result) -> CachedPrediction:
+    boxes = result.boxes
+    xyxy = boxes.xyxy.cpu().numpy().astype(np.float32).reshape(-1, 4)
+    conf = boxes.conf.cpu().numpy().astype(np.float32).reshape(-1)
+    cls = boxes.cls.cpu().numpy().astype(np.int16).reshape(-1)
+    order = np.argsort(-conf, kind="stable")
+    h, w = result.orig_shape[:2]
+    return CachedPrediction(xyxy[order], conf[order], cls[order], (int(h), int(w)))
+
+
+class PredictionCache:
+    """
+    On-disk store of low-threshold detections for one model configuration.
+
+    The configuration key covers the weights file hash, imgsz, backend, device,
+    NMS IoU, conf floor, max_det and an input variant (e.g. original files vs
+    pre-letterboxed arrays), so any change lands in a fresh store. Images are
+    keyed by content hash. Detections are kept down to conf_floor after NMS;
+    a higher threshold applied later gives the same boxes a fresh predict would.
+
+    Storage is columnar: each flush writes one npz shard with concatenated
+    xyxy/conf/cls arrays and per-image offsets. config.json also records the
+    model's class names, so a fully cached run can label boxes without loading it.
+    """
+
+    def __init__(
+        self,
+        cache_root: Path,
+        model_ref: str,
+        imgsz: int,
+        iou: float,
+        conf_floor: float = 0.001,
+        max_det: int = 300,
+        device: object = "",
+        variant: str = "file",
+    ):
+        self.cache_root = Path(cache_root)
+        self.conf_floor = float(conf_floor)
+        self.max_det = int(max_det)
+        self.config = {
+            "version": CACHE_VERSION,
+            "weights": self._weights_identity(model_ref),
+            "imgsz": int(imgsz),
+            "backend": infer_backend_name(model_ref),
+            "device": str(device),
+            "iou": float(iou),
+            "conf_floor": self.conf_floor,
+            "max_det": self.max_det,
+            "variant": variant,
+        }
+        key = hashlib.sha1(json.dumps(self.config, sort_keys=True).encode()).hexdigest()[:16]
+        self.store_dir = self.cache_root / key
+        self._entries: dict[str, CachedPrediction] | None = None
+        self._pending: dict[str, CachedPrediction] = {}
+        self._class_names: dict[int, str] | None = None
+        self._class_names_dirty = False
+        self._image_hashes: dict[tuple[str, int, int], str] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _weights_identity(self, model_ref: str) -> str:
+        path = Path(model_ref)
+        if not path.exists():
+            # Hub alias such as "yolo26s.pt"; the name is the best identity available.
+            return f"ref:{model_ref}"
+        if path.is_dir():
+            files = sorted(p for p in path.rglob("*") if p.is_file())
+            digest = hashlib.sha1()
+            for p in files:
+                digest.update(p.relative_to(path).as_posix().encode())
+                digest.update(self._memo_file_hash(p).encode())
+            return digest.hexdigest()
+        return self._memo_file_hash(path)
+
+    def _memo_file_hash(self, path: Path) -> str:
+        # Weights files are large; remember their hash by (path, size, mtime).
+        memo_path = self.cache_root / "weights_hashes.json"
+        try:
+            memo = json.loads(memo_path.read_text())
+        except (OSError, json.JSONDecodeError):
+            memo = {}
+        st = path.stat()
+        memo_key = f"{path.resolve()}:{st.st_size}:{st.st_mtime_ns}"
+        if memo_key not in memo:
+            memo[memo_key] = hash_file(path)
+            self.cache_root.mkdir(parents=True, exist_ok=True)
+            tmp_path = memo_path.with_name(memo_path.name + ".tmp")
+            tmp_path.write_text(json.dumps(memo, indent=1, sort_keys=True))
+            os.replace(tmp_path, memo_path)
+        return memo[memo_key]
+
+    def image_key(self, image_path: Path) -> str:
+        st = Path(image_path).stat()
+        memo_key = (str(image_path), st.st_size, st.st_mtime_ns)
+        if memo_key not in self._image_hashes:
+            self._image_hashes[memo_key] = hash_file(image_path)
+        return self._image_hashes[memo_key]
+
+    def _shard_paths(self) -> list[Path]:
+        if not self.store_dir.exists():
+            return []
+        return sorted(p for p in self.store_dir.glob("shard_*.npz") if _SHARD_NAME.fullmatch(p.name))
+
+    def _load(self) -> dict[str, CachedPrediction]:
+        if self._entries is not None:
+            return self._entries
+        entries: dict[str, CachedPrediction] = {}
+        for shard_path in self._shard_paths():
+            with np.load(shard_path, allow_pickle=False) as shard:
+                keys = shard["keys"]
+                offsets = shard["offsets"]
+                xyxy, conf, cls, shapes = shard["xyxy"], shard["conf"], shard["cls"], shard["shapes"]
+                for i, key in enumerate(keys):
+                    lo, hi = int(offsets[i]), int(offsets[i + 1])
+                    entries[str(key)] = CachedPrediction(
+                        xyxy[lo:hi],
+                        conf[lo:hi],
+                        cls[lo:hi],
+                        (int(shapes[i, 0]), int(shapes[i, 1])),
+                    )
+        self._entries = entries
+        return entries
+
+    def get(self, key: str) -> CachedPrediction | None:
+        return self._load().get(key)
+
+    def put(self, key: str, prediction: CachedPrediction) -> None:
+        self._pending[key] = prediction
+        self._load()[key] = prediction
+
+    @staticmethod
+    def _write_shard(path: Path, items: list[tuple[str, CachedPrediction]]) -> None:
+        counts = [len(p) for _, p in items]
+        offsets = np.zeros(len(items) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(counts)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        # Write through a file object so numpy does not append ".npz" to the temp name.
+        with tmp_path.open("wb") as f:
+            np.savez(
+                f,
+                keys=np.array([k for k, _ in items]),
+                offsets=offsets,
+                xyxy=np.concatenate([p.xyxy for _, p in items]).astype(np.float32).reshape(-1, 4),
+                conf=np.concatenate([p.conf for _, p in items]).astype(np.float32),
+                cls=np.concatenate([p.cls for _, p in items]).astype(np.int16),
+                shapes=np.array([p.orig_shape for _, p in items], dtype=np.int32).reshape(-1, 2),
+            )
+        os.replace(tmp_path, path)
+
+    @property
+    def class_names(self) -> dict[int, str]:
+        """Class id -> name of the model that filled the store ({} if never recorded)."""
+        if self._class_names is None:
+            try:
+                stored = json.loads((self.store_dir / "config.json").read_text()).get("class_names") or {}
+            except (OSError, json.JSONDecodeError):
+                stored = {}
+            self._class_names = {int(k): str(v) for k, v in stored.items()}
+        return self._class_names
+
+    def remember_class_names(self, names) -> None:
+        """Record model.names (dict or list); written to config.json on the next flush."""
+        if not names:
+            return
+        items = names.items() if isinstance(names, dict) else enumerate(names)
+        names = {int(k): str(v) for k, v in items}
+        if names != self.class_names:
+            self._class_names = names
+            self._class_names_dirty = True
+
+    def _write_config(self) -> None:
+        config = dict(self.config)
+        if self._class_names:
+            config["class_names"] = {str(k): v for k, v in sorted(self._class_names.items())}
+        config_path = self.store_dir / "config.json"
+        tmp_path = config_path.with_name(".config.json.tmp")
+        tmp_path.write_text(json.dumps(config, indent=2, sort_keys=True))
+        os.replace(tmp_path, config_path)
+        self._class_names_dirty = False
+
+    def flush(self) -> None:
+        if not self._pending and not self._class_names_dirty:
+            return
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        if self._class_names_dirty or not (self.store_dir / "config.json").exists():
+            self._write_config()
+        if not self._pending:
+            return
+
+        shards = self._shard_paths()
+        if len(shards) >= _MAX_SHARDS:
+            # Compact everything (already merged in memory) into one shard.
+            merged = sorted(self._load().items())
+            self._write_shard(self.store_dir / "shard_000000.npz", merged)
+            for shard_path in shards:
+                if shard_path.name != "shard_000000.npz":
+                    shard_path.unlink()
+        else:
+            next_id = int(_SHARD_NAME.fullmatch(shards[-1].name).group(1)) + 1 if shards else 0
+            self._write_shard(self.store_dir / f"shard_{next_id:06d}.npz", sorted(self._pending.items()))
+        self._pending.clear()
+
+    def predict_paths(self, get_model, image_paths: list[Path], predict_kwargs: dict) -> list[CachedPrediction]:
+        """
+        Return predictions for every path, running the model only on cache misses.
+
+        get_model() is called only when something is missing, so a fully cached
+        run never loads the weights; class_names then comes from the store.
+        """
+        keys = [self.image_key(p) for p in image_paths]
+        missing = [i for i, key in enumerate(keys) if self.get(key) is None]
+        self.hits += len(keys) - len(missing)
+        self.misses += len(missing)
+        if missing:
+            kwargs = dict(predict_kwargs)
+            kwargs.update(conf=self.conf_floor, iou=self.config["iou"], max_det=self.max_det, verbose=False)
+            model = get_model()
+            results = model.predict(source=[str(image_paths[i]) for i in missing], **kwargs)
+            self.remember_class_names(getattr(model, "names", None))
+            for i, result in zip(missing, results):
+                self.put(keys[i], prediction_from_result(result))
+            self.flush()
+        return [self.get(key) for key in keys]
+
+    def __enter__(self) -> "PredictionCache":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.flush()
@@ -7,6 +7,7 @@ import numpy as np
 
 from constants import *
 from utils import *
+from prediction_cache import PredictionCache
 
 
 def list_split_images(dataset_root: Path, split_name: str) -> list[Path]:
@@ -48,6 +49,26 @@ def draw_filename_banner(image_bgr: np.ndarray, filename: str) -> np.ndarray:
     return output
 
 
+def draw_cached_prediction(image_bgr: np.ndarray, prediction, class_names: dict) -> np.ndarray:
+    output = image_bgr.copy()
+    line_width = max(2, int(round(sum(output.shape[:2]) / 2 * 0.003)))
+    for (x1, y1, x2, y2), conf, cls in zip(prediction.xyxy, prediction.conf, prediction.cls):
+        p1, p2 = (int(x1), int(y1)), (int(x2), int(y2))
+        cv2.rectangle(output, p1, p2, (0, 200, 255), line_width, cv2.LINE_AA)
+        label = f"{class_names.get(int(cls), int(cls))} {float(conf):.2f}"
+        cv2.putText(
+            output,
+            label,
+            (p1[0], max(16, p1[1] - 6)),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            0.6,
+            (0, 200, 255),
+            2,
+            cv2.LINE_AA,
+        )
+    return output
+
+
 def build_grid(images: list[np.ndarray]) -> np.ndarray:
     if not images:
         raise RuntimeError("No annotated images to render.")
@@ -129,10 +150,27 @@ def main() -> None:
         YOLO_TEST_WEIGHTS,
         runs_root=YOLO_RUNS_ROOT,
         models_runs_dir=YOLO_MODELS_RUNS_DIR,
+        catalog_path=YOLO_CATALOG_PATH,
     )
 
-    YOLO = load_ultralytics_yolo()
-    model = YOLO(model_ref)
+    loaded_model = []
+
+    def get_model():
+        # Weights are only loaded when the cache cannot serve every sampled image.
+        if not loaded_model:
+            loaded_model.append(load_ultralytics_yolo()(model_ref))
+        return loaded_model[0]
+
+    prediction_cache = None
+    if YOLO_PREDICTION_CACHE_ENABLED:
+        prediction_cache = PredictionCache(
+            resolve_repo_path(YOLO_PREDICTION_CACHE_DIR),
+            model_ref,
+            imgsz=YOLO_IMG_SIZE,
+            iou=YOLO_TEST_IOU,
+            conf_floor=min(YOLO_PREDICTION_CACHE_CONF_FLOOR, YOLO_TEST_CONF),
+            device=YOLO_DEVICE,
+        )
     output_dir, output_base_name, output_ext = resolve_output_destination(
         model_ref=model_ref,
         split_name=split_name,
@@ -151,20 +189,34 @@ def main() -> None:
             rng=rng,
         )
 
-        results = model.predict(
-            source=[str(p) for p in selected_images],
-            imgsz=YOLO_IMG_SIZE,
-            conf=YOLO_TEST_CONF,
-            iou=YOLO_TEST_IOU,
-            device=YOLO_DEVICE,
-            verbose=False,
-        )
-
         rendered: list[np.ndarray] = []
-        for image_path, result in zip(selected_images, results):
-            annotated = result.plot(conf=True, labels=True)
-            annotated = draw_filename_banner(annotated, image_path.name)
-            rendered.append(annotated)
+        if prediction_cache is not None:
+            predictions = prediction_cache.predict_paths(
+                get_model,
+                selected_images,
+                {"imgsz": YOLO_IMG_SIZE, "device": YOLO_DEVICE},
+            )
+            # Fully cached runs never load the model; the store keeps the names of the model that filled it.
+            class_names = prediction_cache.class_names or {0: YOLO_TARGET_CLASS_NAME}
+            for image_path, prediction in zip(selected_images, predictions):
+                image = cv2.imread(str(image_path))
+                if image is None:
+                    raise RuntimeError(f"Could not read image: {image_path}")
+                annotated = draw_cached_prediction(image, prediction.above(YOLO_TEST_CONF), class_names)
+                rendered.append(draw_filename_banner(annotated, image_path.name))
+        else:
+            results = get_model().predict(
+                source=[str(p) for p in selected_images],
+                imgsz=YOLO_IMG_SIZE,
+                conf=YOLO_TEST_CONF,
+                iou=YOLO_TEST_IOU,
+                device=YOLO_DEVICE,
+                verbose=False,
+            )
+            for image_path, result in zip(selected_images, results):
+                annotated = result.plot(conf=True, labels=True)
+                annotated = draw_filename_banner(annotated, image_path.name)
+                rendered.append(annotated)
 
         grid = build_grid(rendered)
         output_path = build_output_path(
@@ -188,6 +240,8 @@ def main() -> None:
         print(f"  - {out}")
     if preview_seed is not None:
         print(f"- base seed: {preview_seed}")
+    if prediction_cache is not None:
+        print(f"- prediction cache: {prediction_cache.hits} hit(s), {prediction_cache.misses} miss(es)")
 
 
 if __name__ == "__main__":
@@ -1,7 +1,45 @@
+import json
 from pathlib import Path
 
 from constants import *
 from utils import *
+from eval_engine import (
+    EvalSettings,
+    LazyYOLO,
+    build_letterbox_cache,
+    evaluate_model_on_cache,
+    list_split_image_paths,
+    open_letterbox_prediction_cache,
+)
+
+
+def evaluate_cached(model_ref: str, dataset_yaml: Path, run_dir: Path) -> dict:
+    image_paths = list_split_image_paths(dataset_yaml.parent, YOLO_TEST_SPLIT)
+    cache = build_letterbox_cache(image_paths, YOLO_IMG_SIZE, resolve_repo_path(YOLO_COMPARE_CACHE_DIR))
+    settings = EvalSettings(
+        imgsz=YOLO_IMG_SIZE,
+        batch=YOLO_TEST_BATCH,
+        conf=YOLO_TEST_CONF,
+        iou=YOLO_TEST_IOU,
+        device=YOLO_DEVICE,
+        overlap_threshold=clamp_overlap_threshold_from_percent(YOLO_EVAL_OVERLAP_SUPPRESSION_PERCENT),
+    )
+    prediction_cache = open_letterbox_prediction_cache(
+        resolve_repo_path(YOLO_PREDICTION_CACHE_DIR), model_ref, settings, YOLO_PREDICTION_CACHE_CONF_FLOOR
+    )
+    # Weights load on the first prediction cache miss only.
+    metrics = evaluate_model_on_cache(LazyYOLO(model_ref), cache, settings, prediction_cache=prediction_cache)
+    print(f"- prediction cache: {prediction_cache.hits} hit(s), {prediction_cache.misses} miss(es)")
+
+    results_dict = {
+        "metrics/precision(B)": metrics["precision"],
+        "metrics/recall(B)": metrics["recall"],
+        "metrics/mAP50(B)": metrics["map50"],
+        "metrics/mAP50-95(B)": metrics["map5095"],
+    }
+    run_dir.mkdir(parents=True, exist_ok=True)
+    (run_dir / "metrics.json").write_text(json.dumps(results_dict, indent=2))
+    return results_dict
 
 
 def main() -> None:
@@ -16,6 +54,7 @@ def main() -> None:
         YOLO_TEST_WEIGHTS,
         runs_root=YOLO_RUNS_ROOT,
         models_runs_dir=YOLO_MODELS_RUNS_DIR,
+        catalog_path=YOLO_CATALOG_PATH,
     )
     model_token = sanitize_token(Path(model_ref).stem)
     project_dir = resolve_repo_path(YOLO_RUNS_ROOT) / YOLO_EVALUATION_RUNS_DIR
@@ -26,25 +65,29 @@ def main() -> None:
     )
     run_name = ensure_unique_run_name(project_dir, desired_run_name)
 
-    YOLO = load_ultralytics_yolo()
-    model = YOLO(model_ref)
-
-    with patched_ultralytics_overlap_suppression(YOLO_EVAL_OVERLAP_SUPPRESSION_PERCENT):
-        metrics = model.val(
-            data=str(dataset_yaml),
-            split=YOLO_TEST_SPLIT,
-            imgsz=YOLO_IMG_SIZE,
-            batch=YOLO_TEST_BATCH,
-            device=YOLO_DEVICE,
-            workers=YOLO_WORKERS,
-            conf=YOLO_TEST_CONF,
-            iou=YOLO_TEST_IOU,
-            project=str(project_dir),
-            name=run_name,
-            exist_ok=False,
-        )
-
-    results_dict = getattr(metrics, "results_dict", {}) or {}
+    if YOLO_TEST_ENGINE == "cached":
+        results_dict = evaluate_cached(model_ref, dataset_yaml, project_dir / run_name)
+    elif YOLO_TEST_ENGINE == "val":
+        YOLO = load_ultralytics_yolo()
+        model = YOLO(model_ref)
+        with patched_ultralytics_overlap_suppression(YOLO_EVAL_OVERLAP_SUPPRESSION_PERCENT):
+            metrics = model.val(
+                data=str(dataset_yaml),
+                split=YOLO_TEST_SPLIT,
+                imgsz=YOLO_IMG_SIZE,
+                batch=YOLO_TEST_BATCH,
+                device=YOLO_DEVICE,
+                workers=YOLO_WORKERS,
+                conf=YOLO_TEST_CONF,
+                iou=YOLO_TEST_IOU,
+                project=str(project_dir),
+                name=run_name,
+                exist_ok=False,
+            )
+        results_dict = getattr(metrics, "results_dict", {}) or {}
+    else:
+        raise RuntimeError(f"Invalid YOLO_TEST_ENGINE: {YOLO_TEST_ENGINE}. Use 'val' or 'cached'.")
+
     print("Evaluation complete.")
     print(f"- model: {model_ref}")
     print(f"- split: {YOLO_TEST_SPLIT}")
@@ -0,0 +1,281 @@
+import csv
+import itertools
+from pathlib import Path
+from time import perf_counter
+
+import numpy as np
+
+from constants import *
+from utils import *
+from eval_engine import (
+    IOU_THRESHOLDS,
+    EvalSettings,
+    LazyYOLO,
+    box_iou_matrix,
+    build_letterbox_cache,
+    detection_metrics,
+    list_split_image_paths,
+    match_predictions,
+    open_letterbox_prediction_cache,
+    predict_batch_with_cache,
+)
+
+SWEEP_CSV_COLUMNS = (
+    "conf",
+    "nms_iou",
+    "overlap_percent",
+    "precision",
+    "recall",
+    "f1",
+    "map50",
+    "map5095",
+    "detections",
+    "pareto",
+)
+
+
+########################################## Vectorized Suppression #########################################
+
+
+def overlap_ratio_matrix(boxes: np.ndarray) -> np.ndarray:
+    """Pairwise intersection / smaller-box-area (same rule as compute_overlap_ratio_xyxy)."""
+    x1 = np.maximum(boxes[:, None, 0], boxes[None, :, 0])
+    y1 = np.maximum(boxes[:, None, 1], boxes[None, :, 1])
+    x2 = np.minimum(boxes[:, None, 2], boxes[None, :, 2])
+    y2 = np.minimum(boxes[:, None, 3], boxes[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area = np.clip(boxes[:, 2] - boxes[:, 0], 0, None) * np.clip(boxes[:, 3] - boxes[:, 1], 0, None)
+    min_area = np.minimum(area[:, None], area[None, :])
+    return np.divide(inter, min_area, out=np.zeros_like(inter, dtype=np.float64), where=min_area > 0)
+
+
+def greedy_keep_mask(suppresses: np.ndarray) -> np.ndarray:
+    """
+    Greedy suppression over boxes already sorted by descending confidence.
+
+    suppresses[i, j] says box i removes box j if i is kept; only j > i is read.
+    """
+    keep = np.ones(len(suppresses), dtype=bool)
+    for i in range(len(suppresses)):
+        if keep[i]:
+            keep[i + 1 :] &= ~suppresses[i, i + 1 :]
+    return keep
+
+
+def build_image_candidates(xyxy: np.ndarray, conf: np.ndarray, cls: np.ndarray) -> dict:
+    """Sort one image's detections by confidence and precompute its pairwise IoU / overlap matrices."""
+    order = np.argsort(-conf, kind="stable")
+    xyxy, conf, cls = xyxy[order], conf[order], cls[order]
+    same_class = cls[:, None] == cls[None, :]
+    return {
+        "xyxy": xyxy,
+        "conf": conf,
+        "cls": cls,
+        "class_iou": box_iou_matrix(xyxy, xyxy) * same_class,
+        "overlap": overlap_ratio_matrix(xyxy),
+    }
+
+
+def suppressed_keep_indices(candidates: dict, nms_iou: float, overlap_threshold: float) -> np.ndarray:
+    """Class-aware NMS at nms_iou followed by class-agnostic overlap suppression, as in live inference."""
+    nms_keep = np.flatnonzero(greedy_keep_mask(candidates["class_iou"] > nms_iou))
+    overlap = candidates["overlap"][np.ix_(nms_keep, nms_keep)]
+    return nms_keep[greedy_keep_mask(overlap > overlap_threshold)]
+
+
+########################################## Sweep ##########################################################
+
+
+def pareto_mask(points: np.ndarray) -> np.ndarray:
+    """True for rows of points (higher is better on every column) that no other row dominates."""
+    if len(points) == 0:
+        return np.zeros(0, dtype=bool)
+    ge = (points[None, :, :] >= points[:, None, :]).all(axis=2)
+    gt = (points[None, :, :] > points[:, None, :]).any(axis=2)
+    return ~(ge & gt).any(axis=1)
+
+
+def sweep_thresholds(
+    predictions: list[tuple[np.ndarray, np.ndarray, np.ndarray]],
+    gt_boxes: list[np.ndarray],
+    gt_classes: list[np.ndarray],
+    conf_thresholds: tuple[float, ...],
+    nms_ious: tuple[float, ...],
+    overlap_percents: tuple[float, ...],
+) -> list[dict]:
+    """
+    Score every (conf, NMS IoU, overlap) combination from one set of low-threshold predictions.
+
+    Suppression is greedy in confidence order, so a confidence cut commutes with it:
+    each (NMS IoU, overlap) pair is suppressed once per image and every conf
+    threshold is a prefix of the result. Predictions must come from NMS at an IoU
+    at least as high as max(nms_ious).
+    """
+    candidates = [build_image_candidates(xyxy, conf, cls) for xyxy, conf, cls in predictions]
+    gt_all = np.concatenate(gt_classes) if gt_classes else np.zeros(0, dtype=np.int32)
+    conf_thresholds = tuple(sorted(conf_thresholds))
+    rows: list[dict] = []
+
+    for nms_iou, overlap_percent in itertools.product(nms_ious, overlap_percents):
+        overlap_threshold = clamp_overlap_threshold_from_percent(overlap_percent)
+        per_conf: dict[float, tuple[list, list, list]] = {c: ([], [], []) for c in conf_thresholds}
+        for image_idx, cand in enumerate(candidates):
+            keep = suppressed_keep_indices(cand, nms_iou, overlap_threshold)
+            xyxy, conf, cls = cand["xyxy"][keep], cand["conf"][keep], cand["cls"][keep]
+            iou = box_iou_matrix(gt_boxes[image_idx], xyxy)
+            previous_count, previous_correct = -1, None
+            for conf_threshold in conf_thresholds:
+                count = int(np.searchsorted(-conf, -conf_threshold, side="right"))
+                if count != previous_count:
+                    # Matching depends on which predictions compete for a GT box, so redo it per prefix.
+                    previous_correct = match_predictions(cls[:count], gt_classes[image_idx], iou[:, :count])
+                    previous_count = count
+                corrects, confs, classes = per_conf[conf_threshold]
+                corrects.append(previous_correct)
+                confs.append(conf[:count])
+                classes.append(cls[:count])
+
+        for conf_threshold in conf_thresholds:
+            corrects, confs, classes = per_conf[conf_threshold]
+            correct = np.concatenate(corrects) if corrects else np.zeros((0, len(IOU_THRESHOLDS)), dtype=bool)
+            metrics = detection_metrics(
+                correct=correct,
+                conf=np.concatenate(confs) if confs else np.zeros(0, dtype=np.float32),
+                pred_classes=np.concatenate(classes) if classes else np.zeros(0, dtype=np.int32),
+                gt_classes=gt_all,
+            )
+            # Operating point at this exact threshold (what live inference would see),
+            # rather than the max-F1 point detection_metrics reports.
+            tp = int(correct[:, 0].sum())
+            precision = tp / len(correct) if len(correct) else 0.0
+            recall = tp / len(gt_all) if len(gt_all) else 0.0
+            rows.append(
+                {
+                    "conf": float(conf_threshold),
+                    "nms_iou": float(nms_iou),
+                    "overlap_percent": float(overlap_percent),
+                    "precision": precision,
+                    "recall": recall,
+                    "f1": 2 * precision * recall / (precision + recall) if precision + recall > 0 else 0.0,
+                    "map50": metrics["map50"],
+                    "map5095": metrics["map5095"],
+                    "detections": len(correct),
+                }
+            )
+
+    front = pareto_mask(np.array([[r["precision"], r["recall"]] for r in rows]).reshape(-1, 2))
+    for row, on_front in zip(rows, front):
+        row["pareto"] = bool(on_front)
+    return rows
+
+
+def collect_sweep_predictions(cache, model_ref: str, conf_floor: float, nms_iou_ceiling: float) -> tuple[list, object]:
+    settings = EvalSettings(
+        imgsz=YOLO_IMG_SIZE,
+        batch=YOLO_TEST_BATCH,
+        conf=conf_floor,
+        iou=nms_iou_ceiling,
+        device=YOLO_DEVICE,
+        overlap_threshold=0.0,
+    )
+    prediction_cache = open_letterbox_prediction_cache(
+        resolve_repo_path(YOLO_PREDICTION_CACHE_DIR), model_ref, settings, conf_floor
+    )
+    model = LazyYOLO(model_ref)
+    images = cache.open_images()
+    predictions: list[tuple] = []
+    for start in range(0, len(cache), max(1, settings.batch)):
+        indices = range(start, min(len(cache), start + max(1, settings.batch)))
+        outputs, _ = predict_batch_with_cache(model, cache, images, indices, settings, prediction_cache)
+        predictions.extend(outputs)
+    return predictions, prediction_cache
+
+
+def write_sweep_csv(rows: list[dict], output_path: Path) -> None:
+    with output_path.open("w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SWEEP_CSV_COLUMNS)
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({key: row[key] for key in SWEEP_CSV_COLUMNS})
+
+
+def print_pareto_table(rows: list[dict]) -> None:
+    front = sorted((r for r in rows if r["pareto"]), key=lambda r: (-r["precision"], -r["recall"]))
+    print(f"{'conf':>6} | {'nms_iou':>7} | {'overlap%':>8} | {'P':>6} | {'R':>6} | {'F1':>6} | {'mAP50':>6} | dets")
+    print("-" * 72)
+    for r in front:
+        print(
+            f"{r['conf']:>6.3f} | {r['nms_iou']:>7.2f} | {r['overlap_percent']:>8.1f} | "
+            f"{r['precision']:>6.3f} | {r['recall']:>6.3f} | {r['f1']:>6.3f} | {r['map50']:>6.3f} | {r['detections']}"
+        )
+
+
+def main() -> None:
+    dataset_yaml = require_dataset_yaml(
+        labels_root=YOLO_LABELS_ROOT,
+        target_class_name=YOLO_TARGET_CLASS_NAME,
+        output_dataset_name=YOLO_OUTPUT_DATASET_NAME,
+        dataset_yaml_name=YOLO_DATASET_YAML_NAME,
+    )
+    model_ref = resolve_model_reference(
+        YOLO_SWEEP_WEIGHTS,
+        runs_root=YOLO_RUNS_ROOT,
+        models_runs_dir=YOLO_MODELS_RUNS_DIR,
+        catalog_path=YOLO_CATALOG_PATH,
+    )
+    if not YOLO_SWEEP_CONF_THRESHOLDS or not YOLO_SWEEP_NMS_IOUS or not YOLO_SWEEP_OVERLAP_PERCENTS:
+        raise RuntimeError("YOLO_SWEEP_* threshold grids must not be empty.")
+
+    project_dir = resolve_repo_path(YOLO_RUNS_ROOT) / YOLO_EVALUATION_RUNS_DIR
+    project_dir.mkdir(parents=True, exist_ok=True)
+    desired_run_name = build_dated_run_name(
+        f"{YOLO_SWEEP_RUN_LABEL}_{sanitize_token(Path(model_ref).stem)}_{YOLO_SWEEP_SPLIT}",
+        YOLO_RUN_DATE_FORMAT,
+    )
+    run_dir = project_dir / ensure_unique_run_name(project_dir, desired_run_name)
+    run_dir.mkdir(parents=True, exist_ok=False)
+
+    print("Threshold sweep")
+    print(f"- model: {model_ref}")
+    print(f"- dataset: {dataset_yaml} ({YOLO_SWEEP_SPLIT})")
+
+    image_paths = list_split_image_paths(dataset_yaml.parent, YOLO_SWEEP_SPLIT)
+    cache = build_letterbox_cache(image_paths, YOLO_IMG_SIZE, resolve_repo_path(YOLO_COMPARE_CACHE_DIR))
+
+    t0 = perf_counter()
+    conf_floor = min(YOLO_PREDICTION_CACHE_CONF_FLOOR, min(YOLO_SWEEP_CONF_THRESHOLDS))
+    predictions, prediction_cache = collect_sweep_predictions(
+        cache, model_ref, conf_floor=conf_floor, nms_iou_ceiling=max(YOLO_SWEEP_NMS_IOUS)
+    )
+    print(
+        f"- predictions: {len(predictions)} image(s), {prediction_cache.hits} cached, "
+        f"{prediction_cache.misses} inferred ({perf_counter() - t0:.1f}s)"
+    )
+
+    t0 = perf_counter()
+    rows = sweep_thresholds(
+        predictions,
+        gt_boxes=cache.gt_boxes_xyxy,
+        gt_classes=cache.gt_classes,
+        conf_thresholds=YOLO_SWEEP_CONF_THRESHOLDS,
+        nms_ious=YOLO_SWEEP_NMS_IOUS,
+        overlap_percents=YOLO_SWEEP_OVERLAP_PERCENTS,
+    )
+    print(f"- combinations: {len(rows)} ({perf_counter() - t0:.1f}s)")
+    print()
+
+    write_sweep_csv(rows, run_dir / "threshold_sweep.csv")
+    print("Pareto front (precision vs recall at each threshold):")
+    print_pareto_table(rows)
+    best = max(rows, key=lambda r: (r["f1"], r["precision"]))
+    print()
+    print("Best F1 (copy to inference/constants.py):")
+    print(f"INFER_CONF_THRESHOLD = {best['conf']}")
+    print(f"INFER_IOU_THRESHOLD = {best['nms_iou']}")
+    print(f"INFER_OVERLAP_SUPPRESSION_PERCENT = {best['overlap_percent']}")
+    print()
+    print(f"Saved: {run_dir / 'threshold_sweep.csv'}")
+
+
+if __name__ == "__main__":
+    main()
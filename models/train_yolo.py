@@ -14,6 +14,7 @@ def main() -> None:
             model_ref=YOLO_RESUME_WEIGHTS,
             runs_root=YOLO_RUNS_ROOT,
             models_runs_dir=YOLO_MODELS_RUNS_DIR,
+            catalog_path=YOLO_CATALOG_PATH,
         )
         model = YOLO(resume_weights)
         print(f"Resuming training from: {resume_weights}")
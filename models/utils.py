@@ -1,3 +1,4 @@
+import sys
 from datetime import datetime
 from contextlib import contextmanager
 from pathlib import Path
@@ -22,12 +23,44 @@ def resolve_repo_path(path_like: str) -> Path:
     return path if path.is_absolute() else (REPO_ROOT / path)
 
 
+def open_session_catalog(catalog_path: str):
+    # data/ is a flat script folder; import its catalog as a namespace package from the repo root.
+    if str(REPO_ROOT) not in sys.path:
+        sys.path.insert(0, str(REPO_ROOT))
+    from data.catalog import SessionCatalog
+
+    return SessionCatalog(resolve_repo_path(catalog_path))
+
+
+def _resolve_latest_model_weights_from_catalog(models_dir: Path, weight_name: str, catalog_path: str) -> str | None:
+    """Same choice as the directory scan: newest run folder by mtime, error if it lacks the weights."""
+    with open_session_catalog(catalog_path) as catalog:
+        catalog.refresh_model_runs(models_dir, source="runs")
+        runs = [r for r in catalog.model_runs(source="runs") if r.path.parent == models_dir.resolve()]
+    if not runs:
+        return None
+    latest_run = max(runs, key=lambda r: r.run_mtime_ns)
+    weight_path = latest_run.best_path if weight_name == "best.pt" else latest_run.last_path
+    if weight_path is None:
+        raise RuntimeError(
+            f"Missing weights file: {latest_run.path / 'weights' / weight_name}\n"
+            f"Latest run is {latest_run.name}, but {weight_name} is not present."
+        )
+    return str(weight_path)
+
+
 def _resolve_latest_model_weights(
     model_ref: str,
     runs_root: str,
     models_runs_dir: str,
+    catalog_path: str | None = None,
 ) -> str:
     models_dir = resolve_repo_path(runs_root) / models_runs_dir
+    if catalog_path and models_dir.exists():
+        weight_name = "best.pt" if model_ref == "latest_best" else "last.pt"
+        cataloged = _resolve_latest_model_weights_from_catalog(models_dir, weight_name, catalog_path)
+        if cataloged is not None:
+            return cataloged
     if not models_dir.exists():
         raise RuntimeError(
             f"Models runs directory not found: {models_dir}\n"
@@ -56,6 +89,7 @@ def resolve_model_reference(
     model_ref: str,
     runs_root: str | None = None,
     models_runs_dir: str | None = None,
+    catalog_path: str | None = None,
 ) -> str:
     normalized = model_ref.strip().lower()
     if normalized in ("latest_best", "latest_last"):
@@ -67,6 +101,7 @@ def resolve_model_reference(
             model_ref=normalized,
             runs_root=runs_root,
             models_runs_dir=models_runs_dir,
+            catalog_path=catalog_path,
         )
 
     ref_path = resolve_repo_path(model_ref)
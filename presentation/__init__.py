@@ -0,0 +1,12 @@
+"""Frame presenters: local OpenCV window or headless MJPEG-over-HTTP stream."""
+
+from .mjpeg import MJPEGPresenter, parse_key
+from .presenters import OpenCVPresenter, create_presenter, parse_stream_address
+
+__all__ = [
+    "MJPEGPresenter",
+    "OpenCVPresenter",
+    "create_presenter",
+    "parse_key",
+    "parse_stream_address",
+]
@@ -0,0 +1,35 @@
+########################################## Headless Streaming ##############################################
+
+# Environment switch read by the live entrypoints (flight_vision, drone_follower demo, live depth review).
+# - unset / "" / "0" -> local OpenCV window (cv2.imshow / cv2.waitKey)
+# - "1"              -> MJPEG over HTTP on STREAM_HOST:STREAM_PORT, no window
+# - "<port>" or "<host>:<port>" -> MJPEG on that address
+# Example:
+#   FPV_STREAM=1 ./scripts/live_depth_review.sh      # then open http://127.0.0.1:8090/
+STREAM_ENV_VAR = "FPV_STREAM"
+
+# Bind address. Keep 127.0.0.1 unless the ground station has to be viewed from another machine
+# (then "0.0.0.0"; only key commands are token-protected, the stream and metrics are open).
+STREAM_HOST = "127.0.0.1"
+STREAM_PORT = 8090
+
+# Encoding runs on the presenter thread at reduced size/rate, so viewers never slow the vision loop.
+# Frames wider than STREAM_MAX_WIDTH are downscaled; frames beyond STREAM_MAX_FPS are dropped.
+STREAM_MAX_WIDTH = 960
+STREAM_MAX_FPS = 15.0
+STREAM_JPEG_QUALITY = 70
+
+# Key commands are POSTed to /key (body k=<name>) and must carry this header with the per-run token
+# printed at startup (also embedded in the viewer page). Plain GETs and cross-site requests cannot
+# set it, so a link or <img> pointing at /key cannot quit or land the drone.
+STREAM_KEY_TOKEN_HEADER = "X-FPV-Key-Token"
+
+# Key command names accepted on /key (k=<name>), mapped to the key codes the loops already handle.
+STREAM_KEY_ALIASES = {
+    "quit": ord("q"),
+    "esc": 27,
+    "gating": ord("g"),
+    "dump": ord("r"),
+}
+# Pending key commands kept until the loop polls them (oldest dropped beyond this).
+STREAM_KEY_QUEUE_SIZE = 32
@@ -0,0 +1,353 @@
+from __future__ import annotations
+
+import hmac
+import json
+import math
+import secrets
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterable
+from urllib.parse import parse_qs, urlsplit
+
+import cv2
+import numpy as np
+
+from presentation.constants import (
+    STREAM_HOST,
+    STREAM_JPEG_QUALITY,
+    STREAM_KEY_ALIASES,
+    STREAM_KEY_QUEUE_SIZE,
+    STREAM_KEY_TOKEN_HEADER,
+    STREAM_MAX_FPS,
+    STREAM_MAX_WIDTH,
+    STREAM_PORT,
+)
+
+NO_KEY = 0xFF
+BOUNDARY = "fpvframe"
+
+INDEX_HTML = """<!doctype html>
+<html><head><title>{title}</title>
+<style>body{{background:#161616;color:#ddd;font-family:monospace}}img{{max-width:100%}}a{{color:#8cf}}
+button{{background:#262626;color:#8cf;border:1px solid #444;font-family:monospace}}</style>
+</head><body>
+<div><img src="/stream.mjpg" alt="stream"></div>
+<div>keys: {keys} &middot; <a href="/metrics.json">metrics</a> &middot; <a href="/snapshot.jpg">snapshot</a></div>
+<script>
+const token = {token};
+for (const b of document.querySelectorAll("button.key")) {{
+  b.onclick = () => fetch("/key", {{
+    method: "POST",
+    headers: {{"Content-Type": "application/x-www-form-urlencoded", "{header}": token}},
+    body: "k=" + encodeURIComponent(b.dataset.k),
+  }});
+}}
+</script>
+</body></html>
+"""
+
+
+def parse_key(value: str) -> int | None:
+    """Key command -> key code: an alias name ("quit"), a single character ("g") or a decimal code."""
+    value = value.strip()
+    if not value:
+        return None
+    alias = STREAM_KEY_ALIASES.get(value.lower())
+    if alias is not None:
+        return int(alias)
+    if len(value) == 1:
+        return ord(value)
+    if value.isdigit() and int(value) < 256:
+        return int(value)
+    return None
+
+
+def _jsonable(value: object) -> object:
+    """Metrics -> strict JSON types (numpy scalars/arrays unwrapped, NaN/inf -> null)."""
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return _jsonable(value.tolist())
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if value is None or isinstance(value, (bool, int, str)):
+        return value
+    return str(value)
+
+
+class MJPEGPresenter:
+    """
+    Serves the annotated stream as MJPEG over HTTP instead of a local window.
+
+    present()/show() only downscale (or copy) the frame and hand it over; JPEG encoding runs on the
+    presenter's encoder thread and HTTP clients are served from the server threads, so a slow or
+    absent viewer never blocks the vision loop. Frames arriving faster than max_fps are dropped.
+
+    Endpoints: / (viewer page), /stream.mjpg, /snapshot.jpg, /metrics.json and POST /key with body
+    k=<name|char>. Key commands need the per-run key_token in the STREAM_KEY_TOKEN_HEADER header (the
+    viewer page sends it), are queued and returned by poll_key() in place of cv2.waitKey().
+    """
+
+    def __init__(
+        self,
+        *,
+        key_quit: Iterable[int] = (ord("q"), 27),
+        host: str = STREAM_HOST,
+        port: int = STREAM_PORT,
+        max_width: int = STREAM_MAX_WIDTH,
+        max_fps: float = STREAM_MAX_FPS,
+        jpeg_quality: int = STREAM_JPEG_QUALITY,
+        title: str = "FPV stream",
+    ) -> None:
+        self.key_quit = frozenset(key_quit)
+        self.max_width = max(0, int(max_width))
+        self.min_interval_s = 1.0 / float(max_fps) if max_fps and max_fps > 0 else 0.0
+        self.jpeg_params = [int(cv2.IMWRITE_JPEG_QUALITY), int(np.clip(jpeg_quality, 1, 100))]
+        self.title = title
+        self.key_token = secrets.token_urlsafe(16)
+
+        self._cond = threading.Condition()
+        self._closed = False
+        self._pending: np.ndarray | None = None
+        self._pending_seq = 0
+        self._jpeg: bytes | None = None
+        self._jpeg_seq = 0
+        self._metrics: dict = {}
+        self._keys: deque[int] = deque(maxlen=STREAM_KEY_QUEUE_SIZE)
+        self._last_accept_t = -math.inf
+        self._stats = {
+            "frames_presented": 0,
+            "frames_dropped": 0,
+            "frames_encoded": 0,
+            "encode_ms": 0.0,
+            "jpeg_bytes": 0,
+            "clients": 0,
+        }
+
+        self._server = ThreadingHTTPServer((host, int(port)), _StreamHandler)
+        self._server.daemon_threads = True
+        self._server.presenter = self
+        self.host, self.port = self._server.server_address[:2]
+        self._server_thread = threading.Thread(target=self._server.serve_forever, name="mjpeg-http", daemon=True)
+        self._encoder_thread = threading.Thread(target=self._encode_loop, name="mjpeg-encode", daemon=True)
+        self._server_thread.start()
+        self._encoder_thread.start()
+
+    @property
+    def url(self) -> str:
+        host = "127.0.0.1" if self.host in ("0.0.0.0", "") else self.host
+        return f"http://{host}:{self.port}/"
+
+    ###################################### Vision loop side ################################################
+
+    def present(self, frame: np.ndarray, metrics: dict | None = None) -> None:
+        """Non-blocking: publish metrics and, if the rate allows, hand a reduced copy of the frame to the encoder."""
+        if metrics is not None:
+            with self._cond:
+                self._metrics = metrics
+        now = time.monotonic()
+        if now - self._last_accept_t < self.min_interval_s:
+            self._stats["frames_dropped"] += 1
+            return
+        self._last_accept_t = now
+
+        # The caller may reuse its canvas for the next frame, so always take a private copy here.
+        h, w = frame.shape[:2]
+        if self.max_width and w > self.max_width:
+            size = (self.max_width, max(1, int(round(h * self.max_width / w))))
+            small = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+        else:
+            small = frame.copy()
+        with self._cond:
+            self._pending = small
+            self._pending_seq += 1
+            self._stats["frames_presented"] += 1
+            self._cond.notify_all()
+
+    def poll_key(self) -> int:
+        """Next key command received over HTTP, or 0xFF (like cv2.waitKey(1) & 0xFF)."""
+        with self._cond:
+            return self._keys.popleft() if self._keys else NO_KEY
+
+    def show(self, frame: np.ndarray, metrics: dict | None = None) -> bool:
+        self.present(frame, metrics)
+        while True:
+            key = self.poll_key()
+            if key == NO_KEY:
+                return True
+            if key in self.key_quit:
+                return False
+
+    def close(self) -> None:
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify_all()
+        self._server.shutdown()
+        self._server.server_close()
+        self._encoder_thread.join(timeout=2.0)
+        self._server_thread.join(timeout=2.0)
+
+    ###################################### Encoder / HTTP side #############################################
+
+    def _encode_loop(self) -> None:
+        encoded_seq = 0
+        while True:
+            with self._cond:
+                while not self._closed and self._pending_seq == encoded_seq:
+                    self._cond.wait()
+                if self._closed:
+                    return
+                frame, encoded_seq = self._pending, self._pending_seq
+            t0 = time.perf_counter()
+            ok, buf = cv2.imencode(".jpg", frame, self.jpeg_params)
+            encode_ms = (time.perf_counter() - t0) * 1000.0
+            if not ok:
+                continue
+            with self._cond:
+                self._jpeg = buf.tobytes()
+                self._jpeg_seq += 1
+                self._stats["frames_encoded"] += 1
+                self._stats["encode_ms"] = encode_ms
+                self._stats["jpeg_bytes"] = len(self._jpeg)
+                self._cond.notify_all()
+
+    def wait_jpeg(self, after_seq: int, timeout_s: float) -> tuple[int, bytes] | None:
+        """Block until a JPEG newer than after_seq exists; None on timeout or close."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._closed or self._jpeg_seq > after_seq, timeout=timeout_s)
+            if self._closed or self._jpeg is None or self._jpeg_seq <= after_seq:
+                return None
+            return self._jpeg_seq, self._jpeg
+
+    def latest_jpeg(self) -> bytes | None:
+        with self._cond:
+            return self._jpeg
+
+    def push_key(self, key: int) -> None:
+        with self._cond:
+            self._keys.append(int(key) & 0xFF)
+
+    def metrics_snapshot(self) -> dict:
+        with self._cond:
+            metrics = self._metrics
+            stats = dict(self._stats)
+        return {"metrics": _jsonable(metrics), "stream": stats}
+
+    def _client_delta(self, delta: int) -> None:
+        with self._cond:
+            self._stats["clients"] += delta
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+
+class _StreamHandler(BaseHTTPRequestHandler):
+    server_version = "FPVStream/1.0"
+
+    @property
+    def presenter(self) -> MJPEGPresenter:
+        return self.server.presenter
+
+    def log_message(self, format: str, *args) -> None:
+        # Quiet: one line per request would flood the vision loop's console.
+        pass
+
+    def _send_body(self, status: int, content_type: str, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, status: int, payload: dict) -> None:
+        self._send_body(status, "application/json", json.dumps(payload).encode("utf-8"))
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        route = url.path.rstrip("/") or "/"
+        if route in ("/", "/index.html"):
+            keys = " ".join(
+                f'<button class="key" data-k="{name}">{name}</button>' for name in STREAM_KEY_ALIASES
+            )
+            page = INDEX_HTML.format(
+                title=self.presenter.title,
+                keys=keys,
+                token=json.dumps(self.presenter.key_token),
+                header=STREAM_KEY_TOKEN_HEADER,
+            )
+            self._send_body(200, "text/html; charset=utf-8", page.encode("utf-8"))
+        elif route == "/stream.mjpg":
+            self._stream()
+        elif route == "/snapshot.jpg":
+            jpeg = self.presenter.latest_jpeg()
+            if jpeg is None:
+                self._send_json(503, {"error": "no frame yet"})
+            else:
+                self._send_body(200, "image/jpeg", jpeg)
+        elif route == "/metrics.json":
+            self._send_json(200, self.presenter.metrics_snapshot())
+        elif route == "/key":
+            # State changes never ride on a GET: any page could trigger it with <img src=".../key?k=quit">.
+            self.send_response(405)
+            self.send_header("Allow", "POST")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        else:
+            self._send_json(404, {"error": f"unknown path {url.path}"})
+
+    def do_POST(self) -> None:
+        url = urlsplit(self.path)
+        if url.path.rstrip("/") != "/key":
+            self._send_json(404, {"error": f"unknown path {url.path}"})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length).decode("utf-8", "replace") if length else ""
+        token = self.headers.get(STREAM_KEY_TOKEN_HEADER) or ""
+        if not hmac.compare_digest(token.encode("utf-8"), self.presenter.key_token.encode("utf-8")):
+            self._send_json(403, {"error": f"missing or wrong {STREAM_KEY_TOKEN_HEADER} header"})
+            return
+        self._key(body)
+
+    def _key(self, query: str) -> None:
+        values = parse_qs(query).get("k", [])
+        key = parse_key(values[0]) if values else None
+        if key is None:
+            self._send_json(400, {"error": "expected k=<" + "|".join(STREAM_KEY_ALIASES) + "|char>"})
+            return
+        self.presenter.push_key(key)
+        self._send_json(200, {"key": key})
+
+    def _stream(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={BOUNDARY}")
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        presenter = self.presenter
+        presenter._client_delta(1)
+        try:
+            seq = 0
+            while not presenter.closed:
+                item = presenter.wait_jpeg(seq, timeout_s=1.0)
+                if item is None:
+                    continue
+                seq, jpeg = item
+                self.wfile.write(
+                    f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\nContent-Length: {len(jpeg)}\r\n\r\n".encode("ascii")
+                )
+                self.wfile.write(jpeg)
+                self.wfile.write(b"\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            presenter._client_delta(-1)
@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+import os
+from typing import Iterable
+
+import cv2
+
+from presentation.constants import STREAM_ENV_VAR, STREAM_HOST, STREAM_KEY_TOKEN_HEADER, STREAM_PORT
+from presentation.mjpeg import MJPEGPresenter
+
+
+class OpenCVPresenter:
+    """Local window presenter (cv2.imshow + cv2.waitKey on the calling thread)."""
+
+    def __init__(
+        self,
+        *,
+        window_name: str,
+        key_quit: Iterable[int],
+    ) -> None:
+        self.window_name = window_name
+        self.key_quit = frozenset(key_quit)
+        self._last_key = 0xFF
+
+    def present(self, frame: object, metrics: dict | None = None) -> None:
+        cv2.imshow(self.window_name, frame)
+        self._last_key = cv2.waitKey(1) & 0xFF
+
+    def poll_key(self) -> int:
+        key, self._last_key = self._last_key, 0xFF
+        return key
+
+    def show(self, frame: object, metrics: dict | None = None) -> bool:
+        self.present(frame, metrics)
+        return self.poll_key() not in self.key_quit
+
+    def close(self) -> None:
+        cv2.destroyAllWindows()
+
+
+def parse_stream_address(value: str | None) -> tuple[str, int] | None:
+    """FPV_STREAM / --stream value -> (host, port); None means use the local window."""
+    if value is None:
+        return None
+    value = value.strip()
+    if value in ("", "0"):
+        return None
+    if value == "1":
+        return STREAM_HOST, STREAM_PORT
+    host, sep, port = value.rpartition(":")
+    if not sep:
+        host, port = STREAM_HOST, value
+    try:
+        return host or STREAM_HOST, int(port)
+    except ValueError as exc:
+        raise RuntimeError(f"Invalid stream address '{value}'. Expected 1, <port> or <host>:<port>.") from exc
+
+
+def create_presenter(
+    *,
+    window_name: str,
+    key_quit: Iterable[int],
+    stream: str | None = None,
+) -> OpenCVPresenter | MJPEGPresenter:
+    """
+    Window or MJPEG presenter. `stream` overrides the FPV_STREAM environment variable
+    (same syntax; "" keeps the window).
+    """
+    address = parse_stream_address(os.environ.get(STREAM_ENV_VAR) if stream is None else stream)
+    if address is None:
+        return OpenCVPresenter(window_name=window_name, key_quit=key_quit)
+    host, port = address
+    presenter = MJPEGPresenter(key_quit=key_quit, host=host, port=port, title=window_name)
+    print(f"[stream] {window_name}: {presenter.url}")
+    print(
+        f"[stream] keys: curl -X POST -H '{STREAM_KEY_TOKEN_HEADER}: {presenter.key_token}' "
+        f"-d k=quit {presenter.url}key"
+    )
+    return presenter
@@ -0,0 +1,33 @@
+"""Lightweight per-stage tracing with Chrome trace (Perfetto) export."""
+
+from .tracing import (
+    Tracer,
+    counter,
+    default_trace_path,
+    enable_trace_output,
+    instant,
+    is_enabled,
+    record_span,
+    record_yolo_stages,
+    span,
+    start_tracing,
+    start_tracing_from_env,
+    stop_tracing,
+    traced,
+)
+
+__all__ = [
+    "Tracer",
+    "counter",
+    "default_trace_path",
+    "enable_trace_output",
+    "instant",
+    "is_enabled",
+    "record_span",
+    "record_yolo_stages",
+    "span",
+    "start_tracing",
+    "start_tracing_from_env",
+    "stop_tracing",
+    "traced",
+]
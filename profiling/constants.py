@@ -0,0 +1,16 @@
+########################################## Tracing ########################################################
+
+# Environment switch read by the live entrypoints (flight_vision, drone_follower demo, live depth review).
+# - unset / "" / "0" -> tracing off (spans cost one global check)
+# - "1"              -> write runs/traces/<entrypoint>_<timestamp>.json on exit
+# - any other value  -> treated as the output path
+# Example:
+#   FPV_TRACE=1 ./scripts/flight_vision.sh --vision-only
+TRACE_ENV_VAR = "FPV_TRACE"
+
+# Default output folder for traces (repo-relative).
+TRACE_OUTPUT_DIR = "runs/traces"
+
+# Events kept in memory. Oldest events are dropped first, so a long flight keeps its last minutes.
+# ~10 spans per frame at 30 FPS -> 500k events is roughly 25 minutes.
+TRACE_MAX_EVENTS = 500_000
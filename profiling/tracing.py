@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import atexit
+from collections import deque
+import functools
+import json
+import os
+from pathlib import Path
+import threading
+import time
+
+from profiling.constants import TRACE_ENV_VAR, TRACE_MAX_EVENTS, TRACE_OUTPUT_DIR
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+# Maps Ultralytics `result.speed` keys to stage spans (postprocess is NMS + box rescaling).
+YOLO_SPEED_STAGES = (
+    ("preprocess", "yolo.preprocess", "preprocess"),
+    ("inference", "yolo.inference", "inference"),
+    ("postprocess", "yolo.nms", "nms"),
+)
+
+
+class Tracer:
+    """
+    In-memory collector of Chrome trace events ("X" complete spans, instants, counters).
+
+    Timestamps are time.perf_counter() in microseconds; every thread writes into one
+    bounded deque (append is atomic under the GIL) tagged with its native thread id,
+    so spans from the vision and control threads land on separate tracks.
+    """
+
+    def __init__(self, max_events: int = TRACE_MAX_EVENTS) -> None:
+        self.events: deque[dict] = deque(maxlen=max(1, int(max_events)))
+        self.pid = os.getpid()
+        self.thread_names: dict[int, str] = {}
+        self.started_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+
+    def _tid(self) -> int:
+        tid = threading.get_native_id()
+        if tid not in self.thread_names:
+            self.thread_names[tid] = threading.current_thread().name
+        return tid
+
+    def add_complete(self, name: str, cat: str, start_s: float, end_s: float, args: dict | None = None) -> None:
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": start_s * 1e6,
+            "dur": max(0.0, end_s - start_s) * 1e6,
+            "pid": self.pid,
+            "tid": self._tid(),
+        }
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+    def add_instant(self, name: str, cat: str, args: dict | None = None) -> None:
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "i",
+            "s": "t",
+            "ts": time.perf_counter() * 1e6,
+            "pid": self.pid,
+            "tid": self._tid(),
+        }
+        if args:
+            event["args"] = args
+        self.events.append(event)
+
+    def add_counter(self, name: str, values: dict[str, float]) -> None:
+        self.events.append(
+            {
+                "name": name,
+                "ph": "C",
+                "ts": time.perf_counter() * 1e6,
+                "pid": self.pid,
+                "tid": self._tid(),
+                "args": values,
+            }
+        )
+
+    def chrome_trace(self) -> dict:
+        metadata = [
+            {"name": "process_name", "ph": "M", "pid": self.pid, "tid": 0, "args": {"name": "crazyflie-fpv"}},
+        ]
+        for tid, thread_name in sorted(self.thread_names.items()):
+            metadata.append({"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": thread_name}})
+        return {
+            "traceEvents": metadata + list(self.events),
+            "displayTimeUnit": "ms",
+            "otherData": {"started_at": self.started_at, "dropped_oldest": len(self.events) == self.events.maxlen},
+        }
+
+    def write(self, path: str | Path) -> Path:
+        out_path = Path(path)
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = out_path.with_name(out_path.name + ".tmp")
+        tmp_path.write_text(json.dumps(self.chrome_trace()))
+        os.replace(tmp_path, out_path)
+        return out_path
+
+
+_TRACER: Tracer | None = None
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "args", "start_s")
+
+    def __init__(self, tracer: Tracer, name: str, cat: str, args: dict) -> None:
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.start_s = 0.0
+
+    def __enter__(self) -> "_Span":
+        self.start_s = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.tracer.add_complete(self.name, self.cat, self.start_s, time.perf_counter(), self.args)
+
+
+def is_enabled() -> bool:
+    return _TRACER is not None
+
+
+def start_tracing(max_events: int = TRACE_MAX_EVENTS) -> Tracer:
+    global _TRACER
+    if _TRACER is None:
+        _TRACER = Tracer(max_events=max_events)
+    return _TRACER
+
+
+def stop_tracing(output_path: str | Path | None = None) -> Path | None:
+    """Disable tracing; write the collected events when output_path is given."""
+    global _TRACER
+    tracer, _TRACER = _TRACER, None
+    if tracer is None or output_path is None:
+        return None
+    return tracer.write(output_path)
+
+
+def span(name: str, cat: str = "stage", **args):
+    """`with span("capture.read", "capture"):` -- a shared no-op object when tracing is off."""
+    tracer = _TRACER
+    if tracer is None:
+        return _NULL_SPAN
+    return _Span(tracer, name, cat, args)
+
+
+def traced(name: str | None = None, cat: str = "stage"):
+    """Decorator form of span(); the span name defaults to the function's qualified name."""
+
+    def _decorate(fn):
+        span_name = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def _wrapper(*args, **kwargs):
+            tracer = _TRACER
+            if tracer is None:
+                return fn(*args, **kwargs)
+            start_s = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                tracer.add_complete(span_name, cat, start_s, time.perf_counter())
+
+        return _wrapper
+
+    return _decorate
+
+
+def record_span(name: str, cat: str, start_s: float, end_s: float, **args) -> None:
+    """Add a span measured elsewhere (perf_counter seconds)."""
+    tracer = _TRACER
+    if tracer is not None:
+        tracer.add_complete(name, cat, start_s, end_s, args)
+
+
+def record_yolo_stages(result, start_s: float) -> None:
+    """
+    Lay out Ultralytics' per-stage timings (result.speed, ms) as consecutive spans
+    starting at start_s, so preprocess / inference / NMS show up under the predict span.
+    """
+    tracer = _TRACER
+    if tracer is None:
+        return
+    speed = getattr(result, "speed", None) or {}
+    t = start_s
+    for key, span_name, cat in YOLO_SPEED_STAGES:
+        ms = speed.get(key)
+        if ms is None:
+            continue
+        end = t + float(ms) / 1000.0
+        tracer.add_complete(span_name, cat, t, end)
+        t = end
+
+
+def instant(name: str, cat: str = "event", **args) -> None:
+    tracer = _TRACER
+    if tracer is not None:
+        tracer.add_instant(name, cat, args)
+
+
+def counter(name: str, **values: float) -> None:
+    tracer = _TRACER
+    if tracer is not None:
+        tracer.add_counter(name, values)
+
+
+def default_trace_path(label: str) -> Path:
+    stamp = time.strftime("%Y%m%d_%H%M%S")
+    return REPO_ROOT / TRACE_OUTPUT_DIR / f"{label}_{stamp}.json"
+
+
+def start_tracing_from_env(label: str) -> Path | None:
+    """
+    Start tracing when TRACE_ENV_VAR is set and write the trace at interpreter exit.
+    Returns the output path, or None when tracing stays off.
+    """
+    raw = os.environ.get(TRACE_ENV_VAR, "").strip()
+    if raw in ("", "0"):
+        return None
+    output_path = default_trace_path(label) if raw == "1" else Path(raw)
+    enable_trace_output(output_path)
+    return output_path
+
+
+def enable_trace_output(output_path: str | Path) -> Path:
+    """Start tracing and register an exit hook that writes output_path (also on Ctrl+C/crash)."""
+    output_path = Path(output_path)
+    start_tracing()
+
+    def _write_at_exit() -> None:
+        written = stop_tracing(output_path)
+        if written is not None:
+            print(f"Trace written: {written} (open in https://ui.perfetto.dev)")
+
+    atexit.register(_write_at_exit)
+    print(f"Tracing enabled -> {output_path}")
+    return output_path
@@ -0,0 +1,6 @@
+#!/usr/bin/env bash
+set -euo pipefail
+source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/_common.sh"
+
+# Time depth colorization at 640x480: old per-call path vs the LUT-based DepthColorizer.
+run_repo_python "depth_estimation/benchmark_colorize.py" "$@"
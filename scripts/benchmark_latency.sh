@@ -0,0 +1,6 @@
+#!/usr/bin/env bash
+set -euo pipefail
+source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/_common.sh"
+
+# Time models on the CPU across backends, image sizes and thread counts.
+run_repo_python "models/benchmark_latency.py" "$@"
@@ -0,0 +1,6 @@
+#!/usr/bin/env bash
+set -euo pipefail
+source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/_common.sh"
+
+# Compare ROI-only vs full-frame dense depth latency (UniDepth/MiDaS).
+run_repo_python "depth_estimation/benchmark_roi_depth.py" "$@"
@@ -0,0 +1,6 @@
+#!/usr/bin/env bash
+set -euo pipefail
+source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/_common.sh"
+
+# Build/resume a session dense depth archive (<session>/depth_archive/<method>/).
+run_repo_python "depth_estimation/build_depth_archive.py" "$@"
@@ -0,0 +1,7 @@
+#!/usr/bin/env bash
+set -euo pipefail
+source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/_common.sh"
+
+# Refresh the SQLite session/model catalog and optionally query frames.
+# Example: ./scripts/catalog.sh --class-name black_drone --bbox-source yolo --min-conf 0.6
+run_repo_python "data/catalog.py" "$@"
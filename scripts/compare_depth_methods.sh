@@ -0,0 +1,6 @@
+#!/usr/bin/env bash
+set -euo pipefail
+source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/_common.sh"
+
+# Compare naive/UniDepth/MiDaS on one session from cached review logs + depth archives.
+run_repo_python "depth_estimation/compare_depth_methods.py" "$@"
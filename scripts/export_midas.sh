@@ -0,0 +1,6 @@
+#!/usr/bin/env bash
+set -euo pipefail
+source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/_common.sh"
+
+# One-time TorchScript export of MiDaS (fixed input size) + cold start/latency report vs torch.hub.
+run_repo_python "depth_estimation/midas/export_midas.py" "$@"
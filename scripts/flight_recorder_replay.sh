@@ -0,0 +1,7 @@
+#!/usr/bin/env bash
+set -euo pipefail
+source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/_common.sh"
+
+# Inspect/replay a flight recorder dump (default: newest in runs/flight_recorder).
+# Examples: --summary | --export runs/flight_recorder/export | --reprocess naive
+run_repo_python "flight_recorder/replay.py" "$@"
@@ -3,4 +3,4 @@ set -euo pipefail
 source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/_common.sh"
 
 # Run MiDaS on a .avi video using depth_estimation/midas/constants.py.
-run_repo_python "depth_estimation/midas/depth_video_inference.py"
+run_repo_python "depth_estimation/midas/depth_video_inference.py" "$@"
@@ -0,0 +1,8 @@
+#!/usr/bin/env bash
+set -euo pipefail
+source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/_common.sh"
+
+# Offline replay of a recorded flight through DroneFollowerMission + depth pipeline.
+#   run <dump.fpvrec|video> [--method naive] [--label NAME] [--mission-arg k=v] [--pipeline-arg k=v]
+#   diff <base.json> <other.json> [--tol 1e-4]
+run_repo_python "demos/drone_follower/replay.py" "$@"
@@ -0,0 +1,13 @@
+#!/usr/bin/env bash
+set -euo pipefail
+source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/_common.sh"
+
+# Run hot-path timing regression checks against runs/perf baselines.
+# PERF_UPDATE_BASELINE=1 re-records them; PERF_TOLERANCE (default 1.30) sets the allowed slowdown.
+cd "$REPO_ROOT"
+export PERF_TESTS=1
+if command -v uv >/dev/null 2>&1; then
+    uv run python -m unittest tests.test_perf_hot_paths "$@"
+else
+    python3 -m unittest tests.test_perf_hot_paths "$@"
+fi
@@ -0,0 +1,6 @@
+#!/usr/bin/env bash
+set -euo pipefail
+source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/_common.sh"
+
+# Grid-search inference thresholds on cached predictions and print the Pareto front.
+run_repo_python "models/threshold_sweep.py" "$@"
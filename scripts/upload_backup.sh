@@ -2,5 +2,5 @@
 set -euo pipefail
 source "$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)/_common.sh"
 
-# Zip raw_data + labels and upload to Google Drive folder from .env.
+# Stream-zip raw_data + labels to the Google Drive folder from .env (or --mode chunked).
 run_repo_python "data/upload_data_drive.py" "$@"
@@ -0,0 +1,111 @@
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from depth_estimation.batch_video import BatchedVideoDepthRunner, truncate_npy_stack
+
+FRAME_SIZE = (64, 48)
+FRAME_COUNT = 10
+
+
+def write_video(path: Path, count: int = FRAME_COUNT) -> None:
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 10.0, FRAME_SIZE)
+    for i in range(count):
+        # Brightness encodes the frame index so the depth stack order can be checked.
+        writer.write(np.full((FRAME_SIZE[1], FRAME_SIZE[0], 3), 20 * i, dtype=np.uint8))
+    writer.release()
+
+
+def half_res_depth(frames):
+    # Depth = mean brightness / 20 (~frame index), at half resolution like a real model output.
+    return [
+        np.full((FRAME_SIZE[1] // 2, FRAME_SIZE[0] // 2), float(f.mean()) / 20.0, dtype=np.float32)
+        for f in frames
+    ]
+
+
+def gray_colorize(depth_map):
+    return cv2.cvtColor(np.clip(depth_map * 20.0, 0, 255).astype(np.uint8), cv2.COLOR_GRAY2BGR)
+
+
+class BatchedVideoDepthRunnerTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.video = self.root / "video.avi"
+        write_video(self.video)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_writes_video_and_ordered_depth_stack(self):
+        batches = []
+        infer_threads = set()
+
+        def infer(frames):
+            batches.append(len(frames))
+            infer_threads.add(threading.get_ident())
+            return half_res_depth(frames)
+
+        stack_path = self.root / "out" / "video_depth.npy"
+        runner = BatchedVideoDepthRunner(
+            infer_batch=infer,
+            colorize=gray_colorize,
+            batch_size=4,
+            output_video_path=self.root / "out" / "overlay.avi",
+            depth_stack_path=stack_path,
+            stack_dtype="float16",
+        )
+        summary = runner.run(self.video)
+
+        self.assertEqual(summary["frames"], FRAME_COUNT)
+        self.assertEqual(batches, [4, 4, 2])
+        self.assertEqual(infer_threads, {threading.get_ident()})
+        stack = np.load(stack_path, mmap_mode="r")
+        self.assertEqual(stack.shape, (FRAME_COUNT, FRAME_SIZE[1], FRAME_SIZE[0]))
+        self.assertEqual(stack.dtype, np.float16)
+        np.testing.assert_allclose(stack[:, 10, 10], np.arange(FRAME_COUNT), atol=0.3)
+        self.assertTrue(stack_path.with_suffix(".json").is_file())
+
+        cap = cv2.VideoCapture(str(self.root / "out" / "overlay.avi"))
+        self.assertEqual(int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), 2 * FRAME_SIZE[0])
+        self.assertEqual(int(cap.get(cv2.CAP_PROP_FRAME_COUNT)), FRAME_COUNT)
+        cap.release()
+
+    def test_max_frames_and_inference_error(self):
+        runner = BatchedVideoDepthRunner(
+            infer_batch=half_res_depth,
+            colorize=gray_colorize,
+            batch_size=3,
+            depth_stack_path=self.root / "capped.npy",
+            max_frames=5,
+        )
+        self.assertEqual(runner.run(self.video)["frames"], 5)
+        self.assertEqual(np.load(self.root / "capped.npy").shape[0], 5)
+
+        def broken(_frames):
+            raise ValueError("model exploded")
+
+        runner = BatchedVideoDepthRunner(infer_batch=broken, colorize=gray_colorize, batch_size=2)
+        with self.assertRaisesRegex(RuntimeError, "model exploded"):
+            runner.run(self.video)
+
+    def test_truncate_npy_stack_keeps_prefix(self):
+        path = self.root / "stack.npy"
+        data = np.arange(6 * 4 * 5, dtype=np.float32).reshape(6, 4, 5)
+        np.save(path, data)
+        truncate_npy_stack(path, 2)
+        np.testing.assert_array_equal(np.load(path), data[:2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import sys
+import unittest
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from depth_estimation.colorize import DepthColorizer, colormap_lut
+from depth_estimation.unidepth.utils import colorize_depth_map
+
+
+def ramp_depth(lo=1.0, hi=5.0, shape=(48, 64)):
+    return np.linspace(lo, hi, shape[0] * shape[1], dtype=np.float32).reshape(shape)
+
+
+class DepthColorizerTests(unittest.TestCase):
+    def test_lut_matches_opencv_colormap(self):
+        ramp = np.arange(256, dtype=np.uint8).reshape(16, 16)
+        depth = ramp.astype(np.float32)
+        expected = cv2.applyColorMap(ramp, cv2.COLORMAP_TURBO)
+        out = DepthColorizer("turbo", depth_range=(0.0, 255.0)).colorize(depth)
+        np.testing.assert_array_equal(out, expected)
+        inverted = DepthColorizer("turbo", invert_colormap=True, depth_range=(0.0, 255.0)).colorize(depth)
+        np.testing.assert_array_equal(inverted, cv2.applyColorMap(255 - ramp, cv2.COLORMAP_TURBO))
+        self.assertIs(colormap_lut("TURBO", False), colormap_lut("turbo"))
+
+    def test_buffers_reused_and_non_finite_clamped(self):
+        colorizer = DepthColorizer("viridis", depth_range=(1.0, 5.0))
+        depth = ramp_depth()
+        depth[0, :3] = [np.nan, np.inf, -np.inf]
+        first = colorizer.colorize(depth)
+        lut = colormap_lut("viridis")
+        np.testing.assert_array_equal(first[0, 0], lut[0, 0])  # NaN -> near end
+        np.testing.assert_array_equal(first[0, 1], lut[255, 0])  # +inf -> far end
+        np.testing.assert_array_equal(first[0, 2], lut[0, 0])
+        self.assertIs(colorizer.colorize(ramp_depth()), first)
+        out = np.empty((48, 64, 3), np.uint8)
+        self.assertIs(colorizer.colorize(depth, out=out), out)
+
+    def test_robust_range_refreshes_every_n_frames(self):
+        colorizer = DepthColorizer("turbo", percentiles=(0.0, 100.0), range_update_every=3, range_sample_step=1)
+        colorizer.colorize(ramp_depth(1.0, 5.0))
+        self.assertEqual(colorizer.depth_range, (1.0, 5.0))
+        colorizer.colorize(ramp_depth(2.0, 9.0))
+        colorizer.colorize(ramp_depth(2.0, 9.0))
+        self.assertEqual(colorizer.depth_range, (1.0, 5.0))
+        colorizer.colorize(ramp_depth(2.0, 9.0))
+        self.assertEqual(colorizer.depth_range, (2.0, 9.0))
+
+        robust = DepthColorizer("turbo", percentiles=(2.0, 98.0), range_sample_step=2)
+        depth = ramp_depth(1.0, 5.0)
+        depth[10, 10] = 500.0  # outlier does not stretch the color scale
+        robust.colorize(depth)
+        self.assertLess(robust.depth_range[1], 5.0)
+
+    def test_colorize_depth_map_keeps_per_frame_min_max(self):
+        depth = ramp_depth(2.0, 4.0)
+        a = colorize_depth_map(depth, "turbo")
+        b = colorize_depth_map(depth * 10.0, "turbo")
+        self.assertIsNot(a, b)
+        np.testing.assert_array_equal(a, b)
+        np.testing.assert_array_equal(a[0, 0], colormap_lut("turbo")[0, 0])
+        self.assertEqual(colorize_depth_map(np.full((4, 4), np.nan, np.float32), "turbo").shape, (4, 4, 3))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+import csv
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from depth_estimation.compare_depth_methods import (
+    band_statistics,
+    build_comparison_table,
+    compare_methods,
+    fit_inverse_to_metric,
+    load_naive_log,
+)
+from depth_estimation.depth_archive import DepthArchive, session_archive_dir
+
+FRAME_SIZE = (64, 48)
+BBOX = (20.0, 16.0, 36.0, 28.0)
+
+
+class BandStatisticsTests(unittest.TestCase):
+    def test_bias_agreement_and_noise_per_band(self):
+        reference = np.array([0.4, 0.45, 1.2, 1.3, 1.25, np.nan])
+        values = np.array([0.44, 0.49, 1.0, 1.1, np.nan, 1.0])
+        rows = band_statistics(values, reference, np.arange(6), band_edges=(0.0, 1.0), agree_rel=0.10, min_band_frames=2)
+        near, far = rows
+        self.assertEqual(near["frames"], 2)
+        self.assertAlmostEqual(near["bias_m"], 0.04)
+        self.assertEqual(near["agree_frac"], 1.0)
+        self.assertAlmostEqual(near["noise_std_m"], 0.0, places=6)
+        self.assertEqual(far["frames"], 2)
+        self.assertAlmostEqual(far["coverage"], 2 / 3, places=3)
+        self.assertAlmostEqual(far["bias_m"], -0.2)
+        self.assertEqual(far["agree_frac"], 0.0)
+        self.assertIsNone(far["band_m"][1])
+
+    def test_inverse_fit_recovers_metric_depth(self):
+        reference = np.linspace(0.5, 2.5, 20)
+        relative_inverse = 3.0 / reference + 0.2
+        metric, fit = fit_inverse_to_metric(relative_inverse, reference)
+        np.testing.assert_allclose(metric, reference, rtol=1e-6)
+        self.assertEqual(fit["frames"], 20)
+
+
+class ComparisonTableTests(unittest.TestCase):
+    def test_aligns_log_rows_with_archives_by_image_name(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            session = Path(tmp) / "label_session_test"
+            truths = [0.8, 1.0, 1.2, 1.6]
+            archive = DepthArchive.create(
+                session_archive_dir(session, "unidepth"),
+                frame_count=4,
+                frame_size=FRAME_SIZE,
+                method="unidepth",
+                frame_names=[f"frame_{i:06d}.jpg" for i in range(4)],
+            )
+            x1, y1, x2, y2 = (int(v) for v in BBOX)
+            for i, d in enumerate(truths[:3]):  # last frame not archived
+                depth = np.full((FRAME_SIZE[1], FRAME_SIZE[0]), 5.0, dtype=np.float32)
+                depth[y1:y2, x1:x2] = d
+                archive.write(i, depth)
+            archive.close()
+
+            log = Path(tmp) / "log.csv"
+            fields = [
+                "frame_index", "image_name", "estimate_source", "raw_bbox_width_px", "raw_bbox_height_px",
+                "raw_bbox_center_x_px", "raw_bbox_center_y_px", "raw_distance_m", "distance_m",
+            ]
+            with log.open("w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=fields)
+                writer.writeheader()
+                # Log row order differs from the archive order; row 2 has no measurement.
+                for row_idx, frame in enumerate([1, 0, 2, 3]):
+                    measured = frame != 2
+                    writer.writerow(
+                        {
+                            "frame_index": row_idx,
+                            "image_name": f"frame_{frame:06d}.jpg",
+                            "estimate_source": "measurement" if measured else "prediction",
+                            "raw_bbox_width_px": BBOX[2] - BBOX[0] if measured else "",
+                            "raw_bbox_height_px": BBOX[3] - BBOX[1] if measured else "",
+                            "raw_bbox_center_x_px": 28.0 if measured else "",
+                            "raw_bbox_center_y_px": 22.0 if measured else "",
+                            "raw_distance_m": 0.9 * truths[frame] if measured else "",
+                            "distance_m": 0.9 * truths[frame],
+                        }
+                    )
+
+            naive, table, notes = build_comparison_table(session, log)
+            self.assertEqual(sorted(table), ["naive", "naive_raw", "unidepth"])
+            np.testing.assert_allclose(table["unidepth"][:2], [1.0, 0.8], atol=1e-3)
+            self.assertTrue(np.isnan(table["unidepth"][2]))  # no bbox on that row
+            self.assertTrue(np.isnan(table["unidepth"][3]))  # not archived
+            report = compare_methods(table, naive["frame_index"], reference="unidepth")
+            overall = report["methods"]["naive_raw"]["overall"]
+            self.assertEqual(overall["frames"], 2)
+            self.assertAlmostEqual(overall["median_rel"], -0.1, places=3)
+            self.assertEqual(notes["archives"]["unidepth"]["depth_units"], "m")
+
+    def test_reprocessed_frames_keep_only_the_last_row(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            log = Path(tmp) / "log.csv"
+            with log.open("w", newline="") as f:
+                writer = csv.DictWriter(f, fieldnames=["frame_index", "image_name", "estimate_source", "distance_m"])
+                writer.writeheader()
+                for row_idx, (name, distance) in enumerate([("a.jpg", 1.0), ("b.jpg", 2.0), ("a.jpg", 1.5)]):
+                    writer.writerow(
+                        {"frame_index": row_idx, "image_name": name, "estimate_source": "prediction", "distance_m": distance}
+                    )
+
+            naive = load_naive_log(log)
+            self.assertEqual(list(naive["image_name"]), ["a.jpg", "b.jpg"])
+            np.testing.assert_allclose(naive["naive"], [1.5, 2.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from depth_estimation.concurrent_executor import ConcurrentPipelineExecutor, outputs_with_age_labels
+from depth_estimation.pipeline_base import LiveDepthPipeline, LiveFrameOutput
+
+
+class FakePipeline(LiveDepthPipeline):
+    def __init__(self, name, delay_s, fail=False):
+        self.name = name
+        self.delay_s = delay_s
+        self.fail = fail
+        self.seen = []
+        self.gating = False
+
+    def process_live_frame(self, frame_bgr):
+        if self.fail:
+            raise ValueError("boom")
+        time.sleep(self.delay_s)
+        self.seen.append(int(frame_bgr[0, 0, 0]))
+        return LiveFrameOutput(method=self.name, frame_bgr=frame_bgr.copy(), metrics={"infer_ms": self.delay_s * 1000.0})
+
+    def toggle_gating(self):
+        self.gating = not self.gating
+        return self.gating
+
+
+def frame(i):
+    return np.full((24, 32, 3), i % 256, dtype=np.uint8)
+
+
+class ConcurrentExecutorTests(unittest.TestCase):
+    def test_slow_method_does_not_throttle_fast_one(self):
+        fast = FakePipeline("naive", 0.002)
+        slow = FakePipeline("unidepth", 0.08)
+        executor = ConcurrentPipelineExecutor([fast, slow])
+        try:
+            for i in range(1, 31):
+                executor.submit(frame(i), i)
+                time.sleep(0.01)
+            self.assertTrue(executor.wait_for_all(30, timeout_s=2.0))
+            latest = executor.latest()
+        finally:
+            executor.close()
+        self.assertGreaterEqual(len(fast.seen), 25)
+        self.assertLess(len(slow.seen), 10)
+        # The slow worker skips to the newest frame instead of queueing every one.
+        self.assertEqual(slow.seen[-1], 30)
+        self.assertGreater(executor.stats()["unidepth"]["skipped"], 0)
+        self.assertEqual(latest["naive"].frame_idx, 30)
+        self.assertGreater(latest["unidepth"].latency_ms, 50.0)
+
+    def test_display_outputs_carry_age_and_placeholders(self):
+        blocker = threading.Event()
+        fast = FakePipeline("naive", 0.0)
+        slow = FakePipeline("midas", 0.0)
+        slow.process_live_frame = lambda f: (blocker.wait(2.0), FakePipeline.process_live_frame(slow, f))[1]
+        executor = ConcurrentPipelineExecutor([fast, slow])
+        try:
+            executor.submit(frame(1), 1)
+            deadline = time.monotonic() + 2.0
+            while executor.latest()["naive"] is None and time.monotonic() < deadline:
+                time.sleep(0.005)
+            outputs = outputs_with_age_labels(executor.latest(), (32, 24))
+            self.assertEqual([out.method for out in outputs], ["naive", "midas"])
+            self.assertIn("age_ms", outputs[0].metrics)
+            self.assertEqual(outputs[1].frame_bgr.shape, (24, 32, 3))
+            self.assertEqual(outputs[1].metrics, {})
+            blocker.set()
+            toggled = executor.apply(lambda p: p.toggle_gating())
+            self.assertEqual(toggled, [("naive", True), ("midas", True)])
+        finally:
+            blocker.set()
+            executor.close()
+
+    def test_worker_error_is_raised_on_latest(self):
+        executor = ConcurrentPipelineExecutor([FakePipeline("naive", 0.0), FakePipeline("fused", 0.0, fail=True)])
+        try:
+            executor.submit(frame(1), 1)
+            self.assertFalse(executor.wait_for_all(1, timeout_s=2.0))
+            with self.assertRaises(RuntimeError):
+                executor.latest()
+        finally:
+            executor.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
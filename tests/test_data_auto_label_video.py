@@ -0,0 +1,163 @@
+import csv
+import importlib.util
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from types import ModuleType
+
+import cv2
+import numpy as np
+
+
+def load_module_from_file(module_file: Path, module_name: str) -> ModuleType:
+    parent_dir = str(module_file.parent)
+    sys.path.insert(0, parent_dir)
+    try:
+        for shadowed_name in ("constants", "utils", module_name):
+            sys.modules.pop(shadowed_name, None)
+        spec = importlib.util.spec_from_file_location(module_name, module_file)
+        if spec is None or spec.loader is None:
+            raise RuntimeError(f"Could not load module: {module_file}")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    finally:
+        if sys.path and sys.path[0] == parent_dir:
+            sys.path.pop(0)
+
+
+class FakeTensor:
+    def __init__(self, values):
+        self.values = values
+
+    def cpu(self):
+        return self
+
+    def tolist(self):
+        return list(self.values)
+
+
+class FakeBoxes:
+    def __init__(self, xyxy: list[list[float]], conf: list[float]):
+        self.xyxy = FakeTensor(xyxy)
+        self.conf = FakeTensor(conf)
+
+    def __len__(self) -> int:
+        return len(self.xyxy.values)
+
+
+class FakeResult:
+    def __init__(self, det: tuple[float, float, float, float, float] | None):
+        self.boxes = FakeBoxes([list(det[:4])], [det[4]]) if det is not None else FakeBoxes([], [])
+
+
+class ScheduledYOLO:
+    """Returns one scripted detection per frame, in decode order."""
+
+    def __init__(self, schedule):
+        self.schedule = list(schedule)
+        self.batch_sizes: list[int] = []
+
+    def predict(self, frames, conf, verbose):
+        self.batch_sizes.append(len(frames))
+        return [FakeResult(self.schedule.pop(0)) for _ in frames]
+
+
+class AutoLabelVideoTests(unittest.TestCase):
+    def setUp(self) -> None:
+        repo_root = Path(__file__).resolve().parent.parent
+        self.mod = load_module_from_file(repo_root / "data" / "auto_label_video.py", "auto_label_video_test_mod")
+
+    def _write_video(self, video_path: Path, frames: int) -> None:
+        writer = cv2.VideoWriter(str(video_path), cv2.VideoWriter_fourcc(*"MJPG"), 30.0, (160, 120))
+        self.assertTrue(writer.isOpened())
+        rng = np.random.default_rng(0)
+        target = rng.integers(0, 255, (30, 30, 3), dtype=np.uint8)
+        for _ in range(frames):
+            frame = np.full((120, 160, 3), 90, dtype=np.uint8)
+            frame[40:70, 60:90] = target
+            writer.write(frame)
+        writer.release()
+
+    def test_batched_labels_bridge_gaps_and_list_review_segments(self) -> None:
+        near = (60.0, 40.0, 90.0, 70.0)
+        far = (0.0, 0.0, 20.0, 20.0)
+        schedule = (
+            [near + (0.9,)] * 6  # 0-5 confident YOLO
+            + [None] * 3  # 6-8 tracker bridges the miss
+            + [far + (0.9,)]  # 9 rejected jump, tracker again
+            + [near + (0.3,)] * 4  # 10-13 accepted but low confidence
+            + [near + (0.9,)] * 6  # 14-19
+        )
+        with tempfile.TemporaryDirectory(prefix="auto_label_test_") as tmp:
+            video_path = Path(tmp) / "video.avi"
+            self._write_video(video_path, len(schedule))
+            self.mod.EXPORT_FPS = 30.0
+            self.mod.LABEL_AUTO_REVIEW_MIN_CONF = 0.5
+            yolo = ScheduledYOLO(schedule)
+
+            session_dir = self.mod.run_auto_label(
+                video_path=video_path,
+                labels_root=Path(tmp) / "labels",
+                class_name="test_drone",
+                yolo_model=yolo,
+                batch_size=4,
+            )
+
+            self.assertEqual(yolo.batch_sizes, [4] * 5)
+            with (session_dir / "meta.csv").open(newline="") as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual(len(rows), 20)
+            self.assertEqual(
+                [r["bbox_source"] for r in rows],
+                ["yolo"] * 6 + ["tracker"] * 4 + ["yolo"] * 10,
+            )
+            self.assertEqual(rows[9]["yolo_rejected_far"], "1")
+            self.assertEqual(len(list((session_dir / "images").glob("*.jpg"))), 20)
+            self.assertEqual((session_dir / "labels" / "frame_000000.txt").read_text().split()[0], "1")
+
+            with (session_dir / "review_segments.csv").open(newline="") as f:
+                segments = [(r["start_export_index"], r["end_export_index"], r["reason"]) for r in csv.DictReader(f)]
+            self.assertEqual(segments, [("6", "9", "tracker"), ("10", "13", "low_conf")])
+
+    def test_bounded_writer_limits_in_flight_writes_and_fails_fast(self) -> None:
+        release = threading.Event()
+        in_flight = []
+
+        def slow_write(i: int) -> None:
+            in_flight.append(i)
+            release.wait(timeout=5)
+
+        writer = self.mod.BoundedWriter(workers=1, max_pending=2)
+        writer.submit(slow_write, 0)
+        writer.submit(slow_write, 1)
+        releaser = threading.Timer(0.2, release.set)
+        releaser.start()
+        t0 = time.perf_counter()
+        writer.submit(slow_write, 2)  # blocks until the oldest write finished
+        self.assertGreaterEqual(time.perf_counter() - t0, 0.15)
+        writer.close()
+        self.assertEqual(in_flight, [0, 1, 2])
+
+        def failing_write() -> None:
+            raise OSError("disk full")
+
+        writer = self.mod.BoundedWriter(workers=1, max_pending=8)
+        writer.submit(failing_write)
+        time.sleep(0.05)
+        with self.assertRaisesRegex(OSError, "disk full"):
+            writer.submit(lambda: None)
+        writer.close()
+
+        with tempfile.TemporaryDirectory(prefix="auto_label_write_") as tmp:
+            with self.assertRaisesRegex(RuntimeError, "Could not write image"):
+                self.mod.write_exported_frame(
+                    Path(tmp) / "missing_dir" / "a.jpg", np.zeros((8, 8, 3), np.uint8), Path(tmp) / "a.txt", ""
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import csv
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import ModuleType
+
+
+def load_module_from_file(module_file: Path, module_name: str) -> ModuleType:
+    parent_dir = str(module_file.parent)
+    sys.path.insert(0, parent_dir)
+    try:
+        for shadowed_name in ("constants", "utils", module_name):
+            sys.modules.pop(shadowed_name, None)
+        spec = importlib.util.spec_from_file_location(module_name, module_file)
+        if spec is None or spec.loader is None:
+            raise RuntimeError(f"Could not load module: {module_file}")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    finally:
+        if sys.path and sys.path[0] == parent_dir:
+            sys.path.pop(0)
+
+
+def write_label_session(session_dir: Path, confs: list[float | None]) -> None:
+    (session_dir / "images").mkdir(parents=True)
+    (session_dir / "labels").mkdir(parents=True)
+    with (session_dir / "meta.csv").open("w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(
+            [
+                "export_index",
+                "video_frame_index",
+                "image_name",
+                "label_name",
+                "bbox_ok",
+                "bbox_source",
+                "yolo_candidate_conf",
+            ]
+        )
+        for idx, conf in enumerate(confs):
+            image_name = f"frame_{idx:06d}.jpg"
+            label_name = f"frame_{idx:06d}.txt"
+            (session_dir / "images" / image_name).write_bytes(b"fake_jpg")
+            (session_dir / "labels" / label_name).write_text("1 0.5 0.5 0.2 0.2\n")
+            source = "tracker" if conf is None else "yolo"
+            writer.writerow([idx, idx * 3, image_name, label_name, 1, source, "" if conf is None else conf])
+
+
+class SessionCatalogTests(unittest.TestCase):
+    def setUp(self) -> None:
+        repo_root = Path(__file__).resolve().parent.parent
+        self.mod = load_module_from_file(repo_root / "data" / "catalog.py", "catalog_test_mod")
+
+    def test_refresh_is_incremental_and_frames_are_queryable(self) -> None:
+        with tempfile.TemporaryDirectory(prefix="catalog_test_") as tmp:
+            labels_root = Path(tmp) / "labels"
+            bucket = labels_root / "black_drone" / "all_data" / "train_val"
+            write_label_session(bucket / "session_a", [0.9, 0.4, None])
+            write_label_session(bucket / "session_b", [0.7])
+            # Built dataset folders are not sessions.
+            (labels_root / "black_drone" / "black_drone_dataset" / "images").mkdir(parents=True)
+
+            with self.mod.SessionCatalog(Path(tmp) / "catalog.sqlite") as catalog:
+                stats = catalog.refresh_labels(labels_root)
+                self.assertEqual(stats.sessions_indexed, 2)
+
+                sessions = catalog.sessions(kind="label", class_name="black_drone", bucket="all_data")
+                self.assertEqual([s.name for s in sessions], ["session_a", "session_b"])
+                self.assertEqual(sessions[0].bucket, "all_data/train_val")
+
+                confident = catalog.frames(class_name="black_drone", bbox_source="yolo", min_conf=0.6)
+                self.assertEqual(
+                    [(f.session_path.name, f.image_path.name) for f in confident],
+                    [("session_a", "frame_000000.jpg"), ("session_b", "frame_000000.jpg")],
+                )
+                self.assertEqual(confident[0].video_frame_index, 0)
+                self.assertEqual(len(catalog.frames(label_class_id=1)), 4)
+
+                stats = catalog.refresh_labels(labels_root)
+                self.assertEqual((stats.sessions_indexed, stats.sessions_unchanged), (0, 2))
+
+                write_label_session(bucket / "session_c", [0.95])
+                stats = catalog.refresh_labels(labels_root)
+                self.assertEqual((stats.sessions_indexed, stats.sessions_unchanged), (1, 2))
+                self.assertEqual(len(catalog.frames(min_conf=0.6)), 3)
+
+                # In-place label edit: directory mtimes unchanged, file mtime/size changed.
+                labels_dir = bucket / "session_a" / "labels"
+                dir_times = (labels_dir.stat().st_atime_ns, labels_dir.stat().st_mtime_ns)
+                (labels_dir / "frame_000001.txt").write_text("3 0.4 0.4 0.1 0.1\n3 0.6 0.6 0.1 0.1\n")
+                os.utime(labels_dir, ns=dir_times)
+                stats = catalog.refresh_labels(labels_root)
+                self.assertEqual((stats.sessions_indexed, stats.labels_reread), (0, 1))
+                self.assertEqual([f.image_path.name for f in catalog.frames(label_class_id=3)], ["frame_000001.jpg"])
+                self.assertEqual(len(catalog.frames(label_class_id=1)), 4)
+
+    def test_model_runs_are_ordered_by_weights_mtime(self) -> None:
+        with tempfile.TemporaryDirectory(prefix="catalog_runs_test_") as tmp:
+            runs_root = Path(tmp) / "runs" / "models"
+            for run_name, mtime in (("run_old", 1_000), ("run_new", 2_000)):
+                weights = runs_root / run_name / "weights"
+                weights.mkdir(parents=True)
+                for name in ("best.pt", "last.pt"):
+                    (weights / name).write_bytes(b"weights")
+                    os.utime(weights / name, (mtime, mtime))
+
+            with self.mod.SessionCatalog(Path(tmp) / "catalog.sqlite") as catalog:
+                catalog.refresh_model_runs(runs_root, source="runs")
+                runs = catalog.model_runs(source="runs")
+                self.assertEqual([r.name for r in runs], ["run_new", "run_old"])
+                self.assertEqual(runs[0].best_path.name, "best.pt")
+
+    def test_latest_weights_match_directory_scan(self) -> None:
+        repo_root = Path(__file__).resolve().parent.parent
+        models_utils = load_module_from_file(repo_root / "models" / "utils.py", "models_utils_catalog_test")
+        with tempfile.TemporaryDirectory(prefix="catalog_latest_test_") as tmp:
+            runs_root = Path(tmp) / "runs"
+            catalog_path = str(Path(tmp) / "catalog.sqlite")
+
+            def add_run(name: str, weight_names: tuple[str, ...], weights_mtime: int, dir_mtime: int) -> None:
+                weights = runs_root / "models" / name / "weights"
+                weights.mkdir(parents=True)
+                for weight_name in weight_names:
+                    (weights / weight_name).write_bytes(b"weights")
+                    os.utime(weights / weight_name, (weights_mtime, weights_mtime))
+                os.utime(weights.parent, (dir_mtime, dir_mtime))
+
+            def resolve(model_ref: str, catalog: str | None) -> str:
+                return models_utils._resolve_latest_model_weights(model_ref, str(runs_root), "models", catalog)
+
+            # Newest run folder wins, even if another run saved weights more recently.
+            add_run("run_a", ("best.pt", "last.pt"), weights_mtime=5_000, dir_mtime=1_000)
+            add_run("run_b", ("best.pt", "last.pt"), weights_mtime=2_000, dir_mtime=3_000)
+            for catalog in (None, catalog_path):
+                self.assertEqual(Path(resolve("latest_best", catalog)).parts[-3], "run_b")
+
+            # Interrupted newest run: an error like the directory scan, not a silent older model.
+            add_run("run_c", ("last.pt",), weights_mtime=6_000, dir_mtime=6_000)
+            for catalog in (None, catalog_path):
+                with self.assertRaisesRegex(RuntimeError, "run_c, but best.pt is not present"):
+                    resolve("latest_best", catalog)
+                self.assertEqual(Path(resolve("latest_last", catalog)).parts[-3], "run_c")
+            add_run("run_d", (), weights_mtime=0, dir_mtime=7_000)
+            for catalog in (None, catalog_path):
+                with self.assertRaisesRegex(RuntimeError, "run_d, but last.pt is not present"):
+                    resolve("latest_last", catalog)
+
+
+if __name__ == "__main__":
+    unittest.main()
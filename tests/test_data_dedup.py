@@ -0,0 +1,84 @@
+import importlib.util
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import ModuleType
+
+import cv2
+import numpy as np
+
+
+def load_module_from_file(module_file: Path, module_name: str) -> ModuleType:
+    parent_dir = str(module_file.parent)
+    sys.path.insert(0, parent_dir)
+    try:
+        for shadowed_name in ("constants", "utils", module_name):
+            sys.modules.pop(shadowed_name, None)
+        spec = importlib.util.spec_from_file_location(module_name, module_file)
+        if spec is None or spec.loader is None:
+            raise RuntimeError(f"Could not load module: {module_file}")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    finally:
+        if sys.path and sys.path[0] == parent_dir:
+            sys.path.pop(0)
+
+
+class DedupSessionTests(unittest.TestCase):
+    def setUp(self) -> None:
+        repo_root = Path(__file__).resolve().parent.parent
+        self.mod = load_module_from_file(repo_root / "data" / "dedup.py", "dedup_test_mod")
+
+    def _write_session(self, session_dir: Path) -> list[Path]:
+        images_dir = session_dir / "images"
+        labels_dir = session_dir / "labels"
+        images_dir.mkdir(parents=True)
+        labels_dir.mkdir(parents=True)
+
+        rng = np.random.default_rng(0)
+        hover = cv2.GaussianBlur(rng.integers(0, 255, (480, 640, 3), dtype=np.uint8), (31, 31), 0)
+        other = cv2.GaussianBlur(rng.integers(0, 255, (480, 640, 3), dtype=np.uint8), (31, 31), 0)
+        # 0-5: hovering (same image, same box), 6: box moved, 7: different scene.
+        frames = [(hover, "0.50 0.50 0.10 0.10")] * 6 + [
+            (hover, "0.80 0.50 0.10 0.10"),
+            (other, "0.80 0.50 0.10 0.10"),
+        ]
+        paths = []
+        for idx, (image, box) in enumerate(frames):
+            noisy = np.clip(image.astype(np.int16) + rng.integers(-2, 3, image.shape), 0, 255).astype(np.uint8)
+            image_path = images_dir / f"frame_{idx:06d}.jpg"
+            cv2.imwrite(str(image_path), noisy)
+            (labels_dir / f"frame_{idx:06d}.txt").write_text(f"1 {box}\n")
+            paths.append(image_path)
+        return paths
+
+    def test_drop_and_thin_modes_use_hash_and_bbox_signature(self) -> None:
+        with tempfile.TemporaryDirectory(prefix="dedup_test_") as tmp:
+            session_dir = Path(tmp) / "session"
+            paths = self._write_session(session_dir)
+
+            dropped = self.mod.dedup_session(session_dir, paths, self.mod.DedupConfig(mode="drop"))
+            self.assertEqual(
+                [p.name for p in dropped.kept],
+                ["frame_000000.jpg", "frame_000006.jpg", "frame_000007.jpg"],
+            )
+            self.assertEqual(dropped.hashes_computed, 8)
+            self.assertTrue((session_dir / "frame_hashes.csv").exists())
+
+            thinned = self.mod.dedup_session(
+                session_dir,
+                paths,
+                self.mod.DedupConfig(mode="thin", thin_keep_every=2),
+            )
+            self.assertEqual(len(thinned.kept), 5)
+            # Second pass reuses the cached hashes.
+            self.assertEqual(thinned.hashes_computed, 0)
+
+            off = self.mod.dedup_session(session_dir, paths, self.mod.DedupConfig(mode="off"))
+            self.assertEqual(off.kept, paths)
+
+
+if __name__ == "__main__":
+    unittest.main()
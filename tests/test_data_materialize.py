@@ -0,0 +1,73 @@
+import errno
+import importlib.util
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import ModuleType
+from unittest import mock
+
+
+def load_module_from_file(module_file: Path, module_name: str) -> ModuleType:
+    parent_dir = str(module_file.parent)
+    sys.path.insert(0, parent_dir)
+    try:
+        sys.modules.pop(module_name, None)
+        spec = importlib.util.spec_from_file_location(module_name, module_file)
+        if spec is None or spec.loader is None:
+            raise RuntimeError(f"Could not load module: {module_file}")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    finally:
+        if sys.path and sys.path[0] == parent_dir:
+            sys.path.pop(0)
+
+
+class AutoLinkFallbackTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        repo_root = Path(__file__).resolve().parents[1]
+        cls.mod = load_module_from_file(repo_root / "data" / "materialize.py", "materialize")
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        self.entries = []
+        for name in ("a.jpg", "b.jpg", "c.jpg"):
+            (root / name).write_bytes(name.encode())
+            self.entries.append(self.mod.MaterializeEntry(dst_rel=f"images/{name}", src=root / name))
+        self.out_root = root / "out"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _sync_with_hardlink_error(self, failing_name: str, error_no: int):
+        real_place = self.mod._place_file
+
+        def place(src, dst, mode):
+            if mode == "reflink":
+                raise OSError(errno.EOPNOTSUPP, "no reflink here")
+            if mode == "hardlink" and src.name == failing_name:
+                raise OSError(error_no, "simulated")
+            real_place(src, dst, mode)
+
+        materializer = self.mod.DatasetMaterializer(self.out_root, link_mode="auto")
+        with mock.patch.object(self.mod, "_place_file", place):
+            stats = materializer.sync(self.entries)
+        return materializer, stats
+
+    def test_per_file_error_only_falls_back_for_that_file(self):
+        materializer, stats = self._sync_with_hardlink_error("a.jpg", errno.EACCES)
+        self.assertEqual(stats.by_mode, {"copy": 1, "hardlink": 2})
+        self.assertEqual(materializer._unsupported_modes, {"reflink"})
+        self.assertEqual((self.out_root / "images" / "a.jpg").read_bytes(), b"a.jpg")
+
+    def test_cross_device_error_disables_the_mode(self):
+        materializer, stats = self._sync_with_hardlink_error("a.jpg", errno.EXDEV)
+        self.assertEqual(stats.by_mode, {"copy": 3})
+        self.assertEqual(materializer._unsupported_modes, {"reflink", "hardlink"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import importlib.util
+import shutil
+import sys
+import tempfile
+import unittest
+import zipfile
+from pathlib import Path
+from types import ModuleType
+
+
+def load_module_from_file(module_file: Path, module_name: str) -> ModuleType:
+    parent_dir = str(module_file.parent)
+    sys.path.insert(0, parent_dir)
+    try:
+        for shadowed_name in ("constants", "utils", module_name):
+            sys.modules.pop(shadowed_name, None)
+        spec = importlib.util.spec_from_file_location(module_name, module_file)
+        if spec is None or spec.loader is None:
+            raise RuntimeError(f"Could not load module: {module_file}")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    finally:
+        if sys.path and sys.path[0] == parent_dir:
+            sys.path.pop(0)
+
+
+class StreamingZipTests(unittest.TestCase):
+    def setUp(self) -> None:
+        repo_root = Path(__file__).resolve().parent.parent
+        self.mod = load_module_from_file(repo_root / "data" / "streaming_zip.py", "streaming_zip_test_mod")
+
+    def _write_tree(self, root: Path) -> Path:
+        source = root / "labels"
+        (source / "session_a" / "images").mkdir(parents=True)
+        (source / "session_a" / "images" / "frame_000000.jpg").write_bytes(bytes(range(256)) * 300)
+        (source / "session_a" / "meta.csv").write_text("export_index,image_name\n" + "0,frame_000000.jpg\n" * 500)
+        return source
+
+    def test_stream_matches_make_archive_layout_and_stores_jpegs(self) -> None:
+        with tempfile.TemporaryDirectory(prefix="streaming_zip_test_") as tmp:
+            tmp_dir = Path(tmp)
+            source = self._write_tree(tmp_dir)
+            stream = self.mod.ZipStream(source, block_size=4096, queue_blocks=2)
+            out = self.mod.write_zip_stream(stream, tmp_dir / "out.zip")
+            reference = Path(shutil.make_archive(str(tmp_dir / "ref"), "zip", root_dir=tmp, base_dir="labels"))
+
+            with zipfile.ZipFile(out) as zf, zipfile.ZipFile(reference) as ref:
+                self.assertIsNone(zf.testzip())
+                self.assertEqual(sorted(zf.namelist()), sorted(n for n in ref.namelist() if not n.endswith("/")))
+                info = {i.filename: i for i in zf.infolist()}
+                self.assertEqual(info["labels/session_a/images/frame_000000.jpg"].compress_type, zipfile.ZIP_STORED)
+                self.assertEqual(info["labels/session_a/meta.csv"].compress_type, zipfile.ZIP_DEFLATED)
+                self.assertEqual(
+                    zf.read("labels/session_a/meta.csv"),
+                    (source / "session_a" / "meta.csv").read_bytes(),
+                )
+            self.assertEqual((stream.stats.files, stream.stats.stored), (2, 1))
+            self.assertEqual(stream.stats.bytes_out, out.stat().st_size)
+
+    def test_getbytes_serves_retries_and_signals_end_with_short_read(self) -> None:
+        with tempfile.TemporaryDirectory(prefix="streaming_zip_test_") as tmp:
+            tmp_dir = Path(tmp)
+            source = self._write_tree(tmp_dir)
+            expected = self.mod.write_zip_stream(self.mod.ZipStream(source, block_size=4096), tmp_dir / "a.zip").read_bytes()
+
+            stream = self.mod.ZipStream(source, block_size=4096, queue_blocks=2)
+            chunk = 10_000
+            received = bytearray()
+            while True:
+                data = stream.getbytes(len(received), chunk)
+                # A retried request for the same offset returns the same bytes.
+                self.assertEqual(stream.getbytes(len(received), chunk), data)
+                received += data
+                if len(data) < chunk:
+                    break
+            stream.close()
+            self.assertEqual(bytes(received), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import contextlib
+import importlib.util
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+# The follower mission imports the drone stack (cflib + pygame) through its constants/runner.
+DRONE_STACK_AVAILABLE = all(importlib.util.find_spec(name) is not None for name in ("cflib", "pygame"))
+
+
+class ScriptedPipeline:
+    """Reports a target whose distance/offset depend on the frame brightness (set per frame below)."""
+
+    name = "scripted"
+
+    def __init__(self, z_offset: float = 0.0):
+        self.z_offset = z_offset
+        self.closed = False
+
+    def process_live_frame(self, frame_bgr):
+        level = int(frame_bgr[0, 0, 0])
+        if level == 0:
+            metrics = {"track_state": "lost", "estimate_source": "none", "detection_count": 0}
+        else:
+            metrics = {
+                "track_state": "tracked",
+                "estimate_source": "measurement",
+                "detection_count": 1,
+                "z_rel_m": level / 100.0 + self.z_offset,
+                "y_rel_m": 0.0,
+                "yaw_error_deg": 10.0,
+            }
+        return SimpleNamespace(method=self.name, frame_bgr=frame_bgr, metrics=metrics)
+
+    def close(self):
+        self.closed = True
+
+
+def make_frames(levels):
+    return [np.full((24, 32, 3), level, dtype=np.uint8) for level in levels]
+
+
+@unittest.skipUnless(DRONE_STACK_AVAILABLE, "cflib/pygame not installed")
+class FollowerReplayTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        from demos.drone_follower import replay
+
+        cls.replay = replay
+
+    def _run(self, levels, z_offset=0.0, mission_args=None):
+        capture = self.replay.RecordedFrameCapture(make_frames(levels), [i / 30.0 for i in range(len(levels))])
+        return self.replay.replay_recording(
+            Path("scripted"),
+            method="scripted",
+            mission_args={"precontrol_cv_warmup_frames": 2, **(mission_args or {})},
+            pipeline_factory=lambda: ScriptedPipeline(z_offset),
+            capture=capture,
+        )
+
+    def test_commands_are_recorded_per_frame_without_sending(self):
+        log = self._run([50, 50, 80, 0, 120])
+        commands = log["commands"]
+        # Two warm-up frames, then one command per frame.
+        self.assertEqual([c["frame"] for c in commands], [2, 3, 4])
+        self.assertGreater(commands[0]["vx"], 0.0)
+        self.assertEqual(commands[1]["vx"], 0.0)
+        self.assertTrue(commands[1]["reason"].startswith("wait_lost"))
+        self.assertEqual(log["events"][0]["kind"], "takeoff")
+        self.assertEqual(log["header"]["frames"], 5)
+
+    def test_replay_is_deterministic_and_diff_flags_changes(self):
+        # z 0.32..0.38 m stays inside the forward speed clamp, so an offset shows up in vx.
+        levels = [30, 30, 32, 35, 0, 38]
+        first, second = self._run(levels), self._run(levels)
+        self.assertTrue(self.replay.diff_command_logs(first, second)["identical"])
+
+        changed = self._run(levels, z_offset=0.05)
+        report = self.replay.diff_command_logs(first, changed)
+        self.assertFalse(report["identical"])
+        self.assertEqual(report["differing_frames"], 3)
+        self.assertAlmostEqual(report["max_abs_delta"]["vx"], 0.06, places=5)
+
+        gain_change = self._run(levels, mission_args={"kp_yaw": 1.0})
+        self.assertGreater(self.replay.diff_command_logs(first, gain_change)["max_abs_delta"]["yawrate"], 0.0)
+
+    def test_flight_recorder_dump_replays_through_cli(self):
+        from flight_recorder import FlightRecorder
+
+        with tempfile.TemporaryDirectory() as tmp:
+            recorder = FlightRecorder(frame_capacity=8, dump_dir=tmp)
+            try:
+                for i, frame in enumerate(make_frames([40, 40, 40, 40]), start=1):
+                    recorder.record_frame(frame, i)
+                    recorder.flush()
+                recorder.record_state(0.0, 0.0, 0.4)
+                with contextlib.redirect_stdout(io.StringIO()):
+                    dump = recorder.dump("key")
+            finally:
+                recorder.close()
+
+            capture = self.replay.RecordedFrameCapture.from_flight_recording(dump)
+            self.assertEqual(len(capture), 4)
+            ok, frame = capture.read()
+            self.assertTrue(ok)
+            self.assertEqual(frame.shape, (24, 32, 3))
+
+            log_a, log_b = Path(tmp) / "a.json", Path(tmp) / "b.json"
+            log = self.replay.replay_recording(dump, pipeline_factory=ScriptedPipeline, mission_args={"precontrol_cv_warmup_frames": 1})
+            log_a.write_text(json.dumps(log))
+            log["commands"][0]["vx"] += 0.5
+            log_b.write_text(json.dumps(log))
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertEqual(self.replay.main(["diff", str(log_a), str(log_a)]), 0)
+                self.assertEqual(self.replay.main(["diff", str(log_a), str(log_b)]), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
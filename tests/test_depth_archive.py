@@ -0,0 +1,106 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from depth_estimation.build_depth_archive import SessionFrames, fill_archive, open_or_create_archive
+from depth_estimation.depth_archive import DepthArchive, session_archive_dir
+
+FRAME_SIZE = (64, 48)
+BBOX = (20.0, 16.0, 36.0, 28.0)
+
+
+def fake_depth(frames):
+    # Background 4 m, drone box at (1 + brightness / 100) m, at half resolution.
+    out = []
+    for frame in frames:
+        depth = np.full((FRAME_SIZE[1] // 2, FRAME_SIZE[0] // 2), 4.0, dtype=np.float32)
+        x1, y1, x2, y2 = (int(v) // 2 for v in BBOX)
+        depth[y1:y2, x1:x2] = 1.0 + float(frame.mean()) / 100.0
+        out.append(depth)
+    return out
+
+
+class DepthArchiveTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.session = Path(self.tmp.name) / "images_session_test"
+        images = self.session / "images"
+        images.mkdir(parents=True)
+        lines = ["frame_idx,filename,t_wall,t_mono"]
+        for i in range(5):
+            name = f"frame_{i:06d}.png"
+            cv2.imwrite(str(images / name), np.full((FRAME_SIZE[1], FRAME_SIZE[0], 3), 10 * i, dtype=np.uint8))
+            lines.append(f"{i},{name},{1000.0 + 0.1 * i:.6f},{5.0 + 0.1 * i:.6f}")
+        (self.session / "meta.csv").write_text("\n".join(lines) + "\n")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _build(self, frames, calls=None):
+        archive = open_or_create_archive(
+            session_archive_dir(self.session, "unidepth"),
+            frames,
+            method="unidepth",
+            depth_units="m",
+            model_meta={"model": "fake"},
+            store_scale=0.5,
+            overwrite=False,
+        )
+
+        def infer(batch):
+            if calls is not None:
+                calls.append(len(batch))
+            return fake_depth(batch)
+
+        return archive, infer
+
+    def test_build_resume_and_random_access(self):
+        frames = SessionFrames(self.session)
+        archive, infer = self._build(frames)
+        # Partial fill, as if the build was interrupted.
+        archive.write(3, fake_depth([cv2.imread(str(frames.image_paths[3]))])[0], infer_ms=5.0)
+        archive.close()
+
+        calls = []
+        archive, infer = self._build(frames, calls)
+        self.assertEqual(fill_archive(archive, frames, infer, batch_size=2), 4)
+        self.assertEqual(calls, [2, 2])
+        archive.close()
+
+        archive = DepthArchive.open(session_archive_dir(self.session, "unidepth"))
+        self.assertEqual(len(archive), 5)
+        self.assertEqual(archive.depth.dtype, np.float16)
+        self.assertEqual(archive.depth.shape, (5, FRAME_SIZE[1] // 2, FRAME_SIZE[0] // 2))
+        self.assertEqual(archive.filled_indices().tolist(), [0, 1, 2, 3, 4])
+        self.assertAlmostEqual(archive.timestamp(archive.index_of("frame_000002.png")), 1000.2)
+        self.assertEqual(archive.read(4).dtype, np.float32)
+        stats = archive.bbox_depth(4, BBOX)
+        self.assertAlmostEqual(stats["median"], 1.4, places=2)
+        self.assertFalse(archive.writable)
+        with self.assertRaises(RuntimeError):
+            archive.write(0, fake_depth([np.zeros((48, 64, 3), np.uint8)])[0])
+        archive.close()
+
+    def test_unfilled_frames_read_as_missing(self):
+        archive = DepthArchive.create(
+            Path(self.tmp.name) / "archive", frame_count=3, frame_size=FRAME_SIZE, method="midas",
+            depth_units="relative_inverse",
+        )
+        archive.write(1, np.ones((FRAME_SIZE[1], FRAME_SIZE[0]), np.float32))
+        self.assertIsNone(archive.read(0))
+        self.assertIsNone(archive.bbox_depth(2, BBOX))
+        self.assertEqual(archive.missing_indices().tolist(), [0, 2])
+        self.assertIsNone(archive.timestamp(1))
+        archive.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
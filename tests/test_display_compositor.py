@@ -0,0 +1,97 @@
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import cv2
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from depth_estimation import live_depth_review
+from depth_estimation.display_compositor import DisplayCompositor
+from depth_estimation.pipeline_base import LiveFrameOutput
+
+METRICS = {
+    "track_state": "tracked",
+    "estimate_source": "measurement",
+    "detection_count": 1,
+    "infer_ms": 12.5,
+    "x_rel_m": 0.1,
+    "y_rel_m": -0.05,
+    "z_rel_m": 1.8,
+    "yaw_error_deg": 3.2,
+}
+
+
+def frame(shape, seed):
+    return np.random.default_rng(seed).integers(0, 255, size=shape, dtype=np.uint8)
+
+
+class DisplayCompositorTests(unittest.TestCase):
+    def test_matches_previous_review_display(self):
+        # Panel text that fits (the compositor also marks overflowing panels with "...").
+        outputs = [LiveFrameOutput(method="naive", frame_bgr=frame((240, 320, 3), 0), metrics=METRICS)]
+        combined = live_depth_review.combine_frames(outputs, 480)
+        expected = live_depth_review.compose_display(combined, 7, 30.0, ["naive"], outputs, {})
+        compositor = live_depth_review.build_review_compositor(480)
+        got = live_depth_review.compose_review_frame(compositor, 7, 30.0, ["naive"], outputs, {})
+        np.testing.assert_array_equal(got, expected)
+
+    def test_overlay_review_matches_previous_display(self):
+        # No side panel: telemetry is drawn over the frames, anti-aliased like cv2.putText(LINE_AA).
+        outputs = [LiveFrameOutput(method="naive", frame_bgr=frame((240, 320, 3), 0), metrics=METRICS)]
+        with mock.patch.object(live_depth_review, "DEPTH_LIVE_REVIEW_USE_SIDE_PANEL", False):
+            combined = live_depth_review.combine_frames(outputs, 480)
+            expected = live_depth_review.compose_display(combined, 7, 30.0, ["naive"], outputs, {})
+            compositor = live_depth_review.build_review_compositor(480)
+            got = live_depth_review.compose_review_frame(compositor, 7, 30.0, ["naive"], outputs, {})
+        np.testing.assert_allclose(got.astype(np.int16), expected.astype(np.int16), atol=1)
+
+    def test_overlay_text_matches_put_text(self):
+        background = frame((60, 240, 3), 5)
+        expected = background.copy()
+        cv2.putText(expected, "frame: 42", (10, 24), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2, cv2.LINE_AA)
+        compositor = DisplayCompositor(target_height=60)
+        canvas = compositor.place_frames([background])
+        compositor.overlay_text("frame: 42", (10, 24), 0.7, (255, 255, 255), 2)
+        np.testing.assert_allclose(canvas.astype(np.int16), expected.astype(np.int16), atol=1)
+
+    def test_canvas_reused_and_only_changed_lines_redrawn(self):
+        compositor = DisplayCompositor(target_height=120, panel_width=200)
+        frames = [frame((120, 160, 3), 2), frame((60, 80, 3), 3)]
+        lines = [("Header", (0, 255, 0), 0.6), ("Frame: 1", (255, 255, 255), 0.5)]
+        first = compositor.compose(frames, lines)
+        snapshot = first.copy()
+        self.assertEqual(first.shape, (120, 160 + 160 + 200, 3))
+        np.testing.assert_array_equal(first[:, :160], frames[0])
+
+        second = compositor.compose(frames, [lines[0], ("Frame: 2", (255, 255, 255), 0.5)])
+        self.assertIs(second, first)
+        changed_rows = np.flatnonzero(np.any(second != snapshot, axis=(1, 2)))
+        self.assertTrue(changed_rows.size > 0)
+        # Only the second line's band (baseline 50, 22 px lines) was touched.
+        self.assertGreaterEqual(changed_rows.min(), 50 - 22)
+        self.assertLessEqual(changed_rows.max(), 50 + 6)
+
+        many = [(f"line {i}", (255, 255, 255), 0.5) for i in range(10)]
+        compositor.compose(frames, many)
+        self.assertEqual(compositor._slot_keys[28 + 22 * 4][0], "...")
+
+        resized = compositor.compose([frame((120, 160, 3), 4)], lines)
+        self.assertIsNot(resized, first)
+        self.assertEqual(resized.shape, (120, 360, 3))
+
+    def test_overlay_text_clips_to_canvas(self):
+        compositor = DisplayCompositor(target_height=40)
+        canvas = compositor.place_frames([np.zeros((40, 60, 3), np.uint8)])
+        compositor.overlay_text("frame: 12345678", (30, 30), 0.7, (255, 255, 255))
+        compositor.overlay_text("off-canvas", (100, 300), 0.7, (255, 255, 255))
+        self.assertTrue(canvas[:, 30:].any())
+        self.assertFalse(canvas[:, :28].any())
+
+
+if __name__ == "__main__":
+    unittest.main()
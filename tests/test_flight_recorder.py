@@ -0,0 +1,115 @@
+import contextlib
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import flight_recorder
+from flight_recorder import FlightRecorder, load_flight_recording, metrics_from_measurement
+from flight_recorder import replay
+
+
+def make_frame(i: int) -> np.ndarray:
+    frame = np.zeros((120, 160, 3), dtype=np.uint8)
+    cv2.putText(frame, str(i), (40, 80), cv2.FONT_HERSHEY_SIMPLEX, 2.0, (255, 255, 255), 3)
+    return frame
+
+
+class FlightRecorderTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.tmp = Path(self._tmp.name)
+        self.recorder = FlightRecorder(
+            frame_capacity=4,
+            frame_slot_bytes=32 * 1024,
+            measurement_capacity=3,
+            state_capacity=5,
+            command_capacity=5,
+            dump_dir=self.tmp,
+            metadata={"app": "test"},
+        )
+
+    def tearDown(self):
+        flight_recorder.install_recorder(None)
+        self.recorder.close()
+        self._tmp.cleanup()
+
+    def _fill(self, frames: int) -> None:
+        for i in range(1, frames + 1):
+            self.recorder.record_frame(make_frame(i), i)
+            self.assertTrue(self.recorder.flush())
+            self.recorder.record_measurement(
+                i,
+                {"distance_m": 1.0 + i, "x_rel_m": 0.1, "track_state": "tracked", "filter_mode": "kalman"},
+                "follow",
+            )
+            self.recorder.record_state(0.0, 0.0, 0.5 + 0.01 * i)
+            self.recorder.record_command(0.1 * i, 0.0, 0.0, 5.0, "mission")
+
+    def test_dump_round_trip_keeps_newest_records(self):
+        self._fill(6)
+        self.recorder.record_command(0.0, 0.0, 0.0, 0.0, "teleop")
+        self.recorder.mark("takeover")
+
+        path = self.recorder.dump("takeover")
+        self.assertTrue(path.name.endswith("_takeover.fpvrec"))
+        rec = load_flight_recording(path)
+
+        self.assertEqual(rec.reason, "takeover")
+        self.assertEqual(rec.header["metadata"], {"app": "test"})
+        self.assertEqual(rec.frame_index["frame_idx"].tolist(), [3, 4, 5, 6])
+        self.assertEqual(rec.frame(0).shape, (120, 160, 3))
+        self.assertEqual(rec.measurements["frame_idx"].tolist(), [4, 5, 6])
+        self.assertEqual(len(rec.states), 5)
+        self.assertEqual([rec.command_source(c) for c in rec.commands][-2:], ["mission", "teleop"])
+        self.assertTrue(np.all(np.diff(rec.commands["t"]) >= 0))
+        self.assertEqual([bytes(e["kind"]).decode() for e in rec.events], ["takeover", "dump"])
+
+        metrics = metrics_from_measurement(rec.measurement_for_frame(6))
+        self.assertAlmostEqual(metrics["distance_m"], 7.0, places=5)
+        self.assertEqual(metrics["track_state"], "tracked")
+        self.assertEqual(metrics["command_reason"], "follow")
+        self.assertNotIn("z_rel_m", metrics)
+
+    def test_module_hooks_are_noops_until_installed(self):
+        flight_recorder.record_command(1.0, 0.0, 0.0, 0.0)
+        self.assertIsNone(flight_recorder.dump_recorder("key"))
+        self.assertEqual(self.recorder.commands.count, 0)
+
+        flight_recorder.install_recorder(self.recorder)
+        flight_recorder.record_command(1.0, 0.0, 0.0, 0.0, "goto_z")
+        flight_recorder.record_state(1.0, 2.0, 3.0)
+        path = flight_recorder.dump_recorder("crash")
+        rec = load_flight_recording(path)
+        self.assertEqual(rec.command_source(rec.commands[0]), "goto_z")
+        self.assertEqual(rec.frame_count, 0)
+
+    def test_bad_signature_is_rejected(self):
+        bogus = self.tmp / "bogus.fpvrec"
+        bogus.write_bytes(b"not a dump")
+        with self.assertRaises(RuntimeError):
+            load_flight_recording(bogus)
+
+    def test_replay_export_writes_csvs_and_frames(self):
+        self._fill(2)
+        path = self.recorder.dump("key")
+        out_dir = self.tmp / "export"
+        with contextlib.redirect_stdout(io.StringIO()):
+            replay.main([str(path), "--export", str(out_dir)])
+
+        commands_csv = (out_dir / "commands.csv").read_text().splitlines()
+        self.assertEqual(commands_csv[0], "t,vx,vy,vz,yawrate,source")
+        self.assertTrue(commands_csv[1].endswith(",mission"))
+        self.assertEqual(sorted(p.name for p in (out_dir / "frames").iterdir()), ["frame_000001.jpg", "frame_000002.jpg"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+import sys
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from depth_estimation.fused_depth.fusion import ScaleBiasFit, sample_bbox_depth
+from depth_estimation.fused_depth.pipeline import FusedDepthPipeline
+
+FRAME_SHAPE = (240, 320, 3)
+BBOX = (140.0, 100.0, 180.0, 130.0)
+TRUE_DISTANCE_M = 1.0
+
+
+class BiasedNaive:
+    """Reports a fixed bbox with a distance 20% short of the truth, like a wrong drone width."""
+
+    name = "naive"
+    gating_enabled = False
+
+    def __init__(self):
+        self.closed = False
+
+    def process_live_frame(self, frame_bgr):
+        x1, y1, x2, y2 = BBOX
+        distance = 0.8 * TRUE_DISTANCE_M
+        metrics = {
+            "estimate_source": "measurement",
+            "raw_bbox_width_px": x2 - x1,
+            "raw_bbox_height_px": y2 - y1,
+            "raw_bbox_center_x_px": 0.5 * (x1 + x2),
+            "raw_bbox_center_y_px": 0.5 * (y1 + y2),
+            "raw_distance_m": distance,
+            "distance_m": distance,
+            "x_rel_m": 0.1,
+            "z_rel_m": distance,
+        }
+        return SimpleNamespace(frame_bgr=frame_bgr.copy(), metrics=metrics)
+
+    def toggle_gating(self):
+        self.gating_enabled = not self.gating_enabled
+        return self.gating_enabled
+
+    def close(self):
+        self.closed = True
+
+
+def dense_depth(frame_bgr):
+    # Half-resolution metric map: drone at the true distance, background far away.
+    depth = np.full((FRAME_SHAPE[0] // 2, FRAME_SHAPE[1] // 2), 4.0, dtype=np.float32)
+    x1, y1, x2, y2 = (int(v) // 2 for v in BBOX)
+    depth[y1:y2, x1:x2] = TRUE_DISTANCE_M
+    return depth
+
+
+class ScaleBiasFitTests(unittest.TestCase):
+    def test_identity_until_min_samples(self):
+        fit = ScaleBiasFit(min_samples=3)
+        fit.update(1.0, 1.3)
+        fit.update(1.1, 1.4)
+        self.assertFalse(fit.active)
+        self.assertEqual(fit.apply(1.0), 1.0)
+        fit.update(1.2, 1.5)
+        self.assertTrue(fit.active)
+        self.assertGreater(fit.apply(1.0), 1.1)
+
+    def test_recovers_linear_correction_and_rejects_outliers(self):
+        rng = np.random.default_rng(0)
+        fit = ScaleBiasFit()
+        for d in rng.uniform(0.4, 1.6, size=80):
+            bbox = (d - 0.1) / 1.2 + rng.normal(0.0, 0.01)
+            fit.update(bbox, d + rng.normal(0.0, 0.02))
+        for d in (0.5, 1.0, 1.5):
+            self.assertAlmostEqual(fit.apply((d - 0.1) / 1.2), d, delta=0.05)
+
+        samples = fit.samples
+        self.assertFalse(fit.update(1.0, 3.0))
+        self.assertFalse(fit.update(1.0, float("nan")))
+        self.assertEqual(fit.samples, samples)
+        self.assertEqual(fit.rejected, 2)
+
+
+class SampleBBoxDepthTests(unittest.TestCase):
+    def test_samples_drone_not_background_across_resolutions(self):
+        depth = dense_depth(None)
+        self.assertAlmostEqual(sample_bbox_depth(depth, BBOX, (320, 240)), TRUE_DISTANCE_M)
+        # Loose box reaching into the background still reads the near (drone) surface.
+        loose = (130.0, 90.0, 190.0, 140.0)
+        self.assertAlmostEqual(sample_bbox_depth(depth, loose, (320, 240), shrink=1.0), TRUE_DISTANCE_M)
+        self.assertIsNone(sample_bbox_depth(depth, (400.0, 300.0, 420.0, 320.0), (320, 240)))
+
+
+class FusedDepthPipelineTests(unittest.TestCase):
+    def setUp(self):
+        self.naive = BiasedNaive()
+        self.pipeline = FusedDepthPipeline(naive_pipeline=self.naive, dense_depth_fn=dense_depth)
+
+    def tearDown(self):
+        self.pipeline.close()
+
+    def test_dense_samples_correct_bbox_distance(self):
+        frame = np.zeros(FRAME_SHAPE, dtype=np.uint8)
+        first = self.pipeline.process_live_frame(frame).metrics
+        self.assertEqual(first["fused_distance_m"], 0.8)
+        self.assertEqual(first["fusion_active"], 0)
+
+        for _ in range(30):
+            self.assertTrue(self.pipeline.worker.wait_idle(5.0))
+            out = self.pipeline.process_live_frame(frame)
+        metrics = out.metrics
+        self.assertEqual(metrics["fusion_active"], 1)
+        self.assertAlmostEqual(metrics["dense_depth_m"], TRUE_DISTANCE_M)
+        self.assertAlmostEqual(metrics["distance_m"], TRUE_DISTANCE_M, delta=0.03)
+        self.assertEqual(metrics["bbox_distance_m"], 0.8)
+        ratio = metrics["distance_m"] / 0.8
+        self.assertAlmostEqual(metrics["z_rel_m"], metrics["distance_m"], places=3)
+        self.assertAlmostEqual(metrics["x_rel_m"], 0.1 * ratio, places=3)
+        self.assertEqual(out.frame_bgr.shape, FRAME_SHAPE)
+
+    def test_gating_and_close_delegate_to_naive(self):
+        self.assertTrue(self.pipeline.toggle_gating())
+        self.assertTrue(self.pipeline.gating_enabled)
+        self.pipeline.close()
+        self.assertTrue(self.naive.closed)
+
+    def test_worker_failure_surfaces_in_pipeline_thread(self):
+        def broken(_frame):
+            raise ValueError("model exploded")
+
+        pipeline = FusedDepthPipeline(naive_pipeline=BiasedNaive(), dense_depth_fn=broken)
+        try:
+            frame = np.zeros(FRAME_SHAPE, dtype=np.uint8)
+            pipeline.process_live_frame(frame)
+            pipeline.worker.wait_idle(5.0)
+            with self.assertRaisesRegex(RuntimeError, "model exploded"):
+                pipeline.process_live_frame(frame)
+        finally:
+            pipeline.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
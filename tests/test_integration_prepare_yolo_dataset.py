@@ -1,5 +1,6 @@
 import csv
 import importlib.util
+import shutil
 import sys
 import tempfile
 import unittest
@@ -24,6 +25,34 @@ def load_module_from_file(module_file: Path, module_name: str) -> ModuleType:
             sys.path.pop(0)
 
 
+def baseline_write_yolo_label(src_label: Path, dst_label: Path, single_class_mode: bool, target_class_id: int) -> None:
+    """Frozen copy of the original one-file-at-a-time label writer (test oracle)."""
+    if not src_label.exists():
+        dst_label.write_text("")
+        return
+
+    if not single_class_mode:
+        shutil.copy2(src_label, dst_label)
+        return
+
+    out_lines: list[str] = []
+    for raw_line in src_label.read_text().splitlines():
+        line = raw_line.strip()
+        if not line:
+            continue
+        parts = line.split()
+        if len(parts) < 5:
+            out_lines.append(line)
+            continue
+        parts[0] = str(target_class_id)
+        out_lines.append(" ".join(parts))
+
+    if out_lines:
+        dst_label.write_text("\n".join(out_lines) + "\n")
+    else:
+        dst_label.write_text("")
+
+
 class PrepareYoloDatasetIntegrationTests(unittest.TestCase):
     def setUp(self) -> None:
         self.repo_root = Path(__file__).resolve().parent.parent
@@ -134,6 +163,150 @@ class PrepareYoloDatasetIntegrationTests(unittest.TestCase):
 
             self.assertEqual(total_images, 9)
 
+    def _configure_module(self, mod: ModuleType, labels_root: Path, class_name: str) -> None:
+        mod.OUT_DIR = str(labels_root)
+        mod.YOLO_TARGET_CLASS_NAME = class_name
+        mod.YOLO_SOURCE_DATASET_NAME = f"{class_name}_dataset"
+        mod.YOLO_OUTPUT_DATASET_NAME = f"{class_name}_yolo"
+        mod.YOLO_DATASET_YAML_NAME = "dataset.yaml"
+        mod.YOLO_OVERWRITE_OUTPUT = True
+        mod.YOLO_INCLUDED_SESSIONS = ()
+        mod.YOLO_SPLIT_SEED = 7
+        mod.YOLO_TRAIN_RATIO = 0.6
+        mod.YOLO_VAL_RATIO = 0.2
+        mod.YOLO_TEST_RATIO = 0.2
+        mod.YOLO_SPLIT_MODE = "session"
+        mod.YOLO_SINGLE_CLASS_MODE = True
+        mod.YOLO_TARGET_CLASS_ID = 0
+        mod.YOLO_LINK_MODE = "auto"
+        mod.YOLO_INCREMENTAL_OUTPUT = True
+
+    def test_incremental_rebuild_only_touches_changed_samples(self) -> None:
+        with tempfile.TemporaryDirectory(prefix="prepare_yolo_incremental_") as tmp:
+            labels_root = Path(tmp) / "labels_root"
+            class_name = "black_drone"
+            self._build_source_dataset(labels_root, class_name, f"{class_name}_dataset")
+            src_root = labels_root / class_name / f"{class_name}_dataset"
+            out_root = labels_root / class_name / f"{class_name}_yolo"
+
+            mod = load_module_from_file(self.script_path, "prepare_yolo_dataset_incremental_mod")
+            self._configure_module(mod, labels_root, class_name)
+            mod.main()
+
+            materializer = mod.DatasetMaterializer(out_root, manifest_name=mod.YOLO_MATERIALIZE_MANIFEST_NAME)
+            manifest = materializer.load_manifest()
+            image_entries = {k: v for k, v in manifest.items() if k.startswith("images/")}
+            self.assertEqual(len(image_entries), 9)
+            sample_rel, sample_record = sorted(image_entries.items())[0]
+            if sample_record["mode"] == "hardlink":
+                src_image = src_root / "images" / Path(sample_rel).name
+                self.assertEqual((out_root / sample_rel).stat().st_ino, src_image.stat().st_ino)
+
+            # Nothing changed: a rebuild must not touch any file.
+            samples = mod.read_manifest(src_root / "manifest.csv", set())
+            split_samples = mod.split_by_session(samples, 0.6, 0.2, 0.2, 7)
+            _, _, stats = mod.copy_split_files(
+                split_samples=split_samples,
+                source_images_dir=src_root / "images",
+                source_labels_dir=src_root / "labels",
+                output_root=out_root,
+                single_class_mode=True,
+                target_class_id=0,
+                materializer=materializer,
+            )
+            self.assertEqual(stats.touched, 0)
+            self.assertEqual(stats.unchanged, 18)
+
+            # One relabeled frame and one dropped frame.
+            (src_root / "labels" / "frame_000004.txt").write_text("1 0.4 0.4 0.1 0.1\n")
+            split_samples = {
+                split: [s for s in items if s.image_name != "frame_000008.jpg"]
+                for split, items in split_samples.items()
+            }
+            _, _, stats = mod.copy_split_files(
+                split_samples=split_samples,
+                source_images_dir=src_root / "images",
+                source_labels_dir=src_root / "labels",
+                output_root=out_root,
+                single_class_mode=True,
+                target_class_id=0,
+                materializer=materializer,
+            )
+            self.assertEqual(stats.written, 1)
+            self.assertEqual(stats.linked + stats.copied, 0)
+            self.assertEqual(stats.removed, 2)
+            relabeled = next(out_root.glob("labels/*/frame_000004.txt"))
+            self.assertEqual(relabeled.read_text(), "0 0.4 0.4 0.1 0.1\n")
+            self.assertEqual(list(out_root.glob("*/*/frame_000008.*")), [])
+
+    def test_parallel_materialization_matches_sequential_copy(self) -> None:
+        with tempfile.TemporaryDirectory(prefix="prepare_yolo_parallel_") as tmp:
+            labels_root = Path(tmp) / "labels_root"
+            class_name = "black_drone"
+            self._build_source_dataset(labels_root, class_name, f"{class_name}_dataset")
+            src_root = labels_root / class_name / f"{class_name}_dataset"
+            # Edge cases the label rewrite must preserve byte-for-byte.
+            (src_root / "labels" / "frame_000001.txt").write_text("1 0.5 0.5 0.2 0.2\nbroken line\n\n2 0.1 0.1 0.1 0.1")
+            (src_root / "labels" / "frame_000002.txt").write_text("")
+            (src_root / "labels" / "frame_000003.txt").unlink()
+
+            mod = load_module_from_file(self.script_path, "prepare_yolo_dataset_parallel_mod")
+            samples = mod.read_manifest(src_root / "manifest.csv", set())
+            split_samples = mod.split_by_session(samples, 0.6, 0.2, 0.2, 7)
+
+            for single_class_mode in (True, False):
+                sequential_root = Path(tmp) / f"sequential_{single_class_mode}"
+                parallel_root = Path(tmp) / f"parallel_{single_class_mode}"
+
+                # Reference: the original one-file-at-a-time copy + label rewrite.
+                mod.prepare_output_dirs(sequential_root, overwrite=True)
+                for split_name, items in split_samples.items():
+                    for sample in items:
+                        shutil.copy2(
+                            src_root / "images" / sample.image_name,
+                            sequential_root / "images" / split_name / sample.image_name,
+                        )
+                        baseline_write_yolo_label(
+                            src_label=src_root / "labels" / sample.label_name,
+                            dst_label=sequential_root / "labels" / split_name / sample.label_name,
+                            single_class_mode=single_class_mode,
+                            target_class_id=0,
+                        )
+
+                progress_calls: list[tuple[int, int]] = []
+                mod.prepare_output_dirs(parallel_root, overwrite=True)
+                copied, missing, _ = mod.copy_split_files(
+                    split_samples=split_samples,
+                    source_images_dir=src_root / "images",
+                    source_labels_dir=src_root / "labels",
+                    output_root=parallel_root,
+                    single_class_mode=single_class_mode,
+                    target_class_id=0,
+                    materializer=mod.DatasetMaterializer(parallel_root, link_mode="copy"),
+                    workers=8,
+                    progress=lambda done, total: progress_calls.append((done, total)),
+                )
+                self.assertEqual((copied, missing), (9, 0))
+                self.assertEqual(progress_calls[-1], (18, 18))
+
+                expected = {
+                    p.relative_to(sequential_root): p.read_bytes()
+                    for p in sequential_root.rglob("*")
+                    if p.is_file()
+                }
+                actual = {
+                    p.relative_to(parallel_root): p.read_bytes()
+                    for p in parallel_root.rglob("*")
+                    if p.is_file() and not p.name.startswith(".materialize")
+                }
+                self.assertEqual(actual, expected)
+
+                edge_label = next(parallel_root.glob("labels/*/frame_000001.txt")).read_bytes()
+                if single_class_mode:
+                    self.assertEqual(edge_label, b"0 0.5 0.5 0.2 0.2\nbroken line\n0 0.1 0.1 0.1 0.1\n")
+                else:
+                    self.assertEqual(edge_label, b"1 0.5 0.5 0.2 0.2\nbroken line\n\n2 0.1 0.1 0.1 0.1")
+
 
 if __name__ == "__main__":
     unittest.main()
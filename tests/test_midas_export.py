@@ -0,0 +1,108 @@
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from depth_estimation.midas.utils import (
+    aspect_mismatch,
+    export_artifact_stem,
+    find_exported_midas,
+    midas_normalization,
+    prepare_midas_input,
+)
+
+TORCH_AVAILABLE = importlib.util.find_spec("torch") is not None
+
+
+class PrepareInputTests(unittest.TestCase):
+    def test_matches_hub_normalisation_at_fixed_size(self):
+        frame = np.full((480, 640, 3), 255, dtype=np.uint8)
+        mean, std = midas_normalization("DPT_Hybrid")
+        batch = prepare_midas_input(frame, (512, 384), mean, std)
+        self.assertEqual(batch.shape, (1, 3, 384, 512))
+        self.assertEqual(batch.dtype, np.float32)
+        np.testing.assert_allclose(batch, 1.0, atol=1e-5)
+
+        mean, std = midas_normalization("MiDaS_small")
+        batch = prepare_midas_input(np.zeros((480, 640, 3), dtype=np.uint8), (256, 192), mean, std)
+        np.testing.assert_allclose(batch[0, :, 0, 0], [-0.485 / 0.229, -0.456 / 0.224, -0.406 / 0.225], rtol=1e-5)
+
+    def test_rejects_sizes_the_network_cannot_take(self):
+        with self.assertRaises(ValueError):
+            prepare_midas_input(np.zeros((10, 10, 3), dtype=np.uint8), (500, 384), (0.5,) * 3, (0.5,) * 3)
+        self.assertEqual(export_artifact_stem("DPT_Hybrid", (512, 384)), "DPT_Hybrid_512x384")
+
+
+class FindExportTests(unittest.TestCase):
+    def test_matches_model_type_exactly_and_checks_sidecar(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            export_dir = Path(tmp)
+
+            def write(model_type, input_size, sidecar_type, mtime):
+                artifact = export_dir / f"{export_artifact_stem(model_type, input_size)}.pt"
+                artifact.write_bytes(b"")
+                artifact.with_suffix(".json").write_text(json.dumps({"model_type": sidecar_type}))
+                os.utime(artifact, (mtime, mtime))
+                return artifact
+
+            self.assertIsNone(find_exported_midas(export_dir / "missing", "MiDaS"))
+            write("MiDaS_small", (256, 192), "MiDaS_small", 300)
+            self.assertIsNone(find_exported_midas(export_dir, "MiDaS"))
+
+            midas = write("MiDaS", (384, 288), "MiDaS", 100)
+            write("MiDaS", (512, 384), "MiDaS_small", 200)  # renamed file, sidecar disagrees
+            self.assertEqual(find_exported_midas(export_dir, "MiDaS"), midas)
+            self.assertEqual(find_exported_midas(export_dir, "MiDaS_small").name, "MiDaS_small_256x192.pt")
+
+    def test_aspect_mismatch(self):
+        self.assertFalse(aspect_mismatch((480, 640, 3), (512, 384), 0.02))
+        self.assertTrue(aspect_mismatch((720, 1280, 3), (512, 384), 0.02))
+
+
+@unittest.skipUnless(TORCH_AVAILABLE, "torch not installed")
+class TorchScriptExportTests(unittest.TestCase):
+    def test_exported_model_matches_eager_and_is_preferred(self):
+        import torch
+
+        from depth_estimation.midas.export_midas import export_torchscript
+        from depth_estimation.midas.midas_model import MiDaSTorchScriptModel, load_midas_model
+
+        class TinyDepth(torch.nn.Module):
+            def __init__(self):
+                super().__init__()
+                self.conv = torch.nn.Conv2d(3, 1, 3, padding=1)
+                self.bn = torch.nn.BatchNorm2d(1)
+
+            def forward(self, x):
+                return torch.relu(self.bn(self.conv(x))).squeeze(1)
+
+        torch.manual_seed(0)
+        eager = TinyDepth().eval()
+        mean, std = midas_normalization("DPT_Hybrid")
+        frame = np.random.default_rng(0).integers(0, 255, size=(48, 64, 3), dtype=np.uint8)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            artifact = Path(tmp) / f"{export_artifact_stem('DPT_Hybrid', (64, 32))}.pt"
+            meta = {"model_type": "DPT_Hybrid", "mean": list(mean), "std": list(std)}
+            export_torchscript(eager, (64, 32), artifact, meta)
+
+            exported = MiDaSTorchScriptModel(artifact, device="cpu")
+            with torch.no_grad():
+                expected = eager(torch.from_numpy(prepare_midas_input(frame, (64, 32), mean, std)))
+            expected = torch.nn.functional.interpolate(expected.unsqueeze(1), size=(48, 64), mode="bicubic")
+            np.testing.assert_allclose(exported.predict(frame), expected.squeeze().numpy(), atol=1e-4)
+
+            self.assertIsInstance(load_midas_model("DPT_Hybrid", "cpu", export_dir=Path(tmp)), MiDaSTorchScriptModel)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import importlib.util
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import ModuleType, SimpleNamespace
+from unittest import mock
+
+import cv2
+import numpy as np
+
+
+def load_module_from_file(module_file: Path, module_name: str) -> ModuleType:
+    parent_dir = str(module_file.parent)
+    sys.path.insert(0, parent_dir)
+    try:
+        for shadowed_name in ("constants", "utils", "eval_engine", "prediction_cache", module_name):
+            sys.modules.pop(shadowed_name, None)
+        spec = importlib.util.spec_from_file_location(module_name, module_file)
+        if spec is None or spec.loader is None:
+            raise RuntimeError(f"Could not load module: {module_file}")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    finally:
+        if sys.path and sys.path[0] == parent_dir:
+            sys.path.pop(0)
+
+
+class BenchmarkLatencyTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        repo_root = Path(__file__).resolve().parents[1]
+        cls.mod = load_module_from_file(repo_root / "models" / "benchmark_latency.py", "benchmark_latency")
+
+    def test_latency_summary_percentiles(self):
+        summary = self.mod.latency_summary([float(v) for v in range(1, 101)])
+        self.assertAlmostEqual(summary["mean_ms"], 50.5)
+        self.assertAlmostEqual(summary["p50_ms"], 50.5)
+        self.assertAlmostEqual(summary["p99_ms"], 99.01)
+        self.assertAlmostEqual(summary["fps"], 1000.0 / 50.5)
+
+    def test_matrix_covers_every_combination_and_rejects_unknown_backend(self):
+        matrix = self.mod.build_benchmark_matrix(["a.pt", "b.pt"], ("torch", "onnx"), (320, 640), (1, 4))
+        self.assertEqual(len(matrix), 16)
+        self.assertIn({"model_ref": "b.pt", "backend": "onnx", "imgsz": 640, "threads": 4}, matrix)
+        with self.assertRaises(RuntimeError):
+            self.mod.build_benchmark_matrix(["a.pt"], ("tensorrt",), (640,), (1,))
+
+    def test_frames_are_sampled_from_session_video_or_images(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            session = Path(tmp) / "session"
+            (session / "images").mkdir(parents=True)
+            for i in range(10):
+                cv2.imwrite(str(session / "images" / f"{i:03d}.jpg"), np.full((24, 32, 3), i * 20, np.uint8))
+            frames = self.mod.load_benchmark_frames(session, count=4)
+            self.assertEqual(len(frames), 4)
+            self.assertEqual(frames[0].shape, (24, 32, 3))
+
+            writer = cv2.VideoWriter(str(session / "video.avi"), cv2.VideoWriter_fourcc(*"MJPG"), 10, (32, 24))
+            for i in range(12):
+                writer.write(np.full((24, 32, 3), i * 20, np.uint8))
+            writer.release()
+            frames = self.mod.load_benchmark_frames(session, count=5)
+            self.assertEqual(len(frames), 5)
+
+    def test_thread_limit_reaches_onnxruntime_and_openvino(self):
+        class FakeSession:
+            def __init__(self, path_or_bytes, sess_options=None, providers=None):
+                self.options = sess_options
+
+        class FakeCore:
+            def compile_model(self, model, device_name=None, config=None):
+                return SimpleNamespace(device=device_name, config=config)
+
+        fake_ort = SimpleNamespace(InferenceSession=FakeSession, SessionOptions=SimpleNamespace)
+        fake_ov = SimpleNamespace(Core=FakeCore)
+        with mock.patch.dict(sys.modules, {"onnxruntime": fake_ort, "openvino": fake_ov}):
+            applied = self.mod.limit_backend_threads("onnx", 2)
+            # What Ultralytics does: no session options.
+            session = fake_ort.InferenceSession("model.onnx", providers=["CPUExecutionProvider"])
+            self.assertEqual((session.options.intra_op_num_threads, session.options.inter_op_num_threads), (2, 1))
+            self.assertEqual(applied, ["onnxruntime intra_op_num_threads=2"])
+
+            applied = self.mod.limit_backend_threads("openvino", 4)
+            compiled = fake_ov.Core().compile_model("model.xml", device_name="CPU", config={"PERFORMANCE_HINT": "LATENCY"})
+            self.assertEqual(compiled.config, {"PERFORMANCE_HINT": "LATENCY", "INFERENCE_NUM_THREADS": 4})
+            self.assertEqual(applied, ["openvino INFERENCE_NUM_THREADS=4"])
+
+            self.assertEqual(self.mod.limit_backend_threads("torch", 1), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,127 @@
+import importlib.util
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import ModuleType, SimpleNamespace
+
+import cv2
+import numpy as np
+
+
+def load_module_from_file(module_file: Path, module_name: str) -> ModuleType:
+    parent_dir = str(module_file.parent)
+    sys.path.insert(0, parent_dir)
+    try:
+        for shadowed_name in ("constants", "utils", module_name):
+            sys.modules.pop(shadowed_name, None)
+        spec = importlib.util.spec_from_file_location(module_name, module_file)
+        if spec is None or spec.loader is None:
+            raise RuntimeError(f"Could not load module: {module_file}")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    finally:
+        if sys.path and sys.path[0] == parent_dir:
+            sys.path.pop(0)
+
+
+class FakeTensor:
+    def __init__(self, values):
+        self.values = np.asarray(values)
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self.values
+
+
+class ScriptedModel:
+    """Returns queued (xyxy, conf) predictions, one entry per image in order."""
+
+    def __init__(self, outputs):
+        self.outputs = list(outputs)
+        self.batch_sizes: list[int] = []
+
+    def predict(self, source, **kwargs):
+        self.batch_sizes.append(len(source))
+        results = []
+        for image in source:
+            assert image.shape == (kwargs["imgsz"], kwargs["imgsz"], 3)
+            xyxy, conf = self.outputs.pop(0)
+            boxes = SimpleNamespace(
+                xyxy=FakeTensor(np.asarray(xyxy, dtype=np.float32).reshape(-1, 4)),
+                conf=FakeTensor(np.asarray(conf, dtype=np.float32)),
+                cls=FakeTensor(np.zeros(len(conf))),
+            )
+            results.append(SimpleNamespace(boxes=boxes, speed={"inference": 5.0}))
+        return results
+
+
+class EvalEngineTests(unittest.TestCase):
+    def setUp(self) -> None:
+        repo_root = Path(__file__).resolve().parent.parent
+        self.mod = load_module_from_file(repo_root / "models" / "eval_engine.py", "eval_engine_test_mod")
+
+    def _write_split(self, dataset_root: Path, count: int) -> None:
+        images_dir = dataset_root / "images" / "test"
+        labels_dir = dataset_root / "labels" / "test"
+        images_dir.mkdir(parents=True)
+        labels_dir.mkdir(parents=True)
+        for idx in range(count):
+            cv2.imwrite(str(images_dir / f"img_{idx}.jpg"), np.full((120, 160, 3), 40 * idx, dtype=np.uint8))
+            (labels_dir / f"img_{idx}.txt").write_text("0 0.5 0.5 0.25 0.5\n")
+
+    def test_letterbox_cache_is_reused_and_gt_is_in_letterbox_coords(self) -> None:
+        with tempfile.TemporaryDirectory(prefix="eval_engine_test_") as tmp:
+            dataset_root = Path(tmp) / "dataset"
+            self._write_split(dataset_root, 3)
+            paths = self.mod.list_split_image_paths(dataset_root, "test")
+
+            cache = self.mod.build_letterbox_cache(paths, 64, Path(tmp) / "cache")
+            self.assertEqual(cache.open_images().shape, (3, 64, 64, 3))
+            # 160x120 -> 64x48 centered with 8px padding on top and bottom.
+            np.testing.assert_allclose(cache.gt_boxes_xyxy[0], [[24.0, 20.0, 40.0, 44.0]], atol=1e-4)
+            self.assertEqual(int(cache.open_images()[0, 0, 0, 0]), 114)
+
+            again = self.mod.build_letterbox_cache(paths, 64, Path(tmp) / "cache")
+            self.assertEqual(again.cache_dir, cache.cache_dir)
+
+    def test_perfect_and_partial_predictions_score_as_expected(self) -> None:
+        with tempfile.TemporaryDirectory(prefix="eval_engine_test_") as tmp:
+            dataset_root = Path(tmp) / "dataset"
+            self._write_split(dataset_root, 4)
+            paths = self.mod.list_split_image_paths(dataset_root, "test")
+            cache = self.mod.build_letterbox_cache(paths, 64, Path(tmp) / "cache")
+            settings = self.mod.EvalSettings(imgsz=64, batch=3, conf=0.001, iou=0.7, device="cpu", overlap_threshold=0.3)
+
+            gt = [b.tolist() for b in cache.gt_boxes_xyxy]
+            perfect = ScriptedModel([(box, [0.9]) for box in gt])
+            metrics = self.mod.evaluate_model_on_cache(perfect, cache, settings)
+            self.assertEqual(perfect.batch_sizes, [3, 1])
+            # 101-point interpolation tops out at 0.995, same as Ultralytics val.
+            self.assertAlmostEqual(metrics["map50"], 0.995, places=3)
+            self.assertAlmostEqual(metrics["map5095"], 0.995, places=3)
+            self.assertAlmostEqual(metrics["inference_ms"], 5.0)
+
+            # Two hits, one miss, and one image with a confident false positive.
+            far = [[0.0, 0.0, 4.0, 4.0]]
+            partial = ScriptedModel(
+                [(gt[0], [0.9]), (gt[1], [0.8]), (np.zeros((0, 4)), []), (far, [0.95])]
+            )
+            metrics = self.mod.evaluate_model_on_cache(partial, cache, settings)
+            self.assertAlmostEqual(metrics["recall"], 0.5, places=2)
+            self.assertAlmostEqual(metrics["map50"], 0.5, places=2)
+
+    def test_overlap_suppression_drops_nested_duplicate(self) -> None:
+        xyxy = np.array([[0, 0, 10, 10], [1, 1, 9, 9], [20, 20, 30, 30]], dtype=np.float32)
+        conf = np.array([0.9, 0.8, 0.7], dtype=np.float32)
+        cls = np.zeros(3, dtype=np.int32)
+        kept_xyxy, kept_conf, _ = self.mod.apply_overlap_suppression(xyxy, conf, cls, threshold=0.3)
+        np.testing.assert_allclose(kept_conf, [0.9, 0.7])
+        self.assertEqual(len(kept_xyxy), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,140 @@
+import importlib.util
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from types import ModuleType, SimpleNamespace
+
+import cv2
+import numpy as np
+
+
+def load_module_from_file(module_file: Path, module_name: str) -> ModuleType:
+    parent_dir = str(module_file.parent)
+    sys.path.insert(0, parent_dir)
+    try:
+        for shadowed_name in ("constants", "utils", module_name):
+            sys.modules.pop(shadowed_name, None)
+        spec = importlib.util.spec_from_file_location(module_name, module_file)
+        if spec is None or spec.loader is None:
+            raise RuntimeError(f"Could not load module: {module_file}")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    finally:
+        if sys.path and sys.path[0] == parent_dir:
+            sys.path.pop(0)
+
+
+class FakeTensor:
+    def __init__(self, values):
+        self.values = np.asarray(values)
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self.values
+
+
+class CountingModel:
+    """Returns one box per image, or none for images whose name contains 'empty'."""
+
+    names = {0: "black_drone"}
+
+    def __init__(self):
+        self.predicted_sources: list[str] = []
+
+    def predict(self, source, **kwargs):
+        results = []
+        for src in source:
+            self.predicted_sources.append(src)
+            if "empty" in Path(src).name:
+                xyxy, conf, cls = np.zeros((0, 4)), np.zeros(0), np.zeros(0)
+            else:
+                xyxy, conf, cls = [[10, 10, 30, 30], [0, 0, 5, 5]], [0.2, 0.9], [0, 0]
+            boxes = SimpleNamespace(xyxy=FakeTensor(xyxy), conf=FakeTensor(conf), cls=FakeTensor(cls))
+            results.append(SimpleNamespace(boxes=boxes, orig_shape=(48, 64)))
+        return results
+
+
+class PredictionCacheTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        repo_root = Path(__file__).resolve().parents[1]
+        cls.mod = load_module_from_file(repo_root / "models" / "prediction_cache.py", "prediction_cache")
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.weights = self.root / "best.pt"
+        self.weights.write_bytes(b"weights-v1")
+        self.images = []
+        for i, name in enumerate(("a.jpg", "b.jpg", "empty.jpg")):
+            path = self.root / name
+            cv2.imwrite(str(path), np.full((48, 64, 3), 40 * i, dtype=np.uint8))
+            self.images.append(path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _cache(self, **overrides):
+        kwargs = {"imgsz": 640, "iou": 0.7}
+        kwargs.update(overrides)
+        return self.mod.PredictionCache(self.root / "cache", str(self.weights), **kwargs)
+
+    def test_second_run_is_served_from_disk_without_loading_model(self):
+        model = CountingModel()
+        first = self._cache().predict_paths(lambda: model, self.images, {})
+        self.assertEqual(len(model.predicted_sources), 3)
+        # Stored sorted by confidence, in original pixel coordinates.
+        np.testing.assert_allclose(first[0].conf, [0.9, 0.2], rtol=1e-6)
+        self.assertEqual(first[0].orig_shape, (48, 64))
+        self.assertEqual(len(first[2]), 0)
+
+        def fail_to_load():
+            raise AssertionError("model should not be loaded on a full cache hit")
+
+        cache = self._cache()
+        second = cache.predict_paths(fail_to_load, self.images, {})
+        self.assertEqual((cache.hits, cache.misses), (3, 0))
+        np.testing.assert_allclose(second[0].xyxy, first[0].xyxy)
+        self.assertEqual(len(second[0].above(0.5)), 1)
+        self.assertEqual(len(second[2]), 0)
+        # Labels for a fully cached run come from the store, not the (unloaded) model.
+        self.assertEqual(cache.class_names, {0: "black_drone"})
+
+    def test_only_new_images_are_predicted(self):
+        model = CountingModel()
+        self._cache().predict_paths(lambda: model, self.images[:1], {})
+        cache = self._cache()
+        cache.predict_paths(lambda: model, self.images, {})
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        self.assertEqual([Path(p).name for p in model.predicted_sources], ["a.jpg", "b.jpg", "empty.jpg"])
+
+    def test_stale_temp_shard_from_interrupted_write_is_ignored(self):
+        model = CountingModel()
+        cache = self._cache()
+        cache.predict_paths(lambda: model, self.images[:1], {})
+        # Leftovers of interrupted writes: current temp name and the old "<stem>.tmp.npz" one.
+        (cache.store_dir / ".shard_000001.npz.tmp").write_bytes(b"partial")
+        (cache.store_dir / "shard_000001.tmp.npz").write_bytes(b"partial")
+
+        cache = self._cache()
+        cache.predict_paths(lambda: model, self.images, {})
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+        self.assertTrue((cache.store_dir / "shard_000001.npz").exists())
+        reloaded = self._cache()
+        reloaded.predict_paths(lambda: model, self.images, {})
+        self.assertEqual((reloaded.hits, reloaded.misses), (3, 0))
+
+    def test_config_change_uses_a_separate_store(self):
+        base = self._cache()
+        self.assertNotEqual(base.store_dir, self._cache(imgsz=320).store_dir)
+        self.assertNotEqual(base.store_dir, self._cache(iou=0.5).store_dir)
+        self.weights.write_bytes(b"weights-version-2")
+        self.assertNotEqual(base.store_dir, self._cache().store_dir)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+import importlib.util
+import sys
+import unittest
+from pathlib import Path
+from types import ModuleType
+
+import numpy as np
+
+
+def load_module_from_file(module_file: Path, module_name: str) -> ModuleType:
+    parent_dir = str(module_file.parent)
+    sys.path.insert(0, parent_dir)
+    try:
+        for shadowed_name in ("constants", "utils", "eval_engine", module_name):
+            sys.modules.pop(shadowed_name, None)
+        spec = importlib.util.spec_from_file_location(module_name, module_file)
+        if spec is None or spec.loader is None:
+            raise RuntimeError(f"Could not load module: {module_file}")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+    finally:
+        if sys.path and sys.path[0] == parent_dir:
+            sys.path.pop(0)
+
+
+class ThresholdSweepTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        repo_root = Path(__file__).resolve().parents[1]
+        cls.mod = load_module_from_file(repo_root / "models" / "threshold_sweep.py", "threshold_sweep")
+
+    def test_vectorized_overlap_suppression_matches_reference(self):
+        rng = np.random.default_rng(0)
+        xy = rng.uniform(0, 200, size=(40, 2))
+        wh = rng.uniform(5, 60, size=(40, 2))
+        boxes = np.concatenate([xy, xy + wh], axis=1)
+        conf = rng.uniform(0, 1, size=40)
+        order = np.argsort(-conf, kind="stable")
+
+        keep = self.mod.greedy_keep_mask(self.mod.overlap_ratio_matrix(boxes[order]) > 0.3)
+        reference = self.mod.suppress_overlap_indices(
+            boxes_xyxy=[tuple(b) for b in boxes], confidences=list(conf), overlap_threshold=0.3
+        )
+        self.assertEqual(sorted(order[keep].tolist()), sorted(reference))
+
+    def test_sweep_scores_each_combination_from_one_prediction_set(self):
+        gt_boxes = [np.array([[100, 100, 200, 200]], dtype=np.float32)]
+        gt_classes = [np.array([0], dtype=np.int32)]
+        # True box, a shifted duplicate (IoU ~0.74 with it) and a distant false positive.
+        xyxy = np.array([[100, 100, 200, 200], [115, 100, 215, 200], [300, 300, 340, 340]], dtype=np.float32)
+        predictions = [(xyxy, np.array([0.9, 0.8, 0.3], dtype=np.float32), np.zeros(3, dtype=np.int32))]
+
+        rows = self.mod.sweep_thresholds(
+            predictions,
+            gt_boxes,
+            gt_classes,
+            conf_thresholds=(0.25, 0.5),
+            nms_ious=(0.5, 0.9),
+            overlap_percents=(100.0,),
+        )
+        by_key = {(r["conf"], r["nms_iou"]): r for r in rows}
+        self.assertEqual(len(rows), 4)
+        self.assertAlmostEqual(by_key[(0.5, 0.5)]["precision"], 1.0)
+        self.assertAlmostEqual(by_key[(0.5, 0.9)]["precision"], 0.5)
+        self.assertAlmostEqual(by_key[(0.25, 0.5)]["precision"], 0.5)
+        self.assertAlmostEqual(by_key[(0.25, 0.9)]["precision"], 1.0 / 3.0)
+        self.assertTrue(all(r["recall"] == 1.0 for r in rows))
+        self.assertEqual([r["pareto"] for r in rows if r["pareto"]], [True])
+        self.assertTrue(by_key[(0.5, 0.5)]["pareto"])
+
+    def test_pareto_mask_keeps_non_dominated_points(self):
+        points = np.array([[0.9, 0.5], [0.7, 0.8], [0.6, 0.6], [0.9, 0.5]])
+        self.assertEqual(self.mod.pareto_mask(points).tolist(), [True, True, False, True])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,393 @@
+"""
+Timing regression checks for the live pipeline hot paths.
+
+Opt-in (timings are machine specific and too noisy for the default run):
+
+    PERF_TESTS=1 python -m unittest tests.test_perf_hot_paths
+    ./scripts/run_perf_tests.sh
+
+Everything runs offline on the CPU: YOLO is replaced by a fixture model that
+returns fixed boxes, frames are synthetic. The first run on a host records
+per-case timings in PERF_BASELINE_PATH (default runs/perf/hot_path_baselines.json);
+later runs fail when a case is still slower than baseline * PERF_TOLERANCE after
+PERF_RETRIES re-measurements.
+PERF_UPDATE_BASELINE=1 re-records the baselines.
+"""
+
+import json
+import os
+import platform
+import sys
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import cv2
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+PERF_ENABLED = os.environ.get("PERF_TESTS", "") == "1"
+BASELINE_PATH = Path(os.environ.get("PERF_BASELINE_PATH", REPO_ROOT / "runs" / "perf" / "hot_path_baselines.json"))
+TOLERANCE = float(os.environ.get("PERF_TOLERANCE", "1.30"))
+UPDATE_BASELINE = os.environ.get("PERF_UPDATE_BASELINE", "") == "1"
+# Absolute slack so sub-microsecond cases do not fail on timer noise.
+ABS_SLACK_S = 2e-6
+REPEATS = 7
+# A case over its limit is re-measured this many times (best kept) before failing,
+# so one burst of background load does not read as a regression.
+RETRIES = int(os.environ.get("PERF_RETRIES", "2"))
+
+FRAME_SHAPE = (480, 640, 3)
+
+
+def measure_best_s(fn, number: int, warmup: int = 3) -> float:
+    """Best of REPEATS of the mean per-call time of number calls (least affected by other load)."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(REPEATS):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        samples.append((time.perf_counter() - t0) / number)
+    return float(min(samples))
+
+
+def synthetic_frame(seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    frame = rng.integers(0, 255, size=FRAME_SHAPE, dtype=np.uint8)
+    return cv2.GaussianBlur(frame, (7, 7), 0)
+
+
+########################################## Fixture Model ##################################################
+
+
+class _FixtureArray:
+    def __init__(self, values):
+        self.values = np.asarray(values, dtype=np.float32)
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self.values
+
+    def item(self):
+        return float(self.values)
+
+    def __getitem__(self, idx):
+        return _FixtureArray(self.values[idx])
+
+    def __len__(self):
+        return len(self.values)
+
+
+class _FixtureBox:
+    def __init__(self, xyxy, conf):
+        self.xyxy = _FixtureArray([xyxy])
+        self.conf = _FixtureArray([conf])
+
+
+class _FixtureBoxes(list):
+    @property
+    def xyxy(self):
+        return _FixtureArray([b.xyxy.values[0] for b in self])
+
+    @property
+    def conf(self):
+        return _FixtureArray([b.conf.values[0] for b in self])
+
+
+class _FixtureResult:
+    def __init__(self, frame, boxes: _FixtureBoxes):
+        self.orig_img = frame
+        self.boxes = boxes
+        self.speed = {"preprocess": 0.0, "inference": 0.0, "postprocess": 0.0}
+
+    def plot(self, labels=True, conf=True, line_width=2):
+        annotated = self.orig_img.copy()
+        for box in self.boxes:
+            x1, y1, x2, y2 = (int(v) for v in box.xyxy.values[0])
+            cv2.rectangle(annotated, (x1, y1), (x2, y2), (0, 255, 0), line_width)
+        return annotated
+
+
+class FixtureYOLO:
+    """Stands in for an Ultralytics model: a drone box drifting across the frame plus two distractors."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def predict(self, source=None, *args, **kwargs):
+        frame = source if source is not None else args[0]
+        self.calls += 1
+        dx = (self.calls % 40) * 2.0
+        boxes = _FixtureBoxes(
+            [
+                _FixtureBox([280 + dx, 200, 340 + dx, 240], 0.91),
+                _FixtureBox([285 + dx, 205, 330 + dx, 238], 0.55),
+                _FixtureBox([20, 30, 60, 50], 0.35),
+            ]
+        )
+        return [_FixtureResult(frame, boxes)]
+
+
+########################################## Runtime Fakes ##################################################
+
+
+class FakeSource:
+    def __init__(self, frame):
+        self.frame = frame
+
+    def open(self):
+        return None
+
+    def read(self):
+        return True, self.frame
+
+    def close(self):
+        return None
+
+
+class CountingPresenter:
+    def __init__(self, frames: int):
+        self.remaining = frames
+
+    def show(self, frame, metrics=None) -> bool:
+        self.remaining -= 1
+        return self.remaining > 0
+
+    def close(self):
+        return None
+
+
+@unittest.skipUnless(PERF_ENABLED, "set PERF_TESTS=1 to run timing regression checks")
+class HotPathPerfTests(unittest.TestCase):
+    results: dict[str, float] = {}
+    baselines: dict[str, float] = {}
+
+    @classmethod
+    def setUpClass(cls):
+        cv2.setNumThreads(1)
+        cls.host = platform.node() or "unknown"
+        cls.results = {}
+        cls.baselines = {}
+        if BASELINE_PATH.is_file() and not UPDATE_BASELINE:
+            cls.baselines = json.loads(BASELINE_PATH.read_text()).get(cls.host, {}).get("cases", {})
+
+    @classmethod
+    def tearDownClass(cls):
+        new_cases = {k: v for k, v in cls.results.items() if UPDATE_BASELINE or k not in cls.baselines}
+        if not new_cases:
+            return
+        data = json.loads(BASELINE_PATH.read_text()) if BASELINE_PATH.is_file() else {}
+        entry = data.setdefault(cls.host, {"cases": {}})
+        entry["cases"].update({k: round(v, 9) for k, v in new_cases.items()})
+        entry["python"] = platform.python_version()
+        entry["numpy"] = np.__version__
+        entry["opencv"] = cv2.__version__
+        entry["updated_at"] = time.strftime("%Y-%m-%dT%H:%M:%S")
+        BASELINE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        BASELINE_PATH.write_text(json.dumps(data, indent=2, sort_keys=True))
+
+    def check(self, name: str, measure) -> None:
+        """measure() returns seconds for one pass of the case."""
+        seconds = measure()
+        baseline = self.baselines.get(name)
+        limit = None if baseline is None else baseline * TOLERANCE + ABS_SLACK_S
+        for _ in range(RETRIES):
+            if limit is None or seconds <= limit:
+                break
+            seconds = min(seconds, measure())
+        self.results[name] = seconds
+        print(f"\n[perf] {name}: {seconds * 1e6:.1f} us" + (f" (baseline {baseline * 1e6:.1f} us)" if baseline else ""))
+        if limit is None:
+            return
+        self.assertLessEqual(
+            seconds,
+            limit,
+            f"{name} regressed: {seconds * 1e6:.1f} us > {limit * 1e6:.1f} us "
+            f"(baseline {baseline * 1e6:.1f} us x {TOLERANCE:.2f})",
+        )
+
+    ###################################### Naive depth pipeline ##########################################
+
+    def _naive_pipeline(self, gating: bool):
+        from depth_estimation.naive_bbox_depth.pipeline import NaiveBBoxDepthPipeline
+
+        pipeline = NaiveBBoxDepthPipeline(
+            intrinsics_source="manual",
+            filter_mode="kalman",
+            enable_relative_position=True,
+            gating_enabled=gating,
+        )
+        pipeline._model = FixtureYOLO()
+        return pipeline
+
+    def test_naive_process_live_frame_gating_off(self):
+        pipeline = self._naive_pipeline(gating=False)
+        frame = synthetic_frame()
+        self.check("naive_process_live_frame_gating_off", lambda: measure_best_s(lambda: pipeline.process_live_frame(frame), 50))
+
+    def test_naive_process_live_frame_gating_on(self):
+        pipeline = self._naive_pipeline(gating=True)
+        frame = synthetic_frame()
+        self.check("naive_process_live_frame_gating_on", lambda: measure_best_s(lambda: pipeline.process_live_frame(frame), 50))
+
+    ###################################### Filters ########################################################
+
+    def test_scalar_filters(self):
+        from depth_estimation.naive_bbox_depth.filtering import ScalarSignalFilter
+
+        values = (2.0 + 0.1 * np.sin(np.arange(1000) / 10.0)).tolist()
+        for mode in ("ema", "kalman"):
+            f = ScalarSignalFilter(mode=mode, ema_alpha=0.3, kalman_process_var=0.01, kalman_measurement_var=0.05)
+
+            def run():
+                f.reset()
+                for v in values:
+                    f.update(v)
+
+            self.check(f"scalar_filter_{mode}_1000", lambda: measure_best_s(run, 5))
+
+    ###################################### Overlap suppression ###########################################
+
+    def test_overlap_suppression(self):
+        from inference.utils import suppress_overlapping_detections_indices
+
+        rng = np.random.default_rng(1)
+        xy = rng.uniform(0, 600, size=(30, 2))
+        wh = rng.uniform(10, 80, size=(30, 2))
+        boxes = [tuple(map(float, b)) for b in np.concatenate([xy, xy + wh], axis=1)]
+        confs = rng.uniform(0.2, 1.0, size=30).tolist()
+        self.check(
+            "overlap_suppression_30",
+            lambda: measure_best_s(lambda: suppress_overlapping_detections_indices(boxes, confs, 0.3), 50),
+        )
+
+    ###################################### Depth display ##################################################
+
+    def test_colorize_depth_map(self):
+        from depth_estimation.unidepth.utils import colorize_depth_map
+
+        rng = np.random.default_rng(2)
+        depth = rng.uniform(0.3, 8.0, size=FRAME_SHAPE[:2]).astype(np.float32)
+        self.check("colorize_depth_map_640x480", lambda: measure_best_s(lambda: colorize_depth_map(depth, "turbo"), 30))
+
+    def test_depth_colorizer(self):
+        from depth_estimation.colorize import DepthColorizer
+
+        rng = np.random.default_rng(2)
+        depth = rng.uniform(0.3, 8.0, size=FRAME_SHAPE[:2]).astype(np.float32)
+        colorizer = DepthColorizer("turbo", invert_colormap=True)
+        self.check("depth_colorizer_640x480", lambda: measure_best_s(lambda: colorizer.colorize(depth), 30))
+
+    def test_combine_frames_and_compose_display(self):
+        from depth_estimation import live_depth_review
+        from depth_estimation.pipeline_base import LiveFrameOutput
+
+        metrics = {
+            "track_state": "tracked",
+            "estimate_source": "measurement",
+            "detection_count": 1,
+            "yolo_detection_count": 3,
+            "infer_ms": 12.5,
+            "process_fps": 60.0,
+            "gating_enabled": 1,
+            "gating_passed": 1,
+            "x_rel_m": 0.1,
+            "y_rel_m": -0.05,
+            "z_rel_m": 1.8,
+            "yaw_error_deg": 3.2,
+        }
+        outputs = [
+            LiveFrameOutput(method="naive", frame_bgr=synthetic_frame(3), metrics=metrics),
+            LiveFrameOutput(method="unidepth", frame_bgr=synthetic_frame(4), metrics=dict(metrics)),
+        ]
+
+        def run():
+            combined = live_depth_review.combine_frames(outputs, FRAME_SHAPE[0])
+            live_depth_review.compose_display(combined, 100, 30.0, ["naive", "unidepth"], outputs, {})
+
+        self.check("combine_and_compose_display_2x", lambda: measure_best_s(run, 20))
+
+        compositor = live_depth_review.build_review_compositor(FRAME_SHAPE[0])
+        frame_idx = [0]
+
+        def run_compositor():
+            frame_idx[0] += 1
+            live_depth_review.compose_review_frame(
+                compositor, frame_idx[0], 30.0, ["naive", "unidepth"], outputs, {}
+            )
+
+        self.check("compose_review_frame_2x", lambda: measure_best_s(run_compositor, 20))
+
+    ###################################### ROI depth ######################################################
+
+    def test_roi_depth_vs_full_frame(self):
+        from depth_estimation.roi_depth import infer_roi_depth, roi_depth_stats
+
+        frame = synthetic_frame()
+        bbox = (300.0, 200.0, 340.0, 224.0)
+        frame_size = (FRAME_SHAPE[1], FRAME_SHAPE[0])
+
+        def depth_fn(image, _window=None):
+            return cv2.GaussianBlur(image[..., 0], (9, 9), 0).astype(np.float32)
+
+        self.check(
+            "roi_depth_full_frame_640x480",
+            lambda: measure_best_s(lambda: roi_depth_stats(depth_fn(frame), bbox, frame_size), 30),
+        )
+        self.check(
+            "roi_depth_roi_640x480",
+            lambda: measure_best_s(lambda: infer_roi_depth(frame, bbox, depth_fn, (0.5, 2.5)), 30),
+        )
+
+    ###################################### Vision runtime #################################################
+
+    def test_vision_runtime_end_to_end(self):
+        from flight_vision import vision_runtime
+
+        frames_per_run = 30
+        frame = synthetic_frame(5)
+        with mock.patch.object(vision_runtime, "load_yolo_model", return_value=FixtureYOLO()):
+            detector = vision_runtime.YOLODetector(
+                model_weights="fixture.pt",
+                image_size=640,
+                conf_threshold=0.4,
+                iou_threshold=0.7,
+                max_detections=10,
+                device="cpu",
+                verbose=False,
+                show_labels=True,
+                show_confidence=True,
+                box_line_width=2,
+            )
+        overlay = vision_runtime.OverlayRenderer(
+            font_scale=0.6,
+            thickness=2,
+            line_height=22,
+            text_color=(255, 255, 255),
+            text_origin=(10, 24),
+        )
+
+        def run():
+            runtime = vision_runtime.VisionRuntime(
+                FakeSource(frame),
+                detector,
+                overlay,
+                CountingPresenter(frames_per_run),
+                frame_poll_backoff_s=0.001,
+            )
+            runtime.run(threading.Event())
+
+        self.check("vision_runtime_per_frame", lambda: measure_best_s(run, 1, warmup=1) / frames_per_run)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,133 @@
+import json
+import os
+import sys
+import time
+import unittest
+import urllib.error
+import urllib.request
+from pathlib import Path
+from unittest import mock
+
+import cv2
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from presentation import MJPEGPresenter, OpenCVPresenter, create_presenter, parse_key, parse_stream_address
+from presentation.constants import STREAM_KEY_TOKEN_HEADER
+
+
+def fetch(presenter, path, data=None, headers=None):
+    request = urllib.request.Request(presenter.url.rstrip("/") + path, data=data, headers=headers or {})
+    with urllib.request.urlopen(request, timeout=5) as resp:
+        return resp.status, resp.headers.get("Content-Type"), resp.read()
+
+
+def send_key(presenter, body, token=None):
+    token = presenter.key_token if token is None else token
+    return fetch(presenter, "/key", data=body, headers={STREAM_KEY_TOKEN_HEADER: token})
+
+
+def wait_until(predicate, timeout_s=5.0):
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class MJPEGPresenterTests(unittest.TestCase):
+    def setUp(self):
+        self.presenter = MJPEGPresenter(key_quit={ord("q"), 27}, port=0, max_width=320, max_fps=0)
+
+    def tearDown(self):
+        self.presenter.close()
+
+    def test_snapshot_is_downscaled_copy_and_metrics_are_json(self):
+        with self.assertRaises(urllib.error.HTTPError) as ctx:
+            fetch(self.presenter, "/snapshot.jpg")
+        self.assertEqual(ctx.exception.code, 503)
+
+        frame = np.full((480, 640, 3), 200, np.uint8)
+        metrics = {"z_rel_m": np.float32(1.5), "detection_count": np.int64(1), "yaw_error_deg": float("nan")}
+        self.presenter.present(frame, metrics)
+        frame[:] = 0  # caller reuses its canvas; the stream must keep the presented pixels
+        self.assertTrue(wait_until(lambda: self.presenter.latest_jpeg() is not None))
+
+        status, content_type, body = fetch(self.presenter, "/snapshot.jpg")
+        self.assertEqual((status, content_type), (200, "image/jpeg"))
+        decoded = cv2.imdecode(np.frombuffer(body, np.uint8), cv2.IMREAD_COLOR)
+        self.assertEqual(decoded.shape, (240, 320, 3))
+        self.assertGreater(decoded.mean(), 150)
+
+        _, content_type, body = fetch(self.presenter, "/metrics.json")
+        self.assertEqual(content_type, "application/json")
+        payload = json.loads(body)
+        self.assertEqual(payload["metrics"], {"z_rel_m": 1.5, "detection_count": 1, "yaw_error_deg": None})
+        self.assertEqual(payload["stream"]["frames_encoded"], 1)
+
+    def test_stream_sends_multipart_jpeg_frames(self):
+        self.presenter.present(np.zeros((120, 160, 3), np.uint8))
+        self.assertTrue(wait_until(lambda: self.presenter.latest_jpeg() is not None))
+        with urllib.request.urlopen(self.presenter.url + "stream.mjpg", timeout=5) as resp:
+            self.assertTrue(resp.headers.get("Content-Type").startswith("multipart/x-mixed-replace"))
+            head = resp.read(64)
+        self.assertTrue(head.startswith(b"--fpvframe\r\nContent-Type: image/jpeg"))
+
+    def test_key_commands_drive_show_and_poll_key(self):
+        frame = np.zeros((60, 80, 3), np.uint8)
+        self.assertTrue(self.presenter.show(frame))
+        send_key(self.presenter, b"k=gating")
+        self.assertEqual(self.presenter.poll_key(), ord("g"))
+        self.assertEqual(self.presenter.poll_key(), 0xFF)
+
+        send_key(self.presenter, b"k=quit")
+        self.assertFalse(self.presenter.show(frame))
+        with self.assertRaises(urllib.error.HTTPError) as ctx:
+            send_key(self.presenter, b"k=nope")
+        self.assertEqual(ctx.exception.code, 400)
+
+    def test_key_commands_need_post_and_the_run_token(self):
+        _, _, page = fetch(self.presenter, "/")
+        self.assertIn(self.presenter.key_token.encode(), page)
+
+        for path, data, headers, code in (
+            ("/key?k=quit", None, {}, 405),
+            ("/key?k=quit", None, {STREAM_KEY_TOKEN_HEADER: self.presenter.key_token}, 405),
+            ("/key", b"k=quit", {}, 403),
+            ("/key", b"k=quit", {STREAM_KEY_TOKEN_HEADER: "guess"}, 403),
+        ):
+            with self.assertRaises(urllib.error.HTTPError) as ctx:
+                fetch(self.presenter, path, data=data, headers=headers)
+            self.assertEqual(ctx.exception.code, code)
+        self.assertTrue(self.presenter.show(np.zeros((60, 80, 3), np.uint8)))
+
+
+class PresenterFactoryTests(unittest.TestCase):
+    def test_parse_helpers(self):
+        self.assertIsNone(parse_stream_address("0"))
+        self.assertEqual(parse_stream_address("1"), ("127.0.0.1", 8090))
+        self.assertEqual(parse_stream_address("9000"), ("127.0.0.1", 9000))
+        self.assertEqual(parse_stream_address("0.0.0.0:9001"), ("0.0.0.0", 9001))
+        with self.assertRaises(RuntimeError):
+            parse_stream_address("host:port")
+        self.assertEqual(parse_key("ESC"), 27)
+        self.assertEqual(parse_key("r"), ord("r"))
+
+    def test_env_selects_presenter(self):
+        with mock.patch.dict(os.environ, {"FPV_STREAM": ""}):
+            self.assertIsInstance(create_presenter(window_name="w", key_quit={27}), OpenCVPresenter)
+        with mock.patch.dict(os.environ, {"FPV_STREAM": "127.0.0.1:0"}):
+            presenter = create_presenter(window_name="w", key_quit={27})
+        try:
+            self.assertIsInstance(presenter, MJPEGPresenter)
+            self.assertNotEqual(presenter.port, 0)
+        finally:
+            presenter.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,128 @@
+import json
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from types import SimpleNamespace
+from unittest import mock
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import profiling
+from profiling import tracing
+
+
+class TracingTests(unittest.TestCase):
+    def tearDown(self):
+        profiling.stop_tracing()
+
+    def test_disabled_spans_are_shared_noops(self):
+        self.assertFalse(profiling.is_enabled())
+        first = profiling.span("a", "capture", frame=1)
+        second = profiling.span("b", "inference")
+        self.assertIs(first, second)
+        with first:
+            pass
+
+        @profiling.traced("work", "gating")
+        def work(x):
+            return x * 2
+
+        self.assertEqual(work(3), 6)
+        profiling.record_span("late", "filtering", 0.0, 1.0)
+        profiling.record_yolo_stages(SimpleNamespace(speed={"inference": 1.0}), 0.0)
+        self.assertIsNone(profiling.stop_tracing())
+
+    def test_spans_from_two_threads_export_as_chrome_trace(self):
+        profiling.start_tracing()
+
+        @profiling.traced("gate", "gating")
+        def gate():
+            return True
+
+        def vision_loop():
+            for i in range(3):
+                with profiling.span("vision.frame", "frame", frame=i):
+                    with profiling.span("capture.grab", "capture"):
+                        pass
+                    gate()
+
+        worker = threading.Thread(target=vision_loop, name="flight-vision-runtime")
+        worker.start()
+        worker.join()
+        with profiling.span("control.send", "control", vx=0.1):
+            pass
+        with self.assertRaises(ValueError):
+            with profiling.span("boom", "presentation"):
+                raise ValueError("x")
+
+        with tempfile.TemporaryDirectory() as tmp:
+            out_path = profiling.stop_tracing(Path(tmp) / "nested" / "trace.json")
+            data = json.loads(out_path.read_text())
+
+        self.assertFalse(profiling.is_enabled())
+        self.assertEqual(data["displayTimeUnit"], "ms")
+        events = data["traceEvents"]
+        spans = [e for e in events if e["ph"] == "X"]
+        thread_names = {e["tid"]: e["args"]["name"] for e in events if e["name"] == "thread_name"}
+
+        self.assertEqual(len([e for e in spans if e["name"] == "vision.frame"]), 3)
+        self.assertEqual(len([e for e in spans if e["name"] == "gate"]), 3)
+        by_name = {e["name"]: e for e in spans}
+        self.assertEqual(thread_names[by_name["gate"]["tid"]], "flight-vision-runtime")
+        self.assertNotEqual(by_name["gate"]["tid"], by_name["control.send"]["tid"])
+        self.assertEqual(by_name["control.send"]["args"], {"vx": 0.1})
+        self.assertEqual(by_name["boom"]["args"]["error"], "ValueError")
+
+        # Children are nested inside their frame span on the same track.
+        frame = [e for e in spans if e["name"] == "vision.frame"][-1]
+        grab = [e for e in spans if e["name"] == "capture.grab"][-1]
+        self.assertGreaterEqual(grab["ts"], frame["ts"])
+        self.assertLessEqual(grab["ts"] + grab["dur"], frame["ts"] + frame["dur"] + 1e-3)
+
+    def test_yolo_stages_are_laid_out_back_to_back(self):
+        tracer = profiling.start_tracing()
+        result = SimpleNamespace(speed={"preprocess": 1.0, "inference": 5.0, "postprocess": 2.0})
+        profiling.record_yolo_stages(result, 10.0)
+
+        stages = [(e["name"], e["cat"], e["ts"], e["dur"]) for e in tracer.events]
+        self.assertEqual([s[0] for s in stages], ["yolo.preprocess", "yolo.inference", "yolo.nms"])
+        self.assertEqual([s[1] for s in stages], ["preprocess", "inference", "nms"])
+        self.assertAlmostEqual(stages[1][2], 10.001e6)
+        self.assertAlmostEqual(stages[2][2], 10.006e6)
+        self.assertAlmostEqual(stages[2][3], 2000.0)
+
+    def test_ring_buffer_keeps_newest_events(self):
+        tracer = profiling.start_tracing(max_events=5)
+        for i in range(12):
+            profiling.instant(f"event{i}")
+        self.assertEqual([e["name"] for e in tracer.events], [f"event{i}" for i in range(7, 12)])
+        self.assertTrue(tracer.chrome_trace()["otherData"]["dropped_oldest"])
+
+    def test_env_switch(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            target = Path(tmp) / "flight.json"
+            with mock.patch.object(tracing.atexit, "register") as register:
+                with mock.patch.dict(os.environ, {"FPV_TRACE": "0"}):
+                    self.assertIsNone(profiling.start_tracing_from_env("demo"))
+                self.assertFalse(profiling.is_enabled())
+
+                with mock.patch.dict(os.environ, {"FPV_TRACE": str(target)}):
+                    self.assertEqual(profiling.start_tracing_from_env("demo"), target)
+                self.assertTrue(profiling.is_enabled())
+                with profiling.span("capture.read", "capture"):
+                    pass
+                write_at_exit = register.call_args[0][0]
+                write_at_exit()
+
+            self.assertFalse(profiling.is_enabled())
+            names = [e["name"] for e in json.loads(target.read_text())["traceEvents"]]
+            self.assertIn("capture.read", names)
+
+
+if __name__ == "__main__":
+    unittest.main()
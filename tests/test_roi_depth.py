@@ -0,0 +1,110 @@
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from depth_estimation.benchmark_roi_depth import benchmark_roi_vs_full
+from depth_estimation.roi_depth import compute_roi_window, extract_roi, infer_roi_depth, roi_depth_stats
+from depth_estimation.unidepth.utils import fixed_get_paddings
+
+FRAME_W, FRAME_H = 640, 480
+BBOX = (300.0, 200.0, 340.0, 224.0)
+ASPECT = (0.5, 2.5)
+
+
+def scene_frame() -> np.ndarray:
+    # Channel 0 encodes depth * 10: drone at 1 m, background at 4 m.
+    frame = np.full((FRAME_H, FRAME_W, 3), 40, dtype=np.uint8)
+    x1, y1, x2, y2 = (int(v) for v in BBOX)
+    frame[y1:y2, x1:x2, 0] = 10
+    return frame
+
+
+def depth_from_pixels(image_bgr, _window=None) -> np.ndarray:
+    return image_bgr[..., 0].astype(np.float32) / 10.0
+
+
+class PaddingTests(unittest.TestCase):
+    def test_fixed_get_paddings_never_shrinks(self):
+        for shape in [(100, 400), (400, 100), (97, 131), (1, 3)]:
+            (left, right, top, bottom), (h_new, w_new) = fixed_get_paddings(shape, ASPECT)
+            self.assertGreaterEqual(min(left, right, top, bottom), 0)
+            self.assertEqual((h_new, w_new), (shape[0] + top + bottom, shape[1] + left + right))
+            self.assertGreaterEqual(w_new / h_new, ASPECT[0] - 1e-6)
+            self.assertLessEqual(w_new / h_new, ASPECT[1] + 0.05)
+
+
+class RoiWindowTests(unittest.TestCase):
+    def test_window_holds_context_inside_frame(self):
+        window = compute_roi_window(BBOX, (FRAME_W, FRAME_H), ASPECT, context_scale=3.0, min_side_px=96)
+        w, h = window.crop_size
+        self.assertEqual((w, h), (120, 96))
+        self.assertEqual(window.pad, (0, 0, 0, 0))
+        self.assertLessEqual(window.x0, BBOX[0])
+        self.assertGreaterEqual(window.x1, BBOX[2])
+
+        roi = extract_roi(scene_frame(), window)
+        self.assertEqual((roi.shape[1], roi.shape[0]), window.input_size)
+        bx1, by1, _bx2, _by2 = (int(v) for v in window.bbox_in_input())
+        self.assertEqual(roi[by1, bx1, 0], 10)
+
+    def test_edge_bbox_shifts_then_pads(self):
+        # Tall thin box against a narrow frame: crop is clamped to the frame, the rest is padded.
+        window = compute_roi_window((2.0, 10.0, 12.0, 90.0), (40, 100), (1.0, 1.0), context_scale=2.0, min_side_px=8)
+        self.assertEqual((window.x0, window.x1), (0, 40))
+        left, right, _top, _bottom = window.pad
+        self.assertEqual(window.input_size[0], window.input_size[1])
+        self.assertGreater(left + right, 0)
+        fx, fy, cx, cy = window.adjust_intrinsics(200.0, 210.0, 20.0, 50.0)
+        self.assertEqual((fx, fy), (200.0, 210.0))
+        self.assertEqual((cx, cy), (20.0 + left, 50.0 - window.y0))
+
+
+class RoiInferenceTests(unittest.TestCase):
+    def test_roi_stats_match_full_frame_on_smaller_input(self):
+        frame = scene_frame()
+        seen_shapes = []
+
+        def infer(roi, window):
+            seen_shapes.append(roi.shape)
+            return depth_from_pixels(roi)
+
+        result = infer_roi_depth(frame, BBOX, infer, ASPECT, context_scale=3.0, min_side_px=96)
+        self.assertEqual(seen_shapes, [(96, 120, 3)])
+        self.assertAlmostEqual(result.stats["median"], 1.0)
+        self.assertEqual(result.stats["valid_fraction"], 1.0)
+
+        # Same stats from a half-resolution full-frame map in frame coordinates.
+        full = depth_from_pixels(frame)[::2, ::2]
+        self.assertAlmostEqual(roi_depth_stats(full, BBOX, (FRAME_W, FRAME_H))["median"], 1.0)
+
+    def test_benchmark_report_skips_frames_without_target(self):
+        # Structure only: wall-clock speed-up is machine dependent (see tests/test_perf_hot_paths.py).
+        frames = [scene_frame(), scene_frame()]
+        calls = {"full": 0, "roi": 0}
+
+        def full_fn(frame):
+            calls["full"] += 1
+            return depth_from_pixels(frame)
+
+        def roi_fn(frame, bbox):
+            calls["roi"] += 1
+            return infer_roi_depth(frame, bbox, depth_from_pixels, ASPECT)
+
+        report = benchmark_roi_vs_full(frames, [BBOX, None], full_fn, roi_fn, repeats=2, warmup=1)
+        self.assertEqual(report["frames"], 1)
+        self.assertEqual([row["frame"] for row in report["rows"]], [0])
+        self.assertEqual(calls, {"full": 3, "roi": 3})
+        for mode in ("full", "roi"):
+            self.assertEqual(sorted(report[mode]), ["median_ms", "min_ms", "p90_ms"])
+        self.assertIn("speedup", report)
+        self.assertEqual(report["depth_abs_diff_median"], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()